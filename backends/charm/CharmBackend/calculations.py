@@ -6,13 +6,15 @@ import random
 import string
 from charm.toolbox.ABEnc import ABEnc
 from charm.toolbox.secretutil import SecretUtil
+from charm.toolbox.node import OpType
 from charm.toolbox.pairinggroup import PairingGroup, pair, G1, G2, GT, ZR
 from CharmBackend import parsing, datastructures
+from CharmBackend.loader import gen_loader
 
 
 class Calculations:
 
-    def __init__(self, group_obj, meta):
+    def __init__(self, group_obj, meta, fdh_capacity=1024, policy_capacity=256):
         ABEnc.__init__(self)
         global util, abeparser, users
         self.group = PairingGroup(group_obj)
@@ -22,12 +24,28 @@ class Calculations:
         self.g = self.__get_generator(G1)
         self.h = self.__get_generator(G2)
         self.gt = pair(self.g, self.h)
+        # lift_g, lift_h and lift_gt always exponentiate the generators
+        self.g.initPP()
+        self.h.initPP()
+        self.gt.initPP()
 
+        self.fdh_cache = datastructures.FdhCache(fdh_capacity)
+        self.policy_cache = datastructures.PolicyCache(policy_capacity)
         self.__secret_cache = None
         self.__rgid_cache = None
         self._masking_values = None
         self._shares = None
         self._coefficients = None
+        # the decryption costs of a positive and a negated row of the linear
+        # combination, exported by pracy as ROW_COSTS (see check_prune)
+        self.row_costs = {"pos": 1.0, "neg": 1.0}
+        # run the .gen files compiled once by the loader instead of exec'ing
+        # their source on every call (False to benchmark the latter)
+        self.compile_gen = True
+        # multi_exp exponentiates natively below this many bases, where Charm's
+        # (possibly precomputed) exponentiations beat building the window tables
+        # in Python; tools/bench_multi_exp.py measures the crossover per curve
+        self.multi_exp_threshold = 4
 
     def sample_z(self):
         return self.group.random(ZR)
@@ -47,12 +65,114 @@ class Calculations:
     def pair_groups(self, g1, g2):
         return pair(g1, g2)
 
+    def reset_pairs(self):
+        """
+        returns an empty product of pairings, see multi_pair, consisting of
+        the arguments of the pairings and the pairings evaluated in GT
+        """
+        return [], [], []
+
+    def add_pair(self, pairs, g1, g2):
+        """adds e(g1, g2) to the product of pairings"""
+        pairs[0].append(g1)
+        pairs[1].append(g2)
+
+    def add_pair_g(self, pairs, g1, g2, exponent):
+        """adds e(g1, g2)^exponent, exponentiating g1"""
+        self.add_pair(pairs, g1**exponent, g2)
+
+    def add_pair_h(self, pairs, g1, g2, exponent):
+        """adds e(g1, g2)^exponent, exponentiating g2"""
+        self.add_pair(pairs, g1, g2**exponent)
+
+    def add_pair_gt(self, pairs, g1, g2, exponent):
+        """adds e(g1, g2)^exponent, exponentiating the pairing in GT"""
+        pairs[2].append(pair(g1, g2) ** exponent)
+
+    def multi_pair(self, pairs):
+        """
+        evaluates the product of pairings with a single final exponentiation
+        """
+        g1s, g2s, gts = pairs
+        res = self.group.pair_prod(g1s, g2s) if g1s else self.reset_gt()
+        for gt in gts:
+            res *= gt
+        return res
+
     def lift_g(self, exponent):
         return self.g**exponent
 
     def reset_g(self):
         return self.lift_g(0)
 
+    def precompute(self, element):
+        """
+        builds the precomputation table for fixed-base exponentiations with
+        element, which is used by all subsequent exponentiations of element
+        """
+        element.initPP()
+        return element
+
+    def reset_terms_g(self):
+        """returns an empty multi-exponentiation in G1, see multi_scale_g"""
+        return [], []
+
+    def add_term_g(self, terms, exponent, g1):
+        """adds g1^exponent to the multi-exponentiation"""
+        terms[0].append(g1)
+        terms[1].append(exponent)
+
+    def multi_scale_g(self, terms):
+        """evaluates the multi-exponentiation in G1"""
+        return self.multi_exp(terms[0], terms[1], self.reset_g())
+
+    def reset_terms_h(self):
+        """returns an empty multi-exponentiation in G2, see multi_scale_h"""
+        return [], []
+
+    def add_term_h(self, terms, exponent, g2):
+        """adds g2^exponent to the multi-exponentiation"""
+        terms[0].append(g2)
+        terms[1].append(exponent)
+
+    def multi_scale_h(self, terms):
+        """evaluates the multi-exponentiation in G2"""
+        return self.multi_exp(terms[0], terms[1], self.reset_h())
+
+    def multi_exp(self, bases, exponents, identity, window=4):
+        """
+        calculates prod_i bases[i]^exponents[i] by windowed simultaneous
+        exponentiation, i.e., all bases share the squarings, or by native
+        exponentiations if there are fewer than multi_exp_threshold bases
+        """
+        if not bases:
+            return identity
+        if len(bases) < self.multi_exp_threshold:
+            res = bases[0] ** exponents[0]
+            for base, e in zip(bases[1:], exponents[1:]):
+                res = res * base ** e
+            return res
+        order = int(self.group.order())
+        exponents = [int(e) % order for e in exponents]
+        size = 1 << window
+        tables = []
+        for base in bases:
+            table = [identity, base]
+            for _ in range(size - 2):
+                table.append(table[-1] * base)
+            tables.append(table)
+
+        digits = (max(e.bit_length() for e in exponents) + window - 1) // window
+        res = identity
+        for i in reversed(range(digits)):
+            for _ in range(window):
+                res = res * res
+            for table, e in zip(tables, exponents):
+                digit = (e >> (i * window)) & (size - 1)
+                if digit:
+                    res = res * table[digit]
+        return res
+
     def lift_h(self, exponent):
         return self.h**exponent
 
@@ -65,11 +185,20 @@ class Calculations:
     def reset_gt(self):
         return self.initialize_gt(1)
 
-    def fdh_g(self):
-        print("TODO")
+    def fdh_g(self, idx, arg):
+        return self.__fdh(G1, idx, arg)
 
-    def fdh_h(self):
-        print("TODO")
+    def fdh_h(self, idx, arg):
+        return self.__fdh(G2, idx, arg)
+
+    def __fdh(self, subgroup, idx, arg):
+        """hashes "idx:arg" to subgroup, reusing the results cached in fdh_cache"""
+        key = (subgroup, idx, arg)
+        element = self.fdh_cache.get(key)
+        if element is None:
+            element = self.group.hash(f"{idx}:{arg}", subgroup)
+            self.fdh_cache.put(key, element)
+        return element
 
     def __calc_random_id(self):
         """returns random 4-character long string"""
@@ -83,10 +212,6 @@ class Calculations:
         """calls __calc_random_id to generate rgid"""
         return self.__calc_random_id()
 
-    def __calc_coefficients(self, policy):
-        """uses charms built-in function to calculate coefficients - needs CHARM POLICY"""
-        self._coefficients = util.getCoefficients(policy)
-
     def __calc_shares(self, policy):
         """uses charms built-in function to calculate shares - needs CHARM POLICY"""
         self._shares = util.calculateSharesDict(self.get_secret(), policy)
@@ -171,6 +296,7 @@ class Calculations:
 
     def check_prune(self, user_attributes, policy):
         """determine whether a given set of attributes satisfies the policy (...iff. P(x,y) = 1...)
+           and pick the satisfying set of literals with the lowest decryption cost by row_costs
         Args:
             user_attributes ([Element]): list of user attributes as element
             policy (Policy()): policy of type Policy()
@@ -181,47 +307,72 @@ class Calculations:
             check_prune(['0', '3'], '(0 or 1) and (2 or 3)')
             >>> ['0', '3']
         """
-        # iterate over all literal(policy) attributes and over all element(user) attributes
-        # if they match, append Literal to the list
-        # needed because user_attributes are of type Element() but we need Literal().index for prune
-        attributes = []
-        for literal in policy.literals:  # iterate over policy literals
-            literal_attr = literal.attr_repr
-            for element in user_attributes:  # iterate over user attributes
-                element_attr = element.attr_repr
-                if literal_attr == element_attr:
-                    attributes.append(literal)
-
-        attribute_indices = [
-            literal.index for literal in attributes
-        ]  # Literal(...) -> int, so it matches charms policy
-        prune = util.prune(policy.charm_lsss, attribute_indices)
-        assert prune, "Attributes do not fulfill policy"
-        prune_transformed = [str(repr(idx)) for idx in prune]
+        # index the user attributes by their attribute, such that matching a
+        # literal is a lookup instead of a comparison with every element
+        user_attrs = {attribute_key(element.attr_repr) for element in user_attributes}
+        costs = {
+            literal.index: self.row_costs["neg" if literal.neg else "pos"]
+            for literal in policy.literals
+            if attribute_key(literal.attr_repr) in user_attrs
+        }
+        cheapest = cheapest_rows(policy.charm_lsss, costs)
+        assert cheapest, "Attributes do not fulfill policy"
+        rows = set(cheapest[1])
         lin_comb = [
-            literal.index
-            for literal in attributes
-            if literal.index in prune_transformed
+            literal.index for literal in policy.literals if literal.index in rows
         ]
         return lin_comb
 
+    def compile_policy(self, policy_original):
+        """parses a policy into its literals, lsss friendly policy, charm policy
+           and reconstruction coefficients, which are cached in policy_cache
+        Args:
+            policy_original (str): original policy as string
+        Returns:
+            CompiledPolicy: the parts of the policy which do not change between encryptions
+        """
+        key = datastructures.normalize_policy(policy_original)
+        compiled = self.policy_cache.get(key)
+        if compiled is None:
+            policy_literals = abeparser.policy_to_literals(policy_original)
+            policy_lsss = abeparser.policy_to_lsss_friendly(
+                policy_original, policy_literals
+            )
+            policy_charm = util.createPolicy(policy_lsss)
+            compiled = datastructures.CompiledPolicy(
+                literals=policy_literals,
+                lsss_friendly=policy_lsss,
+                charm_lsss=policy_charm,
+                coefficients=util.getCoefficients(policy_charm),
+            )
+            self.policy_cache.put(key, compiled)
+        return compiled
+
     def process_policy(self, policy_original):
-        """create all pol representations and precalulate all belonging values
+        """create all pol representations and precalulate all belonging values,
+           only the shares and masking values are sampled for every call
         Args:
             policy_original (str): original policy as string
         Returns:
             list: original policy, policy with ints for leafs instead of attribtues, 
                   policy created by charm, attribtues from original policy
         """
-        policy_literals = abeparser.policy_to_literals(policy_original)
-        policy_lsss = abeparser.policy_to_lsss_friendly(
-            policy_original, policy_literals
-        )
-        policy_charm = util.createPolicy(policy_lsss)
-        self.__calc_maskingvalues(policy_charm)
-        self.__calc_shares(policy_charm)
-        self.__calc_coefficients(policy_charm)
-        return [policy_original, policy_lsss, policy_charm, policy_literals]
+        compiled = self.compile_policy(policy_original)
+        self.__calc_maskingvalues(compiled.charm_lsss)
+        self.__calc_shares(compiled.charm_lsss)
+        self._coefficients = compiled.coefficients
+        return [
+            policy_original,
+            compiled.lsss_friendly,
+            compiled.charm_lsss,
+            list(compiled.literals),
+        ]
+
+    def load_coefficients(self, policy):
+        """sets the coefficients get_coefficient returns to those of policy
+           (of type Policy()), e.g. of the ciphertext to decrypt
+        """
+        self._coefficients = self.compile_policy(policy.original).coefficients
 
     def attributes_to_elements(self, string_attributes):
         attributes = [
@@ -288,7 +439,41 @@ class Calculations:
             dict: context/namespace with updated variables/etc
         """
         context["self"] = self  # to execute functions in this class
+        if self.compile_gen:
+            return gen_loader.run(file, context)
         with open(file, "r") as ir:
             exec(ir.read(), context)
 
         return context
+
+
+def attribute_key(attribute):
+    """Attribute() is not hashable, hence sets of attributes hold this tuple"""
+    return (attribute.auth, attribute.label, attribute.value)
+
+
+def cheapest_rows(node, costs):
+    """picks the cheapest set of leaves satisfying the charm policy tree node
+    Args:
+        node (BinNode): charm policy (sub)tree over literal indices
+        costs (dict): cost by literal index of the satisfied literals
+    Returns:
+        tuple: (cost, [literal indices]) of the cheapest satisfying set, None
+               if the satisfied literals do not satisfy node
+    Example:
+        cheapest_rows('(0 or 1) and (2 or 3)', {'0': 2, '1': 1, '3': 1})
+        >>> (2, ['1', '3'])
+    """
+    node_type = node.getNodeType()
+    if node_type == OpType.ATTR:
+        index = str(node)
+        return (costs[index], [index]) if index in costs else None
+    left = cheapest_rows(node.getLeft(), costs)
+    right = cheapest_rows(node.getRight(), costs)
+    if node_type == OpType.AND:
+        if left is None or right is None:
+            return None
+        return (left[0] + right[0], left[1] + right[1])
+    # OR: the cheaper child, the left one on ties like util.prune
+    satisfied = [child for child in (left, right) if child is not None]
+    return min(satisfied, key=lambda child: child[0]) if satisfied else None
@@ -2,8 +2,12 @@
 Please refer to the documentation provided
 """
 
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
 
+from charm.core.engine.util import bytesToObject, objectToBytes
+
 
 @dataclass()
 class Attribute:
@@ -56,7 +60,9 @@ class MasterSecretKey:
 
 class MasterPublicKey:
     def __init__(self):
-        self.params = {"alpha": {}, "b_g": {}, "b_h": {}}
+        # b_g_pp and b_h_pp hold the common vars with precomputation tables
+        # for fixed-base exponentiations (only filled if setup builds them)
+        self.params = {"alpha": {}, "b_g": {}, "b_h": {}, "b_g_pp": {}, "b_h_pp": {}}
 
     def __getitem__(self, key):
         return self.params[key]
@@ -64,6 +70,37 @@ class MasterPublicKey:
     def __setitem__(self, key, value):
         self.params[key] = value
 
+    def precompute(self):
+        """(re)builds the precomputation tables of all common vars"""
+        for key in ("b_g", "b_h"):
+            for idx, element in self.params[key].items():
+                element.initPP()
+                self.params[f"{key}_pp"][idx] = element
+
+    def serialize(self, group):
+        """
+        serializes the MPK, the precomputation tables can not be serialized
+        by charm and are rebuilt by deserialize instead; the entries are
+        stored as [idx, element] pairs as structured index keys (tuples) can
+        not be keys of serialized dicts
+        """
+        params = {
+            k: [[idx, element] for idx, element in v.items()]
+            for k, v in self.params.items()
+            if not k.endswith("_pp")
+        }
+        return objectToBytes(params, group)
+
+    @classmethod
+    def deserialize(cls, data, group, precompute=False):
+        """loads an MPK from serialize, building the tables if `precompute` is set"""
+        mpk = cls()
+        for k, entries in bytesToObject(data, group).items():
+            mpk.params[k] = {_as_index(idx): element for idx, element in entries}
+        if precompute:
+            mpk.precompute()
+        return mpk
+
     def __repr__(self):
         return f"MPK({self.params})"
 
@@ -82,6 +119,27 @@ class SecretKey:
         return f"SK({self.params})"
 
 
+class PreparedSecretKey(SecretKey):
+    """
+    a secret key prepared for repeated decryptions: the key elements in G1
+    come with precomputation tables for fixed-base exponentiations, which are
+    kept in k_g_pp and r_g_pp
+    """
+
+    def __init__(self, sk):
+        super().__init__()
+        self.params.update(sk.params)
+        self.params["k_g_pp"] = {}
+        self.params["r_g_pp"] = {}
+        for key in ("k_g", "r_g"):
+            for idx, element in self.params[key].items():
+                element.initPP()
+                self.params[f"{key}_pp"][idx] = element
+
+    def __repr__(self):
+        return f"PreparedSK({self.params})"
+
+
 class Ciphertext:
     def __init__(self):
         self.params = {
@@ -102,3 +160,112 @@ class Ciphertext:
 
     def __repr__(self):
         return f"CT({self.params})"
+
+
+class LRUCache:
+    """
+    holds at most capacity entries: when a new entry does not fit anymore,
+    the least recently used one is evicted
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """returns the element cached for key or None, counting hits and misses"""
+        element = self._entries.get(key)
+        if element is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return element
+
+    def put(self, key, element):
+        self._entries[key] = element
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def set_capacity(self, capacity):
+        self.capacity = capacity
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def hit_rate(self):
+        """returns the share of the lookups which were hits (0 without lookups)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(size={len(self)}, capacity={self.capacity}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+class FdhCache(LRUCache):
+    """
+    the hash-to-curve results of Calculations.fdh_g/fdh_h by (group, hash
+    index, argument)
+    """
+
+    def __init__(self, capacity=1024):
+        super().__init__(capacity)
+
+    def serialize(self, group):
+        """
+        serializes the cached entries (from the least to the most recently
+        used one), e.g. to store them next to the MPK
+        """
+        entries = [[*key, element] for key, element in self._entries.items()]
+        return objectToBytes(entries, group)
+
+    def load(self, data, group):
+        """adds the entries from serialize to the cache"""
+        for subgroup, idx, arg, element in bytesToObject(data, group):
+            self.put((subgroup, idx, _as_index(arg)), element)
+
+
+@dataclass()
+class CompiledPolicy:
+    """the parts of a policy which do not change between encryptions"""
+
+    literals: [Literal]
+    lsss_friendly: str
+    charm_lsss: str
+    coefficients: dict
+
+
+class PolicyCache(LRUCache):
+    """
+    the policies compiled by Calculations.compile_policy by their normalized
+    policy string (see normalize_policy)
+    """
+
+    def __init__(self, capacity=256):
+        super().__init__(capacity)
+
+
+def normalize_policy(policy):
+    """
+    normalizes the whitespace of a policy, such that policies only differing
+    in their spacing share their entry in the PolicyCache
+    Example: normalize_policy(' ( A.ONE  or A.TWO) ')
+        >>> '(A.ONE or A.TWO)'
+    """
+    policy = re.sub(r"\s+", " ", policy).strip()
+    return re.sub(r"\(\s|\s\)", lambda m: m.group(0).strip(), policy)
+
+
+def _as_index(idx):
+    """restores an index, as structured index keys (tuples) are deserialized as lists"""
+    if isinstance(idx, list):
+        return tuple(idx)
+    return idx
@@ -7,7 +7,8 @@ from pstats import SortKey, Stats
 import unittest
 import json
 import os
-from CharmBackend import template, parsing
+import time
+from CharmBackend import template, parsing, calculations
 
 
 def run_scheme(meta_path, schemes_path, benchmark):
@@ -39,10 +40,159 @@ def run_scheme(meta_path, schemes_path, benchmark):
             with Profile() as profile:
                 runner.run(suite)
                 (Stats(profile).strip_dirs().sort_stats(SortKey.CALLS).print_stats())
+            report_throughput(meta, ir, test_path)
+            report_pruning(meta, ir, test_path)
         else:
             runner.run(suite)
 
 
+def report_throughput(meta, scheme_path, test_path, rounds=10):
+    """
+    prints the operations per second of the scheme in scheme_path on the first
+    correct setup of the correctness tests, with the .gen files exec'ed on
+    every call (before) and compiled once by the loader (after), followed by
+    the hit and miss counts of the policy cache (see Calculations.compile_policy)
+
+    Example: report_throughput(meta, "schemes/a_1_xx/", "CharmBackend/tests")
+        >>> schemes/a_1_xx/ exec     setup: <n> ops/s keygen: <n> ops/s ...
+            schemes/a_1_xx/ compiled setup: <n> ops/s keygen: <n> ops/s ... PolicyCache(...)
+    """
+    setups = parsing.parse_json(os.path.join(test_path, "correctness.json"))
+    setup = next(setup for setup in setups.values() if setup["correct"])
+    key_input, ct_input = convert_setup(meta, setup)
+
+    for label, compiled in (("exec", False), ("compiled", True)):
+        scheme = template.Scheme(
+            meta_data=meta,
+            ir_path=scheme_path,
+            group_obj=setup["groupObj"],
+            user=setup["user"],
+        )
+        scheme.calc_instance.compile_gen = compiled
+        if meta["attribute-universe"] == "small":
+            universe = setup["attribute_universe"]
+        else:
+            universe = None
+        M = scheme.calc_instance.sample_gt()
+        operations = {
+            "setup": lambda: scheme.setup(setup["authorities"], universe),
+            "keygen": lambda: scheme.keygen(MSK, key_input),
+            "encrypt": lambda: scheme.encrypt(MPK, ct_input, M),
+            "decrypt": lambda: scheme.decrypt(MPK, CT, SK),
+        }
+        (MSK, MPK) = operations["setup"]()
+        SK = scheme.prepare_key(operations["keygen"]())
+        CT = operations["encrypt"]()
+        results = []
+        for name, operation in operations.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                operation()
+            elapsed = time.perf_counter() - start
+            results.append(f"{name}: {rounds / elapsed:.1f} ops/s")
+        print(
+            f"{scheme_path} {label:<8}",
+            " ".join(results),
+            scheme.calc_instance.policy_cache,
+        )
+
+
+def report_pruning(meta, scheme_path, test_path, rounds=1000):
+    """
+    prints the literals decryption combines on the OR-heavy policies of the
+    correctness tests (COMPLEX and MIXED_ENOUGH-CHEAPEST), picked as the first
+    satisfying set by util.prune after matching every literal against every
+    user attribute (first) and as the cheapest set by Calculations.row_costs
+    after matching by lookup (cheapest, see Calculations.check_prune), with
+    their costs, the calls of the selection and the decryptions per second
+
+    Example: report_pruning(meta, "schemes/a_1_xx/", "CharmBackend/tests")
+        >>> schemes/a_1_xx/ COMPLEX first    [...] cost: <n> prune: <n> ops/s decrypt: <n> ops/s
+            schemes/a_1_xx/ COMPLEX cheapest [...] cost: <n> prune: <n> ops/s decrypt: <n> ops/s
+            ...
+    """
+    setups = parsing.parse_json(os.path.join(test_path, "correctness.json"))
+
+    def first_rows(user_attributes, policy):
+        attributes = [
+            literal
+            for literal in policy.literals
+            for element in user_attributes
+            if literal.attr_repr == element.attr_repr
+        ]
+        prune = calculations.util.prune(
+            policy.charm_lsss, [literal.index for literal in attributes]
+        )
+        assert prune, "Attributes do not fulfill policy"
+        pruned = [str(repr(idx)) for idx in prune]
+        return [literal.index for literal in attributes if literal.index in pruned]
+
+    for case in ("COMPLEX", "MIXED_ENOUGH-CHEAPEST"):
+        setup = setups[case]
+        key_input, ct_input = convert_setup(meta, setup)
+        scheme = template.Scheme(
+            meta_data=meta,
+            ir_path=scheme_path,
+            group_obj=setup["groupObj"],
+            user=setup["user"],
+        )
+        calc = scheme.calc_instance
+        if meta["attribute-universe"] == "small":
+            universe = setup["attribute_universe"]
+        else:
+            universe = None
+        (MSK, MPK) = scheme.setup(setup["authorities"], universe)
+        SK = scheme.prepare_key(scheme.keygen(MSK, key_input))
+        CT = scheme.encrypt(MPK, ct_input, calc.sample_gt())
+        literals = {literal.index: literal for literal in CT["x"].literals}
+
+        for label, select in (("first", first_rows), ("cheapest", calc.check_prune)):
+            rows = select(SK["y"].elements, CT["x"])
+            cost = sum(
+                calc.row_costs["neg" if literals[row].neg else "pos"] for row in rows
+            )
+            # decrypt calls calc.check_prune
+            calc.check_prune = select
+            results = []
+            for name, operation in (
+                ("prune", lambda: select(SK["y"].elements, CT["x"])),
+                ("decrypt", lambda: scheme.decrypt(MPK, CT, SK)),
+            ):
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    operation()
+                elapsed = time.perf_counter() - start
+                results.append(f"{name}: {rounds / elapsed:.1f} ops/s")
+            del calc.check_prune
+            print(
+                f"{scheme_path} {case} {label:<8}",
+                rows,
+                f"cost: {cost:g}",
+                " ".join(results),
+            )
+
+
+def convert_setup(meta, setup):
+    """
+    converts the attributes and policy of a correctness test setup into the
+    first type the scheme supports and returns them as the inputs of keygen
+    and encrypt (depending on the ABE type)
+    """
+    types = [v["syntax"] for k, v in meta["types"].items()]
+    idx = next(
+        idx
+        for idx, elem in enumerate(types)
+        if (not meta["needs_authority"] or "auth" in elem)
+        and (not meta["needs_label"] or "lab" in elem)
+    )
+    attributes, policy = parsing.ABEParser(meta).convert_type(
+        setup["attributes"], setup["policy"], idx
+    )
+    if meta["abe-type"] == "CP-ABE":
+        return attributes, policy
+    return policy, attributes
+
+
 ########## TESTING ##########
 def load_tests(meta, scheme_path, test_path):
     """
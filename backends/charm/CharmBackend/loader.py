@@ -0,0 +1,125 @@
+"""
+Please refer to the documentation provided
+"""
+
+import ast
+import importlib.util
+import os
+
+
+class GenLoader:
+    """
+    compiles .gen files once into functions taking the names of their context
+    as arguments, such that the variables of a file are fast locals instead of
+    entries of the context dict; the functions (and the modules generated by
+    pracy --charm-module, see load_module, and the constants of files, see
+    load_constant) are cached by path and reloaded once the modification time
+    of their file changes
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def load(self, file, names):
+        """returns the function running file with the context names as arguments"""
+        key = (file, tuple(names))
+        mtime = os.stat(file).st_mtime_ns
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        with open(file, "r") as ir:
+            function = compile_gen(ir.read(), file, names)
+        self._entries[key] = (mtime, function)
+        return function
+
+    def run(self, file, context):
+        """runs file like exec(source, context), storing its variables in context"""
+        function = self.load(file, sorted(context))
+        context.update(function(**context))
+        return context
+
+    def load_module(self, file):
+        """
+        imports the module generated by pracy --charm-module, which python
+        byte-compiles once and caches in __pycache__ next to file
+        """
+        key = (file, None)
+        mtime = os.stat(file).st_mtime_ns
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        name = f"pracy_scheme_{len(self._entries)}"
+        spec = importlib.util.spec_from_file_location(name, file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self._entries[key] = (mtime, module)
+        return module
+
+    def load_constant(self, file, name, default=None):
+        """
+        returns the literal assigned to name at the top of file (e.g. the
+        ROW_COSTS pracy writes into decrypt.gen) without running it, default
+        if file does not assign it
+        """
+        key = (file, name)
+        mtime = os.stat(file).st_mtime_ns
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        with open(file, "r") as ir:
+            module = ast.parse(ir.read(), filename=file)
+        value = default
+        for stmt in module.body:
+            if (
+                isinstance(stmt, ast.Assign)
+                and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+                and stmt.targets[0].id == name
+            ):
+                value = ast.literal_eval(stmt.value)
+                break
+        self._entries[key] = (mtime, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"GenLoader(size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+
+def compile_gen(source, file, names):
+    """
+    compiles the source of a .gen file into a function with the parameters
+    names returning its locals, keeping the line numbers of file in tracebacks
+    Example: the function of decrypt.gen is
+        def decrypt(CT, LINEAR_COMB_INDICES, LSSS_map, SK, acc_gt, self):
+            <decrypt.gen>
+            return locals()
+    """
+    module = ast.parse(source, filename=file)
+    function = ast.parse(f"def run({', '.join(names)}):\n    return locals()")
+    function = function.body[0]
+    name = os.path.splitext(os.path.basename(file))[0]
+    if name.isidentifier():
+        function.name = name
+    function.body[:0] = module.body
+    module.body = [function]
+    namespace = {}
+    exec(compile(module, file, "exec"), namespace)
+    return namespace[function.name]
+
+
+# shared by all schemes, such that each .gen file is compiled once per process
+gen_loader = GenLoader()
@@ -2,13 +2,16 @@
 Please refer to the documentation provided
 """
 
+import os
+
 from CharmBackend import datastructures, calculations, parsing
+from CharmBackend.loader import gen_loader
 
 
 class Scheme:
     def __init__(self, meta_data, ir_path, group_obj, user):
         """ """
-        global meta, folder, calc
+        global meta, folder, calc, module
 
         meta = meta_data
         folder = ir_path
@@ -16,10 +19,26 @@ class Scheme:
         self.calc_instance = calculations.Calculations(group_obj, meta)
         calc = self.calc_instance
 
+        # the module generated with pracy --charm-module replaces the .gen files
+        module = None
+        if os.path.exists(f"{folder}scheme.py"):
+            module = gen_loader.load_module(f"{folder}scheme.py")
+        # the costs by which check_prune picks the rows to decrypt with
+        if module is not None:
+            calc.row_costs = getattr(module, "ROW_COSTS", calc.row_costs)
+        elif os.path.exists(f"{folder}decrypt.gen"):
+            calc.row_costs = gen_loader.load_constant(
+                f"{folder}decrypt.gen", "ROW_COSTS", calc.row_costs
+            )
+
     def setup(self, AUTHORITIES, ATTRIBUTE_UNIVERSE=None):
         """initializes MSK & MPK and modifies them by calculations of setup.gen"""
         MSK = datastructures.MasterSecretKey()
         MPK = datastructures.MasterPublicKey()
+        if module is not None:
+            module.setup(calc, AUTHORITIES, MSK, MPK, ATTRIBUTE_UNIVERSE)
+            return (MSK, MPK)
+
         context = {
             "AUTHORITIES": AUTHORITIES,
             "MSK": MSK,
@@ -46,6 +65,11 @@ class Scheme:
         else:
             assert False, "No abe type given"
 
+        if module is not None:
+            module.keygen(calc, SK["y"].elements, SK, MSK)
+            calc.check_object(SK)
+            return SK
+
         context = {
             "non_lone_randoms": {},
             "lone_randoms": {},
@@ -60,6 +84,10 @@ class Scheme:
 
         return SK
 
+    def prepare_key(self, SK):
+        """prepares SK for repeated decryptions, see datastructures.PreparedSecretKey"""
+        return datastructures.PreparedSecretKey(SK)
+
     def encrypt(self, MPK, x, M):
         """initializes CT and modifies it by calculations of encrypt.gen"""
         CT = datastructures.Ciphertext()
@@ -98,6 +126,14 @@ class Scheme:
         else:
             assert False, "No ABE-type given"
 
+        if module is not None:
+            acc_gt = module.encrypt(
+                calc, LSSS_map, LSSS_ROWS, DEDUPLICATION_INDICES, CT, MPK
+            )
+            CT["C"] = acc_gt * M
+            calc.check_object(CT)
+            return CT
+
         context = {
             "lone_randoms": {},
             "non_lone_randoms": {},
@@ -119,6 +155,22 @@ class Scheme:
 
     def decrypt(self, MPK, x, y):
         """calculates PT by calculations of decrypt.gen"""
+        if meta["abe-type"] == "CP-ABE":
+            # the coefficients of the policy of x, not of the last encryption
+            calc.load_coefficients(x["x"])
+        if module is not None:
+            acc_gt = module.decrypt(
+                calc,
+                calc.initialize_gt(1),
+                {literal.index: literal for literal in x["x"].literals},
+                calc.check_prune(y["y"].elements, x["x"]),
+                x,
+                y,
+            )
+            M = x["C"] * (acc_gt ** (-1))
+            calc.check_group_membership("gt", M)
+            return M
+
         context = {
             "acc_gt": calc.initialize_gt(1),
             "LSSS_map": {literal.index: literal for literal in x["x"].literals},
@@ -166,7 +218,9 @@ def main(meta, setup, ir_path):
     else:
         raise Exception("attribute-universe in meta.json doesnt match CP-/KP-ABE")
 
-    # Decryption
+    # Decryption (a prepared key works with decrypt.gen generated with and
+    # without --prepared-key)
+    SK = scheme.prepare_key(SK)
     PT = scheme.decrypt(MPK, CT, SK)
 
     if M == PT:
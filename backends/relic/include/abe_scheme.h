@@ -5,16 +5,27 @@
 #include "env.h"
 #include "ops.h"
 
+// The decrypt code generated with `--prepared-key` reads the precomputation
+// tables of a prepared key
+#ifdef PREPARED_KEY
+typedef Prepared_user_secret_key Decryption_key;
+#else
+typedef User_secret_key Decryption_key;
+#endif
+
 struct Abe_scheme {
-  Abe_scheme(Env env, Ops _ops);
+  // The scheme runs in `env` with `_ops`, which have to outlive it; `env` has
+  // to use the same operations, such that they share the caches
+  Abe_scheme(Env& env, Ops& _ops);
   void setup(Master_secret_key& msk, Master_public_key& mpk);
   void keygen(Master_secret_key& msk, User_attributes& user_attrs, User_secret_key& usk);
   void encrypt(Master_public_key& mpk, Policy& pol, Ciphertext& ct);
-  bool decrypt(User_secret_key& usk, Ciphertext& ct, Gt& blinding_poly);
+  void prepare_key(User_secret_key& usk, Prepared_user_secret_key& pusk);
+  bool decrypt(Decryption_key& usk, Ciphertext& ct, Gt& blinding_poly);
 
 private:
-  Env _env;
-  Ops ops;
+  Env& _env;
+  Ops& ops;
 };
 
 #endif /* ABE_SCHEME_H */
@@ -1,7 +1,9 @@
 #ifndef ABE_TYPES_H
 #define ABE_TYPES_H
 
+#include <istream>
 #include <map>
+#include <ostream>
 #include <string>
 #include <vector>
 
@@ -10,20 +12,27 @@
 #include "h.h"
 #include "gt.h"
 #include "ops.h"
+#include "index_key.h"
 
 struct Master_secret_key {
-  std::map<std::string, Z> alphas;
-  std::map<std::string, Z> common_vars;
+  Index_map<Z> alphas;
+  Index_map<Z> common_vars;
 
   void print();
 };
 
 struct Master_public_key {
-  std::map<std::string, Gt> alphas;
-  std::map<std::string, G> common_vars_g;
-  std::map<std::string, H> common_vars_h;
+  Index_map<Gt> alphas;
+  Index_map<G> common_vars_g;
+  Index_map<H> common_vars_h;
+  // Only filled if setup builds precomputation tables for the common vars
+  Index_map<TableG> tables_g;
+  Index_map<TableH> tables_h;
 
   void print();
+  // Persist the precomputation tables, e.g. to reuse them across processes
+  void write_tables(std::ostream& out);
+  void read_tables(std::istream& in);
 };
 
 struct Entry {
@@ -49,14 +58,23 @@ struct User_attributes {
 
 struct User_secret_key {
   User_attributes user_attrs;
-  std::map<std::string, G> non_lone_vars_g;
-  std::map<std::string, H> non_lone_vars_h;
-  std::map<std::string, G> polys_g;
-  std::map<std::string, H> polys_h;
+  Index_map<G> non_lone_vars_g;
+  Index_map<H> non_lone_vars_h;
+  Index_map<G> polys_g;
+  Index_map<H> polys_h;
 
   void print();
 };
 
+// A user secret key prepared for repeated decryptions (see
+// `Abe_scheme::prepare_key`): all elements are normalized, so the pairings
+// do not have to convert them, and the elements in G come with
+// precomputation tables for fixed-base multiplications
+struct Prepared_user_secret_key : User_secret_key {
+  Index_map<TableG> tables_non_lone_vars_g;
+  Index_map<TableG> tables_polys_g;
+};
+
 /* For now a Policy is always the conjunction of a given set of attributes */
 struct Policy {
   std::vector<Entry> conjunction;
@@ -68,16 +86,16 @@ struct Policy {
 
   void print();
   bool is_satisfied(User_attributes user_attrs);
-  std::pair<std::vector<Z>, std::vector<Z>> share_secret(Z secret, Ops ops);
+  std::pair<std::vector<Z>, std::vector<Z>> share_secret(Z secret, Ops& ops);
 };
 
 struct Ciphertext {
   Policy policy;
-  std::map<std::string, G> non_lone_vars_g;
-  std::map<std::string, H> non_lone_vars_h;
-  std::map<std::string, G> primary_polys_g;
-  std::map<std::string, H> primary_polys_h;
-  std::map<std::string, Gt> secondary_polys;
+  Index_map<G> non_lone_vars_g;
+  Index_map<H> non_lone_vars_h;
+  Index_map<G> primary_polys_g;
+  Index_map<H> primary_polys_h;
+  Index_map<Gt> secondary_polys;
   Gt blinding_poly;
 
   void print();
@@ -14,7 +14,8 @@ typedef std::string Lbl;
 typedef std::string Attr;
 
 struct Env {
-  Ops ops;
+  // Shared with the scheme, see `Abe_scheme`
+  Ops& ops;
   std::vector<Entry> _policy;
   std::vector<size_t> _negs;
   std::vector<Entry> _user_attrs;
@@ -30,7 +31,7 @@ struct Env {
   std::vector<Z> _mus;
   std::map<std::string, Z> _xattrs;
 
-  Env(User_attributes attrs, Policy policy, Ops _ops);
+  Env(User_attributes attrs, Policy policy, Ops& _ops);
 
   std::vector<Auth> get_authorities();
   std::vector<Attr> get_attribute_universe();
@@ -50,6 +51,13 @@ struct Env {
   std::string ls_row_to_string(int i);
   std::string dedup_idx_to_string(int i);
 
+  // The ids of indices in structured index keys, see `index_key`
+  uint16_t auth_to_id(const Auth& auth);
+  uint16_t attr_to_id(const Attr& attr);
+  uint16_t lbl_to_id(const Lbl& lbl);
+  uint16_t ls_row_to_id(int i);
+  uint16_t dedup_idx_to_id(int i);
+
   Auth attr_to_auth(Attr attr);
   Lbl attr_to_lbl(Lbl attr);
   int ls_row_to_dedup_idx(int i);
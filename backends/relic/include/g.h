@@ -1,6 +1,9 @@
 #ifndef G_H
 #define G_H
 
+#include <istream>
+#include <ostream>
+
 extern "C" {
 #include <relic/relic.h>
 #include <relic/relic_pc.h>
@@ -16,6 +19,13 @@ struct G {
 
   void print();
   bool eq(const G& other);
+  void write(std::ostream& out);
+  void read(std::istream& in);
 };
 
+// Write (read) `p` as the size of its compressed encoding followed by the
+// encoding itself
+void write_g1(std::ostream& out, const g1_t p);
+void read_g1(std::istream& in, g1_t p);
+
 #endif /* G_H */
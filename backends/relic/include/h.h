@@ -1,6 +1,9 @@
 #ifndef H_H
 #define H_H
 
+#include <istream>
+#include <ostream>
+
 extern "C" {
 #include <relic/relic.h>
 #include <relic/relic_pc.h>
@@ -16,6 +19,13 @@ struct H {
 
   void print();
   bool eq(const H& other);
+  void write(std::ostream& out);
+  void read(std::istream& in);
 };
 
+// Write (read) `p` as the size of its compressed encoding followed by the
+// encoding itself
+void write_g2(std::ostream& out, const g2_t p);
+void read_g2(std::istream& in, g2_t p);
+
 #endif /* H_H */
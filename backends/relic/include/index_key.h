@@ -0,0 +1,62 @@
+#ifndef INDEX_KEY_H
+#define INDEX_KEY_H
+
+#include <cstdint>
+#include <istream>
+#include <map>
+#include <ostream>
+#include <string>
+#include <unordered_map>
+
+// A structured index (see `--structured-index`): the id of the variable
+// family in the lowest 16 bits, followed by up to three 16 bit ids of its
+// indices. Strings (attributes, labels and authorities) are interned, i.e.,
+// their ids are only valid within the current process, while integers (LSSS
+// rows and deduplication indices) are stored directly. An id of 0 marks an
+// unused index.
+typedef uint64_t Index_key;
+
+// The id of the string `str`, interning it first if it is new
+uint16_t intern(const std::string& str);
+// The id of the integer `i`
+uint16_t intern(int i);
+
+inline Index_key index_key(uint16_t family) {
+  return family;
+}
+
+inline Index_key index_key(uint16_t family, uint16_t a) {
+  return family | ((Index_key) a << 16);
+}
+
+inline Index_key index_key(uint16_t family, uint16_t a, uint16_t b) {
+  return index_key(family, a) | ((Index_key) b << 32);
+}
+
+inline Index_key index_key(uint16_t family, uint16_t a, uint16_t b, uint16_t c) {
+  return index_key(family, a, b) | ((Index_key) c << 48);
+}
+
+// A representation of `key` which does not depend on the interned ids,
+// e.g. to hash it
+std::string index_key_to_string(Index_key key);
+
+// The type of the indices of the keys, ciphertexts and locals used by the
+// generated code, depending on whether it was generated with
+// `--structured-index`
+#ifdef STRUCTURED_INDEX
+typedef Index_key Index;
+template <typename T>
+using Index_map = std::unordered_map<Index_key, T>;
+#else
+typedef std::string Index;
+template <typename T>
+using Index_map = std::map<std::string, T>;
+#endif
+
+std::string index_to_string(const Index& idx);
+// Persist an index independently of the interned ids
+void write_index(std::ostream& out, const Index& idx);
+Index read_index(std::istream& in);
+
+#endif /* INDEX_KEY_H */
@@ -0,0 +1,108 @@
+#ifndef LRU_CACHE_H
+#define LRU_CACHE_H
+
+#include <cstddef>
+#include <list>
+#include <string>
+#include <unordered_map>
+#include <utility>
+
+// A map from strings to values holding at most `capacity` entries: when a
+// new entry does not fit anymore, the least recently used one is evicted.
+// Counts the hits and misses of `get`.
+template <typename T>
+struct Lru_cache {
+  size_t capacity;
+  size_t hits = 0;
+  size_t misses = 0;
+
+  Lru_cache(size_t capacity) : capacity(capacity) {}
+
+  Lru_cache(const Lru_cache& other)
+      : capacity(other.capacity), hits(other.hits), misses(other.misses),
+        _entries(other._entries) {
+    reindex();
+  }
+
+  Lru_cache& operator=(const Lru_cache& other) {
+    if (this == &other) {
+      return *this;
+    }
+    capacity = other.capacity;
+    hits = other.hits;
+    misses = other.misses;
+    _entries = other._entries;
+    reindex();
+    return *this;
+  }
+
+  // Returns the value of `key` (which becomes the most recently used entry)
+  // or nullptr if it is not cached
+  T* get(const std::string& key) {
+    auto it = _index.find(key);
+    if (it == _index.end()) {
+      misses++;
+      return nullptr;
+    }
+    hits++;
+    _entries.splice(_entries.begin(), _entries, it->second);
+    return &it->second->second;
+  }
+
+  void put(const std::string& key, const T& value) {
+    auto it = _index.find(key);
+    if (it != _index.end()) {
+      it->second->second = value;
+      _entries.splice(_entries.begin(), _entries, it->second);
+      return;
+    }
+    if (capacity == 0) {
+      return;
+    }
+    if (_entries.size() >= capacity) {
+      evict();
+    }
+    _entries.emplace_front(key, value);
+    _index[key] = _entries.begin();
+  }
+
+  void set_capacity(size_t new_capacity) {
+    capacity = new_capacity;
+    while (_entries.size() > capacity) {
+      evict();
+    }
+  }
+
+  size_t size() const {
+    return _entries.size();
+  }
+
+  // Calls `f(key, value)` for all entries from the least to the most recently
+  // used one, i.e., putting them in this order restores the cache
+  template <typename F>
+  void for_each(F f) {
+    for (auto it = _entries.rbegin(); it != _entries.rend(); ++it) {
+      f(it->first, it->second);
+    }
+  }
+
+private:
+  typedef std::list<std::pair<std::string, T>> Entries;
+
+  Entries _entries;
+  std::unordered_map<std::string, typename Entries::iterator> _index;
+
+  void evict() {
+    _index.erase(_entries.back().first);
+    _entries.pop_back();
+  }
+
+  void reindex() {
+    _index.clear();
+    for (auto it = _entries.begin(); it != _entries.end(); ++it) {
+      _index[it->first] = it;
+    }
+  }
+};
+
+#endif /* LRU_CACHE_H */
@@ -3,15 +3,103 @@
 
 #include <string>
 #include <map>
+#include <vector>
+#include <istream>
+#include <ostream>
 
 #include "z.h"
 #include "g.h"
 #include "h.h"
 #include "gt.h"
+#include "lru_cache.h"
+#include "index_key.h"
 
+// The number of hashed elements cached per group, see `Ops::fdh_g`
+#ifndef FDH_CACHE_CAPACITY
+#define FDH_CACHE_CAPACITY 1024
+#endif
+
+// The small integer literals in [-Z_POOL_BOUND, Z_POOL_BOUND] are reduced
+// once when the operations are created, see `Ops::const_z`. The generated
+// code reads these literals from the pool without a check, so this has to be
+// `_Z_POOL_BOUND` of src/pracy/backend/export/relic.py
+#define Z_POOL_BOUND 16
+
+// A precomputation table for fixed-base multiplications with some G,
+// built by `Ops::precompute_g` and used by `Ops::scale_fix_g`
+struct TableG {
+  g1_t _data[RLC_G1_TABLE];
+
+  TableG();
+  ~TableG();
+  TableG(const TableG& other);
+  TableG& operator=(const TableG& other);
+
+  void write(std::ostream& out);
+  void read(std::istream& in);
+};
+
+struct TableH {
+  g2_t _data[RLC_G2_TABLE];
+
+  TableH();
+  ~TableH();
+  TableH(const TableH& other);
+  TableH& operator=(const TableH& other);
+
+  void write(std::ostream& out);
+  void read(std::istream& in);
+};
+
+// The terms of a multi-scalar multiplication, evaluated by
+// `Ops::multi_scale_g` and `Ops::multi_scale_h`
+struct TermsG {
+  std::vector<Z> zs;
+  std::vector<G> gs;
+};
+
+struct TermsH {
+  std::vector<Z> zs;
+  std::vector<H> hs;
+};
+
+// A product of pairings, evaluated by `Ops::multi_pair`
+struct Pairings {
+  std::vector<G> gs;
+  std::vector<H> hs;
+  // The product of the pairings exponentiated in Gt (see `Ops::add_pair_gt`)
+  Gt gt;
+};
+
+// All scalars returned by the operations on Z are reduced modulo the group
+// order, i.e., in [0, order)
 struct Ops {
+  // The group order and the constant for Barrett reductions modulo it
+  Z order;
+  Z barrett;
+  // The reduced literals -Z_POOL_BOUND, ..., Z_POOL_BOUND
+  std::vector<Z> z_pool;
   std::map<std::string, Z> fdhs;
+  // The hash-to-curve results of fdh_g and fdh_h by "idx:arg", shared by
+  // all operations of a scheme (the capacity can be changed at runtime)
+  Lru_cache<G> fdh_cache_g{FDH_CACHE_CAPACITY};
+  Lru_cache<H> fdh_cache_h{FDH_CACHE_CAPACITY};
+
+  // Persist the cached hashes, e.g. next to the master public key, to start
+  // with a warm cache
+  void write_fdh_cache(std::ostream& out);
+  void read_fdh_cache(std::istream& in);
 
+  Ops();
+  // The operations own the caches and are shared by reference (see `Env` and
+  // `Abe_scheme`), copies would fill their own caches
+  Ops(const Ops&) = delete;
+  Ops& operator=(const Ops&) = delete;
+
+  // Reduces `z` (which may be negative) modulo the group order in place
+  void reduce_z(Z& z);
+  // The literal `val`, which must be in [-Z_POOL_BOUND, Z_POOL_BOUND]
+  const Z& const_z(int val);
   Z sample_z();
   Z one_z();
   Z set_z(int val);
@@ -23,26 +111,57 @@ struct Ops {
   Z inv_z(Z arg);
   Z scale_z(int lhs, Z rhs);
   Z reset_z();
+  // In-place updates of an accumulator, which avoid the copies of the
+  // by-value operations above
+  void add_assign_z(Z& acc, const Z& z);
+  void mul_assign_z(Z& acc, const Z& z);
 
   G lift_g(Z z);
   G scale_g(Z z, G g);
   G add_g(G g1, G g2);
+  void add_assign_g(G& acc, const G& g);
+  void scale_assign_g(G& acc, const Z& z);
   G reset_g();
   G fdh_g(int idx, std::string arg);
+  // Hashes the representation of a structured index, see `index_key_to_string`
+  G fdh_g(int idx, Index_key arg);
+  TableG precompute_g(G g);
+  G scale_fix_g(Z z, TableG& table);
+  TermsG reset_terms_g();
+  void add_term_g(TermsG& terms, Z z, G g);
+  G multi_scale_g(TermsG& terms);
 
   H lift_h(Z z);
   H scale_h(Z z, H h);
   H add_h(H h1, H h2);
+  void add_assign_h(H& acc, const H& h);
+  void scale_assign_h(H& acc, const Z& z);
   H reset_h();
   H fdh_h(int idx, std::string args);
+  H fdh_h(int idx, Index_key arg);
+  TableH precompute_h(H h);
+  H scale_fix_h(Z z, TableH& table);
+  TermsH reset_terms_h();
+  void add_term_h(TermsH& terms, Z z, H h);
+  H multi_scale_h(TermsH& terms);
 
   Gt lift_gt(Z z);
   Gt scale_gt(Z z, Gt gt);
   Gt add_gt(Gt gt1, Gt gt2);
+  void add_assign_gt(Gt& acc, const Gt& gt);
+  void scale_assign_gt(Gt& acc, const Z& z);
   Gt inv_gt(Gt gt);
   Gt reset_gt();
 
   Gt pair(G g, H h);
+
+  Pairings reset_pairs();
+  void add_pair(Pairings& pairs, G g, H h);
+  // Add e(g, h)^z, applying z in G, in H or in Gt
+  void add_pair_g(Pairings& pairs, G g, H h, Z z);
+  void add_pair_h(Pairings& pairs, G g, H h, Z z);
+  void add_pair_gt(Pairings& pairs, G g, H h, Z z);
+  Gt multi_pair(Pairings& pairs);
 };
 
 #endif /* ABE_OPS_H */
@@ -1,18 +1,18 @@
 #include "abe_scheme.h"
 
-Abe_scheme::Abe_scheme(Env env, Ops _ops) : _env(env), ops(_ops) { }
+Abe_scheme::Abe_scheme(Env& env, Ops& _ops) : _env(env), ops(_ops) { }
 
 void Abe_scheme::setup(Master_secret_key& msk, Master_public_key& mpk) {
-  Env env = this->_env;
-  std::string idx = "";
+  Env& env = this->_env;
+  Index idx{};
 #include "setup.gen"
 }
 
 void Abe_scheme::keygen(Master_secret_key& msk, User_attributes& user_attrs, User_secret_key& usk) {
   Env& env = this->_env;
   usk.user_attrs = user_attrs;
-  std::map<std::string, Z> lone_randoms;
-  std::map<std::string, Z> non_lone_randoms;
+  Index_map<Z> lone_randoms;
+  Index_map<Z> non_lone_randoms;
   Z tmp_z;
   Z aux_z;
   Z tmp_z_2;
@@ -21,16 +21,18 @@ void Abe_scheme::keygen(Master_secret_key& msk, User_attributes& user_attrs, Use
   G acc_g;
   H tmp_h;
   H acc_h;
-  std::string idx = "";
+  TermsG terms_g;
+  TermsH terms_h;
+  Index idx{};
 #include "keygen.gen"
 }
 
 void Abe_scheme::encrypt(Master_public_key& mpk, Policy& pol, Ciphertext& ct) {
   Env& env = this->_env;
   ct.policy = pol;
-  std::map<std::string, Z> lone_randoms;
-  std::map<std::string, Z> non_lone_randoms;
-  std::map<std::string, Z> special_lone_randoms;
+  Index_map<Z> lone_randoms;
+  Index_map<Z> non_lone_randoms;
+  Index_map<Z> special_lone_randoms;
   Z tmp_z;
   Z aux_z;
   Z tmp_z_2;
@@ -41,11 +43,31 @@ void Abe_scheme::encrypt(Master_public_key& mpk, Policy& pol, Ciphertext& ct) {
   H acc_h;
   Gt tmp_gt;
   Gt acc_gt;
-  std::string idx = "";
+  TermsG terms_g;
+  TermsH terms_h;
+  Index idx{};
 #include "encrypt.gen"
 }
 
-bool Abe_scheme::decrypt(User_secret_key& usk, Ciphertext& ct, Gt& blinding_poly) {
+void Abe_scheme::prepare_key(User_secret_key& usk, Prepared_user_secret_key& pusk) {
+  static_cast<User_secret_key&>(pusk) = usk;
+  for (auto& [key, g] : pusk.non_lone_vars_g) {
+    g1_norm(g._data, g._data);
+    pusk.tables_non_lone_vars_g[key] = ops.precompute_g(g);
+  }
+  for (auto& [key, g] : pusk.polys_g) {
+    g1_norm(g._data, g._data);
+    pusk.tables_polys_g[key] = ops.precompute_g(g);
+  }
+  for (auto& [key, h] : pusk.non_lone_vars_h) {
+    g2_norm(h._data, h._data);
+  }
+  for (auto& [key, h] : pusk.polys_h) {
+    g2_norm(h._data, h._data);
+  }
+}
+
+bool Abe_scheme::decrypt(Decryption_key& usk, Ciphertext& ct, Gt& blinding_poly) {
   User_attributes user_attrs = usk.user_attrs;
   Policy policy = ct.policy;
   if (!policy.is_satisfied(user_attrs)) {
@@ -62,7 +84,8 @@ bool Abe_scheme::decrypt(User_secret_key& usk, Ciphertext& ct, Gt& blinding_poly
   H acc_h;
   Gt tmp_gt;
   Gt acc_gt;
-  std::string idx = "";
+  Pairings acc_pairs;
+  Index idx{};
 #include "decrypt.gen"
   return true;
 }
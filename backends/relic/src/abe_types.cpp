@@ -9,13 +9,13 @@ void Master_secret_key::print() {
   cout << "Master secret key:" << endl;
   cout << "  alphas:" << endl;
   for (auto [key, val] : alphas) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  common vars:" << endl;
   for (auto [key, val] : common_vars) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
@@ -26,24 +26,55 @@ void Master_public_key::print() {
   cout << "Master public key:" << endl;
   cout << "  alphas:" << endl;
   for (auto [key, val] : alphas) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  common vars (G):" << endl;
   for (auto [key, val] : common_vars_g) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  common vars (H):" << endl;
   for (auto [key, val] : common_vars_h) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
 }
 
+// Writes the number of tables of each group, followed by the key (see
+// `write_index`) and the table for each of them
+void Master_public_key::write_tables(std::ostream& out) {
+  uint32_t count = tables_g.size();
+  out.write((const char*) &count, sizeof(count));
+  for (auto& [key, table] : tables_g) {
+    write_index(out, key);
+    table.write(out);
+  }
+  count = tables_h.size();
+  out.write((const char*) &count, sizeof(count));
+  for (auto& [key, table] : tables_h) {
+    write_index(out, key);
+    table.write(out);
+  }
+}
+
+void Master_public_key::read_tables(std::istream& in) {
+  uint32_t count;
+  in.read((char*) &count, sizeof(count));
+  for (uint32_t i = 0; i < count; i++) {
+    Index key = read_index(in);
+    tables_g[key].read(in);
+  }
+  in.read((char*) &count, sizeof(count));
+  for (uint32_t i = 0; i < count; i++) {
+    Index key = read_index(in);
+    tables_h[key].read(in);
+  }
+}
+
 Entry::Entry(std::string str) {
   auth = str.substr(0, str.find("."));
   lbl = str.substr(str.find(".") + 1, str.find(":") - str.find(".") - 1);
@@ -114,25 +145,25 @@ void User_secret_key::print() {
   cout << endl;
   cout << "  non-lone vars (G):" << endl;
   for (auto [key, val] : non_lone_vars_g) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  non-lone vars (H):" << endl;
   for (auto [key, val] : non_lone_vars_h) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  key polys (G):" << endl;
   for (auto [key, val] : polys_g) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  key polys (H):" << endl;
   for (auto [key, val] : polys_h) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
@@ -183,7 +214,7 @@ bool Policy::is_satisfied(User_attributes user_attrs) {
   return true;
 }
 
-std::pair<std::vector<Z>, std::vector<Z>> Policy::share_secret(Z secret, Ops ops) {
+std::pair<std::vector<Z>, std::vector<Z>> Policy::share_secret(Z secret, Ops& ops) {
   std::vector<Z> lambdas;
   std::vector<Z> mus;
   Z ZERO;
@@ -215,31 +246,31 @@ void Ciphertext::print() {
   policy.print();
   cout << "  non-lone vars (G):" << endl;
   for (auto [key, val] : non_lone_vars_g) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  non-lone vars (H):" << endl;
   for (auto [key, val] : non_lone_vars_h) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  primary polys (G):" << endl;
   for (auto [key, val] : primary_polys_g) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  primary polys (H):" << endl;
   for (auto [key, val] : primary_polys_h) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
   cout << "  secondary polys:" << endl;
   for (auto [key, val] : secondary_polys) {
-    cout << "    " << key << " = ";
+    cout << "    " << index_to_string(key) << " = ";
     val.print();
     cout << endl;
   }
@@ -2,8 +2,7 @@
 
 #include "env.h"
 
-Env::Env(User_attributes attrs, Policy policy, Ops _ops) {
-  this->ops = _ops;
+Env::Env(User_attributes attrs, Policy policy, Ops& _ops) : ops(_ops) {
   _policy = policy.conjunction;
   _negs = policy.negations;
   for (size_t i = 0; i < _policy.size(); ++i) {
@@ -179,6 +178,26 @@ std::string Env::dedup_idx_to_string(int i) {
   return std::to_string(i);
 }
 
+uint16_t Env::auth_to_id(const Auth& auth) {
+  return intern(auth);
+}
+
+uint16_t Env::attr_to_id(const Attr& attr) {
+  return intern(attr);
+}
+
+uint16_t Env::lbl_to_id(const Lbl& lbl) {
+  return intern(lbl);
+}
+
+uint16_t Env::ls_row_to_id(int i) {
+  return intern(i);
+}
+
+uint16_t Env::dedup_idx_to_id(int i) {
+  return intern(i);
+}
+
 std::string Env::attr_to_auth(Attr attr) {
   if (_attr_to_auth.count(attr) != 1) {
     throw std::invalid_argument("Cannot compute authority for unknown attribute");
@@ -252,7 +271,7 @@ Z Env::get_mu(int i) {
 
 Z Env::get_epsilon(int i) {
   (void)i;
-  return ops.read_z("1");
+  return ops.const_z(1);
 }
 
 Z Env::get_xattr(Attr attr) {
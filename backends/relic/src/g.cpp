@@ -1,5 +1,8 @@
 #include "g.h"
 
+#include <cstdint>
+#include <vector>
+
 G::G() {
   g1_null(_data);
   g1_new(_data);
@@ -30,3 +33,27 @@ void G::print() {
 bool G::eq(const G& other) {
   return g1_cmp(_data, other._data) == RLC_EQ;
 }
+
+void G::write(std::ostream& out) {
+  write_g1(out, _data);
+}
+
+void G::read(std::istream& in) {
+  read_g1(in, _data);
+}
+
+void write_g1(std::ostream& out, const g1_t p) {
+  uint32_t len = g1_size_bin(p, 1);
+  std::vector<uint8_t> bin(len);
+  g1_write_bin(bin.data(), len, p, 1);
+  out.write((const char*) &len, sizeof(len));
+  out.write((const char*) bin.data(), len);
+}
+
+void read_g1(std::istream& in, g1_t p) {
+  uint32_t len;
+  in.read((char*) &len, sizeof(len));
+  std::vector<uint8_t> bin(len);
+  in.read((char*) bin.data(), len);
+  g1_read_bin(p, bin.data(), len);
+}
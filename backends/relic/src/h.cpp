@@ -1,5 +1,8 @@
 #include "h.h"
 
+#include <cstdint>
+#include <vector>
+
 H::H() {
   g2_null(_data);
   g2_new(_data);
@@ -30,3 +33,27 @@ void H::print() {
 bool H::eq(const H& other) {
   return g2_cmp(_data, other._data) == RLC_EQ;
 }
+
+void H::write(std::ostream& out) {
+  write_g2(out, _data);
+}
+
+void H::read(std::istream& in) {
+  read_g2(in, _data);
+}
+
+void write_g2(std::ostream& out, const g2_t p) {
+  uint32_t len = g2_size_bin(p, 1);
+  std::vector<uint8_t> bin(len);
+  g2_write_bin(bin.data(), len, p, 1);
+  out.write((const char*) &len, sizeof(len));
+  out.write((const char*) bin.data(), len);
+}
+
+void read_g2(std::istream& in, g2_t p) {
+  uint32_t len;
+  in.read((char*) &len, sizeof(len));
+  std::vector<uint8_t> bin(len);
+  in.read((char*) bin.data(), len);
+  g2_read_bin(p, bin.data(), len);
+}
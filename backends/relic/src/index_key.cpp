@@ -0,0 +1,150 @@
+#include "index_key.h"
+
+#include <stdexcept>
+#include <vector>
+
+// Ids of integers have the highest bit set, the ones of strings are their
+// positions in the interned strings (starting at 1)
+static const uint16_t INT_FLAG = 0x8000;
+
+struct Interned_strings {
+  std::vector<std::string> strs;
+  std::unordered_map<std::string, uint16_t> ids;
+};
+
+static Interned_strings& interned_strings() {
+  static Interned_strings interned;
+  return interned;
+}
+
+uint16_t intern(const std::string& str) {
+  Interned_strings& interned = interned_strings();
+  auto it = interned.ids.find(str);
+  if (it != interned.ids.end()) {
+    return it->second;
+  }
+  if (interned.strs.size() + 1 >= INT_FLAG) {
+    throw std::length_error("Too many interned strings");
+  }
+  interned.strs.push_back(str);
+  uint16_t id = interned.strs.size();
+  interned.ids[str] = id;
+  return id;
+}
+
+uint16_t intern(int i) {
+  if (i < 0 || i >= INT_FLAG) {
+    throw std::out_of_range("Cannot use integer as index");
+  }
+  return INT_FLAG | i;
+}
+
+// The ids of the indices of `key`
+static std::vector<uint16_t> index_key_parts(Index_key key) {
+  std::vector<uint16_t> parts;
+  for (int shift = 16; shift < 64; shift += 16) {
+    uint16_t part = (key >> shift) & 0xffff;
+    if (part == 0) {
+      break;
+    }
+    parts.push_back(part);
+  }
+  return parts;
+}
+
+// Strings are prefixed with their length, such that the result is
+// unambiguous, e.g. "3(5:att_1,#2)"
+std::string index_key_to_string(Index_key key) {
+  std::string res = std::to_string(key & 0xffff) + "(";
+  std::vector<uint16_t> parts = index_key_parts(key);
+  for (size_t i = 0; i < parts.size(); i++) {
+    if (i > 0) {
+      res += ",";
+    }
+    if (parts[i] & INT_FLAG) {
+      res += "#" + std::to_string(parts[i] & ~INT_FLAG);
+    } else {
+      const std::string& str = interned_strings().strs[parts[i] - 1];
+      res += std::to_string(str.size()) + ":" + str;
+    }
+  }
+  return res + ")";
+}
+
+static void write_string(std::ostream& out, const std::string& str) {
+  uint32_t len = str.size();
+  out.write((const char*) &len, sizeof(len));
+  out.write(str.data(), len);
+}
+
+static std::string read_string(std::istream& in) {
+  uint32_t len;
+  in.read((char*) &len, sizeof(len));
+  std::string str(len, '\0');
+  in.read(str.data(), len);
+  return str;
+}
+
+#ifdef STRUCTURED_INDEX
+
+std::string index_to_string(const Index& idx) {
+  return index_key_to_string(idx);
+}
+
+// Writes the family and the number of indices, followed by each index: a
+// flag whether it is an integer and the integer or the string
+void write_index(std::ostream& out, const Index& idx) {
+  uint16_t family = idx & 0xffff;
+  out.write((const char*) &family, sizeof(family));
+  std::vector<uint16_t> parts = index_key_parts(idx);
+  uint8_t count = parts.size();
+  out.write((const char*) &count, sizeof(count));
+  for (uint16_t part : parts) {
+    uint8_t is_int = (part & INT_FLAG) != 0;
+    out.write((const char*) &is_int, sizeof(is_int));
+    if (is_int) {
+      uint16_t i = part & ~INT_FLAG;
+      out.write((const char*) &i, sizeof(i));
+    } else {
+      write_string(out, interned_strings().strs[part - 1]);
+    }
+  }
+}
+
+Index read_index(std::istream& in) {
+  uint16_t family;
+  in.read((char*) &family, sizeof(family));
+  uint8_t count;
+  in.read((char*) &count, sizeof(count));
+  Index_key key = family;
+  for (uint8_t j = 0; j < count; j++) {
+    uint8_t is_int;
+    in.read((char*) &is_int, sizeof(is_int));
+    uint16_t part;
+    if (is_int) {
+      uint16_t i;
+      in.read((char*) &i, sizeof(i));
+      part = intern((int) i);
+    } else {
+      part = intern(read_string(in));
+    }
+    key |= (Index_key) part << (16 * (j + 1));
+  }
+  return key;
+}
+
+#else
+
+std::string index_to_string(const Index& idx) {
+  return idx;
+}
+
+void write_index(std::ostream& out, const Index& idx) {
+  write_string(out, idx);
+}
+
+Index read_index(std::istream& in) {
+  return read_string(in);
+}
+
+#endif
@@ -67,12 +67,59 @@ bool check_correctness(bool use_negs) {
 
   // Decrypt
   Gt blinding_poly;
+#ifdef PREPARED_KEY
+  Prepared_user_secret_key pusk;
+  scheme.prepare_key(usk, pusk);
+  bool can_decrypt = scheme.decrypt(pusk, ct, blinding_poly);
+#else
   bool can_decrypt = scheme.decrypt(usk, ct, blinding_poly);
+#endif
   bool decrypt_correct = ct.blinding_poly.eq(blinding_poly);
 
   return can_decrypt && decrypt_correct;
 }
 
+// Checks that the operations on Z return reduced scalars which agree with
+// the plain (unreduced) arithmetic modulo the group order
+bool check_z_arithmetic() {
+  std::cout << "Checking scalar arithmetic ..." << std::endl;
+  Ops ops;
+  Z zero;
+  bool ok = true;
+  auto reduced = [&](const Z& z) {
+    return bn_sign(z._data) != RLC_NEG && bn_cmp(z._data, ops.order._data) == RLC_LT;
+  };
+  auto equal = [](const Z& lhs, const Z& rhs) {
+    return bn_cmp(lhs._data, rhs._data) == RLC_EQ;
+  };
+  for (int i = 0; i < 100; ++i) {
+    Z a = ops.sample_z();
+    Z b = ops.sample_z();
+    Z product = ops.mul_z(a, b);
+    Z expected;
+    bn_mul(expected._data, a._data, b._data);
+    bn_mod_basic(expected._data, expected._data, ops.order._data);
+    ok &= reduced(product) && equal(product, expected);
+    Z diff = ops.sub_z(a, b);
+    ok &= reduced(diff) && equal(ops.add_z(diff, b), a);
+    Z neg = ops.neg_z(a);
+    ok &= reduced(neg) && equal(ops.add_z(neg, a), zero);
+    ok &= equal(ops.mul_z(a, ops.inv_z(a)), ops.one_z());
+    Z acc = a;
+    ops.mul_assign_z(acc, b);
+    ok &= equal(acc, product);
+  }
+  for (int val = -Z_POOL_BOUND; val <= Z_POOL_BOUND; ++val) {
+    Z literal = ops.read_z(std::to_string(val));
+    ok &= reduced(literal) && equal(ops.const_z(val), literal);
+  }
+  ok &= equal(ops.add_z(ops.const_z(-1), ops.one_z()), zero);
+  if (!ok) {
+    std::cout << "\tThe scalar arithmetic is incorrect" << std::endl;
+  }
+  return ok;
+}
+
 double bench_setup(timer* t) {
   User_attributes user_attrs = User_attributes::random(POLICY_LEN);
   Policy policy;
@@ -211,8 +258,108 @@ double bench_decrypt(timer* t) {
   scheme.encrypt(mpk, policy, ct);
 
   Gt blinding_poly;
+#ifdef PREPARED_KEY
+  // The key is prepared once for all decryptions, so it is not measured
+  Prepared_user_secret_key pusk;
+  scheme.prepare_key(usk, pusk);
+  start_timer(t);
+  scheme.decrypt(pusk, ct, blinding_poly);
+#else
   start_timer(t);
   scheme.decrypt(usk, ct, blinding_poly);
+#endif
+  return stop_timer(t);
+}
+
+// The number of elements summed up by the accumulation benchmarks
+#ifndef BENCH_ACC_LEN
+#define BENCH_ACC_LEN 1000
+#endif
+
+// Accumulate elements as the code generated at -O0 does, i.e.,
+// `acc = ops.add_g(acc, tmp)`, and with the in-place updates generated at
+// higher levels, i.e., `ops.add_assign_g(acc, tmp)`
+double bench_accumulate_g(timer* t) {
+  Ops ops;
+  G tmp = ops.lift_g(ops.sample_z());
+  G acc = ops.reset_g();
+  start_timer(t);
+  for (int i = 0; i < BENCH_ACC_LEN; i++) {
+    acc = ops.add_g(acc, tmp);
+  }
+  return stop_timer(t);
+}
+
+double bench_accumulate_assign_g(timer* t) {
+  Ops ops;
+  G tmp = ops.lift_g(ops.sample_z());
+  G acc = ops.reset_g();
+  start_timer(t);
+  for (int i = 0; i < BENCH_ACC_LEN; i++) {
+    ops.add_assign_g(acc, tmp);
+  }
+  return stop_timer(t);
+}
+
+double bench_accumulate_gt(timer* t) {
+  Ops ops;
+  Gt tmp = ops.lift_gt(ops.sample_z());
+  Gt acc = ops.lift_gt(ops.one_z());
+  start_timer(t);
+  for (int i = 0; i < BENCH_ACC_LEN; i++) {
+    acc = ops.add_gt(acc, tmp);
+  }
+  return stop_timer(t);
+}
+
+double bench_accumulate_assign_gt(timer* t) {
+  Ops ops;
+  Gt tmp = ops.lift_gt(ops.sample_z());
+  Gt acc = ops.lift_gt(ops.one_z());
+  start_timer(t);
+  for (int i = 0; i < BENCH_ACC_LEN; i++) {
+    ops.add_assign_gt(acc, tmp);
+  }
+  return stop_timer(t);
+}
+
+// The number of factors of the coefficient chains in the benchmarks
+#ifndef BENCH_CHAIN_LEN
+#define BENCH_CHAIN_LEN 8
+#endif
+
+// Multiply the factors of a coefficient chain (as the code generated for
+// `compile_coeff` does) and scale an element by the product, with the
+// reduced operations and with plain multiplications of the bignums
+double bench_coeff_chain(timer* t) {
+  Ops ops;
+  std::vector<Z> factors;
+  for (int i = 0; i < BENCH_CHAIN_LEN; i++) {
+    factors.push_back(ops.sample_z());
+  }
+  G g = ops.lift_g(ops.sample_z());
+  start_timer(t);
+  Z acc = ops.one_z();
+  for (int i = 0; i < BENCH_CHAIN_LEN; i++) {
+    ops.mul_assign_z(acc, factors[i]);
+  }
+  G res = ops.scale_g(acc, g);
+  return stop_timer(t);
+}
+
+double bench_coeff_chain_unreduced(timer* t) {
+  Ops ops;
+  std::vector<Z> factors;
+  for (int i = 0; i < BENCH_CHAIN_LEN; i++) {
+    factors.push_back(ops.sample_z());
+  }
+  G g = ops.lift_g(ops.sample_z());
+  start_timer(t);
+  Z acc = ops.one_z();
+  for (int i = 0; i < BENCH_CHAIN_LEN; i++) {
+    bn_mul(acc._data, acc._data, factors[i]._data);
+  }
+  G res = ops.scale_g(acc, g);
   return stop_timer(t);
 }
 
@@ -223,6 +370,8 @@ int main(void) {
   pc_param_print();
   std::cout << "POLICY_LEN = " << POLICY_LEN << std::endl;
   std::cout << "BENCH_ITERS = " << BENCH_ITERS << std::endl;
+  std::cout << "BENCH_ACC_LEN = " << BENCH_ACC_LEN << std::endl;
+  std::cout << "BENCH_CHAIN_LEN = " << BENCH_CHAIN_LEN << std::endl;
 
 #ifdef MULTI_AUTH
   std::cout << "MULTI_AUTH = true" << std::endl;
@@ -236,7 +385,20 @@ int main(void) {
   std::cout << "OT_NEGS = false" << std::endl;
 #endif
 
-  bool is_correct = check_correctness(false);
+#ifdef PREPARED_KEY
+  std::cout << "PREPARED_KEY = true" << std::endl;
+#else
+  std::cout << "PREPARED_KEY = false" << std::endl;
+#endif
+
+#ifdef STRUCTURED_INDEX
+  std::cout << "STRUCTURED_INDEX = true" << std::endl;
+#else
+  std::cout << "STRUCTURED_INDEX = false" << std::endl;
+#endif
+
+  bool is_correct = check_z_arithmetic();
+  is_correct &= check_correctness(false);
 
 #ifdef OT_NEGS
   is_correct &= check_correctness(true);
@@ -246,6 +408,12 @@ int main(void) {
   benchmark("KEYGEN", BENCH_ITERS, &bench_keygen);
   benchmark("ENCRYPT", BENCH_ITERS, &bench_encrypt);
   benchmark("DECRYPT", BENCH_ITERS, &bench_decrypt);
+  benchmark("ACCUMULATE G", BENCH_ITERS, &bench_accumulate_g);
+  benchmark("ACCUMULATE G IN PLACE", BENCH_ITERS, &bench_accumulate_assign_g);
+  benchmark("ACCUMULATE GT", BENCH_ITERS, &bench_accumulate_gt);
+  benchmark("ACCUMULATE GT IN PLACE", BENCH_ITERS, &bench_accumulate_assign_gt);
+  benchmark("COEFF CHAIN", BENCH_ITERS, &bench_coeff_chain);
+  benchmark("COEFF CHAIN UNREDUCED", BENCH_ITERS, &bench_coeff_chain_unreduced);
 
   if (is_correct) {
     std::cout << "Decryption successful" << std::endl;
@@ -5,47 +5,212 @@ extern "C" {
 #include <relic/relic_pc.h>
 }
 
+TableG::TableG() {
+  for (int i = 0; i < RLC_G1_TABLE; i++) {
+    g1_null(_data[i]);
+    g1_new(_data[i]);
+  }
+}
+
+TableG::~TableG() {
+  for (int i = 0; i < RLC_G1_TABLE; i++) {
+    g1_free(_data[i]);
+  }
+}
+
+TableG::TableG(const TableG& other) : TableG() {
+  for (int i = 0; i < RLC_G1_TABLE; i++) {
+    g1_copy(_data[i], other._data[i]);
+  }
+}
+
+TableG& TableG::operator=(const TableG& other) {
+  if (this == &other) {
+    return *this;
+  }
+  for (int i = 0; i < RLC_G1_TABLE; i++) {
+    g1_copy(_data[i], other._data[i]);
+  }
+  return *this;
+}
+
+void TableG::write(std::ostream& out) {
+  for (int i = 0; i < RLC_G1_TABLE; i++) {
+    write_g1(out, _data[i]);
+  }
+}
+
+void TableG::read(std::istream& in) {
+  for (int i = 0; i < RLC_G1_TABLE; i++) {
+    read_g1(in, _data[i]);
+  }
+}
+
+TableH::TableH() {
+  for (int i = 0; i < RLC_G2_TABLE; i++) {
+    g2_null(_data[i]);
+    g2_new(_data[i]);
+  }
+}
+
+TableH::~TableH() {
+  for (int i = 0; i < RLC_G2_TABLE; i++) {
+    g2_free(_data[i]);
+  }
+}
+
+TableH::TableH(const TableH& other) : TableH() {
+  for (int i = 0; i < RLC_G2_TABLE; i++) {
+    g2_copy(_data[i], other._data[i]);
+  }
+}
+
+TableH& TableH::operator=(const TableH& other) {
+  if (this == &other) {
+    return *this;
+  }
+  for (int i = 0; i < RLC_G2_TABLE; i++) {
+    g2_copy(_data[i], other._data[i]);
+  }
+  return *this;
+}
+
+void TableH::write(std::ostream& out) {
+  for (int i = 0; i < RLC_G2_TABLE; i++) {
+    write_g2(out, _data[i]);
+  }
+}
+
+void TableH::read(std::istream& in) {
+  for (int i = 0; i < RLC_G2_TABLE; i++) {
+    read_g2(in, _data[i]);
+  }
+}
+
+// Writes the number of cached hashes in G, followed by the key (its length
+// and characters) and the element for each of them, and the same for H
+void Ops::write_fdh_cache(std::ostream& out) {
+  uint32_t count = fdh_cache_g.size();
+  out.write((const char*) &count, sizeof(count));
+  fdh_cache_g.for_each([&](const std::string& key, G& g) {
+    uint32_t len = key.size();
+    out.write((const char*) &len, sizeof(len));
+    out.write(key.data(), len);
+    g.write(out);
+  });
+  count = fdh_cache_h.size();
+  out.write((const char*) &count, sizeof(count));
+  fdh_cache_h.for_each([&](const std::string& key, H& h) {
+    uint32_t len = key.size();
+    out.write((const char*) &len, sizeof(len));
+    out.write(key.data(), len);
+    h.write(out);
+  });
+}
+
+void Ops::read_fdh_cache(std::istream& in) {
+  uint32_t count;
+  in.read((char*) &count, sizeof(count));
+  for (uint32_t i = 0; i < count; i++) {
+    uint32_t len;
+    in.read((char*) &len, sizeof(len));
+    std::string key(len, '\0');
+    in.read(key.data(), len);
+    G g;
+    g.read(in);
+    fdh_cache_g.put(key, g);
+  }
+  in.read((char*) &count, sizeof(count));
+  for (uint32_t i = 0; i < count; i++) {
+    uint32_t len;
+    in.read((char*) &len, sizeof(len));
+    std::string key(len, '\0');
+    in.read(key.data(), len);
+    H h;
+    h.read(in);
+    fdh_cache_h.put(key, h);
+  }
+}
+
+Ops::Ops() {
+  pc_get_ord(order._data);
+  bn_mod_pre_barrt(barrett._data, order._data);
+  for (int val = -Z_POOL_BOUND; val <= Z_POOL_BOUND; val++) {
+    Z z;
+    bn_set_dig(z._data, val < 0 ? -val : val);
+    if (val < 0) {
+      bn_neg(z._data, z._data);
+    }
+    reduce_z(z);
+    z_pool.push_back(z);
+  }
+}
+
+void Ops::reduce_z(Z& z) {
+  bool neg = bn_sign(z._data) == RLC_NEG;
+  if (neg) {
+    bn_neg(z._data, z._data);
+  }
+  if (bn_cmp(z._data, order._data) != RLC_LT) {
+    // Barrett reduction expects a number below order^2, e.g. a product of
+    // two reduced scalars
+    if (bn_bits(z._data) <= 2 * bn_bits(order._data)) {
+      bn_mod_barrt(z._data, z._data, order._data, barrett._data);
+    } else {
+      bn_mod_basic(z._data, z._data, order._data);
+    }
+  }
+  if (neg && !bn_is_zero(z._data)) {
+    bn_sub(z._data, order._data, z._data);
+  }
+}
+
+const Z& Ops::const_z(int val) {
+  return z_pool[val + Z_POOL_BOUND];
+}
+
 Z Ops::sample_z() {
-  bn_t order;                                                                                                        
-  pc_get_ord(order);
   Z z;
-  bn_rand_mod(z._data, order);
+  bn_rand_mod(z._data, order._data);
   return z;
 }
 
 Z Ops::one_z() {
-  Z z;
-  bn_set_bit(z._data, 0, 1);
-  return z;
+  return const_z(1);
 }
 
 Z Ops::set_z(int val) {
-  Z z;
-  bn_set_dig(z._data, val);
-  return z;
+  if (-Z_POOL_BOUND <= val && val <= Z_POOL_BOUND) {
+    return const_z(val);
+  }
+  return read_z(std::to_string(val));
 }
 
 Z Ops::read_z(std::string str) {
   Z z;
   bn_read_str(z._data, str.c_str(), str.size(), 10);
+  reduce_z(z);
   return z;
 }
 
 Z Ops::add_z(Z lhs, Z rhs) {
   Z z;
   bn_add(z._data, lhs._data, rhs._data);
+  reduce_z(z);
   return z;
 }
 
 Z Ops::sub_z(Z lhs, Z rhs) {
   Z z;
   bn_sub(z._data, lhs._data, rhs._data);
+  reduce_z(z);
   return z;
 }
 
 Z Ops::mul_z(Z lhs, Z rhs) {
   Z z;
   bn_mul(z._data, lhs._data, rhs._data);
+  reduce_z(z);
   return z;
 }
 
@@ -56,19 +221,15 @@ Z Ops::neg_z(Z arg) {
 
 Z Ops::inv_z(Z arg) {
   Z res;
-  Z prime;
-  pc_get_ord(prime._data);
-  // It seems that bn_mod_inv is incorrect for negative numbers
-  if (bn_sign(arg._data) == RLC_NEG) {
-    bn_mod_basic(arg._data, arg._data, prime._data);
-  }
-  bn_mod_inv(res._data, arg._data, prime._data);
+  // bn_mod_inv is incorrect for negative numbers, which the other
+  // operations never return (but `arg` may come from elsewhere)
+  reduce_z(arg);
+  bn_mod_inv(res._data, arg._data, order._data);
   return res;
 }
 
 Z Ops::scale_z(int lhs, Z rhs) {
-  Z z = read_z(std::to_string(lhs));
-  return mul_z(z, rhs);
+  return mul_z(set_z(lhs), rhs);
 }
 
 Z Ops::reset_z() {
@@ -76,6 +237,16 @@ Z Ops::reset_z() {
   return z;
 }
 
+void Ops::add_assign_z(Z& acc, const Z& z) {
+  bn_add(acc._data, acc._data, z._data);
+  reduce_z(acc);
+}
+
+void Ops::mul_assign_z(Z& acc, const Z& z) {
+  bn_mul(acc._data, acc._data, z._data);
+  reduce_z(acc);
+}
+
 G Ops::lift_g(Z z) {
   G g;
   g1_mul_gen(g._data, z._data);
@@ -94,6 +265,14 @@ G Ops::add_g(G g1, G g2) {
   return g;
 }
 
+void Ops::add_assign_g(G& acc, const G& g) {
+  g1_add(acc._data, acc._data, g._data);
+}
+
+void Ops::scale_assign_g(G& acc, const Z& z) {
+  g1_mul(acc._data, acc._data, z._data);
+}
+
 G Ops::reset_g() {
   Z z;
   return this->lift_g(z);
@@ -101,11 +280,76 @@ G Ops::reset_g() {
 
 G Ops::fdh_g(int idx, std::string arg) {
   std::string hash_key = std::to_string(idx) + ":" + arg;
+  G* cached = fdh_cache_g.get(hash_key);
+  if (cached != nullptr) {
+    return *cached;
+  }
   G g;
   g1_map(g._data, (const uint8_t*) hash_key.c_str(), hash_key.length());
+  fdh_cache_g.put(hash_key, g);
   return g;
 }
 
+G Ops::fdh_g(int idx, Index_key arg) {
+  return fdh_g(idx, index_key_to_string(arg));
+}
+
+TableG Ops::precompute_g(G g) {
+  TableG table;
+  g1_mul_pre(table._data, g._data);
+  return table;
+}
+
+G Ops::scale_fix_g(Z z, TableG& table) {
+  G r;
+  // The comb methods expect a reduced (non-negative) scalar
+  reduce_z(z);
+  g1_mul_fix(r._data, table._data, z._data);
+  return r;
+}
+
+TermsG Ops::reset_terms_g() {
+  TermsG terms;
+  return terms;
+}
+
+void Ops::add_term_g(TermsG& terms, Z z, G g) {
+  terms.zs.push_back(z);
+  terms.gs.push_back(g);
+}
+
+G Ops::multi_scale_g(TermsG& terms) {
+  int n = terms.gs.size();
+  if (n == 0) {
+    return this->reset_g();
+  }
+  if (n == 1) {
+    return this->scale_g(terms.zs[0], terms.gs[0]);
+  }
+  // Simultaneous multiplication: shares the doublings between all terms
+  G r;
+  g1_t *ps = new g1_t[n];
+  bn_t *ks = new bn_t[n];
+  for (int i = 0; i < n; i++) {
+    g1_null(ps[i]);
+    g1_new(ps[i]);
+    g1_copy(ps[i], terms.gs[i]._data);
+    bn_null(ks[i]);
+    bn_new(ks[i]);
+    // Scalars not computed by the operations may not be reduced
+    reduce_z(terms.zs[i]);
+    bn_copy(ks[i], terms.zs[i]._data);
+  }
+  g1_mul_sim_lot(r._data, ps, ks, n);
+  for (int i = 0; i < n; i++) {
+    g1_free(ps[i]);
+    bn_free(ks[i]);
+  }
+  delete[] ps;
+  delete[] ks;
+  return r;
+}
+
 H Ops::lift_h(Z z) {
   H h;
   g2_mul_gen(h._data, z._data);
@@ -124,6 +368,14 @@ H Ops::add_h(H h1, H h2) {
   return h;
 }
 
+void Ops::add_assign_h(H& acc, const H& h) {
+  g2_add(acc._data, acc._data, h._data);
+}
+
+void Ops::scale_assign_h(H& acc, const Z& z) {
+  g2_mul(acc._data, acc._data, z._data);
+}
+
 H Ops::reset_h() {
   Z z;
   return this->lift_h(z);
@@ -131,11 +383,76 @@ H Ops::reset_h() {
 
 H Ops::fdh_h(int idx, std::string arg) {
   std::string hash_key = std::to_string(idx) + ":" + arg;
+  H* cached = fdh_cache_h.get(hash_key);
+  if (cached != nullptr) {
+    return *cached;
+  }
   H h;
   g2_map(h._data, (const uint8_t*) hash_key.c_str(), hash_key.length());
+  fdh_cache_h.put(hash_key, h);
   return h;
 }
 
+H Ops::fdh_h(int idx, Index_key arg) {
+  return fdh_h(idx, index_key_to_string(arg));
+}
+
+TableH Ops::precompute_h(H h) {
+  TableH table;
+  g2_mul_pre(table._data, h._data);
+  return table;
+}
+
+H Ops::scale_fix_h(Z z, TableH& table) {
+  H r;
+  // The comb methods expect a reduced (non-negative) scalar
+  reduce_z(z);
+  g2_mul_fix(r._data, table._data, z._data);
+  return r;
+}
+
+TermsH Ops::reset_terms_h() {
+  TermsH terms;
+  return terms;
+}
+
+void Ops::add_term_h(TermsH& terms, Z z, H h) {
+  terms.zs.push_back(z);
+  terms.hs.push_back(h);
+}
+
+H Ops::multi_scale_h(TermsH& terms) {
+  int n = terms.hs.size();
+  if (n == 0) {
+    return this->reset_h();
+  }
+  if (n == 1) {
+    return this->scale_h(terms.zs[0], terms.hs[0]);
+  }
+  // Simultaneous multiplication: shares the doublings between all terms
+  H r;
+  g2_t *ps = new g2_t[n];
+  bn_t *ks = new bn_t[n];
+  for (int i = 0; i < n; i++) {
+    g2_null(ps[i]);
+    g2_new(ps[i]);
+    g2_copy(ps[i], terms.hs[i]._data);
+    bn_null(ks[i]);
+    bn_new(ks[i]);
+    // Scalars not computed by the operations may not be reduced
+    reduce_z(terms.zs[i]);
+    bn_copy(ks[i], terms.zs[i]._data);
+  }
+  g2_mul_sim_lot(r._data, ps, ks, n);
+  for (int i = 0; i < n; i++) {
+    g2_free(ps[i]);
+    bn_free(ks[i]);
+  }
+  delete[] ps;
+  delete[] ks;
+  return r;
+}
+
 Gt Ops::lift_gt(Z z) {
   Gt gt;
   gt_exp_gen(gt._data, z._data);
@@ -154,6 +471,14 @@ Gt Ops::add_gt(Gt gt1, Gt gt2) {
   return gt;
 }
 
+void Ops::add_assign_gt(Gt& acc, const Gt& gt) {
+  gt_mul(acc._data, acc._data, gt._data);
+}
+
+void Ops::scale_assign_gt(Gt& acc, const Z& z) {
+  gt_exp(acc._data, acc._data, z._data);
+}
+
 Gt Ops::inv_gt(Gt gt) {
   Gt r;
   gt_inv(r._data, gt._data);
@@ -170,3 +495,58 @@ Gt Ops::pair(G g, H h) {
   pc_map(gt._data, g._data, h._data);
   return gt;
 }
+
+Pairings Ops::reset_pairs() {
+  Pairings pairs;
+  return pairs;
+}
+
+void Ops::add_pair(Pairings& pairs, G g, H h) {
+  pairs.gs.push_back(g);
+  pairs.hs.push_back(h);
+}
+
+void Ops::add_pair_g(Pairings& pairs, G g, H h, Z z) {
+  pairs.gs.push_back(this->scale_g(z, g));
+  pairs.hs.push_back(h);
+}
+
+void Ops::add_pair_h(Pairings& pairs, G g, H h, Z z) {
+  pairs.gs.push_back(g);
+  pairs.hs.push_back(this->scale_h(z, h));
+}
+
+void Ops::add_pair_gt(Pairings& pairs, G g, H h, Z z) {
+  // The pairing is evaluated on its own, it does not share the final
+  // exponentiation with the other pairings
+  this->add_assign_gt(pairs.gt, this->scale_gt(z, this->pair(g, h)));
+}
+
+Gt Ops::multi_pair(Pairings& pairs) {
+  Gt gt;
+  int n = pairs.gs.size();
+  if (n == 0) {
+    return pairs.gt;
+  }
+  // Simultaneous pairing: shares the final exponentiation (and the squarings
+  // of the Miller loop) between all pairings
+  g1_t *ps = new g1_t[n];
+  g2_t *qs = new g2_t[n];
+  for (int i = 0; i < n; i++) {
+    g1_null(ps[i]);
+    g2_null(qs[i]);
+    g1_new(ps[i]);
+    g2_new(qs[i]);
+    g1_copy(ps[i], pairs.gs[i]._data);
+    g2_copy(qs[i], pairs.hs[i]._data);
+  }
+  pc_map_sim(gt._data, ps, qs, n);
+  for (int i = 0; i < n; i++) {
+    g1_free(ps[i]);
+    g2_free(qs[i]);
+  }
+  delete[] ps;
+  delete[] qs;
+  this->add_assign_gt(gt, pairs.gt);
+  return gt;
+}
@@ -0,0 +1,4 @@
+#!/usr/bin/bash
+
+source /home/pracy/venvs/compiler/bin/activate
+python /home/pracy/scripts/test_interp.py
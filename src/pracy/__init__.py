@@ -1,12 +1,24 @@
+from .optconfig import CURVES, DEFAULT_CURVE, OPT_LEVELS
+
+BACKENDS = ("relic", "charm")
+
+
 def main():
+    # Only the modules needed for the requested work are imported (and only
+    # once the arguments are known): `--help` or invalid arguments should not
+    # pay for loading the parser, the analysis or an unused backend.
+    # See `tools/bench_startup.py`.
     import argparse
-    from pathlib import Path
+    import sys
 
-    from .analysis.scheme import analyze_scheme
-    from .backend.compiler.all import compile
-    from .backend.export.charm import Charm
-    from .backend.export.relic import Relic
-    from .frontend.parsing import parse_json
+    def backend_list(s):
+        backends = s.split(",")
+        for b in backends:
+            if b not in BACKENDS:
+                raise argparse.ArgumentTypeError(
+                    f"invalid backend: '{b}' (choose from {', '.join(BACKENDS)})"
+                )
+        return backends
 
     parser = argparse.ArgumentParser(
         prog=__name__,
@@ -16,9 +28,12 @@ def main():
     parser.add_argument(
         "-b",
         "--backend",
-        help="specify the syntax of the generated code (default=relic)",
-        choices=("relic", "charm"),
-        default="relic",
+        help=(
+            "specify the syntax of the generated code (default=relic); "
+            "in batch mode, a comma separated list such as 'relic,charm'"
+        ),
+        type=backend_list,
+        default=["relic"],
     )
     parser.add_argument(
         "-o",
@@ -31,44 +46,282 @@ def main():
     parser.add_argument(
         "scheme",
         metavar="scheme.json",
+        nargs="+",
         help="path to the JSON specification of the scheme",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            "compile all given schemes for all given backends, writing the "
+            "code for each to '<outdir>/<scheme>/<backend>/'"
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="number of worker processes in batch mode (default=number of CPUs)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "the directory where generated code is cached "
+            "(default=$XDG_CACHE_HOME/pracy)"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always compile the scheme, neither reading nor updating the cache",
+    )
+    parser.add_argument(
+        "-O",
+        dest="opt_level",
+        type=int,
+        choices=OPT_LEVELS,
+        default=0,
+        help="optimization level of the IR (default=0, i.e., no optimizations)",
+    )
+    parser.add_argument(
+        "--curve",
+        choices=CURVES,
+        default=DEFAULT_CURVE,
+        help=f"the curve whose costs guide the optimizations (default={DEFAULT_CURVE})",
+    )
+    parser.add_argument(
+        "--precompute",
+        action="store_true",
+        help=(
+            "build fixed-base precomputation tables for the master public key "
+            "in setup and use them in encrypt"
+        ),
+    )
+    parser.add_argument(
+        "--prepared-key",
+        action="store_true",
+        help=(
+            "generate decrypt for user keys prepared for repeated decryptions "
+            "(with precomputation tables for their elements in G)"
+        ),
+    )
+    parser.add_argument(
+        "--structured-index",
+        action="store_true",
+        help=(
+            "index keys, ciphertexts and locals by structured keys made of "
+            "interned ids instead of strings built at runtime"
+        ),
+    )
+    parser.add_argument(
+        "--charm-module",
+        action="store_true",
+        help=(
+            "generate the charm code as an importable Python module "
+            "'scheme.py' with a function per algorithm instead of .gen files"
+        ),
+    )
+    parser.add_argument(
+        "--opt-stats",
+        action="store_true",
+        help="print statistics on the optimization passes to stderr",
+    )
+    parser.add_argument(
+        "--dump-ir",
+        metavar="DIR",
+        help="write the IR of each program before and after each pass to DIR",
+    )
 
     args = parser.parse_args()
 
-    with open(args.scheme, encoding="utf-8") as f:
+    if args.batch:
+        if not args.outdir:
+            parser.error("--batch requires --outdir")
+        if args.opt_stats or args.dump_ir:
+            parser.error("--opt-stats and --dump-ir are not supported with --batch")
+        from .batch import run_batch
+
+        try:
+            failed = run_batch(
+                args.scheme,
+                args.backend,
+                args.outdir,
+                jobs=args.jobs,
+                cache_dir=args.cache_dir,
+                use_cache=not args.no_cache,
+                opt_level=args.opt_level,
+                curve=args.curve,
+                precompute=args.precompute,
+                prepared_key=args.prepared_key,
+                structured_index=args.structured_index,
+                charm_module=args.charm_module,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        sys.exit(1 if failed else 0)
+
+    if len(args.scheme) > 1:
+        parser.error("multiple schemes require --batch")
+    if len(args.backend) > 1:
+        parser.error("multiple backends require --batch")
+    backend = args.backend[0]
+    if args.charm_module and backend != "charm":
+        parser.error("--charm-module requires the charm backend")
+
+    with open(args.scheme[0], encoding="utf-8") as f:
         json_input = f.read()
 
-    raw_scheme = parse_json(json_input)
-    scheme = analyze_scheme(raw_scheme)
-    setup, keygen, encrypt, decrypt = compile(scheme)
+    from .cache import ArtifactCache
 
-    backend = Relic() if args.backend == "relic" else Charm()
+    cache = None if args.no_cache else ArtifactCache(args.cache_dir)
+    pass_manager = None
+    if args.opt_level > 0 or args.opt_stats or args.dump_ir:
+        from .backend.opt import PassContext, PassManager
+
+        pass_manager = PassManager.for_level(
+            args.opt_level, args.dump_ir, PassContext(args.curve)
+        )
+    if args.opt_stats or args.dump_ir:
+        # The passes have to run to observe them
+        cache = None
+    artifacts = generate_all(
+        json_input,
+        [backend],
+        cache,
+        pass_manager,
+        args.precompute,
+        args.prepared_key,
+        args.structured_index,
+        args.charm_module,
+    )[backend]
+
+    if pass_manager is not None and args.opt_stats:
+        from .backend.opt import format_stats
+
+        print(format_stats(pass_manager.stats), file=sys.stderr)
 
     if args.outdir:
+        from pathlib import Path
+
+        from .cache import write_artifacts
+
         out_dir = Path(args.outdir)
         out_dir.mkdir(parents=True, exist_ok=True)
+        write_artifacts(out_dir, artifacts)
+    else:
+        for content in artifacts.values():
+            print(content)
 
-        with open(out_dir / "setup.gen", "w", encoding="utf-8") as f:
-            f.write(backend.export(setup))
 
-        with open(out_dir / "keygen.gen", "w", encoding="utf-8") as f:
-            f.write(backend.export(keygen))
+def compile_spec(
+    json_input: str,
+    pass_manager=None,
+    precompute: bool = False,
+    prepared_key: bool = False,
+    structured_index: bool = False,
+):
+    """
+    Parse, analyze and compile the scheme specified by `json_input`.
+    Returns the IR programs for setup, keygen, encrypt and decrypt.
 
-        with open(out_dir / "encrypt.gen", "w", encoding="utf-8") as f:
-            f.write(backend.export(encrypt))
+    If `precompute` is set, setup builds fixed-base precomputation tables for
+    the master public key and encrypt uses them (see
+    `pracy.backend.compiler.all.compile`). If `prepared_key` is set, decrypt
+    expects a user key prepared for repeated decryptions. If
+    `structured_index` is set, the programs use structured index keys
+    instead of index strings.
 
-        with open(out_dir / "decrypt.gen", "w", encoding="utf-8") as f:
-            f.write(backend.export(decrypt))
+    If a `pass_manager` (a `pracy.backend.opt.PassManager`) is given, the
+    programs are optimized with it.
+    """
+    from .analysis.scheme import analyze_scheme
+    from .backend.compiler.all import compile
+    from .frontend.parsing import parse_json
+
+    raw_scheme = parse_json(json_input)
+    scheme = analyze_scheme(raw_scheme)
+    programs = compile(scheme, precompute, prepared_key, structured_index)
+    if pass_manager is None:
+        return programs
+
+    from .backend.opt import optimize
+
+    return optimize(programs, pass_manager)
+
+
+def export(programs, backend_name: str, charm_module: bool = False) -> dict[str, str]:
+    """
+    Export the `programs` obtained from `compile_spec` with the given backend.
+    Returns the generated code by artifact name (see `pracy.cache.ARTIFACTS`).
+
+    If `charm_module` is set, the charm backend exports a single module
+    instead (see `pracy.cache.MODULE_ARTIFACTS`).
+    """
+    names = ("setup", "keygen", "encrypt", "decrypt")
+    if backend_name == "relic":
+        from .backend.export.relic import Relic
+
+        relic = Relic()
+        return {name: relic.export(program) for name, program in zip(names, programs)}
+
+    from .backend.export.charm import Charm
+
+    charm = Charm()
+    if charm_module:
+        return {"scheme": charm.export_module(dict(zip(names, programs)))}
+    return {name: charm.export(program) for name, program in zip(names, programs)}
 
-    else:
-        print(backend.export(setup))
 
-        print(backend.export(keygen))
+def generate_all(
+    json_input: str,
+    backend_names: list[str],
+    cache=None,
+    pass_manager=None,
+    precompute: bool = False,
+    prepared_key: bool = False,
+    structured_index: bool = False,
+    charm_module: bool = False,
+):
+    """
+    Generate the code of the scheme specified by `json_input` for all given
+    backends, returning the artifacts by backend name.
 
-        print(backend.export(encrypt))
+    Artifacts are taken from the `cache` (a `pracy.cache.ArtifactCache`) if
+    given, otherwise the scheme is compiled (at most once) and the results are
+    stored in the cache. See `compile_spec` for `pass_manager`, `precompute`,
+    `prepared_key` and `structured_index`, and `export` for `charm_module`.
+    """
+    from .cache import ARTIFACTS, MODULE_ARTIFACTS
 
-        print(backend.export(decrypt))
+    res = {}
+    keys = {}
+    options = dict(pass_manager.options) if pass_manager is not None else {}
+    if precompute:
+        options["precompute"] = str(precompute)
+    if prepared_key:
+        options["prepared_key"] = str(prepared_key)
+    if structured_index:
+        options["structured_index"] = str(structured_index)
+    if cache is not None:
+        for b in backend_names:
+            if charm_module and b == "charm":
+                keys[b] = cache.key(json_input, b, {**options, "module": "True"})
+                artifacts = cache.load(keys[b], MODULE_ARTIFACTS)
+            else:
+                keys[b] = cache.key(json_input, b, options)
+                artifacts = cache.load(keys[b], ARTIFACTS)
+            if artifacts is not None:
+                res[b] = artifacts
+    missing = [b for b in backend_names if b not in res]
+    if missing:
+        programs = compile_spec(
+            json_input, pass_manager, precompute, prepared_key, structured_index
+        )
+        for b in missing:
+            res[b] = export(programs, b, charm_module)
+            if cache is not None:
+                cache.store(keys[b], res[b])
+    return res
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
-from sympy import Add, Integer, Mul, Pow, Symbol, expand
-from sympy.core.numbers import Half, Rational
+from fractions import Fraction
+
+from pracy.core.rational_poly import Atom, RationalPoly, as_rational_poly
 
 
 class Coeff:
@@ -49,139 +50,80 @@ class Term:
 
 
 def analyze_expr(expr) -> list[Term]:
-    """Convert a sympy expression to a list of terms."""
-    res = expand(expr)
-    match res:
-        case Integer():
-            return [Term(Coeff(int(res)))]
-        case Symbol():
-            return [Term(Coeff(res.name))]
-        case Mul():
-            coeffs = []
-            for arg in res.args:
-                if isinstance(arg, Integer):
-                    coeffs.append(Coeff(int(arg)))
-                elif isinstance(arg, Symbol):
-                    coeffs.append(Coeff(arg.name))
-                elif isinstance(arg, Rational):
-                    if arg.numerator < 0:
-                        coeffs.append(Coeff(-1))
-                    coeffs.append(Coeff(abs(arg.numerator)))
-                    coeffs.append(Coeff(1, denom=[[arg.denominator]]))
-                elif isinstance(arg, Pow):
-                    assert len(arg.args) == 2
-                    base = arg.args[0]
-                    exp = arg.args[1]
-                    assert isinstance(exp, Integer)
-                    if exp == -1:
-                        if isinstance(base, Symbol):
-                            coeffs.append(Coeff(1, denom=[[base.name]]))
-                        elif isinstance(base, Integer):
-                            coeffs.append(Coeff(1, denom=[[int(base)]]))
-                        elif isinstance(base, Add):
-                            denom = []
-                            for s in base.args:
-                                if isinstance(s, Integer):
-                                    denom.append([1])
-                                elif isinstance(s, Symbol):
-                                    denom.append([s.name])
-                                elif isinstance(s, Mul):
-                                    d = []
-                                    for f in s.args:
-                                        if isinstance(f, Integer):
-                                            d.append(int(f))
-                                        elif isinstance(f, Symbol):
-                                            d.append(f.name)
-                                        else:
-                                            raise ValueError("Unexpected term")
-                                    denom.append(d)
-                            coeffs.append(Coeff(1, denom=denom))
-                        else:
-                            raise ValueError("Unexpected term")
-                    else:
-                        # Higher powers (like square) should only ever occur with
-                        # symbols as multiplications of numbers are
-                        # computed immediately
-                        assert isinstance(base, Symbol)
-                        for _ in range(exp):
-                            coeffs.append(Coeff(base.name))
-                else:
-                    raise ValueError("Unexpected term")
-            return [Term(*coeffs)]
-        case Pow():
-            assert len(res.args) == 2
-            base = res.args[0]
-            exp = res.args[1]
-            assert isinstance(base, (Integer, Symbol))
-            assert isinstance(exp, Integer) and exp == -1
-            if isinstance(base, Symbol):
-                return [Term(Coeff(1, denom=[[base.name]]))]
-            if isinstance(base, Integer):
-                return [Term(Coeff(1, denom=[[int(base)]]))]
+    """
+    Convert an expression to a list of terms.
+
+    The expression is usually a `RationalPoly` as built by the parser, but
+    numbers and sympy expressions are accepted as well.
+    """
+    poly = as_rational_poly(expr)
+    if poly.is_zero():
+        return [Term(Coeff(0))]
+    terms = poly.terms()
+    if len(terms) == 1:
+        coeff, factors = terms[0]
+        if not factors:
+            return [Term(_sum_coeff(coeff))]
+        return [Term(*_product_coeffs(coeff), *_factor_coeffs(factors))]
+    res = []
+    for coeff, factors in terms:
+        coeffs = _factor_coeffs(factors)
+        if coeff != 1 or not factors:
+            coeffs.insert(0, _sum_coeff(coeff))
+        res.append(Term(*coeffs))
+    return res
+
+
+def _sum_coeff(coeff: Fraction) -> Coeff:
+    """The numeric coefficient of a term within a sum (or of a constant)."""
+    if coeff.denominator == 1:
+        return Coeff(int(coeff))
+    return Coeff(coeff.numerator, denom=[[coeff.denominator]])
+
+
+def _product_coeffs(coeff: Fraction) -> list[Coeff]:
+    """The numeric coefficient of a lone product."""
+    if coeff == 1:
+        return []
+    if coeff.denominator == 1:
+        return [Coeff(int(coeff))]
+    coeffs = []
+    if coeff < 0:
+        coeffs.append(Coeff(-1))
+    coeffs.append(Coeff(abs(coeff.numerator)))
+    coeffs.append(Coeff(1, denom=[[coeff.denominator]]))
+    return coeffs
+
+
+def _factor_coeffs(factors: list[tuple[Atom, int]]) -> list[Coeff]:
+    coeffs = []
+    for atom, exp in factors:
+        if isinstance(atom, str) and exp >= 1:
+            coeffs.extend(Coeff(atom) for _ in range(exp))
+        elif isinstance(atom, str) and exp == -1:
+            coeffs.append(Coeff(1, denom=[[atom]]))
+        elif isinstance(atom, RationalPoly) and exp == -1:
+            coeffs.append(Coeff(1, denom=_denom(atom)))
+        else:
+            raise ValueError("Unexpected term")
+    return coeffs
+
+
+def _denom(poly: RationalPoly) -> list[list[int | str]]:
+    """
+    Convert the sum `poly` to a denominator, i.e., a list of products of
+    integers and symbols.
+    """
+    denom = []
+    for coeff, factors in poly.terms():
+        if coeff.denominator != 1:
             raise ValueError("Unexpected term")
-        case Rational():
-            assert isinstance(res.numerator, int) and res.numerator >= 0
-            assert isinstance(res.denominator, int) and res.denominator >= 1
-            return [Term(Coeff(res.numerator, denom=[[int(res.denominator)]]))]
-        case Add():
-            terms = []
-            for arg in res.args:
-                if isinstance(arg, Integer):
-                    terms.append(Term(Coeff(int(arg))))
-                elif isinstance(arg, Symbol):
-                    terms.append(Term(Coeff(arg.name)))
-                elif isinstance(arg, Mul):
-                    coeffs = []
-                    for a in arg.args:
-                        if isinstance(a, Integer):
-                            coeffs.append(Coeff(int(a)))
-                        elif isinstance(a, Symbol):
-                            coeffs.append(Coeff(a.name))
-                        elif isinstance(a, Half):
-                            coeffs.append(Coeff(1, denom=[[2]]))
-                        elif isinstance(a, Pow):
-                            assert len(a.args) == 2
-                            base = a.args[0]
-                            exp = a.args[1]
-                            assert isinstance(base, (Integer, Symbol))
-                            # assert isinstance(exp, Integer) and exp == -1
-                            if exp == -1:
-                                if isinstance(base, Symbol):
-                                    coeffs.append(Coeff(1, denom=[[base.name]]))
-                                elif isinstance(base, Integer):
-                                    coeffs.append(Coeff(1, denom=[[int(base)]]))
-                                else:
-                                    raise ValueError("Unexpected term")
-                            else:
-                                assert isinstance(base, Symbol)
-                                for _ in range(exp):
-                                    coeffs.append(Coeff(base.name))
-                        else:
-                            raise ValueError("Unexpected term")
-                    terms.append(Term(*coeffs))
-                elif isinstance(arg, Pow):
-                    assert len(arg.args) == 2
-                    base = arg.args[0]
-                    exp = arg.args[1]
-                    assert isinstance(exp, Integer) and exp == -1
-                    if isinstance(base, Symbol):
-                        terms.append(Term(Coeff(1, denom=[[base.name]])))
-                    elif isinstance(base, Integer):
-                        terms.append(Term(Coeff(1, denom=[[int(base)]])))
-                    elif isinstance(base, Add):
-                        denom = []
-                        for s in base.args:
-                            if isinstance(s, Integer):
-                                denom.append([int(s)])
-                            elif isinstance(s, Symbol):
-                                denom.append([s.name])
-                            else:
-                                raise ValueError("Unexpected term")
-                        terms.append(Term(Coeff(1, denom=denom)))
-                    else:
-                        raise ValueError("Unexpected term")
-                else:
-                    raise ValueError("Unexpected term")
-            return terms
-        case _:
-            raise NotImplementedError()
+        d = []
+        if coeff != 1 or not factors:
+            d.append(int(coeff))
+        for atom, exp in factors:
+            if not isinstance(atom, str) or exp != 1:
+                raise ValueError("Unexpected term")
+            d.append(atom)
+        denom.append(d)
+    return denom
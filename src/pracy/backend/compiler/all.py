@@ -2,21 +2,42 @@ from pracy.backend.compiler.decrypt import compile_decrypt
 from pracy.backend.compiler.encrypt import compile_encrypt
 from pracy.backend.compiler.keygen import compile_keygen
 from pracy.backend.compiler.setup import compile_setup
+from pracy.backend.ir.irbuilder import IndexFamilies
 
 
-def compile(scheme):
+def compile(scheme, precompute=False, prepared_key=False, structured_index=False):
+    """
+    Compile the analyzed `scheme` to the IR programs for setup, keygen,
+    encrypt and decrypt.
+
+    If `precompute` is set, setup builds precomputation tables for the master
+    public key, which encrypt uses for fixed-base scalar multiplications.
+    If `prepared_key` is set, decrypt expects a prepared user key (see
+    `compile_decrypt`).
+    If `structured_index` is set, all programs index the keys, ciphertexts
+    and locals by structured keys (see `IrBuilder.build_index`) instead of
+    index strings.
+    """
+    index_families = IndexFamilies() if structured_index else None
     master_key_vars = scheme.master_key_vars
     common_vars = scheme.common_vars
     group_map = scheme.group_map
     fdh_map = scheme.fdh_map
-    setup = compile_setup(master_key_vars, common_vars, group_map, fdh_map)
+    setup = compile_setup(
+        master_key_vars, common_vars, group_map, fdh_map, precompute, index_families
+    )
 
     key_lone_randoms = scheme.key_lone_randoms
     key_non_lone_randoms = scheme.key_non_lone_randoms
     key_polys = scheme.key_polys
     group_map = scheme.group_map
     keygen = compile_keygen(
-        key_lone_randoms, key_non_lone_randoms, key_polys, group_map, fdh_map
+        key_lone_randoms,
+        key_non_lone_randoms,
+        key_polys,
+        group_map,
+        fdh_map,
+        index_families,
     )
 
     cipher_lone_randoms = scheme.cipher_lone_randoms
@@ -36,11 +57,15 @@ def compile(scheme):
         cipher_blinding,
         group_map,
         fdh_map,
+        precompute,
+        index_families,
     )
 
     singles = scheme.dec_singles
     pairs = scheme.dec_pairs
     var_type_map = scheme.var_type_map
-    decrypt = compile_decrypt(singles, pairs, var_type_map, fdh_map)
+    decrypt = compile_decrypt(
+        singles, pairs, var_type_map, fdh_map, prepared_key, index_families
+    )
 
     return setup, keygen, encrypt, decrypt
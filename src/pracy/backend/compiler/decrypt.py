@@ -6,25 +6,45 @@ from pracy.core.type import VarType
 from pracy.core.var import Var
 
 
-def compile_decrypt(singles, pairs, var_type_map, fdh_map):
-    compiler = _DecryptCompiler(var_type_map, fdh_map)
+def compile_decrypt(
+    singles, pairs, var_type_map, fdh_map, prepared_key=False, index_families=None
+):
+    """
+    Generate IR code for _decrypt_ for the given `singles` and `pairs`.
+
+    If `prepared_key` is set, decrypt expects a prepared user key, which comes
+    with precomputation tables for its elements in G. Pairings with such an
+    element are scaled with fixed-base multiplications using these tables.
+
+    If `index_families` is given, structured index keys of these families
+    are used instead of index strings (see `IrBuilder.build_index`).
+    """
+    compiler = _DecryptCompiler(var_type_map, fdh_map, prepared_key, index_families)
     return compiler.compile(singles, pairs)
 
 
 class _DecryptCompiler:
 
-    def __init__(self, var_type_map, fdh_map):
+    def __init__(self, var_type_map, fdh_map, prepared_key, index_families):
         self.var_type_map = var_type_map
         self.fdh_map = fdh_map
+        self.prepared_key = prepared_key
+        self.index_families = index_families
 
     def compile(self, singles, pairs):
-        self._cg = IrBuilder()
+        self._cg = IrBuilder(self.index_families)
         self._cg.comment("BEGIN DECRYPT")
         for single in singles:
             self._compile_single(single)
 
-        for pair in pairs:
-            self._compile_pair(pair)
+        # All pairings are collected and evaluated at once, sharing a single
+        # final exponentiation
+        if pairs:
+            self._cg.reset_pairs(ir.ACC_PAIRS)
+            for pair in pairs:
+                self._compile_pair(pair)
+            self._cg.multi_pair(ir.TMP_GT, ir.ACC_PAIRS)
+            self._cg.add_gt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT)
 
         self._cg.store(ir.BLINDING_POLY, ir.ACC_GT)
         self._cg.comment("END DECRYPT")
@@ -45,17 +65,48 @@ class _DecryptCompiler:
         self._cg.build_loops(single, body)
 
     def _compile_pair(self, pair):
+        table = self._get_table_location(pair)
+        if table is not None:
+            self._compile_prepared_pair(pair, table)
+            return
+
         def body(cg):
             self._compile_get_g_component(cg, pair)
             self._compile_get_h_component(cg, pair)
-            cg.pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H)
             assert len(pair.terms) == 1  # for now assume that we have products only
             compile_coeff(cg, pair.terms[0])
-            cg.scale_gt(ir.TMP_GT, ir.TMP_Z, ir.TMP_GT)
-            cg.add_gt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT)
+            cg.add_pair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H, ir.TMP_Z)
 
         self._cg.build_loops(pair, body)
 
+    def _compile_prepared_pair(self, pair, table):
+        def body(cg):
+            self._compile_get_h_component(cg, pair)
+            assert len(pair.terms) == 1  # for now assume that we have products only
+            compile_coeff(cg, pair.terms[0])
+            cg.build_index(pair.arg_g.quantify(pair.quants))
+            cg.scale_fix_g(ir.TMP_G, ir.TMP_Z, table.indexed_at(ir.IDX))
+            cg.add_pair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H)
+
+        self._cg.build_loops(pair, body)
+
+    def _get_table_location(self, pair) -> ir.IrVar | None:
+        """
+        Return the precomputation tables of the prepared key for the argument
+        in G of `pair`, or `None` if it is not a (stored) key element.
+        """
+        if not self.prepared_key or pair.arg_g.name == "<rgid>":
+            return None
+        arg_g = pair.arg_g.quantify(pair.quants)
+        if self.fdh_map.is_hashed(arg_g):
+            return None
+        match self._get_var_location(arg_g, Group.G):
+            case ir.USK_POLYS_G:
+                return ir.USK_TABLES_POLYS_G
+            case ir.USK_RANDOMS_G:
+                return ir.USK_TABLES_RANDOMS_G
+        return None
+
     def _compile_get_g_component(self, cg, pair):
         if pair.arg_g.name == "<rgid>":
             cg.get_rgid_g(ir.TMP_G)
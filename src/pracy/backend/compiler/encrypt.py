@@ -13,6 +13,8 @@ def compile_encrypt(
     blinding,
     group_map,
     fdh_map,
+    precompute=False,
+    index_families=None,
 ):
     """
     Generate IR code for _encrypt_ for the given random variables and
@@ -39,8 +41,15 @@ def compile_encrypt(
 
     The `blinding` (polynomial) is the one named `cm` in Gt which is
     actually used to hide the secret message.
+
+    If `precompute` is set, the common vars of the master public key are
+    expected to come with precomputation tables (see `compile_setup`), which
+    are used to scale them.
+
+    If `index_families` is given, structured index keys of these families
+    are used instead of index strings (see `IrBuilder.build_index`).
     """
-    compiler = _EncryptCompiler(group_map, fdh_map)
+    compiler = _EncryptCompiler(group_map, fdh_map, precompute, index_families)
     return compiler.compile(
         lone_randoms,
         special_lone_randoms,
@@ -53,9 +62,11 @@ def compile_encrypt(
 
 class _EncryptCompiler:
 
-    def __init__(self, group_map, fdh_map):
+    def __init__(self, group_map, fdh_map, precompute, index_families):
         self.group_map = group_map
         self.fdh_map = fdh_map
+        self.precompute = precompute
+        self.index_families = index_families
 
     def compile(
         self,
@@ -66,7 +77,7 @@ class _EncryptCompiler:
         secondaries,
         blinding,
     ):
-        self._cg = IrBuilder()
+        self._cg = IrBuilder(self.index_families)
         self._cg.comment("BEGIN ENCRYPT")
         for lr in lone_randoms:
             self._compile_lone_random(lr)
@@ -130,10 +141,12 @@ class _EncryptCompiler:
             if group == Group.G:
                 tmp = ir.TMP_G
                 acc = ir.ACC_G
+                terms = ir.TERMS_G
                 target = ir.CT_PRIMARIES_G
             else:
                 tmp = ir.TMP_H
                 acc = ir.ACC_H
+                terms = ir.TERMS_H
                 target = ir.CT_PRIMARIES_H
 
             cg.reset_z(ir.TMP_Z)
@@ -146,14 +159,30 @@ class _EncryptCompiler:
 
             cg.lift(group, acc, ir.ACC_Z)
 
+            # Several common terms are summed up by a single multi-scalar
+            # multiplication, except for those scaled with precomputed tables
+            n_terms = len(poly.common_terms_hashed)
+            if not self.precompute:
+                n_terms += len(poly.common_terms_plain)
+            if n_terms > 1:
+                cg.reset_terms(group, terms)
+            else:
+                terms = None
+
             for term in poly.common_terms_plain:
-                self._compile_primary_plain_common_term(cg, term, poly, tmp, acc, group)
+                self._compile_primary_plain_common_term(
+                    cg, term, poly, tmp, acc, terms, group
+                )
 
             for term in poly.common_terms_hashed:
                 self._compile_primary_hashed_common_term(
-                    cg, term, poly, tmp, acc, group
+                    cg, term, poly, tmp, acc, terms, group
                 )
 
+            if terms is not None:
+                cg.multi_scale(group, tmp, terms)
+                cg.add(group, acc, acc, tmp)
+
             cg.build_index(poly)
             cg.store(target.indexed_at(ir.IDX), acc)
 
@@ -176,7 +205,9 @@ class _EncryptCompiler:
             )
         cg.add_z(ir.ACC_Z, ir.ACC_Z, ir.TMP_Z)
 
-    def _compile_primary_plain_common_term(self, cg, term, poly, tmp, acc, group):
+    def _compile_primary_plain_common_term(
+        self, cg, term, poly, tmp, acc, terms, group
+    ):
         compile_coeff(cg, term.factor)
         if term.random_var.name == "<lambda>":
             self._compile_get_lambda(cg, term)
@@ -187,16 +218,24 @@ class _EncryptCompiler:
                 ir.TMP_Z,
                 ir.ENCRYPT_NON_LONE_RANDOMS.indexed_at(ir.IDX),
             )
+        cg.build_index(term.common_var.quantify(poly.quants))
+        if self.precompute:
+            if group == Group.G:
+                table = ir.MPK_TABLES_G
+            else:
+                table = ir.MPK_TABLES_H
+            cg.scale_fix(group, tmp, ir.TMP_Z, table.indexed_at(ir.IDX))
+            cg.add(group, acc, acc, tmp)
+            return
         if group == Group.G:
             source = ir.MPK_COMMON_VARS_G
         else:
             source = ir.MPK_COMMON_VARS_H
-        cg.build_index(term.common_var.quantify(poly.quants))
-        cg.store(tmp, source.indexed_at(ir.IDX))
-        cg.scale(group, tmp, ir.TMP_Z, tmp)
-        cg.add(group, acc, acc, tmp)
+        self._add_scaled(cg, group, source.indexed_at(ir.IDX), tmp, acc, terms)
 
-    def _compile_primary_hashed_common_term(self, cg, term, poly, tmp, acc, group):
+    def _compile_primary_hashed_common_term(
+        self, cg, term, poly, tmp, acc, terms, group
+    ):
         compile_coeff(cg, term.factor)
         if term.random_var.name == "<lambda>":
             self._compile_get_lambda(cg, term)
@@ -210,6 +249,18 @@ class _EncryptCompiler:
         cg.build_index(term.common_var.quantify(poly.quants))
         fdh_idx = self.fdh_map[term.common_var.quantify(poly.quants)]
         cg.fdh(group, tmp, fdh_idx, ir.IDX)
+        self._add_scaled(cg, group, tmp, tmp, acc, terms)
+
+    def _add_scaled(self, cg, group, source, tmp, acc, terms):
+        """
+        Add `source` scaled by `TMP_Z` to `acc`, or to the multi-scalar
+        multiplication `terms` if given.
+        """
+        if terms is not None:
+            cg.add_term(group, terms, ir.TMP_Z, source)
+            return
+        if source != tmp:
+            cg.store(tmp, source)
         cg.scale(group, tmp, ir.TMP_Z, tmp)
         cg.add(group, acc, acc, tmp)
 
@@ -4,7 +4,9 @@ from pracy.backend.ir.irbuilder import IrBuilder
 from pracy.core.group import Group
 
 
-def compile_keygen(lone_randoms, non_lone_randoms, key_polys, group_map, fdh_map):
+def compile_keygen(
+    lone_randoms, non_lone_randoms, key_polys, group_map, fdh_map, index_families=None
+):
     """
     Generate IR code for _keygen_ for the given random variables and key polys.
 
@@ -21,19 +23,23 @@ def compile_keygen(lone_randoms, non_lone_randoms, key_polys, group_map, fdh_map
     The `group_map` indicates the target groups of the non-lone randoms.
     For the key polys, the group stored in the corresponding objects is used.
     Only non-hashed non-lone randoms are queried in `group_map`.
+
+    If `index_families` is given, structured index keys of these families
+    are used instead of index strings (see `IrBuilder.build_index`).
     """
-    compiler = _KeygenCompiler(group_map, fdh_map)
+    compiler = _KeygenCompiler(group_map, fdh_map, index_families)
     return compiler.compile(lone_randoms, non_lone_randoms, key_polys)
 
 
 class _KeygenCompiler:
 
-    def __init__(self, group_map, fdh_map):
+    def __init__(self, group_map, fdh_map, index_families):
         self.group_map = group_map
         self.fdh_map = fdh_map
+        self.index_families = index_families
 
     def compile(self, lone_randoms, non_lone_randoms, key_polys):
-        self._cg = IrBuilder()
+        self._cg = IrBuilder(self.index_families)
         self._cg.comment("BEGIN KEYGEN")
         for lr in lone_randoms:
             self._compile_lone_random(lr)
@@ -73,10 +79,12 @@ class _KeygenCompiler:
             if group == Group.G:
                 tmp = ir.TMP_G
                 acc = ir.ACC_G
+                terms = ir.TERMS_G
                 target = ir.USK_POLYS_G
             else:
                 tmp = ir.TMP_H
                 acc = ir.ACC_H
+                terms = ir.TERMS_H
                 target = ir.USK_POLYS_H
 
             cg.reset_z(ir.TMP_Z)
@@ -93,11 +101,29 @@ class _KeygenCompiler:
 
             cg.lift(group, acc, ir.ACC_Z)
 
+            # Several hashed terms are summed up by a single multi-scalar
+            # multiplication
+            n_terms = len(key_poly.common_terms_random_hashed) + len(
+                key_poly.common_terms_common_hashed
+            )
+            if n_terms > 1:
+                cg.reset_terms(group, terms)
+            else:
+                terms = None
+
             for term in key_poly.common_terms_random_hashed:
-                self._compile_hashed_random_term(cg, term, key_poly, tmp, acc, group)
+                self._compile_hashed_random_term(
+                    cg, term, key_poly, tmp, acc, terms, group
+                )
 
             for term in key_poly.common_terms_common_hashed:
-                self._compile_hashed_common_term(cg, term, key_poly, tmp, acc, group)
+                self._compile_hashed_common_term(
+                    cg, term, key_poly, tmp, acc, terms, group
+                )
+
+            if terms is not None:
+                cg.multi_scale(group, tmp, terms)
+                cg.add(group, acc, acc, tmp)
 
             cg.build_index(key_poly)
             cg.store(target.indexed_at(ir.IDX), acc)
@@ -128,7 +154,7 @@ class _KeygenCompiler:
         cg.mul_z(ir.TMP_Z, ir.TMP_Z, ir.MSK_COMMON_VARS.indexed_at(ir.IDX))
         cg.add_z(ir.ACC_Z, ir.ACC_Z, ir.TMP_Z)
 
-    def _compile_hashed_random_term(self, cg, term, poly, tmp, acc, group):
+    def _compile_hashed_random_term(self, cg, term, poly, tmp, acc, terms, group):
         compile_coeff(cg, term.factor)
         cg.build_index(term.common_var.quantify(poly.quants))
         cg.mul_z(ir.TMP_Z, ir.TMP_Z, ir.MSK_COMMON_VARS.indexed_at(ir.IDX))
@@ -138,10 +164,9 @@ class _KeygenCompiler:
             cg.build_index(term.random_var.quantify(poly.quants))
             fdh_idx = self.fdh_map[term.random_var.quantify(poly.quants)]
             cg.fdh(group, tmp, fdh_idx, ir.IDX)
-        cg.scale(group, tmp, ir.TMP_Z, tmp)
-        cg.add(group, acc, acc, tmp)
+        self._add_scaled(cg, group, tmp, tmp, acc, terms)
 
-    def _compile_hashed_common_term(self, cg, term, poly, tmp, acc, group):
+    def _compile_hashed_common_term(self, cg, term, poly, tmp, acc, terms, group):
         compile_coeff(cg, term.factor)
         cg.build_index(term.random_var.quantify(poly.quants))
         cg.mul_z(
@@ -152,6 +177,18 @@ class _KeygenCompiler:
         cg.build_index(term.common_var.quantify(poly.quants))
         fdh_idx = self.fdh_map[term.common_var.quantify(poly.quants)]
         cg.fdh(group, tmp, fdh_idx, ir.IDX)
+        self._add_scaled(cg, group, tmp, tmp, acc, terms)
+
+    def _add_scaled(self, cg, group, source, tmp, acc, terms):
+        """
+        Add `source` scaled by `TMP_Z` to `acc`, or to the multi-scalar
+        multiplication `terms` if given.
+        """
+        if terms is not None:
+            cg.add_term(group, terms, ir.TMP_Z, source)
+            return
+        if source != tmp:
+            cg.store(tmp, source)
         cg.scale(group, tmp, ir.TMP_Z, tmp)
         cg.add(group, acc, acc, tmp)
 
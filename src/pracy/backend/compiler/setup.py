@@ -3,7 +3,14 @@ from pracy.backend.ir.irbuilder import IrBuilder
 from pracy.core.group import Group
 
 
-def compile_setup(master_key_vars, common_vars, group_map, fdh_map):
+def compile_setup(
+    master_key_vars,
+    common_vars,
+    group_map,
+    fdh_map,
+    precompute=False,
+    index_families=None,
+):
     """
     Generate IR code for _setup_ for the given master key and common vars.
 
@@ -17,19 +24,27 @@ def compile_setup(master_key_vars, common_vars, group_map, fdh_map):
     The `group_map` is used to retrieve the target groups for the
     common vars. It is only queried for non-hashed common vars.
     Common vars can not be mapped to the target group Gt.
+
+    If `precompute` is set, a precomputation table for fixed-base scalar
+    multiplications is built for each common var in the master public key.
+
+    If `index_families` is given, structured index keys of these families
+    are used instead of index strings (see `IrBuilder.build_index`).
     """
-    compiler = _SetupCompiler(group_map, fdh_map)
+    compiler = _SetupCompiler(group_map, fdh_map, precompute, index_families)
     return compiler.compile(master_key_vars, common_vars)
 
 
 class _SetupCompiler:
 
-    def __init__(self, group_map, fdh_map):
+    def __init__(self, group_map, fdh_map, precompute, index_families):
         self.group_map = group_map
         self.fdh_map = fdh_map
+        self.precompute = precompute
+        self.index_families = index_families
 
     def compile(self, master_key_vars, common_vars):
-        self._cg = IrBuilder()
+        self._cg = IrBuilder(self.index_families)
         self._cg.comment("BEGIN SETUP")
         for msk in master_key_vars:
             self._compile_master_key_var(msk)
@@ -63,5 +78,11 @@ class _SetupCompiler:
                 Group.H: ir.MPK_COMMON_VARS_H.indexed_at(ir.IDX),
             }
             cg.lift(group, targets[group], source)
+            if self.precompute:
+                tables = {
+                    Group.G: ir.MPK_TABLES_G.indexed_at(ir.IDX),
+                    Group.H: ir.MPK_TABLES_H.indexed_at(ir.IDX),
+                }
+                cg.precompute(group, tables[group], targets[group])
 
         self._cg.build_loops(cv, body)
@@ -1,11 +1,131 @@
+import re
+
 from pracy.backend import ir
+from pracy.backend.opt.costs import CURVES, row_costs
 from pracy.core.qset import QSet
 
+# The parameters of the functions of the module generated by
+# `Charm.export_module` (besides `calc`, the instance of `Calculations`), i.e.,
+# the names the programs read from the context of the Charm backend, and the
+# variables they return
+_SIGNATURES = {
+    "setup": (["AUTHORITIES", "MSK", "MPK", "ATTRIBUTE_UNIVERSE=None"], None),
+    "keygen": (["USER_ATTRIBUTES", "SK", "MSK"], None),
+    "encrypt": (
+        ["LSSS_map", "LSSS_ROWS", "DEDUPLICATION_INDICES", "CT", "MPK"],
+        "acc_gt",
+    ),
+    "decrypt": (
+        ["acc_gt", "LSSS_map", "LINEAR_COMB_INDICES", "CT", "SK"],
+        "blinding_poly",
+    ),
+}
+
+# The costs of Charm's default curve guide the choice of the rows decryption
+# uses, since the curve is only picked at runtime
+_ROW_COSTS_CURVE = CURVES["ss512"]
+
+# Maps the programs fill, which are created by the functions of the module
+_LOCAL_MAPS = ("lone_randoms", "non_lone_randoms", "special_lone_randoms")
+
 
 class Charm:
 
+    def __init__(self):
+        # While exporting a function of a module: the methods of `calc` and
+        # the maps of keys and ciphertexts it uses, which are bound to locals
+        # at its start (by local name)
+        self._hoisted = None
+
     def export(self, stmts: list[ir.IrStmt]):
-        return "\n".join(self._export_ir_stmt(s).strip("\n") for s in stmts)
+        """
+        Export `stmts` as a .gen file. The decrypt program (i.e., the one
+        looping over the rows of the linear combination) starts with its
+        `ROW_COSTS`, see `export_row_costs`.
+        """
+        code = "\n".join(self._export_ir_stmt(s).strip("\n") for s in stmts)
+        if any(_is_row_loop(s) for s in stmts):
+            code = self.export_row_costs(stmts) + "\n" + code
+        return code
+
+    def export_module(self, programs: dict[str, list[ir.IrStmt]]) -> str:
+        """
+        Export the `programs` for setup, keygen, encrypt and decrypt (by name)
+        as an importable Python module with a function for each, e.g.
+
+            def decrypt(calc, acc_gt, LSSS_map, LINEAR_COMB_INDICES, CT, SK):
+                get_coefficient = calc.get_coefficient
+                ct_bold_C_prime = CT.params['bold_C_prime']
+                ...
+                return blinding_poly
+
+        Unlike the .gen files exported by `export`, which are run in a context
+        dict, the variables are locals and the methods of `calc` and the maps
+        of keys and ciphertexts are looked up once per call.
+        """
+        functions = [
+            self._export_function(name, programs[name]) for name in _SIGNATURES
+        ]
+        header = "# Generated by pracy, do not edit\n"
+        row_costs = self.export_row_costs(programs["decrypt"])
+        return "\n\n".join([header, row_costs, *functions])
+
+    def export_row_costs(self, decrypt: list[ir.IrStmt]) -> str:
+        """
+        Export the costs of positive and negated rows of the linear combination
+        in `decrypt` (see `pracy.backend.opt.costs.row_costs`) as the constant
+        `ROW_COSTS`, by which the Charm backend picks the cheapest set of rows
+        satisfying a policy, e.g.
+
+            ROW_COSTS = {'pos': 5.4, 'neg': 6.8}
+        """
+        costs = row_costs(decrypt, _ROW_COSTS_CURVE)
+        costs = {row: round(cost, 2) for row, cost in costs.items()}
+        return f"ROW_COSTS = {costs!r}\n"
+
+    def _export_function(self, name: str, stmts: list[ir.IrStmt]) -> str:
+        self._hoisted = {}
+        try:
+            body = "".join(self._export_ir_stmt(s, 1) for s in stmts)
+            hoisted = self._hoisted
+        finally:
+            self._hoisted = None
+        params, result = _SIGNATURES[name]
+        indent = self._indent(1)
+        lines = [f"def {name}({', '.join(['calc', *params])}):\n"]
+        lines += [f"{indent}{local} = {value}\n" for local, value in hoisted.items()]
+        lines += [
+            f"{indent}{m} = {{}}\n" for m in _LOCAL_MAPS if re.search(rf"\b{m}\b", body)
+        ]
+        lines.append(body)
+        if result is not None:
+            lines.append(f"{indent}return {result}\n")
+        elif not hoisted and all(isinstance(s, ir.Comment) for s in stmts):
+            lines.append(f"{indent}pass\n")
+        return "".join(lines)
+
+    def _method(self, name: str) -> str:
+        """Return the reference to the method `name` of `Calculations`."""
+        if self._hoisted is None:
+            return f"self.{name}"
+        self._hoisted[name] = f"calc.{name}"
+        return name
+
+    def _container(self, obj: str, key: str) -> str:
+        """Return the reference to the parameter `key` of a key or ciphertext."""
+        if self._hoisted is None:
+            return f"{obj}['{key}']"
+        return f"{obj}.params['{key}']"
+
+    def _entry(self, obj: str, key: str, var: ir.IrVar) -> str:
+        """Return the reference to the entry of `var` in the map `obj[key]`."""
+        assert var.index is not None  # entries of maps are always indexed
+        index = self._export_ir_expr(var.index)
+        if self._hoisted is None:
+            return f"{obj}['{key}'][{index}]"
+        local = f"{obj.lower()}_{key}"
+        self._hoisted[local] = self._container(obj, key)
+        return f"{local}[{index}]"
 
     def _export_ir_stmt(self, stmt: ir.IrStmt, depth=0) -> str:
         indent = self._indent(depth)
@@ -22,79 +142,128 @@ class Charm:
             case ir.StoreExpr():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_expr(stmt.expr)}\n"
             case ir.ResetZ():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.reset_z()\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_z')}()\n"
             case ir.ResetG():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.reset_g()\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_g')}()\n"
             case ir.ResetH():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.reset_h()\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_h')}()\n"
             case ir.ResetGt():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.reset_gt()\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_gt')}()\n"
             case ir.SampleZ():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.sample_z()\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('sample_z')}()\n"
             case ir.AddZ():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.lhs)} + {self._export_ir_var(stmt.rhs)}\n"
             case ir.MulZ():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.lhs)} * {self._export_ir_var(stmt.rhs)}\n"
+            case ir.AddAssignZ():
+                return f"{indent}{self._export_ir_var(stmt.target)} += {self._export_ir_var(stmt.source)}\n"
+            case ir.MulAssignZ():
+                return f"{indent}{self._export_ir_var(stmt.target)} *= {self._export_ir_var(stmt.source)}\n"
             case ir.SetZ():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.set_z({stmt.value})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('set_z')}({stmt.value})\n"
             case ir.NegZ():
                 return f"{indent}{self._export_ir_var(stmt.target)} = -{self._export_ir_var(stmt.source)}\n"
             case ir.InvZ():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.source)} ** (-1)\n"
             case ir.LiftG():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.lift_g({self._export_ir_var(stmt.source)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('lift_g')}({self._export_ir_var(stmt.source)})\n"
             case ir.AddG():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.lhs)} * {self._export_ir_var(stmt.rhs)}\n"
             case ir.ScaleG():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.source)} ** {self._export_ir_var(stmt.coeff)}\n"
+            case ir.AddAssignG():
+                return f"{indent}{self._export_ir_var(stmt.target)} *= {self._export_ir_var(stmt.source)}\n"
+            case ir.ScaleAssignG():
+                return f"{indent}{self._export_ir_var(stmt.target)} **= {self._export_ir_var(stmt.coeff)}\n"
             case ir.FdhG():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.fdh_g({stmt.idx}, {self._export_ir_var(stmt.arg)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('fdh_g')}({stmt.idx}, {self._export_ir_var(stmt.arg)})\n"
+            case ir.PrecomputeG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('precompute')}({self._export_ir_var(stmt.source)})\n"
+            case ir.ScaleFixG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.table)} ** {self._export_ir_var(stmt.coeff)}\n"
+            case ir.ResetTermsG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_terms_g')}()\n"
+            case ir.AddTermG():
+                return f"{indent}{self._method('add_term_g')}({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)})\n"
+            case ir.MultiScaleG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('multi_scale_g')}({self._export_ir_var(stmt.source)})\n"
             case ir.LiftH():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.lift_h({self._export_ir_var(stmt.source)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('lift_h')}({self._export_ir_var(stmt.source)})\n"
             case ir.AddH():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.lhs)} * {self._export_ir_var(stmt.rhs)}\n"
             case ir.ScaleH():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.source)} ** {self._export_ir_var(stmt.coeff)}\n"
+            case ir.AddAssignH():
+                return f"{indent}{self._export_ir_var(stmt.target)} *= {self._export_ir_var(stmt.source)}\n"
+            case ir.ScaleAssignH():
+                return f"{indent}{self._export_ir_var(stmt.target)} **= {self._export_ir_var(stmt.coeff)}\n"
             case ir.FdhH():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.fdh_h({stmt.idx}, {self._export_ir_var(stmt.arg)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('fdh_h')}({stmt.idx}, {self._export_ir_var(stmt.arg)})\n"
+            case ir.PrecomputeH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('precompute')}({self._export_ir_var(stmt.source)})\n"
+            case ir.ScaleFixH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.table)} ** {self._export_ir_var(stmt.coeff)}\n"
+            case ir.ResetTermsH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_terms_h')}()\n"
+            case ir.AddTermH():
+                return f"{indent}{self._method('add_term_h')}({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)})\n"
+            case ir.MultiScaleH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('multi_scale_h')}({self._export_ir_var(stmt.source)})\n"
             case ir.LiftGt():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.lift_gt({self._export_ir_var(stmt.source)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('lift_gt')}({self._export_ir_var(stmt.source)})\n"
             case ir.AddGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.lhs)} * {self._export_ir_var(stmt.rhs)}\n"
             case ir.ScaleGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.source)} ** {self._export_ir_var(stmt.coeff)}\n"
+            case ir.AddAssignGt():
+                return f"{indent}{self._export_ir_var(stmt.target)} *= {self._export_ir_var(stmt.source)}\n"
+            case ir.ScaleAssignGt():
+                return f"{indent}{self._export_ir_var(stmt.target)} **= {self._export_ir_var(stmt.coeff)}\n"
             case ir.InvGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = {self._export_ir_var(stmt.source)} ** (-1)\n"
             case ir.Pair():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.pair_groups({self._export_ir_var(stmt.source_g)}, {self._export_ir_var(stmt.source_h)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('pair_groups')}({self._export_ir_var(stmt.source_g)}, {self._export_ir_var(stmt.source_h)})\n"
+            case ir.ResetPairs():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('reset_pairs')}()\n"
+            case ir.AddPair():
+                args = [stmt.target, stmt.source_g, stmt.source_h]
+                method = "add_pair"
+                if stmt.coeff is not None:
+                    args.append(stmt.coeff)
+                    method = f"add_pair_{stmt.group.name.lower()}"
+                exported = ", ".join(self._export_ir_var(a) for a in args)
+                return f"{indent}{self._method(method)}({exported})\n"
+            case ir.MultiPair():
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('multi_pair')}({self._export_ir_var(stmt.source)})\n"
             case ir.GetRgidG():
-                return (
-                    f"{indent}{self._export_ir_var(stmt.target)} = self.get_rgid_g()\n"
-                )
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('get_rgid_g')}()\n"
             case ir.GetRgidH():
-                return (
-                    f"{indent}{self._export_ir_var(stmt.target)} = self.get_rgid_h()\n"
-                )
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('get_rgid_h')}()\n"
             case ir.GetMu():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.get_maskingvalue({self._export_ir_var(stmt.idx)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('get_maskingvalue')}({self._export_ir_var(stmt.idx)})\n"
             case ir.GetLambda():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.get_share({self._export_ir_var(stmt.idx)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('get_share')}({self._export_ir_var(stmt.idx)})\n"
             case ir.GetEpsilon():
-                return f"{indent}{self._export_ir_var(stmt.target)} = self.get_coefficient({self._export_ir_var(stmt.idx)})\n"
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('get_coefficient')}({self._export_ir_var(stmt.idx)})\n"
             case ir.GetXAttr():
                 return f"{indent}{self._export_ir_var(stmt.target)} = xattr[{self._export_ir_var(stmt.idx)}]\n"
             case ir.GetXAttrAlt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = xattr_alt[{self._export_ir_var(stmt.idx)}]\n"
             case ir.GetSecret():
-                return (
-                    f"{indent}{self._export_ir_var(stmt.target)} = self.get_secret()\n"
-                )
+                return f"{indent}{self._export_ir_var(stmt.target)} = {self._method('get_secret')}()\n"
             case ir.SetIndex():
                 return f'{indent}idx = "{stmt.literal}"\n'
             case ir.AppendIndexLiteral():
                 return f'{indent}idx += "{stmt.literal}"\n'
             case ir.AppendIndex():
                 return f"{indent}idx += {self._export_ir_func(stmt.conversion)}({self._export_ir_var(stmt.source)})\n"
+            case ir.SetIndexKey():
+                # Keys are tuples of the family and the (already interned)
+                # strings of the indices
+                key = [str(stmt.family)] + [self._export_ir_expr(p) for p in stmt.parts]
+                if len(key) == 1:
+                    return f"{indent}idx = ({key[0]},)\n"
+                return f"{indent}idx = ({', '.join(key)})\n"
             case _:
                 raise NotImplementedError()
 
@@ -103,9 +272,9 @@ class Charm:
             case ir.Call():
                 match expr.func:
                     case ir.IrFunc.ATTRIBUTE_TO_LABEL:
-                        return f"self.map_attribute_to_label({self._export_ir_expr(expr.args[0])})"
+                        return f"{self._method('map_attribute_to_label')}({self._export_ir_expr(expr.args[0])})"
                     case ir.IrFunc.ATTRIBUTE_TO_AUTHORITY:
-                        return f"self.map_attribute_to_authority({self._export_ir_expr(expr.args[0])})"
+                        return f"{self._method('map_attribute_to_authority')}({self._export_ir_expr(expr.args[0])})"
                     case ir.IrFunc.ATTRIBUTE_TO_XATTR:
                         return f"{self._export_ir_expr(expr.args[0])}.attr_repr.xattr"
                     case ir.IrFunc.LSSS_ROW_TO_AUTHORITY:
@@ -155,39 +324,47 @@ class Charm:
                 return "acc_gt"
 
             case "msk.alphas":
-                return f"MSK['alpha'][{self._export_ir_expr(var.index)}]"
+                return self._entry("MSK", "alpha", var)
             case "mpk.alphas":
-                return f"MPK['alpha'][{self._export_ir_expr(var.index)}]"
+                return self._entry("MPK", "alpha", var)
             case "msk.common_vars":
-                return f"MSK['b'][{self._export_ir_expr(var.index)}]"
+                return self._entry("MSK", "b", var)
             case "mpk.common_vars_g":
-                return f"MPK['b_g'][{self._export_ir_expr(var.index)}]"
+                return self._entry("MPK", "b_g", var)
             case "mpk.common_vars_h":
-                return f"MPK['b_h'][{self._export_ir_expr(var.index)}]"
+                return self._entry("MPK", "b_h", var)
+            case "mpk.tables_g":
+                return self._entry("MPK", "b_g_pp", var)
+            case "mpk.tables_h":
+                return self._entry("MPK", "b_h_pp", var)
 
             case "usk.polys_g":
-                return f"SK['k_g'][{self._export_ir_expr(var.index)}]"
+                return self._entry("SK", "k_g", var)
             case "usk.polys_h":
-                return f"SK['k_h'][{self._export_ir_expr(var.index)}]"
+                return self._entry("SK", "k_h", var)
             case "usk.randoms_g":
-                return f"SK['r_g'][{self._export_ir_expr(var.index)}]"
+                return self._entry("SK", "r_g", var)
             case "usk.randoms_h":
-                return f"SK['r_h'][{self._export_ir_expr(var.index)}]"
+                return self._entry("SK", "r_h", var)
+            case "usk.tables_polys_g":
+                return self._entry("SK", "k_g_pp", var)
+            case "usk.tables_randoms_g":
+                return self._entry("SK", "r_g_pp", var)
 
             case "blinding_poly":
                 return "blinding_poly"
             case "ct.blinding_poly":
-                return "CT['C']"
+                return self._container("CT", "C")
             case "ct.primaries_g":
-                return f"CT['bold_C_g'][{self._export_ir_expr(var.index)}]"
+                return self._entry("CT", "bold_C_g", var)
             case "ct.primaries_h":
-                return f"CT['bold_C_h'][{self._export_ir_expr(var.index)}]"
+                return self._entry("CT", "bold_C_h", var)
             case "ct.secondaries":
-                return f"CT['bold_C_prime'][{self._export_ir_expr(var.index)}]"
+                return self._entry("CT", "bold_C_prime", var)
             case "ct.randoms_g":
-                return f"CT['bold_s_g'][{self._export_ir_expr(var.index)}]"
+                return self._entry("CT", "bold_s_g", var)
             case "ct.randoms_h":
-                return f"CT['bold_s_h'][{self._export_ir_expr(var.index)}]"
+                return self._entry("CT", "bold_s_h", var)
 
             case "lone_randoms":
                 if var.index:
@@ -225,7 +402,7 @@ class Charm:
                 return "ls_row_to_dedup"
 
             case ir.IrFunc.ATTRIBUTE_TO_STRING:
-                return "self.string_of_attribute"
+                return self._method("string_of_attribute")
             case ir.IrFunc.LABEL_TO_STRING:
                 return "str"
             case ir.IrFunc.AUTHORITY_TO_STRING:
@@ -235,6 +412,17 @@ class Charm:
             case ir.IrFunc.DEDUP_IDX_TO_STRING:
                 return "str"
 
+            case ir.IrFunc.ATTRIBUTE_TO_ID:
+                return self._method("string_of_attribute")
+            case ir.IrFunc.LABEL_TO_ID:
+                return "str"
+            case ir.IrFunc.AUTHORITY_TO_ID:
+                return "str"
+            case ir.IrFunc.LSSS_ROW_TO_ID:
+                return "str"
+            case ir.IrFunc.DEDUP_IDX_TO_ID:
+                return "str"
+
     def _export_qset(self, qset: QSet) -> str:
         match qset:
             case QSet.ATTRIBUTE_UNIVERSE:
@@ -287,3 +475,11 @@ class Charm:
 
     def _indent(self, width) -> str:
         return " " * 4 * width
+
+
+def _is_row_loop(stmt: ir.IrStmt) -> bool:
+    return isinstance(stmt, ir.Loop) and stmt.set in (
+        QSet.LINEAR_COMBINATION_INDICES,
+        QSet.POS_LINEAR_COMBINATION_INDICES,
+        QSet.NEG_LINEAR_COMBINATION_INDICES,
+    )
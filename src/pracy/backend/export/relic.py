@@ -1,6 +1,10 @@
 from pracy.backend import ir
 from pracy.core.qset import QSet
 
+# The bound of the small integer literals pooled by the operations, which has
+# to be `Z_POOL_BOUND` of backends/relic/include/ops.h
+_Z_POOL_BOUND = 16
+
 
 class Relic:
 
@@ -35,7 +39,15 @@ class Relic:
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.add_z({self._export_ir_var(stmt.lhs)}, {self._export_ir_var(stmt.rhs)});\n"
             case ir.MulZ():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.mul_z({self._export_ir_var(stmt.lhs)}, {self._export_ir_var(stmt.rhs)});\n"
+            case ir.AddAssignZ():
+                return f"{indent}ops.add_assign_z({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.MulAssignZ():
+                return f"{indent}ops.mul_assign_z({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.source)});\n"
             case ir.SetZ():
+                value = self._small_int(stmt.value)
+                if value is not None:
+                    # Taken from the pool of reduced literals
+                    return f"{indent}{self._export_ir_var(stmt.target)} = ops.const_z({value});\n"
                 return f'{indent}{self._export_ir_var(stmt.target)} = ops.read_z("{stmt.value}");\n'
             case ir.NegZ():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.neg_z({self._export_ir_var(stmt.source)});\n"
@@ -47,26 +59,72 @@ class Relic:
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.add_g({self._export_ir_var(stmt.lhs)}, {self._export_ir_var(stmt.rhs)});\n"
             case ir.ScaleG():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.scale_g({self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.AddAssignG():
+                return f"{indent}ops.add_assign_g({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.ScaleAssignG():
+                return f"{indent}ops.scale_assign_g({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)});\n"
             case ir.FdhG():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.fdh_g({stmt.idx}, {self._export_ir_var(stmt.arg)});\n"
+            case ir.PrecomputeG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.precompute_g({self._export_ir_var(stmt.source)});\n"
+            case ir.ScaleFixG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.scale_fix_g({self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.table)});\n"
+            case ir.ResetTermsG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.reset_terms_g();\n"
+            case ir.AddTermG():
+                return f"{indent}ops.add_term_g({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.MultiScaleG():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.multi_scale_g({self._export_ir_var(stmt.source)});\n"
             case ir.LiftH():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.lift_h({self._export_ir_var(stmt.source)});\n"
             case ir.AddH():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.add_h({self._export_ir_var(stmt.lhs)}, {self._export_ir_var(stmt.rhs)});\n"
             case ir.ScaleH():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.scale_h({self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.AddAssignH():
+                return f"{indent}ops.add_assign_h({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.ScaleAssignH():
+                return f"{indent}ops.scale_assign_h({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)});\n"
             case ir.FdhH():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.fdh_h({stmt.idx}, {self._export_ir_var(stmt.arg)});\n"
+            case ir.PrecomputeH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.precompute_h({self._export_ir_var(stmt.source)});\n"
+            case ir.ScaleFixH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.scale_fix_h({self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.table)});\n"
+            case ir.ResetTermsH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.reset_terms_h();\n"
+            case ir.AddTermH():
+                return f"{indent}ops.add_term_h({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.MultiScaleH():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.multi_scale_h({self._export_ir_var(stmt.source)});\n"
             case ir.LiftGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.lift_gt({self._export_ir_var(stmt.source)});\n"
             case ir.AddGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.add_gt({self._export_ir_var(stmt.lhs)}, {self._export_ir_var(stmt.rhs)});\n"
             case ir.ScaleGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.scale_gt({self._export_ir_var(stmt.coeff)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.AddAssignGt():
+                return f"{indent}ops.add_assign_gt({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.source)});\n"
+            case ir.ScaleAssignGt():
+                return f"{indent}ops.scale_assign_gt({self._export_ir_var(stmt.target)}, {self._export_ir_var(stmt.coeff)});\n"
             case ir.InvGt():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.inv_gt({self._export_ir_var(stmt.source)});\n"
             case ir.Pair():
                 return f"{indent}{self._export_ir_var(stmt.target)} = ops.pair({self._export_ir_var(stmt.source_g)}, {self._export_ir_var(stmt.source_h)});\n"
+            case ir.ResetPairs():
+                return (
+                    f"{indent}{self._export_ir_var(stmt.target)} = ops.reset_pairs();\n"
+                )
+            case ir.AddPair():
+                args = [stmt.target, stmt.source_g, stmt.source_h]
+                method = "add_pair"
+                if stmt.coeff is not None:
+                    args.append(stmt.coeff)
+                    method = f"add_pair_{stmt.group.name.lower()}"
+                exported = ", ".join(self._export_ir_var(a) for a in args)
+                return f"{indent}ops.{method}({exported});\n"
+            case ir.MultiPair():
+                return f"{indent}{self._export_ir_var(stmt.target)} = ops.multi_pair({self._export_ir_var(stmt.source)});\n"
             case ir.GetRgidG():
                 return (
                     f"{indent}{self._export_ir_var(stmt.target)} = env.get_rgid_g();\n"
@@ -95,6 +153,9 @@ class Relic:
                 return f'{indent}idx += "{stmt.literal}";\n'
             case ir.AppendIndex():
                 return f"{indent}idx += {self._export_ir_func(stmt.conversion)}({self._export_ir_var(stmt.source)});\n"
+            case ir.SetIndexKey():
+                parts = "".join(f", {self._export_ir_expr(p)}" for p in stmt.parts)
+                return f"{indent}idx = index_key({stmt.family}{parts});\n"
             case _:
                 raise NotImplementedError
 
@@ -117,6 +178,7 @@ class Relic:
         name_map = {
             "usk.randoms_g": "usk.non_lone_vars_g",
             "usk.randoms_h": "usk.non_lone_vars_h",
+            "usk.tables_randoms_g": "usk.tables_non_lone_vars_g",
             "ct.primaries_g": "ct.primary_polys_g",
             "ct.primaries_h": "ct.primary_polys_h",
             "ct.secondaries": "ct.secondary_polys",
@@ -157,6 +219,16 @@ class Relic:
                 res = "env.ls_row_to_string"
             case ir.IrFunc.DEDUP_IDX_TO_STRING:
                 res = "env.dedup_idx_to_string"
+            case ir.IrFunc.ATTRIBUTE_TO_ID:
+                res = "env.attr_to_id"
+            case ir.IrFunc.LABEL_TO_ID:
+                res = "env.lbl_to_id"
+            case ir.IrFunc.AUTHORITY_TO_ID:
+                res = "env.auth_to_id"
+            case ir.IrFunc.LSSS_ROW_TO_ID:
+                res = "env.ls_row_to_id"
+            case ir.IrFunc.DEDUP_IDX_TO_ID:
+                res = "env.dedup_idx_to_id"
             case _:
                 raise NotImplementedError
         return res
@@ -215,5 +287,15 @@ class Relic:
                 res = "Attr"
         return res
 
+    def _small_int(self, value) -> int | None:
+        """Return `value` if it is an integer in the pool of `Ops::const_z`."""
+        try:
+            res = int(str(value))
+        except ValueError:
+            return None
+        if abs(res) > _Z_POOL_BOUND:
+            return None
+        return res
+
     def _indent(self, width) -> str:
         return " " * 4 * width
@@ -0,0 +1,47 @@
+"""
+An interpreter for pracys IR.
+
+Instead of exporting the programs of a scheme (see `pracy.backend.export`)
+and running them with a backend, the `Interpreter` evaluates them directly,
+including their loops, the index strings (or structured keys) and the calls
+to the environment (see `pracy.backend.interp.env`). The group operations
+are delegated to a `GroupEngine`:
+
+- the `MockEngine` represents group elements by their discrete logarithms,
+  which checks the correctness of a scheme in milliseconds (see
+  `check_correctness`),
+- the `BatchEngine` (see `pracy.backend.interp.batch`, which requires NumPy)
+  runs a whole batch of instances at once, which `pracy.backend.interp.fuzz`
+  uses to check schemes for random policies,
+- the `CharmEngine` (see `pracy.backend.interp.charm`, which requires Charm)
+  runs the programs on a real pairing group.
+"""
+
+from pracy.backend import ir
+from pracy.backend.interp.engine import GroupEngine, MockEngine
+from pracy.backend.interp.env import Entry, Env, EnvError
+from pracy.backend.interp.interpreter import Interpreter, InterpreterError
+from pracy.backend.ir import IrType
+
+
+def check_correctness(programs, engine: GroupEngine, env: Env):
+    """
+    Run setup, keygen, encrypt and decrypt of a scheme (as returned by
+    `pracy.compile_spec`) in `env` and return whether decrypt recovers the
+    blinding value of the ciphertext (for each instance, if `engine` runs a
+    batch of them). The user attributes of `env` have to satisfy its policy.
+    """
+    if not env.is_satisfied():
+        raise EnvError("The user attributes do not satisfy the policy")
+    interpreter = Interpreter(engine, env)
+    setup, keygen, encrypt, decrypt = programs
+    interpreter.run_program(setup)
+    interpreter.run_program(keygen)
+    interpreter.prepare_key()
+    interpreter.run_program(encrypt)
+    interpreter.run_program(decrypt)
+    return engine.equal(
+        IrType.GT,
+        interpreter.read(ir.BLINDING_POLY),
+        interpreter.read(ir.CT_BLINDING_POLY),
+    )
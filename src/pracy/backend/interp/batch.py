@@ -0,0 +1,87 @@
+"""
+A group engine running a batch of instances at once, which requires NumPy.
+
+Like the `MockEngine`, the `BatchEngine` represents group elements by their
+discrete logarithms, but every value is a vector holding one value per
+instance of the batch. All instances run the same statements (i.e., share
+the policy and the user attributes), but differ in all random values: the
+secret, its shares, the keys, the hashes and the attribute values. The
+cost of interpreting a statement is thus shared by the whole batch.
+"""
+
+import hashlib
+
+import numpy as np
+
+from pracy.backend.interp.engine import GroupEngine
+
+# The largest prime below 2^32, such that products fit into uint64
+P = 4294967291
+
+
+class BatchEngine(GroupEngine):
+    """
+    Runs `size` instances modulo the prime `p`, which has to be below 2^32.
+    `equal` compares the instances one by one, i.e., returns a vector of
+    booleans.
+    """
+
+    def __init__(self, size: int, p: int = P, seed=None):
+        if p >= 2**32:
+            raise ValueError("The products of the elements have to fit into uint64")
+        self.size = size
+        self.p = np.uint64(p)
+        self.rng = np.random.default_rng(seed)
+        # Every instance has a random oracle of its own
+        self._salts = self.rng.integers(0, 2**64, size, dtype=np.uint64)
+
+    def sample_z(self):
+        return self.rng.integers(0, self.p, self.size, dtype=np.uint64)
+
+    def z(self, value: int):
+        return np.full(self.size, value % int(self.p), dtype=np.uint64)
+
+    def add_z(self, lhs, rhs):
+        return (lhs + rhs) % self.p
+
+    def mul_z(self, lhs, rhs):
+        return (lhs * rhs) % self.p
+
+    def neg_z(self, source):
+        return (self.p - source) % self.p
+
+    def inv_z(self, source):
+        # Fermat's little theorem, i.e., source^(p - 2)
+        res = self.z(1)
+        base = source
+        exponent = int(self.p) - 2
+        while exponent:
+            if exponent & 1:
+                res = self.mul_z(res, base)
+            base = self.mul_z(base, base)
+            exponent >>= 1
+        return res
+
+    def lift(self, group, coeff):
+        return coeff
+
+    def add(self, group, lhs, rhs):
+        return self.add_z(lhs, rhs)
+
+    def scale(self, group, coeff, source):
+        return self.mul_z(coeff, source)
+
+    def fdh(self, group, idx, arg):
+        data = f"{group.value}\0{idx}\0{arg}".encode()
+        digest = np.uint64(int.from_bytes(hashlib.sha256(data).digest()[:8], "big"))
+        return _mix(self._salts ^ digest) % self.p
+
+    def pair(self, source_g, source_h):
+        return self.mul_z(source_g, source_h)
+
+
+def _mix(x):
+    """The finalizer of SplitMix64 (wrapping modulo 2^64), applied to each entry of `x`."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
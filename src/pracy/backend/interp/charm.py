@@ -0,0 +1,77 @@
+"""
+A group engine backed by Charm (https://github.com/JHUISI/charm), which has
+to be installed to use it.
+"""
+
+from charm.toolbox.pairinggroup import G1, G2, GT, ZR, PairingGroup, pair
+
+from pracy.backend.interp.engine import GroupEngine
+from pracy.backend.ir import IrType
+
+_SUBGROUPS = {IrType.G: G1, IrType.H: G2, IrType.GT: GT}
+
+
+class CharmEngine(GroupEngine):
+    """
+    Runs the programs on the pairing group `curve` of Charm (e.g. "SS512" or
+    "BN254"), with random generators of G and H like the Charm backend.
+    """
+
+    def __init__(self, curve: str = "SS512"):
+        self.group = PairingGroup(curve)
+        self.generators = {
+            IrType.G: self._generator(G1),
+            IrType.H: self._generator(G2),
+        }
+        self.generators[IrType.GT] = pair(
+            self.generators[IrType.G], self.generators[IrType.H]
+        )
+        for generator in self.generators.values():
+            generator.initPP()
+
+    def _generator(self, subgroup):
+        one = self.group.init(subgroup, 1)
+        generator = self.group.random(subgroup)
+        while generator == one:
+            generator = self.group.random(subgroup)
+        return generator
+
+    def sample_z(self):
+        return self.group.random(ZR)
+
+    def z(self, value):
+        return self.group.init(ZR, value)
+
+    def add_z(self, lhs, rhs):
+        return lhs + rhs
+
+    def mul_z(self, lhs, rhs):
+        return lhs * rhs
+
+    def neg_z(self, source):
+        return -source
+
+    def inv_z(self, source):
+        return source ** (-1)
+
+    def lift(self, group, coeff):
+        return self.generators[group] ** coeff
+
+    def add(self, group, lhs, rhs):
+        return lhs * rhs
+
+    def scale(self, group, coeff, source):
+        return source**coeff
+
+    def fdh(self, group, idx, arg):
+        return self.group.hash(f"{idx}:{arg}", _SUBGROUPS[group])
+
+    def pair(self, source_g, source_h):
+        return pair(source_g, source_h)
+
+    def multi_pair(self, pairs):
+        if not pairs:
+            return self.identity(IrType.GT)
+        # Exponentiating in the source group is cheaper than in Gt
+        g1s = [g if c is None else g**c for g, _, c in pairs]
+        return self.group.pair_prod(g1s, [h for _, h, _ in pairs])
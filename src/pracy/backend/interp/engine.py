@@ -0,0 +1,135 @@
+"""
+Group engines for the interpreter.
+
+An engine implements the scalars (Z) and the groups G, H and Gt of a
+pairing-friendly curve. Following the IR, all groups are written additively
+(e.g. `add(GT, a, b)` is the product of `a` and `b` in Gt), elements of G,
+H and Gt are only combined with elements of the same group and the pairing
+maps G x H to Gt.
+"""
+
+import hashlib
+import random
+
+from pracy.backend.ir import IrType
+
+# The groups of an engine
+GROUPS = (IrType.G, IrType.H, IrType.GT)
+
+
+class GroupEngine:
+    """
+    The operations the interpreter needs. Multi-scalar multiplications and
+    products of pairings are evaluated term by term unless an engine
+    overrides `multi_scale` and `multi_pair`.
+    """
+
+    def sample_z(self):
+        raise NotImplementedError
+
+    def z(self, value: int):
+        """Return the scalar `value` (which may be negative)."""
+        raise NotImplementedError
+
+    def add_z(self, lhs, rhs):
+        raise NotImplementedError
+
+    def mul_z(self, lhs, rhs):
+        raise NotImplementedError
+
+    def neg_z(self, source):
+        raise NotImplementedError
+
+    def inv_z(self, source):
+        raise NotImplementedError
+
+    def lift(self, group: IrType, coeff):
+        """Return the generator of `group` multiplied by `coeff`."""
+        raise NotImplementedError
+
+    def add(self, group: IrType, lhs, rhs):
+        raise NotImplementedError
+
+    def scale(self, group: IrType, coeff, source):
+        raise NotImplementedError
+
+    def fdh(self, group: IrType, idx: int, arg: str):
+        """Hash `arg` to `group` with the `idx`-th hash function."""
+        raise NotImplementedError
+
+    def pair(self, source_g, source_h):
+        raise NotImplementedError
+
+    def equal(self, group: IrType, lhs, rhs) -> bool:
+        return lhs == rhs
+
+    def identity(self, group: IrType):
+        return self.lift(group, self.z(0))
+
+    def multi_scale(self, group: IrType, terms):
+        """Return the sum of `coeff * source` for all `(coeff, source)` in `terms`."""
+        res = self.identity(group)
+        for coeff, source in terms:
+            res = self.add(group, res, self.scale(group, coeff, source))
+        return res
+
+    def multi_pair(self, pairs):
+        """
+        Return the product of `e(source_g, source_h)^coeff` for all
+        `(source_g, source_h, coeff)` in `pairs` (`coeff` may be None).
+        """
+        res = self.identity(IrType.GT)
+        for source_g, source_h, coeff in pairs:
+            value = self.pair(source_g, source_h)
+            if coeff is not None:
+                value = self.scale(IrType.GT, coeff, value)
+            res = self.add(IrType.GT, res, value)
+        return res
+
+
+class MockEngine(GroupEngine):
+    """
+    Represents the elements of all groups by their discrete logarithms modulo
+    the prime `p` (the group order), hence the generators are 1 and a pairing
+    is the product of its arguments. This is insecure, but runs the programs
+    of a scheme in milliseconds and decides exactly the same equations as a
+    real curve (up to a negligible probability).
+    """
+
+    def __init__(self, p: int = 2**127 - 1, seed=None):
+        self.p = p
+        self.rng = random.Random(seed)
+
+    def sample_z(self):
+        return self.rng.randrange(self.p)
+
+    def z(self, value: int):
+        return value % self.p
+
+    def add_z(self, lhs, rhs):
+        return (lhs + rhs) % self.p
+
+    def mul_z(self, lhs, rhs):
+        return (lhs * rhs) % self.p
+
+    def neg_z(self, source):
+        return -source % self.p
+
+    def inv_z(self, source):
+        return pow(source, -1, self.p)
+
+    def lift(self, group, coeff):
+        return coeff
+
+    def add(self, group, lhs, rhs):
+        return (lhs + rhs) % self.p
+
+    def scale(self, group, coeff, source):
+        return (coeff * source) % self.p
+
+    def fdh(self, group, idx, arg):
+        data = f"{group.value}\0{idx}\0{arg}".encode()
+        return int.from_bytes(hashlib.sha256(data).digest(), "big") % self.p
+
+    def pair(self, source_g, source_h):
+        return (source_g * source_h) % self.p
@@ -0,0 +1,273 @@
+"""
+The environment of the interpreted programs, i.e., the policy, the user
+attributes and the values the programs query (see `pracy.backend.ir`, e.g.
+`GetLambda` or the sets looped over).
+
+By default, this mirrors the environment of the Relic backend (see
+backends/relic/src/env.cpp): a policy is the conjunction of its attributes,
+some of which may be negated, and the secret is shared additively. Other
+policies are given by their LSSS matrix (e.g. built by
+`pracy.backend.interp.policy.lsss`) and the rows the user reconstructs the
+secret from, all with the coefficient (`epsilon`) 1.
+"""
+
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pracy.backend.interp.engine import GroupEngine
+from pracy.backend.ir import IrType
+from pracy.core.qset import QSet
+
+
+@dataclass(frozen=True)
+class Entry:
+    auth: str
+    lbl: str
+    attr: str
+
+    def __str__(self):
+        return f"{self.auth}.{self.lbl}:{self.attr}"
+
+
+class EnvError(Exception):
+    pass
+
+
+def satisfied_rows(
+    user_attrs: list[Entry], policy: list[Entry], negations: Collection[int] = ()
+) -> set[int]:
+    """
+    Return the rows of `policy` satisfied by `user_attrs`, where the rows in
+    `negations` are satisfied by exactly one other attribute with the same
+    authority and label (and not by the attribute of the row itself).
+    """
+    res = set()
+    for row, entry in enumerate(policy):
+        if row not in negations:
+            if entry in user_attrs:
+                res.add(row)
+            continue
+        alternatives = _alternatives(user_attrs, entry)
+        if entry not in user_attrs and len(alternatives) == 1:
+            res.add(row)
+    return res
+
+
+class Env:
+    """
+    The environment for the `user_attrs` and the `policy` of entries, where
+    the rows in `negations` are negated (see `satisfied_rows`).
+
+    The policy is the conjunction of its entries unless its LSSS `matrix`
+    (a list of integer rows) and the rows `lin_comb` the user combines are
+    given. Random values are sampled with `engine`.
+    """
+
+    def __init__(
+        self,
+        engine: GroupEngine,
+        user_attrs: Sequence[Entry],
+        policy: Sequence[Entry],
+        negations: Sequence[int] = (),
+        matrix: list[list[int]] | None = None,
+        lin_comb: list[int] | None = None,
+    ):
+        self.engine = engine
+        self.user_attrs = list(user_attrs)
+        self.policy = list(policy)
+        self.negations = set(negations)
+        if matrix is None:
+            matrix = _conjunction(len(self.policy))
+        if len(matrix) != len(self.policy):
+            raise EnvError("The LSSS matrix needs exactly one row per entry")
+        self.matrix = [list(row) for row in matrix]
+        if lin_comb is None:
+            lin_comb = list(range(len(self.policy)))
+        self.lin_comb = list(lin_comb)
+        self._attr_to_auth: dict[str, str] = {}
+        self._attr_to_lbl: dict[str, str] = {}
+        for entry in self.policy + self.user_attrs:
+            if self._attr_to_auth.setdefault(entry.attr, entry.auth) != entry.auth:
+                raise EnvError("Conflicting attr->auth mapping")
+            if self._attr_to_lbl.setdefault(entry.attr, entry.lbl) != entry.lbl:
+                raise EnvError("Conflicting attr->lbl mapping")
+        entries = self.policy + self.user_attrs
+        self._auths = sorted({e.auth for e in entries})
+        self._lbls = sorted({e.lbl for e in entries})
+        self._attr_uni = sorted({e.attr for e in entries})
+        self._ids: dict[object, int] = {}
+        self._xattrs: dict[str, Any] = {}
+
+        self.secret = engine.sample_z()
+        self._rgid_g = engine.sample_z()
+        self._rgid_h = engine.sample_z()
+        self._lambdas = self._share(self.secret)
+        self._mus = self._share(engine.z(0))
+
+    @classmethod
+    def random(
+        cls,
+        engine: GroupEngine,
+        policy_len: int = 5,
+        multi_auth: bool = False,
+        negations: bool = False,
+    ) -> "Env":
+        """
+        Return the environment the Relic backend checks the correctness of a
+        scheme with (see `check_correctness` in backends/relic/src/main.cpp):
+        the policy is the conjunction of all `policy_len` user attributes (or
+        of their negations if `negations` is set), which belong to different
+        authorities if `multi_auth` is set.
+        """
+        user_attrs = []
+        for i in range(policy_len):
+            auth = f"A{chr(ord('A') + i)}" if multi_auth else "AA"
+            user_attrs.append(Entry(auth, f"l{i}", f"{i:02}"))
+        if not negations:
+            return cls(engine, user_attrs, user_attrs)
+        policy = [Entry(e.auth, e.lbl, f"{e.attr}_neg") for e in user_attrs]
+        return cls(engine, user_attrs, policy, list(range(policy_len)))
+
+    def _share(self, secret) -> list:
+        """Return random shares of `secret` for the rows of the policy."""
+        e = self.engine
+        columns = max((len(row) for row in self.matrix), default=1)
+        vector = [secret] + [e.sample_z() for _ in range(columns - 1)]
+        shares = []
+        for row in self.matrix:
+            share = e.z(0)
+            for entry, value in zip(row, vector):
+                if entry == 1:
+                    share = e.add_z(share, value)
+                elif entry == -1:
+                    share = e.add_z(share, e.neg_z(value))
+                elif entry != 0:
+                    share = e.add_z(share, e.mul_z(e.z(entry), value))
+            shares.append(share)
+        return shares
+
+    def is_satisfied(self) -> bool:
+        """
+        Whether the user attributes satisfy the rows they combine and these
+        rows sum up to (1, 0, ..., 0).
+        """
+        satisfied = satisfied_rows(self.user_attrs, self.policy, self.negations)
+        if not satisfied.issuperset(self.lin_comb):
+            return False
+        columns = max((len(row) for row in self.matrix), default=1)
+        sums = [0] * columns
+        for row in self.lin_comb:
+            for column, entry in enumerate(self.matrix[row]):
+                sums[column] += entry
+        return sums == [1] + [0] * (columns - 1)
+
+    def elements(self, qset: QSet) -> list:
+        """Return the elements of `qset`."""
+        rows = range(len(self.policy))
+        match qset:
+            case QSet.ATTRIBUTE_UNIVERSE:
+                return list(self._attr_uni)
+            case QSet.USER_ATTRIBUTES:
+                return [e.attr for e in self.user_attrs]
+            case QSet.LABELS:
+                return list(self._lbls)
+            case QSet.AUTHORITIES:
+                return list(self._auths)
+            case QSet.LSSS_ROWS:
+                return list(rows)
+            case QSet.POS_LSSS_ROWS:
+                return [i for i in rows if i not in self.negations]
+            case QSet.NEG_LSSS_ROWS:
+                return [i for i in rows if i in self.negations]
+            case QSet.LINEAR_COMBINATION_INDICES:
+                return list(self.lin_comb)
+            case QSet.POS_LINEAR_COMBINATION_INDICES:
+                return [i for i in self.lin_comb if i not in self.negations]
+            case QSet.NEG_LINEAR_COMBINATION_INDICES:
+                return [i for i in self.lin_comb if i in self.negations]
+            case QSet.DEDUPLICATION_INDICES:
+                # For now all attributes are unique in all aspects
+                return [1]
+        raise EnvError(f"Unknown set {qset}")
+
+    def intern(self, value) -> int:
+        """Return the id of `value` in structured index keys."""
+        return self._ids.setdefault(value, len(self._ids))
+
+    def attr_to_auth(self, attr: str) -> str:
+        if attr not in self._attr_to_auth:
+            raise EnvError("Cannot compute authority for unknown attribute")
+        return self._attr_to_auth[attr]
+
+    def attr_to_lbl(self, attr: str) -> str:
+        if attr not in self._attr_to_lbl:
+            raise EnvError("Cannot compute label for unknown attribute")
+        return self._attr_to_lbl[attr]
+
+    def ls_row_to_auth(self, row: int) -> str:
+        return self.policy[row].auth
+
+    def ls_row_to_lbl(self, row: int) -> str:
+        return self.policy[row].lbl
+
+    def ls_row_to_attr(self, row: int) -> str:
+        return self.policy[row].attr
+
+    def ls_row_to_alt_attr(self, row: int) -> str:
+        alternatives = _alternatives(self.user_attrs, self.policy[row])
+        if len(alternatives) != 1:
+            raise EnvError("No (unique) alternative attribute could be found")
+        return alternatives[0].attr
+
+    def ls_row_to_dedup_idx(self, row: int) -> int:
+        return 1
+
+    def get_rgid_g(self):
+        return self.engine.lift(IrType.G, self._rgid_g)
+
+    def get_rgid_h(self):
+        return self.engine.lift(IrType.H, self._rgid_h)
+
+    def get_lambda(self, row: int):
+        return self._lambdas[row]
+
+    def get_mu(self, row: int):
+        return self._mus[row]
+
+    def get_epsilon(self, row: int):
+        return self.engine.z(1)
+
+    def get_xattr(self, attr: str):
+        if attr not in self._xattrs:
+            self._xattrs[attr] = self.engine.sample_z()
+        return self._xattrs[attr]
+
+    def get_xattr_alt(self, row: int):
+        if self.policy[row] in self.user_attrs:
+            raise EnvError("Negation is not satisfied as the attribute is present")
+        return self.get_xattr(self.ls_row_to_alt_attr(row))
+
+
+def _alternatives(user_attrs: list[Entry], entry: Entry) -> list[Entry]:
+    """Return the other user attributes with the authority and label of `entry`."""
+    return [
+        e
+        for e in user_attrs
+        if (e.auth, e.lbl) == (entry.auth, entry.lbl) and e.attr != entry.attr
+    ]
+
+
+def _conjunction(rows: int) -> list[list[int]]:
+    """
+    Return the LSSS matrix of the conjunction of `rows` entries, which shares
+    the secret additively like the Relic backend: the first row is all ones,
+    the others are the negated unit vectors.
+    """
+    matrix = []
+    for row in range(rows):
+        if row == 0:
+            matrix.append([1] * rows)
+        else:
+            matrix.append([-1 if column == row else 0 for column in range(rows)])
+    return matrix
@@ -0,0 +1,312 @@
+"""
+Randomized correctness sweeps of schemes, which require NumPy.
+
+`fuzz` samples random instances, i.e., policies of up to `max_rows` rows
+(see `pracy.backend.interp.policy`) with user attributes satisfying them,
+and checks every instance for a whole batch of random values at once with
+the `BatchEngine`. Policies only contain negations and multiple authorities
+if the programs of the scheme support them (see `features`). Failing
+instances are shrunk to a minimal reproducer (see `minimize`).
+"""
+
+import random
+import time
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from pracy.analysis.scheme import Scheme
+from pracy.backend import ir
+from pracy.backend.interp import check_correctness
+from pracy.backend.interp.batch import BatchEngine
+from pracy.backend.interp.env import Entry, Env, EnvError, satisfied_rows
+from pracy.backend.interp.interpreter import InterpreterError
+from pracy.backend.interp.policy import Gate, Leaf, Policy, leaves, lsss, select
+from pracy.core.qset import QSet
+
+# The functions of programs which depend on the authorities
+_AUTHORITY_FUNCS = {
+    ir.IrFunc.ATTRIBUTE_TO_AUTHORITY,
+    ir.IrFunc.LSSS_ROW_TO_AUTHORITY,
+}
+
+
+@dataclass(frozen=True)
+class Features:
+    negations: bool
+    authorities: bool
+
+
+@dataclass(frozen=True)
+class Instance:
+    """
+    A policy and the user attributes satisfying it. `seed` seeds the random
+    values of the batch and the choice of the rows the user combines.
+    """
+
+    policy: Policy
+    user_attrs: tuple[Entry, ...]
+    seed: int
+
+    def env(self, engine) -> Env:
+        entries, negations, satisfied = self._rows()
+        lin_comb = select(self.policy, satisfied, random.Random(self.seed))
+        if lin_comb is None:
+            raise EnvError("The user attributes do not satisfy the policy")
+        matrix = lsss(self.policy)
+        return Env(engine, self.user_attrs, entries, negations, matrix, lin_comb)
+
+    def is_valid(self) -> bool:
+        """Whether the user attributes satisfy the policy."""
+        *_, satisfied = self._rows()
+        return select(self.policy, satisfied) is not None
+
+    def _rows(self):
+        rows = leaves(self.policy)
+        entries = [leaf.entry for leaf in rows]
+        negations = [row for row, leaf in enumerate(rows) if leaf.negated]
+        satisfied = satisfied_rows(self.user_attrs, entries, negations)
+        return entries, negations, satisfied
+
+
+@dataclass
+class Failure:
+    instance: Instance
+    # The number of failed instances in the batch
+    failed: int
+    size: int
+    error: str | None = None
+
+    def __str__(self):
+        reason = f" ({self.error})" if self.error else ""
+        attrs = ", ".join(str(a) for a in self.instance.user_attrs)
+        return (
+            f"{self.failed}/{self.size} instances failed{reason}\n"
+            f"  policy: {self.instance.policy}\n"
+            f"  user attributes: {attrs}\n"
+            f"  reproduce: run(programs, {self.instance!r}, {self.size})"
+        )
+
+
+@dataclass
+class Report:
+    # The number of instances, each checked for a batch of `size` random values
+    instances: int
+    size: int
+    seconds: float
+    failures: list[Failure] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """The number of checked instances (times the batch size) per second."""
+        return self.instances * self.size / self.seconds
+
+
+def features(programs) -> Features:
+    """Return the features of policies the `programs` of a scheme support."""
+    sets: set[QSet] = set()
+    funcs: set[ir.IrFunc] = set()
+    for program in programs:
+        _collect(program, sets, funcs)
+    return Features(
+        negations=bool(
+            sets & {QSet.NEG_LSSS_ROWS, QSet.NEG_LINEAR_COMBINATION_INDICES}
+        ),
+        authorities=QSet.AUTHORITIES in sets or bool(funcs & _AUTHORITY_FUNCS),
+    )
+
+
+def _collect(stmts, sets, funcs):
+    for stmt in stmts:
+        match stmt:
+            case ir.Loop():
+                sets.add(stmt.set)
+                _collect(stmt.body, sets, funcs)
+            case ir.Alloc() | ir.StoreExpr():
+                _collect_expr(stmt.expr, funcs)
+            case ir.SetIndexKey():
+                for part in stmt.parts:
+                    _collect_expr(part, funcs)
+
+
+def _collect_expr(expr, funcs):
+    if isinstance(expr, ir.Call):
+        funcs.add(expr.func)
+        for arg in expr.args:
+            _collect_expr(arg, funcs)
+
+
+def random_instance(
+    rng: random.Random, rows: int, features: Features = Features(False, False)
+) -> Instance:
+    """
+    Return a random policy of `rows` rows, negated with a probability of 1/4
+    and spread over up to three authorities if `features` allow it, and
+    random user attributes satisfying it.
+    """
+    auths = ["AA"]
+    if features.authorities:
+        auths = [f"A{chr(ord('A') + i)}" for i in range(rng.randint(1, 3))]
+    rows_ = []
+    for row in range(rows):
+        entry = Entry(rng.choice(auths), f"l{row}", f"{row:02}")
+        rows_.append(Leaf(entry, features.negations and rng.random() < 0.25))
+    policy = _random_policy(rng, rows_)
+
+    satisfied = {row for row in range(rows) if rng.random() < 0.5}
+    if select(policy, satisfied) is None:
+        lin_comb = select(policy, set(range(rows)), rng)
+        assert lin_comb is not None  # all rows satisfy any policy
+        satisfied.update(lin_comb)
+    user_attrs = []
+    for row, leaf in enumerate(rows_):
+        entry = leaf.entry
+        if not leaf.negated:
+            if row in satisfied:
+                user_attrs.append(entry)
+        elif row in satisfied:
+            user_attrs.append(replace(entry, attr=f"{entry.attr}_alt"))
+        elif rng.random() < 0.5:
+            user_attrs.append(entry)
+    # Attributes the policy does not mention
+    for i in range(rows, rows + rng.randint(0, 2)):
+        user_attrs.append(Entry(rng.choice(auths), f"l{i}", f"{i:02}"))
+    rng.shuffle(user_attrs)
+    return Instance(policy, tuple(user_attrs), rng.randrange(2**32))
+
+
+def _random_policy(rng, rows):
+    if len(rows) == 1:
+        return rows[0]
+    children = rng.randint(2, min(3, len(rows)))
+    cuts = sorted(rng.sample(range(1, len(rows)), children - 1))
+    parts = [rows[a:b] for a, b in zip([0, *cuts], [*cuts, len(rows)])]
+    op = rng.choice(("and", "or"))
+    return Gate(op, tuple(_random_policy(rng, part) for part in parts))
+
+
+def run(programs, instance: Instance, size: int) -> Failure | None:
+    """Check `instance` for a batch of `size` random values."""
+    engine = BatchEngine(size, seed=instance.seed)
+    try:
+        correct = check_correctness(programs, engine, instance.env(engine))
+    except (EnvError, InterpreterError) as e:
+        return Failure(instance, size, size, str(e))
+    failed = size - int(np.count_nonzero(correct))
+    return Failure(instance, failed, size) if failed else None
+
+
+def minimize(programs, failure: Failure, size: int = 8) -> Failure:
+    """
+    Shrink the instance of `failure` while it keeps failing (for a batch of
+    `size` random values): drop user attributes and parts of the policy,
+    turn negations into plain attributes and merge all authorities.
+    """
+    changed = True
+    while changed:
+        changed = False
+        for candidate in _simplifications(failure.instance):
+            if not candidate.is_valid():
+                continue
+            smaller = run(programs, candidate, size)
+            if smaller is not None:
+                failure = smaller
+                changed = True
+                break
+    return failure
+
+
+def _simplifications(instance):
+    for i in range(len(instance.user_attrs)):
+        user_attrs = instance.user_attrs[:i] + instance.user_attrs[i + 1 :]
+        yield replace(instance, user_attrs=user_attrs)
+    for policy in _smaller_policies(instance.policy):
+        yield replace(instance, policy=policy)
+    for leaf in leaves(instance.policy):
+        if leaf.negated:
+            yield _without_negation(instance, leaf)
+    auths = {leaf.entry.auth for leaf in leaves(instance.policy)}
+    auths |= {entry.auth for entry in instance.user_attrs}
+    if len(auths) > 1:
+        yield _single_authority(instance)
+
+
+def _smaller_policies(policy):
+    """Yield the policies with a gate replaced by a child or a child removed."""
+    if isinstance(policy, Leaf):
+        return
+    yield from policy.children
+    for i, child in enumerate(policy.children):
+        if len(policy.children) > 2:
+            yield replace(
+                policy, children=policy.children[:i] + policy.children[i + 1 :]
+            )
+        for smaller in _smaller_policies(child):
+            children = policy.children[:i] + (smaller,) + policy.children[i + 1 :]
+            yield replace(policy, children=children)
+
+
+def _map_leaves(policy, func):
+    if isinstance(policy, Leaf):
+        return func(policy)
+    return replace(
+        policy, children=tuple(_map_leaves(c, func) for c in policy.children)
+    )
+
+
+def _without_negation(instance, negated):
+    """Turn `negated` into a plain attribute the user has iff it was satisfied."""
+    entry = negated.entry
+    user_attrs = []
+    for e in instance.user_attrs:
+        if e == entry:
+            continue
+        if (e.auth, e.lbl) == (entry.auth, entry.lbl):
+            user_attrs.append(entry)
+        else:
+            user_attrs.append(e)
+    policy = _map_leaves(
+        instance.policy, lambda leaf: Leaf(entry) if leaf == negated else leaf
+    )
+    return Instance(policy, tuple(user_attrs), instance.seed)
+
+
+def _single_authority(instance):
+    policy = _map_leaves(
+        instance.policy,
+        lambda leaf: replace(leaf, entry=replace(leaf.entry, auth="AA")),
+    )
+    user_attrs = tuple(replace(e, auth="AA") for e in instance.user_attrs)
+    return Instance(policy, user_attrs, instance.seed)
+
+
+def fuzz(
+    scheme: Scheme,
+    programs=None,
+    instances: int = 100,
+    size: int = 1000,
+    max_rows: int = 16,
+    seed=None,
+) -> Report:
+    """
+    Check `instances` random instances (see `random_instance`) of the analyzed
+    `scheme` for `size` random values each and return a report listing the
+    minimized failures. The `programs` of the scheme are compiled without any
+    options unless given.
+    """
+    if programs is None:
+        from pracy.backend.compiler.all import compile
+
+        programs = compile(scheme)
+    rng = random.Random(seed)
+    supported = features(programs)
+    report = Report(instances, size, 0.0)
+    start = time.perf_counter()
+    for _ in range(instances):
+        instance = random_instance(rng, rng.randint(1, max_rows), supported)
+        failure = run(programs, instance, size)
+        if failure is not None:
+            report.failures.append(failure)
+    report.seconds = time.perf_counter() - start
+    report.failures = [minimize(programs, f) for f in report.failures]
+    return report
@@ -0,0 +1,275 @@
+"""
+Runs IR programs (see `pracy.backend.ir`) directly.
+
+The keys and ciphertexts written by one program (e.g. `msk.alphas` by setup)
+are kept for the next ones, while the locals (e.g. `tmp_z` or `lone_randoms`)
+are dropped in between, see `Interpreter.run_program`. Indexed
+variables are maps from the value of the index, i.e., the index string built
+by `SetIndex` and `AppendIndex` or the structured key built by `SetIndexKey`,
+to the entries. Precomputation tables are represented by their base, the
+terms of multi-scalar multiplications and products of pairings by lists.
+"""
+
+from typing import Any
+
+from pracy.backend import ir
+from pracy.backend.interp.engine import GroupEngine
+from pracy.backend.interp.env import Env
+from pracy.backend.ir import IrType
+
+
+class InterpreterError(Exception):
+    pass
+
+
+# The group of the statements of each group operation
+_GROUPS = {
+    **dict.fromkeys(
+        (ir.ResetG, ir.LiftG, ir.AddG, ir.AddAssignG, ir.ScaleG, ir.ScaleAssignG),
+        IrType.G,
+    ),
+    **dict.fromkeys((ir.ScaleFixG, ir.FdhG, ir.MultiScaleG), IrType.G),
+    **dict.fromkeys(
+        (ir.ResetH, ir.LiftH, ir.AddH, ir.AddAssignH, ir.ScaleH, ir.ScaleAssignH),
+        IrType.H,
+    ),
+    **dict.fromkeys((ir.ScaleFixH, ir.FdhH, ir.MultiScaleH), IrType.H),
+    **dict.fromkeys(
+        (
+            ir.ResetGt,
+            ir.LiftGt,
+            ir.AddGt,
+            ir.AddAssignGt,
+            ir.ScaleGt,
+            ir.ScaleAssignGt,
+            ir.InvGt,
+        ),
+        IrType.GT,
+    ),
+}
+
+
+def _group(s: ir.IrStmt) -> IrType:
+    """Return the group the group operation `s` computes in."""
+    return _GROUPS[type(s)]
+
+
+# The accumulators of the group elements and their groups
+_ACCUMULATORS = ((ir.ACC_G, IrType.G), (ir.ACC_H, IrType.H), (ir.ACC_GT, IrType.GT))
+
+# The precomputation tables of a prepared user key and the elements they are
+# built for
+_PREPARED_KEY_TABLES = (
+    (ir.USK_TABLES_POLYS_G, ir.USK_POLYS_G),
+    (ir.USK_TABLES_RANDOMS_G, ir.USK_RANDOMS_G),
+)
+
+
+class Interpreter:
+    """Runs programs on the groups of `engine` in the environment `env`."""
+
+    def __init__(self, engine: GroupEngine, env: Env):
+        self.engine = engine
+        self.env = env
+        self.vars: dict[str, Any] = {}
+
+    def run_program(self, stmts: list[ir.IrStmt]):
+        """
+        Run the program `stmts`, starting without any locals but the
+        accumulators, which start at zero like in the backends.
+        """
+        self.vars = {n: v for n, v in self.vars.items() if _is_key_material(n)}
+        self.vars[ir.ACC_Z.name] = self.engine.z(0)
+        for var, group in _ACCUMULATORS:
+            self.vars[var.name] = self.engine.identity(group)
+        self.run(stmts)
+
+    def prepare_key(self):
+        """Prepare the user key for decrypt (see `compile_spec(prepared_key=...)`)."""
+        for table, base in _PREPARED_KEY_TABLES:
+            if base.name in self.vars:
+                self.vars[table.name] = dict(self.vars[base.name])
+
+    def run(self, stmts: list[ir.IrStmt]):
+        for stmt in stmts:
+            self._exec(stmt)
+
+    def read(self, var: ir.IrVar):
+        """Return the value of `var` (or of its entry at its index)."""
+        if var.name not in self.vars:
+            raise InterpreterError(f"'{var.name}' is read before it is written")
+        value = self.vars[var.name]
+        if var.index is None:
+            return value
+        key = self.eval(var.index)
+        if key not in value:
+            raise InterpreterError(f"'{var.name}' has no entry at '{key}'")
+        return value[key]
+
+    def write(self, var: ir.IrVar, value):
+        if var.index is None:
+            self.vars[var.name] = value
+        else:
+            self.vars.setdefault(var.name, {})[self.eval(var.index)] = value
+
+    def eval(self, expr: ir.IrExpr):
+        match expr:
+            case ir.Call():
+                return self._call(expr.func, *(self.eval(a) for a in expr.args))
+            case ir.Read():
+                return self.read(expr.source)
+            case ir.StringLiteral():
+                return expr.text
+            case ir.IntLiteral():
+                return expr.value
+        raise InterpreterError(f"Unknown expression {expr}")
+
+    def _call(self, func: ir.IrFunc, arg):
+        env = self.env
+        match func:
+            case ir.IrFunc.ATTRIBUTE_TO_LABEL:
+                return env.attr_to_lbl(arg)
+            case ir.IrFunc.ATTRIBUTE_TO_AUTHORITY:
+                return env.attr_to_auth(arg)
+            case ir.IrFunc.ATTRIBUTE_TO_XATTR:
+                return env.get_xattr(arg)
+            case ir.IrFunc.LSSS_ROW_TO_AUTHORITY:
+                return env.ls_row_to_auth(arg)
+            case ir.IrFunc.LSSS_ROW_TO_LABEL:
+                return env.ls_row_to_lbl(arg)
+            case ir.IrFunc.LSSS_ROW_TO_ATTR:
+                return env.ls_row_to_attr(arg)
+            case ir.IrFunc.LSSS_ROW_TO_ALT_ATTR:
+                return env.ls_row_to_alt_attr(arg)
+            case ir.IrFunc.LSSS_ROW_TO_DEDUP_INDICES:
+                return env.ls_row_to_dedup_idx(arg)
+            case (
+                ir.IrFunc.ATTRIBUTE_TO_STRING
+                | ir.IrFunc.LABEL_TO_STRING
+                | ir.IrFunc.AUTHORITY_TO_STRING
+                | ir.IrFunc.LSSS_ROW_TO_STRING
+                | ir.IrFunc.DEDUP_IDX_TO_STRING
+            ):
+                return str(arg)
+            case (
+                ir.IrFunc.ATTRIBUTE_TO_ID
+                | ir.IrFunc.LABEL_TO_ID
+                | ir.IrFunc.AUTHORITY_TO_ID
+                | ir.IrFunc.LSSS_ROW_TO_ID
+                | ir.IrFunc.DEDUP_IDX_TO_ID
+            ):
+                return env.intern(arg)
+        raise InterpreterError(f"Unknown function {func}")
+
+    def _exec(self, s: ir.IrStmt):
+        r, w, e = self.read, self.write, self.engine
+        match s:
+            case ir.Comment():
+                pass
+            case ir.Loop():
+                for element in self.env.elements(s.set):
+                    self.vars[s.var] = element
+                    self.run(s.body)
+            case ir.Alloc() | ir.StoreExpr():
+                w(s.target, self.eval(s.expr))
+            case ir.Store():
+                w(s.target, r(s.source))
+            case ir.ResetZ():
+                w(s.target, e.z(0))
+            case ir.SampleZ():
+                w(s.target, e.sample_z())
+            case ir.SetZ():
+                w(s.target, e.z(int(s.value)))
+            case ir.AddZ():
+                w(s.target, e.add_z(r(s.lhs), r(s.rhs)))
+            case ir.MulZ():
+                w(s.target, e.mul_z(r(s.lhs), r(s.rhs)))
+            case ir.AddAssignZ():
+                w(s.target, e.add_z(r(s.target), r(s.source)))
+            case ir.MulAssignZ():
+                w(s.target, e.mul_z(r(s.target), r(s.source)))
+            case ir.NegZ():
+                w(s.target, e.neg_z(r(s.source)))
+            case ir.InvZ():
+                w(s.target, e.inv_z(r(s.source)))
+            case ir.ResetG() | ir.ResetH() | ir.ResetGt():
+                w(s.target, e.identity(_group(s)))
+            case ir.LiftG() | ir.LiftH() | ir.LiftGt():
+                w(s.target, e.lift(_group(s), r(s.source)))
+            case ir.AddG() | ir.AddH() | ir.AddGt():
+                w(s.target, e.add(_group(s), r(s.lhs), r(s.rhs)))
+            case ir.AddAssignG() | ir.AddAssignH() | ir.AddAssignGt():
+                w(s.target, e.add(_group(s), r(s.target), r(s.source)))
+            case ir.ScaleG() | ir.ScaleH() | ir.ScaleGt():
+                w(s.target, e.scale(_group(s), r(s.coeff), r(s.source)))
+            case ir.ScaleAssignG() | ir.ScaleAssignH() | ir.ScaleAssignGt():
+                w(s.target, e.scale(_group(s), r(s.coeff), r(s.target)))
+            case ir.InvGt():
+                w(s.target, e.scale(_group(s), e.z(-1), r(s.source)))
+            case ir.PrecomputeG() | ir.PrecomputeH():
+                w(s.target, r(s.source))
+            case ir.ScaleFixG() | ir.ScaleFixH():
+                w(s.target, e.scale(_group(s), r(s.coeff), r(s.table)))
+            case ir.FdhG() | ir.FdhH():
+                w(s.target, e.fdh(_group(s), s.idx, r(s.arg)))
+            case ir.ResetTermsG() | ir.ResetTermsH() | ir.ResetPairs():
+                w(s.target, [])
+            case ir.AddTermG() | ir.AddTermH():
+                r(s.target).append((r(s.coeff), r(s.source)))
+            case ir.MultiScaleG() | ir.MultiScaleH():
+                w(s.target, e.multi_scale(_group(s), r(s.source)))
+            case ir.Pair():
+                w(s.target, e.pair(r(s.source_g), r(s.source_h)))
+            case ir.AddPair():
+                r(s.target).append(self._pairing_term(s))
+            case ir.MultiPair():
+                w(s.target, e.multi_pair(r(s.source)))
+            case ir.GetRgidG():
+                w(s.target, self.env.get_rgid_g())
+            case ir.GetRgidH():
+                w(s.target, self.env.get_rgid_h())
+            case ir.GetSecret():
+                w(s.target, self.env.secret)
+            case ir.GetMu():
+                w(s.target, self.env.get_mu(r(s.idx)))
+            case ir.GetLambda():
+                w(s.target, self.env.get_lambda(r(s.idx)))
+            case ir.GetEpsilon():
+                w(s.target, self.env.get_epsilon(r(s.idx)))
+            case ir.GetXAttr():
+                w(s.target, self.env.get_xattr(r(s.idx)))
+            case ir.GetXAttrAlt():
+                w(s.target, self.env.get_xattr_alt(r(s.idx)))
+            case ir.SetIndex():
+                self.vars[ir.IDX.name] = s.literal
+            case ir.AppendIndexLiteral():
+                self.vars[ir.IDX.name] = r(ir.IDX) + s.literal
+            case ir.AppendIndex():
+                part = self._call(s.conversion, r(s.source))
+                self.vars[ir.IDX.name] = r(ir.IDX) + part
+            case ir.SetIndexKey():
+                parts = tuple(self.eval(p) for p in s.parts)
+                self.vars[ir.IDX.name] = (s.family, *parts)
+            case _:
+                raise InterpreterError(f"Unknown statement {s}")
+
+    def _pairing_term(self, s: ir.AddPair) -> tuple:
+        """
+        Return the term `(source_g, source_h, coeff)` of the product of
+        pairings `s` adds to, with the coefficient applied in its group like
+        in the backends (left to `GroupEngine.multi_pair` for GT).
+        """
+        g, h, e = self.read(s.source_g), self.read(s.source_h), self.engine
+        if s.coeff is None:
+            return g, h, None
+        coeff = self.read(s.coeff)
+        if s.group == IrType.G:
+            return e.scale(IrType.G, coeff, g), h, None
+        if s.group == IrType.H:
+            return g, e.scale(IrType.H, coeff, h), None
+        return g, h, coeff
+
+
+def _is_key_material(name: str) -> bool:
+    """Whether `name` is a part of a key or ciphertext, e.g. `mpk.alphas`."""
+    return "." in name
@@ -0,0 +1,103 @@
+"""
+Monotone policies over (possibly negated) entries and their LSSS matrices.
+
+A policy is a tree of `Gate`s whose leaves are `Leaf`s. The rows of its
+LSSS matrix are the leaves in the order they occur in the tree (see
+`leaves`). The matrix is built by the construction of Lewko and Waters
+(see `lsss`), for which every satisfying selection of leaves (see `select`)
+reconstructs the secret with all coefficients equal to 1.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Union
+
+from pracy.backend.interp.env import Entry
+
+
+@dataclass(frozen=True)
+class Leaf:
+    entry: Entry
+    negated: bool = False
+
+    def __str__(self):
+        return f"not {self.entry}" if self.negated else str(self.entry)
+
+
+@dataclass(frozen=True)
+class Gate:
+    # "and" or "or"
+    op: str
+    children: tuple["Policy", ...]
+
+    def __str__(self):
+        return "(" + f" {self.op} ".join(str(c) for c in self.children) + ")"
+
+
+Policy = Union[Leaf, Gate]
+
+
+def leaves(policy: Policy) -> list[Leaf]:
+    """Return the leaves of `policy`, i.e., the rows of its LSSS matrix."""
+    if isinstance(policy, Leaf):
+        return [policy]
+    return [leaf for child in policy.children for leaf in leaves(child)]
+
+
+def lsss(policy: Policy) -> list[list[int]]:
+    """
+    Return the LSSS matrix of `policy`: an "or" passes its vector on to all
+    of its children, an "and" of two children pads its vector `v` with a 1
+    for its first child and passes (0, ..., 0, -1) to its second one.
+    """
+    rows = []
+    columns = 1
+
+    def visit(node, vector):
+        nonlocal columns
+        if isinstance(node, Leaf):
+            rows.append(vector)
+            return
+        if node.op == "or":
+            for child in node.children:
+                visit(child, vector)
+            return
+        # "and"s of more than two children are nested "and"s of two
+        first, *rest = node.children
+        second = rest[0] if len(rest) == 1 else Gate("and", tuple(rest))
+        column = columns
+        columns += 1
+        visit(first, vector + [0] * (column - len(vector)) + [1])
+        visit(second, [0] * column + [-1])
+
+    visit(policy, [1])
+    return [row + [0] * (columns - len(row)) for row in rows]
+
+
+def select(
+    policy: Policy, satisfied: set[int], rng: random.Random | None = None
+) -> list[int] | None:
+    """
+    Return the rows (see `leaves`) of a selection of leaves satisfying
+    `policy` if the leaves in `satisfied` do, None otherwise. An "or" selects
+    one of its satisfied children, at random if `rng` is given.
+    """
+    offset = 0
+
+    def visit(node):
+        nonlocal offset
+        if isinstance(node, Leaf):
+            row = offset
+            offset += 1
+            return [row] if row in satisfied else None
+        selections = [visit(child) for child in node.children]
+        if node.op == "and":
+            if any(s is None for s in selections):
+                return None
+            return [row for s in selections for row in s]
+        selections = [s for s in selections if s is not None]
+        if not selections:
+            return None
+        return rng.choice(selections) if rng is not None else selections[0]
+
+    return visit(policy)
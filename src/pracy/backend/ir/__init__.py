@@ -10,9 +10,16 @@ API then manually building up programs.
 from pracy.backend.ir.irexpr import Call, IntLiteral, IrExpr, Read, StringLiteral
 from pracy.backend.ir.irfunc import IrFunc
 from pracy.backend.ir.irstmt import (
+    AddAssignG,
+    AddAssignGt,
+    AddAssignH,
+    AddAssignZ,
     AddG,
     AddGt,
     AddH,
+    AddPair,
+    AddTermG,
+    AddTermH,
     AddZ,
     Alloc,
     AppendIndex,
@@ -35,18 +42,33 @@ from pracy.backend.ir.irstmt import (
     LiftGt,
     LiftH,
     Loop,
+    MulAssignZ,
+    MultiPair,
+    MultiScaleG,
+    MultiScaleH,
     MulZ,
     NegZ,
     Pair,
+    PrecomputeG,
+    PrecomputeH,
     ResetG,
     ResetGt,
     ResetH,
+    ResetPairs,
+    ResetTermsG,
+    ResetTermsH,
     ResetZ,
     SampleZ,
+    ScaleAssignG,
+    ScaleAssignGt,
+    ScaleAssignH,
+    ScaleFixG,
+    ScaleFixH,
     ScaleG,
     ScaleGt,
     ScaleH,
     SetIndex,
+    SetIndexKey,
     SetZ,
     Store,
     StoreExpr,
@@ -56,6 +78,7 @@ from pracy.backend.ir.irvar import (
     ACC_G,
     ACC_GT,
     ACC_H,
+    ACC_PAIRS,
     ACC_Z,
     AUX_Z,
     BLINDING_POLY,
@@ -74,8 +97,12 @@ from pracy.backend.ir.irvar import (
     MPK_ALPHAS,
     MPK_COMMON_VARS_G,
     MPK_COMMON_VARS_H,
+    MPK_TABLES_G,
+    MPK_TABLES_H,
     MSK_ALPHAS,
     MSK_COMMON_VARS,
+    TERMS_G,
+    TERMS_H,
     TMP_G,
     TMP_GT,
     TMP_H,
@@ -84,5 +111,7 @@ from pracy.backend.ir.irvar import (
     USK_POLYS_H,
     USK_RANDOMS_G,
     USK_RANDOMS_H,
+    USK_TABLES_POLYS_G,
+    USK_TABLES_RANDOMS_G,
     IrVar,
 )
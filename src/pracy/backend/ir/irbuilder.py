@@ -2,11 +2,28 @@ from pracy.backend import ir
 from pracy.core.group import Group
 
 
-class IrBuilder:
+class IndexFamilies:
+    """
+    Assigns the numeric ids of the variable families used in structured
+    index keys (see `IrBuilder.build_index`). A family consists of the
+    entries of a variable with the same literal indices, e.g. "k_{1,*}"
+    contains both k_{1,i} and k_{1,j}. All programs of a scheme have to
+    share one instance such that they agree on the keys.
+    """
 
     def __init__(self):
-        self.stmts = []
+        self.ids: dict[str, int] = {}
+
+    def id_of(self, pattern: str) -> int:
+        return self.ids.setdefault(pattern, len(self.ids))
+
+
+class IrBuilder:
+
+    def __init__(self, index_families: IndexFamilies | None = None):
+        self.stmts: list[ir.IrStmt] = []
         self.num_locals = 0
+        self.index_families = index_families
 
     def comment(self, msg):
         self.stmts.append(ir.Comment(msg))
@@ -16,14 +33,14 @@ class IrBuilder:
 
     def _loops(self, quants, body_gen):
         if not quants:
-            nested_gen = IrBuilder()
+            nested_gen = IrBuilder(self.index_families)
             body_gen(nested_gen)
             body = nested_gen.build()
             self.stmts.extend(body)
         else:
             curr = quants[0]
             if curr.global_map:
-                nested_gen = IrBuilder()
+                nested_gen = IrBuilder(self.index_families)
                 target = ir.IrVar(curr.name)
                 ir_type = ir.IrType.from_qtype(curr.global_map.get_codomain_type())
                 expr = ir.Call(
@@ -38,7 +55,7 @@ class IrBuilder:
                 set = curr.base_set
                 self.stmts.append(ir.Loop(name, ir_type, set, body))
             else:
-                nested_gen = IrBuilder()
+                nested_gen = IrBuilder(self.index_families)
                 nested_gen._loops(quants[1:], body_gen)
                 body = nested_gen.build()
                 name = curr.name
@@ -47,50 +64,84 @@ class IrBuilder:
                 self.stmts.append(ir.Loop(name, ir_type, set, body))
 
     def build_index(self, var):
+        """
+        Set the index to the one of (the entry of) `var`: a string such as
+        "k_{1,att}" or, if the builder has `index_families`, a structured
+        key made of the id of the family of `var` and the ids of its
+        quantified indices.
+        """
+        if self.index_families is not None:
+            self._build_index_key(var)
+            return
         self.reset_index()
         self.append_index_literal(var.name)
         self.append_index_literal("_{")
         for i, idx in enumerate(var.idcs):
-            if idx.local_map:
-                quants = [q for q in var.quants if q.name == idx.name]
-                if not quants or len(quants) > 1:
-                    raise ValueError(
-                        "Cannot build index with local map if indexed is not"
-                        "quantified or ambiguous."
-                    )
-                quant = quants[0]
-                base_set = quant.base_set
-                global_map = quant.global_map
-                domain_type = base_set.get_element_type()
-                if global_map:
-                    if global_map.get_domain_type() == domain_type:
-                        domain_type = global_map.get_codomain_type()
-                    else:
-                        raise ValueError(
-                            "Unreachable: type error found while building index."
-                        )
-
-                codomain_type = idx.local_map.get_codomain_type()
-                conversion = ir.IrFunc.from_domain_codomain(domain_type, codomain_type)
-                ir_type = ir.IrType.from_qtype(codomain_type)
-                to_string = ir.IrFunc.to_string_conversion(ir_type)
-                target = ir.IrVar(idx.name + f"_local_{self.num_locals}")
-                self.num_locals += 1
-                expr = ir.Call(conversion, [ir.Read(ir.IrVar(idx.name))])
-                self.alloc(target, ir_type, expr)
-                self.append_index(target, to_string)
+            component = self._index_component(var, idx)
+            if component:
+                source, ir_type = component
+                self.append_index(source, ir.IrFunc.to_string_conversion(ir_type))
             else:
-                if idx.is_quantified(var.quants):
-                    ir_type = ir.IrType.from_qtype(idx.get_type(var.quants))
-                    to_string = ir.IrFunc.to_string_conversion(ir_type)
-                    self.append_index(ir.IrVar(idx.name), to_string)
-                else:
-                    self.append_index_literal(idx.name)
+                self.append_index_literal(idx.name)
 
             if i < len(var.idcs) - 1:
                 self.append_index_literal(",")
         self.append_index_literal("}")
 
+    def _build_index_key(self, var):
+        pattern = []
+        parts = []
+        for idx in var.idcs:
+            component = self._index_component(var, idx)
+            if component:
+                source, ir_type = component
+                pattern.append("*")
+                to_id = ir.IrFunc.to_id_conversion(ir_type)
+                parts.append(ir.Call(to_id, [ir.Read(source)]))
+            else:
+                pattern.append(idx.name)
+        pattern = f"{var.name}_{{{','.join(pattern)}}}"
+        family = self.index_families.id_of(pattern)
+        self.stmts.append(ir.SetIndexKey(family, pattern, parts))
+
+    def _index_component(self, var, idx):
+        """
+        Return the variable holding the value of the index `idx` of `var`
+        and its type, or None if `idx` is a literal. Indices with a local map
+        are converted into a new local first.
+        """
+        if idx.local_map:
+            quants = [q for q in var.quants if q.name == idx.name]
+            if not quants or len(quants) > 1:
+                raise ValueError(
+                    "Cannot build index with local map if indexed is not"
+                    "quantified or ambiguous."
+                )
+            quant = quants[0]
+            base_set = quant.base_set
+            global_map = quant.global_map
+            domain_type = base_set.get_element_type()
+            if global_map:
+                if global_map.get_domain_type() == domain_type:
+                    domain_type = global_map.get_codomain_type()
+                else:
+                    raise ValueError(
+                        "Unreachable: type error found while building index."
+                    )
+
+            codomain_type = idx.local_map.get_codomain_type()
+            conversion = ir.IrFunc.from_domain_codomain(domain_type, codomain_type)
+            ir_type = ir.IrType.from_qtype(codomain_type)
+            target = ir.IrVar(idx.name + f"_local_{self.num_locals}")
+            self.num_locals += 1
+            expr = ir.Call(conversion, [ir.Read(ir.IrVar(idx.name))])
+            self.alloc(target, ir_type, expr)
+            return target, ir_type
+        if idx.is_quantified(var.quants):
+            ir_type = ir.IrType.from_qtype(idx.get_type(var.quants))
+            return ir.IrVar(idx.name), ir_type
+        return None
+
     def alloc(self, target, type, source):
         self.stmts.append(ir.Alloc(target, type, source))
 
@@ -142,6 +193,21 @@ class IrBuilder:
     def fdh_g(self, target: ir.IrVar, idx: int, arg: ir.IrVar):
         self.stmts.append(ir.FdhG(target, idx, arg))
 
+    def precompute_g(self, target: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.PrecomputeG(target, source))
+
+    def scale_fix_g(self, target: ir.IrVar, coeff: ir.IrVar, table: ir.IrVar):
+        self.stmts.append(ir.ScaleFixG(target, coeff, table))
+
+    def reset_terms_g(self, target: ir.IrVar):
+        self.stmts.append(ir.ResetTermsG(target))
+
+    def add_term_g(self, target: ir.IrVar, coeff: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.AddTermG(target, coeff, source))
+
+    def multi_scale_g(self, target: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.MultiScaleG(target, source))
+
     def lift_h(self, target: ir.IrVar, source: ir.IrVar):
         self.stmts.append(ir.LiftH(target, source))
 
@@ -154,6 +220,21 @@ class IrBuilder:
     def fdh_h(self, target: ir.IrVar, idx: int, arg: ir.IrVar):
         self.stmts.append(ir.FdhH(target, idx, arg))
 
+    def precompute_h(self, target: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.PrecomputeH(target, source))
+
+    def scale_fix_h(self, target: ir.IrVar, coeff: ir.IrVar, table: ir.IrVar):
+        self.stmts.append(ir.ScaleFixH(target, coeff, table))
+
+    def reset_terms_h(self, target: ir.IrVar):
+        self.stmts.append(ir.ResetTermsH(target))
+
+    def add_term_h(self, target: ir.IrVar, coeff: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.AddTermH(target, coeff, source))
+
+    def multi_scale_h(self, target: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.MultiScaleH(target, source))
+
     def lift_gt(self, target: ir.IrVar, source: ir.IrVar):
         self.stmts.append(ir.LiftGt(target, source))
 
@@ -169,6 +250,21 @@ class IrBuilder:
     def pair(self, target: ir.IrVar, source_g: ir.IrVar, source_h: ir.IrVar):
         self.stmts.append(ir.Pair(target, source_g, source_h))
 
+    def reset_pairs(self, target: ir.IrVar):
+        self.stmts.append(ir.ResetPairs(target))
+
+    def add_pair(
+        self,
+        target: ir.IrVar,
+        source_g: ir.IrVar,
+        source_h: ir.IrVar,
+        coeff: ir.IrVar | None = None,
+    ):
+        self.stmts.append(ir.AddPair(target, source_g, source_h, coeff))
+
+    def multi_pair(self, target: ir.IrVar, source: ir.IrVar):
+        self.stmts.append(ir.MultiPair(target, source))
+
     def get_rgid_g(self, target):
         self.stmts.append(ir.GetRgidG(target))
 
@@ -257,6 +353,61 @@ class IrBuilder:
                     f"Cannot construct scale instruction for invalid group '{group}'"
                 )
 
+    def precompute(self, group, target: ir.IrVar, source: ir.IrVar):
+        match group:
+            case Group.G:
+                self.precompute_g(target, source)
+            case Group.H:
+                self.precompute_h(target, source)
+            case _:
+                raise ValueError(
+                    f"Cannot construct precompute instruction for invalid group '{group}'"
+                )
+
+    def scale_fix(self, group, target: ir.IrVar, coeff: ir.IrVar, table: ir.IrVar):
+        match group:
+            case Group.G:
+                self.scale_fix_g(target, coeff, table)
+            case Group.H:
+                self.scale_fix_h(target, coeff, table)
+            case _:
+                raise ValueError(
+                    f"Cannot construct scale_fix instruction for invalid group '{group}'"
+                )
+
+    def reset_terms(self, group, target: ir.IrVar):
+        match group:
+            case Group.G:
+                self.reset_terms_g(target)
+            case Group.H:
+                self.reset_terms_h(target)
+            case _:
+                raise ValueError(
+                    f"Cannot construct reset_terms instruction for invalid group '{group}'"
+                )
+
+    def add_term(self, group, target: ir.IrVar, coeff: ir.IrVar, source: ir.IrVar):
+        match group:
+            case Group.G:
+                self.add_term_g(target, coeff, source)
+            case Group.H:
+                self.add_term_h(target, coeff, source)
+            case _:
+                raise ValueError(
+                    f"Cannot construct add_term instruction for invalid group '{group}'"
+                )
+
+    def multi_scale(self, group, target: ir.IrVar, source: ir.IrVar):
+        match group:
+            case Group.G:
+                self.multi_scale_g(target, source)
+            case Group.H:
+                self.multi_scale_h(target, source)
+            case _:
+                raise ValueError(
+                    f"Cannot construct multi_scale instruction for invalid group '{group}'"
+                )
+
     def fdh(self, group, target: ir.IrVar, idx: int, arg: ir.IrVar):
         match group:
             case Group.G:
@@ -4,6 +4,7 @@ from pracy.backend.ir.irfunc import IrFunc
 from pracy.backend.ir.irvar import IrVar
 
 
+@dataclass
 class IrExpr:
     pass
 
@@ -21,6 +21,12 @@ class IrFunc(StrEnum):
     LSSS_ROW_TO_STRING = "lsss_row_to_str"
     DEDUP_IDX_TO_STRING = "dedup_idx_to_str"
 
+    ATTRIBUTE_TO_ID = "attr_to_id"
+    LABEL_TO_ID = "lbl_to_id"
+    AUTHORITY_TO_ID = "auth_to_id"
+    LSSS_ROW_TO_ID = "lsss_row_to_id"
+    DEDUP_IDX_TO_ID = "dedup_idx_to_id"
+
     @staticmethod
     def to_string_conversion(ir_type: IrType):
         match ir_type:
@@ -39,6 +45,24 @@ class IrFunc(StrEnum):
             case _:
                 return None
 
+    @staticmethod
+    def to_id_conversion(ir_type: IrType):
+        match ir_type:
+            case IrType.ATTRIBUTE:
+                return IrFunc.ATTRIBUTE_TO_ID
+            case IrType.ALT_ATTR:
+                return IrFunc.ATTRIBUTE_TO_ID
+            case IrType.LABEL:
+                return IrFunc.LABEL_TO_ID
+            case IrType.AUTHORITY:
+                return IrFunc.AUTHORITY_TO_ID
+            case IrType.LSSS_ROW:
+                return IrFunc.LSSS_ROW_TO_ID
+            case IrType.DEDUP_INDEX:
+                return IrFunc.DEDUP_IDX_TO_ID
+            case _:
+                return None
+
     @staticmethod
     def from_qmap(qmap: QMap):
         match qmap:
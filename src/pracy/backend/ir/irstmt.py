@@ -7,6 +7,7 @@ from pracy.backend.ir.irvar import IrVar
 from pracy.core.qset import QSet
 
 
+@dataclass
 class IrStmt:
     pass
 
@@ -82,6 +83,20 @@ class MulZ(IrStmt):
     rhs: IrVar
 
 
+@dataclass
+class AddAssignZ(IrStmt):
+    # Adds `source` to `target` in place
+    target: IrVar
+    source: IrVar
+
+
+@dataclass
+class MulAssignZ(IrStmt):
+    # Multiplies `target` by `source` in place
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class SetZ(IrStmt):
     target: IrVar
@@ -113,6 +128,13 @@ class AddG(IrStmt):
     rhs: IrVar
 
 
+@dataclass
+class AddAssignG(IrStmt):
+    # Adds `source` to `target` in place
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class ScaleG(IrStmt):
     target: IrVar
@@ -120,6 +142,29 @@ class ScaleG(IrStmt):
     source: IrVar
 
 
+@dataclass
+class ScaleAssignG(IrStmt):
+    # Multiplies `target` by `coeff` in place
+    target: IrVar
+    coeff: IrVar
+
+
+@dataclass
+class PrecomputeG(IrStmt):
+    # Builds a precomputation table for fixed-base scalar multiplications
+    # with `source`, see ScaleFixG
+    target: IrVar
+    source: IrVar
+
+
+@dataclass
+class ScaleFixG(IrStmt):
+    # Multiplies the base of the precomputation table `table` by `coeff`
+    target: IrVar
+    coeff: IrVar
+    table: IrVar
+
+
 @dataclass
 class FdhG(IrStmt):
     target: IrVar
@@ -127,6 +172,27 @@ class FdhG(IrStmt):
     arg: IrVar
 
 
+@dataclass
+class ResetTermsG(IrStmt):
+    target: IrVar
+
+
+@dataclass
+class AddTermG(IrStmt):
+    # Adds coeff * source to the terms of the multi-scalar multiplication
+    # `target`
+    target: IrVar
+    coeff: IrVar
+    source: IrVar
+
+
+@dataclass
+class MultiScaleG(IrStmt):
+    # Evaluates the sum of the terms in `source` at once
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class LiftH(IrStmt):
     target: IrVar
@@ -140,6 +206,13 @@ class AddH(IrStmt):
     rhs: IrVar
 
 
+@dataclass
+class AddAssignH(IrStmt):
+    # Adds `source` to `target` in place
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class ScaleH(IrStmt):
     target: IrVar
@@ -147,6 +220,29 @@ class ScaleH(IrStmt):
     source: IrVar
 
 
+@dataclass
+class ScaleAssignH(IrStmt):
+    # Multiplies `target` by `coeff` in place
+    target: IrVar
+    coeff: IrVar
+
+
+@dataclass
+class PrecomputeH(IrStmt):
+    # Builds a precomputation table for fixed-base scalar multiplications
+    # with `source`, see ScaleFixH
+    target: IrVar
+    source: IrVar
+
+
+@dataclass
+class ScaleFixH(IrStmt):
+    # Multiplies the base of the precomputation table `table` by `coeff`
+    target: IrVar
+    coeff: IrVar
+    table: IrVar
+
+
 @dataclass
 class FdhH(IrStmt):
     target: IrVar
@@ -154,6 +250,27 @@ class FdhH(IrStmt):
     arg: IrVar
 
 
+@dataclass
+class ResetTermsH(IrStmt):
+    target: IrVar
+
+
+@dataclass
+class AddTermH(IrStmt):
+    # Adds coeff * source to the terms of the multi-scalar multiplication
+    # `target`
+    target: IrVar
+    coeff: IrVar
+    source: IrVar
+
+
+@dataclass
+class MultiScaleH(IrStmt):
+    # Evaluates the sum of the terms in `source` at once
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class LiftGt(IrStmt):
     target: IrVar
@@ -167,6 +284,13 @@ class AddGt(IrStmt):
     rhs: IrVar
 
 
+@dataclass
+class AddAssignGt(IrStmt):
+    # Adds `source` to `target` in place
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class ScaleGt(IrStmt):
     target: IrVar
@@ -174,6 +298,13 @@ class ScaleGt(IrStmt):
     source: IrVar
 
 
+@dataclass
+class ScaleAssignGt(IrStmt):
+    # Multiplies `target` by `coeff` in place
+    target: IrVar
+    coeff: IrVar
+
+
 @dataclass
 class InvGt(IrStmt):
     target: IrVar
@@ -187,6 +318,32 @@ class Pair(IrStmt):
     source_h: IrVar
 
 
+@dataclass
+class ResetPairs(IrStmt):
+    target: IrVar
+
+
+@dataclass
+class AddPair(IrStmt):
+    # Multiplies the product of pairings `target` by
+    # e(source_g, source_h)^coeff (or e(source_g, source_h) without coeff),
+    # where `coeff` is applied in `group`, i.e., to `source_g` (G), to
+    # `source_h` (H) or to the separately evaluated pairing (GT)
+    target: IrVar
+    source_g: IrVar
+    source_h: IrVar
+    coeff: IrVar | None = None
+    group: IrType = IrType.G
+
+
+@dataclass
+class MultiPair(IrStmt):
+    # Evaluates the product of pairings `source` (with a single final
+    # exponentiation)
+    target: IrVar
+    source: IrVar
+
+
 @dataclass
 class GetRgidG(IrStmt):
     target: IrVar
@@ -246,3 +403,13 @@ class AppendIndexLiteral(IrStmt):
 class AppendIndex(IrStmt):
     source: IrVar
     conversion: IrFunc
+
+
+@dataclass
+class SetIndexKey(IrStmt):
+    # Sets the index to the structured key of an entry of the variable family
+    # `family` (see IndexFamilies), given the ids of its quantified indices.
+    # The `pattern` of the family (e.g. "k_{1,*}") is only informational.
+    family: int
+    pattern: str
+    parts: list[IrExpr]
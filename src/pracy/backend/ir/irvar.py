@@ -32,17 +32,24 @@ TMP_H = IrVar("tmp_h")
 ACC_H = IrVar("acc_h")
 TMP_GT = IrVar("tmp_gt")
 ACC_GT = IrVar("acc_gt")
+ACC_PAIRS = IrVar("acc_pairs")
+TERMS_G = IrVar("terms_g")
+TERMS_H = IrVar("terms_h")
 
 MSK_ALPHAS = IrVar("msk.alphas")
 MPK_ALPHAS = IrVar("mpk.alphas")
 MSK_COMMON_VARS = IrVar("msk.common_vars")
 MPK_COMMON_VARS_G = IrVar("mpk.common_vars_g")
 MPK_COMMON_VARS_H = IrVar("mpk.common_vars_h")
+MPK_TABLES_G = IrVar("mpk.tables_g")
+MPK_TABLES_H = IrVar("mpk.tables_h")
 
 USK_POLYS_G = IrVar("usk.polys_g")
 USK_POLYS_H = IrVar("usk.polys_h")
 USK_RANDOMS_G = IrVar("usk.randoms_g")
 USK_RANDOMS_H = IrVar("usk.randoms_h")
+USK_TABLES_POLYS_G = IrVar("usk.tables_polys_g")
+USK_TABLES_RANDOMS_G = IrVar("usk.tables_randoms_g")
 KEYGEN_LONE_RANDOMS = IrVar("lone_randoms")
 KEYGEN_NON_LONE_RANDOMS = IrVar("non_lone_randoms")
 
@@ -0,0 +1,59 @@
+"""
+Optimizations on pracys IR.
+
+Passes rewrite a program (a list of `IrStmt`, see `pracy.backend.ir`) into
+an equivalent one which does less work. They are registered by name (see
+`register_pass`) and run by a `PassManager` in the pipeline of the chosen
+optimization level (see `PIPELINES`):
+
+- `-O0` does not optimize at all, i.e., the generated code is exactly the
+  code emitted by the compiler,
+- `-O1` runs constant folding, copy propagation and dead-store elimination
+  once,
+- `-O2` additionally aggregates pairings with a loop invariant argument
+  (see `pracy.backend.opt.pairagg`), applies the coefficients of pairings in
+  the cheapest group (see `pracy.backend.opt.gtpush`), fuses loops over the same
+  set (see `pracy.backend.opt.fuse`), moves loop-invariant statements out of
+  loops (see `pracy.backend.opt.licm`), reuses values computed before (see
+  `pracy.backend.opt.cse`) and repeats all passes until the program does not
+  change anymore.
+
+At `-O1` and `-O2`, accumulations are then rewritten into in-place updates
+(see `pracy.backend.opt.inplace` and `LOWERING`).
+
+Passes may take the target curve into account (see `PassContext` and
+`pracy.backend.opt.costs`).
+"""
+
+# The passes register themselves when imported
+import pracy.backend.opt.constfold  # noqa: F401
+import pracy.backend.opt.copyprop  # noqa: F401
+import pracy.backend.opt.cse  # noqa: F401
+import pracy.backend.opt.dse  # noqa: F401
+import pracy.backend.opt.fuse  # noqa: F401
+import pracy.backend.opt.gtpush  # noqa: F401
+import pracy.backend.opt.inplace  # noqa: F401
+import pracy.backend.opt.licm  # noqa: F401
+import pracy.backend.opt.pairagg  # noqa: F401
+from pracy.backend.opt.costs import CURVES, DEFAULT_CURVE
+from pracy.backend.opt.dump import format_ir
+from pracy.backend.opt.manager import (
+    LOWERING,
+    OPT_LEVELS,
+    PASSES,
+    PIPELINES,
+    PassContext,
+    PassManager,
+    PassStats,
+    format_stats,
+    register_pass,
+)
+
+
+def optimize(programs, pass_manager: PassManager):
+    """
+    Optimize the `programs` (setup, keygen, encrypt and decrypt) as returned
+    by `pracy.backend.compiler.all.compile` with the given `pass_manager`.
+    """
+    names = ("setup", "keygen", "encrypt", "decrypt")
+    return tuple(pass_manager.run(n, p) for n, p in zip(names, programs))
@@ -0,0 +1,114 @@
+"""
+Constant folding of scalar chains.
+
+The compiler builds coefficients and sums step by step, starting from
+`1` or `0` (e.g. `tmp_z = 1; tmp_z = tmp_z * aux_z`). This pass tracks
+which (non-indexed) scalars hold a known integer and
+
+- evaluates additions, multiplications and negations of known integers,
+- turns multiplications by `1` and additions of `0` into copies
+  (which copy propagation and dead-store elimination clean up), and
+- merges consecutive literal parts of an index into a single literal.
+
+Inverses are never folded since they depend on the group order.
+"""
+
+from dataclasses import replace
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import defs
+from pracy.backend.opt.manager import PassContext, register_pass
+
+
+@register_pass("constfold")
+def fold_constants(stmts: list[ir.IrStmt], context: PassContext) -> list[ir.IrStmt]:
+    return _fold(stmts, {})
+
+
+def _fold(stmts, consts):
+    res = []
+    for stmt in stmts:
+        if isinstance(stmt, ir.Loop):
+            # Values assigned in the body are not known at its beginning
+            # (except in the first iteration) nor after the loop.
+            for name in defs(stmt):
+                consts.pop(name, None)
+            body = _fold(stmt.body, dict(consts))
+            res.append(replace(stmt, body=body))
+            continue
+        stmt = _fold_stmt(stmt, consts)
+        if stmt is None:
+            continue
+        for name in defs(stmt):
+            consts.pop(name, None)
+        value = _value_of(stmt, consts)
+        if value is not None:
+            consts[stmt.target.name] = value
+        _merge_index_literals(res, stmt)
+    return res
+
+
+def _const(var: ir.IrVar, consts) -> int | None:
+    if var.index is not None:
+        return None
+    return consts.get(var.name)
+
+
+def _fold_stmt(stmt, consts):
+    """
+    Return the folded `stmt` or `None` if it has no effect at all.
+    """
+    match stmt:
+        case ir.AddZ() | ir.MulZ() if stmt.target.index is None:
+            neutral = 0 if isinstance(stmt, ir.AddZ) else 1
+            lhs = _const(stmt.lhs, consts)
+            rhs = _const(stmt.rhs, consts)
+            if lhs is not None and rhs is not None:
+                if isinstance(stmt, ir.AddZ):
+                    return ir.SetZ(stmt.target, str(lhs + rhs))
+                return ir.SetZ(stmt.target, str(lhs * rhs))
+            if isinstance(stmt, ir.MulZ) and 0 in (lhs, rhs):
+                return ir.SetZ(stmt.target, "0")
+            if lhs == neutral:
+                return _copy(stmt.target, stmt.rhs)
+            if rhs == neutral:
+                return _copy(stmt.target, stmt.lhs)
+        case ir.NegZ() if stmt.target.index is None:
+            value = _const(stmt.source, consts)
+            if value is not None:
+                return ir.SetZ(stmt.target, str(-value))
+    return stmt
+
+
+def _copy(target, source):
+    if source.index is None and source.name == target.name:
+        return None
+    return ir.Store(target, source)
+
+
+def _value_of(stmt, consts) -> int | None:
+    """Return the integer assigned by `stmt` to its target (if known)."""
+    match stmt:
+        case ir.SetZ() if stmt.target.index is None:
+            try:
+                return int(str(stmt.value))
+            except ValueError:
+                return None
+        case ir.ResetZ() if stmt.target.index is None:
+            return 0
+        case ir.Store() if stmt.target.index is None:
+            return _const(stmt.source, consts)
+    return None
+
+
+def _merge_index_literals(res, stmt):
+    """Append `stmt` to `res`, merging it with a preceding index literal."""
+    if res and isinstance(stmt, ir.AppendIndexLiteral):
+        prev = res[-1]
+        if isinstance(prev, ir.SetIndex):
+            res[-1] = ir.SetIndex(prev.literal + stmt.literal)
+            return
+        if isinstance(prev, ir.AppendIndexLiteral):
+            res[-1] = ir.AppendIndexLiteral(prev.literal + stmt.literal)
+            return
+    res.append(stmt)
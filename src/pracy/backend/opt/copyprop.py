@@ -0,0 +1,54 @@
+"""
+Copy propagation.
+
+After a copy `t = s` (a `Store` to a non-indexed variable), reads of `t` are
+replaced by reads of `s` as long as neither `t` nor `s` (including the
+variables `s` is indexed with) have been written in between. The copy
+itself usually becomes dead and is removed by dead-store elimination.
+"""
+
+from dataclasses import replace
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import defs, index_vars, replace_uses
+from pracy.backend.opt.manager import PassContext, register_pass
+
+
+@register_pass("copyprop")
+def propagate_copies(stmts: list[ir.IrStmt], context: PassContext) -> list[ir.IrStmt]:
+    return _propagate(stmts, {})
+
+
+def _propagate(stmts, copies):
+    """`copies` maps the name of a copy to the variable it has been copied from."""
+    res = []
+    for stmt in stmts:
+        if isinstance(stmt, ir.Loop):
+            _kill(copies, defs(stmt))
+            body = _propagate(stmt.body, dict(copies))
+            res.append(replace(stmt, body=body))
+            continue
+
+        stmt = replace_uses(stmt, lambda v: _subst(v, copies))
+        if isinstance(stmt, ir.Store) and stmt.target == stmt.source:
+            continue
+        _kill(copies, defs(stmt))
+        if isinstance(stmt, ir.Store) and stmt.target.index is None:
+            copies[stmt.target.name] = stmt.source
+        res.append(stmt)
+    return res
+
+
+def _subst(var, copies):
+    if var.index is not None:
+        return var
+    return copies.get(var.name, var)
+
+
+def _kill(copies, names):
+    """Drop all copies invalidated by writing the variables `names`."""
+    for t, s in list(copies.items()):
+        if t in names or s.name in names:
+            del copies[t]
+        elif any(v.name in names for v in index_vars(s)):
+            del copies[t]
@@ -0,0 +1,102 @@
+"""
+Relative costs of the group operations on the supported curves.
+
+The numbers are normalized to a scalar multiplication in G (i.e., G1) and
+only used to decide between equivalent ways of computing the same value,
+hence they only need to be roughly right.
+"""
+
+from dataclasses import dataclass
+
+from pracy import optconfig
+from pracy.backend import ir
+from pracy.core.qset import QSet
+
+
+@dataclass(frozen=True)
+class CurveCosts:
+    # Scalar multiplication in G and H, exponentiation in Gt
+    scale_g: float
+    scale_h: float
+    scale_gt: float
+    # A pairing and its final exponentiation, which the pairings of a product
+    # share
+    pair: float
+    final_exp: float
+
+
+CURVES: dict[str, CurveCosts] = {
+    # Asymmetric (type 3) Barreto-Naehrig curves as used by Relic
+    "bn254": CurveCosts(
+        scale_g=1.0, scale_h=2.4, scale_gt=4.2, pair=8.5, final_exp=3.9
+    ),
+    "bn256": CurveCosts(
+        scale_g=1.0, scale_h=2.4, scale_gt=4.3, pair=8.7, final_exp=4.0
+    ),
+    "bls12-381": CurveCosts(
+        scale_g=1.0, scale_h=2.1, scale_gt=3.4, pair=6.5, final_exp=3.2
+    ),
+    # Symmetric (type 1) supersingular curve, Charm's default "SS512"
+    "ss512": CurveCosts(
+        scale_g=1.0, scale_h=1.0, scale_gt=0.2, pair=1.4, final_exp=0.6
+    ),
+}
+
+DEFAULT_CURVE = optconfig.DEFAULT_CURVE
+
+
+def coeff_cost(group: ir.IrType, costs: CurveCosts) -> float:
+    """
+    Return the cost of applying the coefficient of an `AddPair` in `group`.
+    In Gt, the pairing is evaluated on its own, so its final exponentiation
+    is not shared with the rest of the product of pairings.
+    """
+    match group:
+        case ir.IrType.G:
+            return costs.scale_g
+        case ir.IrType.H:
+            return costs.scale_h
+    return costs.scale_gt + costs.final_exp
+
+
+def row_costs(decrypt: list[ir.IrStmt], costs: CurveCosts) -> dict[str, float]:
+    """
+    Estimate the cost decrypting with a positive ("pos") and with a negated
+    ("neg") row of the linear combination adds to the `decrypt` program, i.e.,
+    the cost of the group operations in the bodies of the loops over the
+    (positive or negated) linear combination indices. Decryption picks the
+    cheapest satisfying set of rows by these costs.
+    """
+    shared = 0.0
+    res = {"pos": 0.0, "neg": 0.0}
+    for s in decrypt:
+        if not isinstance(s, ir.Loop):
+            continue
+        if s.set == QSet.LINEAR_COMBINATION_INDICES:
+            shared += _body_cost(s.body, costs)
+        elif s.set == QSet.POS_LINEAR_COMBINATION_INDICES:
+            res["pos"] += _body_cost(s.body, costs)
+        elif s.set == QSet.NEG_LINEAR_COMBINATION_INDICES:
+            res["neg"] += _body_cost(s.body, costs)
+    return {row: cost + shared for row, cost in res.items()}
+
+
+def _body_cost(stmts, costs):
+    res = 0.0
+    for s in stmts:
+        match s:
+            case ir.Loop():
+                res += _body_cost(s.body, costs)
+            case ir.Pair():
+                res += costs.pair
+            case ir.AddPair():
+                res += costs.pair
+                if s.coeff is not None:
+                    res += coeff_cost(s.group, costs)
+            case ir.ScaleG() | ir.ScaleAssignG() | ir.ScaleFixG() | ir.AddTermG():
+                res += costs.scale_g
+            case ir.ScaleH() | ir.ScaleAssignH() | ir.ScaleFixH() | ir.AddTermH():
+                res += costs.scale_h
+            case ir.ScaleGt() | ir.ScaleAssignGt():
+                res += costs.scale_gt
+    return res
@@ -0,0 +1,186 @@
+"""
+Common-subexpression elimination.
+
+Within the program and within each loop body, a statement computing a value
+which has been computed before from the same inputs is replaced by a copy
+of the earlier result. As the target of the first computation is usually
+overwritten in between, its result is saved in a fresh local:
+
+    GetEpsilon aux_z, j                 GetEpsilon aux_z, j
+    ...                                 Alloc aux_z_cse_0, -Z-, aux_z
+    GetEpsilon aux_z, j         =>      ...
+                                        Store aux_z, aux_z_cse_0
+
+Locals allocated with the same value (e.g. `ls_row_to_attr(j)` or a copy of
+the same variable) are merged instead, provided neither of them is written
+afterwards.
+
+Values are compared by local value numbering: a read is identified by the
+value last assigned to the variable (or by the variable and the number of
+times it has been written, if that value is unknown), and the index of an
+entry of a map by its parts. Only statements whose results are worth
+reusing are replaced (see `pracy.backend.opt.effects.reusable`), in
+particular samples are never reused.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import fields, replace
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import all_names, defs, fresh_name, rename, target
+from pracy.backend.opt.effects import Effect, effect, reusable, value_type
+from pracy.backend.opt.manager import PassContext, register_pass
+
+
+@register_pass("cse")
+def eliminate_common_subexpressions(
+    stmts: list[ir.IrStmt], context: PassContext
+) -> list[ir.IrStmt]:
+    return _eliminate(stmts, all_names(stmts), _written(stmts))
+
+
+def _eliminate(stmts, names, written):
+    # Loop bodies are separate scopes
+    stmts = [_eliminate_loop(s, names, written) for s in stmts]
+    keys = _value_numbers(stmts, written)
+    counts = Counter(k for k in keys if k is not None)
+    res, saved, renames = [], {}, {}
+    for stmt, key in zip(stmts, keys):
+        stmt = rename(stmt, renames)
+        if key is None or counts[key] < 2:
+            res.append(stmt)
+        elif isinstance(stmt, ir.Alloc):
+            if key in saved:
+                renames[stmt.target.name] = saved[key]
+            else:
+                saved[key] = stmt.target.name
+                res.append(stmt)
+        elif key in saved:
+            res.append(ir.Store(stmt.target, ir.IrVar(saved[key])))
+        else:
+            saved[key] = fresh_name(f"{stmt.target.name}_cse_0", names)
+            res.append(stmt)
+            res.append(
+                ir.Alloc(ir.IrVar(saved[key]), value_type(stmt), ir.Read(stmt.target))
+            )
+    return res
+
+
+def _eliminate_loop(stmt, names, written):
+    if not isinstance(stmt, ir.Loop):
+        return stmt
+    return replace(stmt, body=_eliminate(stmt.body, names, written))
+
+
+def _written(stmts) -> set[str]:
+    """Return the names of the variables written by `stmts` other than allocations."""
+    res = set()
+    for s in stmts:
+        if isinstance(s, ir.Loop):
+            res |= _written(s.body)
+        elif not isinstance(s, ir.Alloc):
+            res |= defs(s)
+    return res
+
+
+def _value_numbers(stmts, written):
+    """
+    Return the value number of the result of each statement in `stmts` which
+    may be reused (or None), see `_Numbering`. Locals in `written` are
+    written after their allocation.
+    """
+    numbering = _Numbering()
+    res = []
+    for stmt in stmts:
+        key = None
+        if isinstance(stmt, ir.Alloc):
+            # Merging locals is a renaming, hence also worth it for copies
+            if stmt.target.name not in written and effect(stmt) in _MERGEABLE:
+                key = numbering.key(stmt)
+        elif reusable(stmt) and value_type(stmt) is not None:
+            key = numbering.key(stmt)
+        numbering.update(stmt, key)
+        res.append(key)
+    return res
+
+
+_MERGEABLE = (Effect.PURE, Effect.READS_ENV)
+
+# Statements building the index `idx`
+_INDEX = (ir.SetIndex, ir.AppendIndexLiteral, ir.AppendIndex, ir.SetIndexKey)
+
+
+class _Numbering:
+    """
+    Assigns value numbers (hashable tuples) to the values read and computed
+    by a sequence of statements.
+    """
+
+    def __init__(self):
+        self.versions = defaultdict(int)
+        self.values = {}
+
+    def read(self, var: ir.IrVar):
+        if var.index is None:
+            if var.name in self.values:
+                return self.values[var.name]
+            return ("var", var.name, self.versions[var.name])
+        return ("entry", var.name, self.versions[var.name], self.expr(var.index))
+
+    def expr(self, expr: ir.IrExpr):
+        match expr:
+            case ir.Call():
+                return ("call", expr.func, tuple(self.expr(a) for a in expr.args))
+            case ir.Read():
+                return self.read(expr.source)
+        return ("literal", repr(expr))
+
+    def operand(self, value):
+        match value:
+            case ir.IrVar():
+                return self.read(value)
+            case ir.IrExpr():
+                return self.expr(value)
+            case list():
+                return tuple(self.operand(v) for v in value)
+        return value
+
+    def key(self, stmt: ir.IrStmt):
+        """Return the value number of the result of `stmt`."""
+        operands = [self.operand(getattr(stmt, f.name)) for f in fields(stmt)]
+        if target(stmt) is not None:
+            operands.pop(0)
+        return (type(stmt).__name__, *operands)
+
+    def update(self, stmt: ir.IrStmt, key):
+        """Run `stmt`, whose result has the value number `key` (if known)."""
+        value = key
+        match stmt:
+            case ir.Loop():
+                value = None
+            case ir.SetIndex():
+                value = ("index", stmt.literal)
+            case ir.AppendIndexLiteral():
+                value = self._append(stmt.literal)
+            case ir.AppendIndex():
+                value = self._append((stmt.conversion, self.read(stmt.source)))
+            case ir.SetIndexKey():
+                value = ("key", stmt.family, self.operand(stmt.parts))
+            case ir.Store():
+                value = self.read(stmt.source)
+            case ir.Alloc(expr=ir.Read(source=source)):
+                value = self.read(source)
+        for name in defs(stmt):
+            self.versions[name] += 1
+            self.values.pop(name, None)
+        t = ir.IDX if isinstance(stmt, _INDEX) else target(stmt)
+        if value is not None and t is not None and t.index is None:
+            self.values[t.name] = value
+
+    def _append(self, part):
+        index = self.values.get(ir.IDX.name)
+        if index is None or index[0] != "index":
+            return None
+        if isinstance(part, str) and isinstance(index[-1], str):
+            return (*index[:-1], index[-1] + part)
+        return (*index, part)
@@ -0,0 +1,379 @@
+"""
+Helpers to inspect which variables a statement reads and writes.
+
+Variables are identified by their name. A statement writing an indexed
+variable (e.g. `ct.primaries_g[idx]`) only updates a single entry of the
+map, so it is a *may-definition*: it does not make earlier values of the
+map unobservable. The same holds for `AddPair`, `AddTermG` and `AddTermH`,
+which extend the product of pairings or the multi-scalar multiplication in
+their target. In-place updates (e.g. `AddAssignG acc_g, tmp_g`) read their
+target before overwriting it. The index building statements implicitly read
+and/or write the index variable `idx`.
+"""
+
+import re
+from dataclasses import fields, replace
+
+from pracy.backend import ir
+from pracy.core.qset import QSet
+
+# Sets by their positive and their negative part, which are disjoint
+PARTS = {
+    QSet.LINEAR_COMBINATION_INDICES: (
+        QSet.POS_LINEAR_COMBINATION_INDICES,
+        QSet.NEG_LINEAR_COMBINATION_INDICES,
+    ),
+    QSet.LSSS_ROWS: (QSet.POS_LSSS_ROWS, QSet.NEG_LSSS_ROWS),
+}
+_PART_SETS = {part for parts in PARTS.values() for part in parts}
+
+# Statements which write (only) their `target`
+_TARGET_FIELD = "target"
+
+# Statements which extend their `target`, i.e., read and (partially) write it
+_ACCUMULATE = (ir.AddPair, ir.AddTermG, ir.AddTermH)
+
+# Additions `target = lhs + rhs` in Z or one of the groups
+_ADD = (ir.AddZ, ir.AddG, ir.AddH, ir.AddGt)
+
+# In-place additions `target += source` in Z or one of the groups
+_ADD_ASSIGN = (ir.AddAssignZ, ir.AddAssignG, ir.AddAssignH, ir.AddAssignGt)
+
+# Statements updating their `target` in place, i.e., reading and overwriting it
+UPDATES = (
+    *_ADD_ASSIGN,
+    ir.MulAssignZ,
+    ir.ScaleAssignG,
+    ir.ScaleAssignH,
+    ir.ScaleAssignGt,
+)
+
+
+def expr_vars(expr: ir.IrExpr) -> list[ir.IrVar]:
+    """Return all variables read by `expr`."""
+    match expr:
+        case ir.Call():
+            return [v for a in expr.args for v in expr_vars(a)]
+        case ir.Read():
+            return [expr.source, *index_vars(expr.source)]
+        case _:
+            return []
+
+
+def index_vars(var: ir.IrVar) -> list[ir.IrVar]:
+    """Return the variables read to compute the index of `var` (if any)."""
+    if var.index is None:
+        return []
+    return expr_vars(var.index)
+
+
+def var_names(var: ir.IrVar) -> set[str]:
+    """Return the names of `var` and of the variables in its index."""
+    return {var.name} | {v.name for v in index_vars(var)}
+
+
+def target(stmt: ir.IrStmt) -> ir.IrVar | None:
+    """Return the variable written by `stmt` (if any) except `idx`."""
+    if isinstance(stmt, ir.Loop):
+        return None
+    return getattr(stmt, _TARGET_FIELD, None)
+
+
+def strong_defs(stmt: ir.IrStmt) -> set[str]:
+    """
+    Return the names of the variables completely overwritten by `stmt`,
+    i.e., whose previous values can not be observed afterwards.
+    """
+    match stmt:
+        case ir.SetIndex() | ir.SetIndexKey():
+            return {ir.IDX.name}
+        case ir.AppendIndexLiteral() | ir.AppendIndex():
+            return {ir.IDX.name}
+        case ir.Loop():
+            return set()
+    if isinstance(stmt, _ACCUMULATE):
+        return set()
+    t = target(stmt)
+    if t is not None and t.index is None:
+        return {t.name}
+    return set()
+
+
+def defs(stmt: ir.IrStmt) -> set[str]:
+    """
+    Return the names of all variables (possibly) written by `stmt`, including
+    the maps of indexed targets and, for loops, everything written in the
+    body as well as the loop variable itself.
+    """
+    if isinstance(stmt, ir.Loop):
+        res = {stmt.var}
+        for s in stmt.body:
+            res |= defs(s)
+        return res
+    res = strong_defs(stmt)
+    t = target(stmt)
+    if t is not None:
+        res.add(t.name)
+    return res
+
+
+def uses(stmt: ir.IrStmt) -> set[str]:
+    """
+    Return the names of all variables read by `stmt`. For loops, these are
+    all variables read anywhere in the body.
+    """
+    if isinstance(stmt, ir.Loop):
+        res = set()
+        for s in stmt.body:
+            res |= uses(s)
+        return res
+    res = set()
+    match stmt:
+        case ir.AppendIndexLiteral() | ir.AppendIndex():
+            res.add(ir.IDX.name)
+        case ir.SetIndexKey():
+            for part in stmt.parts:
+                res.update(v.name for v in expr_vars(part))
+    if isinstance(stmt, (*_ACCUMULATE, *UPDATES)):
+        res.add(stmt.target.name)
+    for f in fields(stmt):
+        value = getattr(stmt, f.name)
+        if isinstance(value, ir.IrVar):
+            if f.name == _TARGET_FIELD:
+                res.update(v.name for v in index_vars(value))
+            else:
+                res.add(value.name)
+                res.update(v.name for v in index_vars(value))
+        elif isinstance(value, ir.IrExpr):
+            res.update(v.name for v in expr_vars(value))
+    return res
+
+
+def live_in(stmts: list[ir.IrStmt], live_out: set[str]) -> set[str]:
+    """
+    Return the names of the variables live before `stmts` given the ones
+    `live_out` afterwards. Loop bodies may run any number of times.
+    """
+    live = set(live_out)
+    for stmt in reversed(stmts):
+        if isinstance(stmt, ir.Loop):
+            head: set[str] = set()
+            while True:
+                new_head = live_in(stmt.body, live | head) - {stmt.var}
+                if new_head == head:
+                    break
+                head = new_head
+            live |= head
+            continue
+        live -= strong_defs(stmt)
+        live |= uses(stmt)
+    return live
+
+
+def live_after_each(stmts: list[ir.IrStmt], live_out: set[str]) -> list[set[str]]:
+    """
+    Return the names of the variables live after each statement of `stmts`
+    given the ones `live_out` after all of them.
+    """
+    res = [set(live_out)]
+    for stmt in reversed(stmts[1:]):
+        res.append(live_in([stmt], res[-1]))
+    res.reverse()
+    return res
+
+
+def accumulators(stmts: list[ir.IrStmt]) -> set[str]:
+    """
+    Return the names of the variables which `stmts` (including loop bodies)
+    only extend by commutative accumulations, i.e., `AddPair`, `AddTermG`,
+    `AddTermH` or an addition `AddX acc, acc, x` or `AddAssignX acc, x` (with
+    `x` not being `acc`).
+    Such accumulations can be reordered freely.
+    """
+    acc, other = set(), set()
+    for stmt in stmts:
+        if isinstance(stmt, ir.Loop):
+            acc |= accumulators(stmt.body)
+            other |= (defs(stmt) | uses(stmt)) - accumulators(stmt.body)
+            continue
+        names = defs(stmt) | uses(stmt)
+        t = _accumulated(stmt)
+        if t is not None:
+            acc.add(t)
+            names.discard(t)
+        other |= names
+    return acc - other
+
+
+def _accumulated(stmt):
+    """Return the name of the variable accumulated by `stmt` (if any)."""
+    t = target(stmt)
+    if t is None or t.index is not None:
+        return None
+    if isinstance(stmt, _ACCUMULATE):
+        return t.name
+    if isinstance(stmt, _ADD) and stmt.lhs == t and stmt.rhs.name != t.name:
+        return t.name
+    if isinstance(stmt, _ADD_ASSIGN) and stmt.source.name != t.name:
+        return t.name
+    return None
+
+
+def replace_uses(stmt: ir.IrStmt, subst) -> ir.IrStmt:
+    """
+    Return `stmt` with each variable `v` read by it (not the target) replaced
+    by `subst(v)`. Returns `stmt` itself if nothing changed.
+    """
+    changes = {}
+    for f in fields(stmt):
+        value = getattr(stmt, f.name)
+        if f.name != _TARGET_FIELD and isinstance(value, ir.IrVar):
+            new = subst(value)
+            if new is not value:
+                changes[f.name] = new
+    if not changes:
+        return stmt
+    return replace(stmt, **changes)
+
+
+def all_names(stmts: list[ir.IrStmt]) -> set[str]:
+    """Return the names of all variables in `stmts` (including loop variables)."""
+    res = set()
+    for s in stmts:
+        res |= defs(s) | uses(s)
+        if isinstance(s, ir.Loop):
+            res |= all_names(s.body)
+    return res
+
+
+def fresh_name(name: str, taken: set[str]) -> str:
+    """
+    Return a variable name based on `name` (e.g. `j_local_1` for `j_local_0`)
+    which is not in `taken`, and add it to `taken`.
+    """
+    base = re.sub(r"_\d+$", "", name)
+    res, n = name, 0
+    while res in taken:
+        res = f"{base}_{n}"
+        n += 1
+    taken.add(res)
+    return res
+
+
+def rename(value, renames: dict[str, str]):
+    """
+    Return `value` (a statement, an expression or a list of them) with each
+    variable (including loop variables) renamed according to `renames`.
+    """
+    match value:
+        case ir.IrVar():
+            return ir.IrVar(
+                renames.get(value.name, value.name), rename(value.index, renames)
+            )
+        case ir.Loop():
+            return replace(
+                value,
+                var=renames.get(value.var, value.var),
+                body=rename(value.body, renames),
+            )
+        case list():
+            return [rename(v, renames) for v in value]
+        case ir.IrStmt() | ir.IrExpr():
+            changes = {
+                f.name: rename(getattr(value, f.name), renames) for f in fields(value)
+            }
+            return replace(value, **changes)
+    return value
+
+
+def count_stmts(stmts: list[ir.IrStmt]) -> int:
+    """Count all statements, including those in (nested) loop bodies."""
+    res = 0
+    for s in stmts:
+        res += 1
+        if isinstance(s, ir.Loop):
+            res += count_stmts(s.body)
+    return res
+
+
+# Statements performing an arithmetic or group operation
+_OPS = (
+    ir.AddZ,
+    ir.MulZ,
+    ir.NegZ,
+    ir.InvZ,
+    ir.LiftG,
+    ir.AddG,
+    ir.ScaleG,
+    ir.PrecomputeG,
+    ir.ScaleFixG,
+    ir.MultiScaleG,
+    ir.FdhG,
+    ir.LiftH,
+    ir.AddH,
+    ir.ScaleH,
+    ir.PrecomputeH,
+    ir.ScaleFixH,
+    ir.MultiScaleH,
+    ir.FdhH,
+    ir.LiftGt,
+    ir.AddGt,
+    ir.ScaleGt,
+    ir.InvGt,
+    ir.Pair,
+    ir.AddPair,
+    ir.MultiPair,
+    *UPDATES,
+)
+
+
+def count_ops(stmts: list[ir.IrStmt]) -> int:
+    """
+    Count the arithmetic and group operations in `stmts` run once and for a
+    single element of each set looped over, i.e., each operation in a loop
+    body counts once, and of the loops over the positive and the negative
+    part of a set (see `PARTS`) only the costlier ones count.
+    """
+    return _count(stmts, _OPS, 0, False)
+
+
+def count_loop_ops(stmts: list[ir.IrStmt]) -> int:
+    """
+    Count the operations in `stmts` (see `count_ops`), each weighted by the
+    number of loops it is nested in. Moving an operation out of a loop over
+    a set `S` decreases the count by one and saves `|S| - 1` operations at
+    runtime.
+    """
+    return _count(stmts, _OPS, 0, True)
+
+
+def count_loop_pairings(stmts: list[ir.IrStmt]) -> int:
+    """
+    Count the pairings in `stmts` (including those added to a product of
+    pairings) like `count_loop_ops`. Moving a pairing out of a loop over a
+    set `S` decreases the count by one and saves `|S| - 1` pairings at
+    runtime.
+    """
+    return _count(stmts, (ir.Pair, ir.AddPair), 0, True)
+
+
+def _count(stmts, counted, depth, weighted) -> int:
+    """
+    Count the statements of the types `counted` in `stmts`, which are nested
+    in `depth` loops, each weighted by its depth if `weighted` is set.
+    """
+    res = 0
+    parts: dict[QSet, int] = {}
+    for s in stmts:
+        if isinstance(s, ir.Loop):
+            count = _count(s.body, counted, depth + 1, weighted)
+            if s.set in _PART_SETS:
+                parts[s.set] = parts.get(s.set, 0) + count
+            else:
+                res += count
+        elif isinstance(s, counted):
+            res += depth if weighted else 1
+    # Each element is either in the positive or in the negative part
+    for pos, neg in PARTS.values():
+        res += max(parts.get(pos, 0), parts.get(neg, 0))
+    return res
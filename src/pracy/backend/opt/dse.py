@@ -0,0 +1,120 @@
+"""
+Dead-store elimination.
+
+Removes statements whose results are never read, based on a backward
+liveness analysis. Loop bodies are analyzed until the variables live at
+their beginning do not change anymore.
+
+Only the scratch variables of the generated functions (see `SCRATCH`) and
+the locals allocated by the program itself are considered dead at its end,
+everything else (the keys, the ciphertext and the blinding polynomial)
+is observable by the caller.
+"""
+
+from dataclasses import replace
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import defs, strong_defs, target, uses
+from pracy.backend.opt.manager import PassContext, register_pass
+
+# Variables which are local to the generated functions.
+# Note that `acc_gt` is not among them: the Charm backend reads it after
+# running encrypt.
+SCRATCH = frozenset(
+    [
+        ir.IDX.name,
+        ir.TMP_Z.name,
+        ir.AUX_Z.name,
+        "tmp_z_2",
+        ir.ACC_Z.name,
+        ir.TMP_G.name,
+        ir.ACC_G.name,
+        ir.TMP_H.name,
+        ir.ACC_H.name,
+        ir.TMP_GT.name,
+        ir.ACC_PAIRS.name,
+        ir.TERMS_G.name,
+        ir.TERMS_H.name,
+    ]
+)
+
+# Statements which are kept even if their results are not needed
+_KEEP = (ir.Comment, ir.SampleZ)
+
+
+@register_pass("dse")
+def eliminate_dead_stores(
+    stmts: list[ir.IrStmt], context: PassContext
+) -> list[ir.IrStmt]:
+    res, _ = _sweep(stmts, live_at_end(stmts))
+    return res
+
+
+def live_at_end(stmts: list[ir.IrStmt]) -> set[str]:
+    """Return the names of the variables of the program `stmts` observable by the caller."""
+    names = set()
+    for s in stmts:
+        names |= defs(s) | uses(s)
+    return names - SCRATCH - _locals(stmts)
+
+
+def _locals(stmts) -> set[str]:
+    """Return the names of all variables allocated (or looped over) in `stmts`."""
+    res = set()
+    for s in stmts:
+        match s:
+            case ir.Alloc():
+                res.add(s.target.name)
+            case ir.Loop():
+                res.add(s.var)
+                res |= _locals(s.body)
+    return res
+
+
+def _sweep(stmts, live):
+    """
+    Remove the dead statements from `stmts` given the variables `live`
+    afterwards. Returns the remaining statements and the variables live
+    before them.
+    """
+    live = set(live)
+    res = []
+    for stmt in reversed(stmts):
+        if isinstance(stmt, ir.Loop):
+            stmt, live = _sweep_loop(stmt, live)
+            if stmt is not None:
+                res.append(stmt)
+            continue
+        if _is_dead(stmt, live):
+            continue
+        live -= strong_defs(stmt)
+        live |= uses(stmt)
+        res.append(stmt)
+    res.reverse()
+    return res, live
+
+
+def _sweep_loop(loop, live_after):
+    # The body may run any number of times (including zero): whatever is
+    # live after the loop or at the beginning of the body is live at its end.
+    live_in = set()
+    while True:
+        _, new_live_in = _sweep(loop.body, live_after | live_in)
+        new_live_in.discard(loop.var)
+        if new_live_in == live_in:
+            break
+        live_in = new_live_in
+    body, _ = _sweep(loop.body, live_after | live_in)
+    if all(isinstance(s, ir.Comment) for s in body):
+        return None, live_after
+    return replace(loop, body=body), live_after | live_in
+
+
+def _is_dead(stmt, live) -> bool:
+    if isinstance(stmt, _KEEP):
+        return False
+    written = strong_defs(stmt)
+    t = target(stmt)
+    if t is not None:
+        written.add(t.name)
+    return not written & live
@@ -0,0 +1,58 @@
+from dataclasses import fields
+
+from pracy.backend import ir
+
+
+def format_ir(stmts: list[ir.IrStmt]) -> str:
+    """
+    Format `stmts` as text with one statement per line, e.g.
+
+        MulZ tmp_z, tmp_z, msk.alphas[idx]
+        Loop i : USER_ATTRIBUTES
+            SetIndex "k_{"
+
+    This is meant for inspecting the IR (see `--dump-ir`), it can not be
+    parsed back.
+    """
+    lines: list[str] = []
+    _format_stmts(stmts, 0, lines)
+    return "".join(f"{line}\n" for line in lines)
+
+
+def _format_stmts(stmts, depth, lines):
+    indent = " " * 4 * depth
+    for s in stmts:
+        match s:
+            case ir.Comment():
+                lines.append(f"{indent}# {s.text}")
+            case ir.Loop():
+                lines.append(f"{indent}Loop {s.var} : {s.set.name}")
+                _format_stmts(s.body, depth + 1, lines)
+            case _:
+                args = ", ".join(_format_value(getattr(s, f.name)) for f in fields(s))
+                lines.append(f"{indent}{type(s).__name__} {args}")
+
+
+def _format_value(value) -> str:
+    match value:
+        case ir.IrVar():
+            if value.index is None:
+                return value.name
+            return f"{value.name}[{_format_value(value.index)}]"
+        case ir.Call():
+            args = ", ".join(_format_value(a) for a in value.args)
+            return f"{value.func.value}({args})"
+        case ir.Read():
+            return _format_value(value.source)
+        case ir.StringLiteral():
+            return repr(value.text)
+        case ir.IntLiteral():
+            return str(value.value)
+        case ir.IrType() | ir.IrFunc():
+            return value.value
+        case list():
+            return f"({', '.join(_format_value(v) for v in value)})"
+        case str():
+            return f'"{value}"'
+        case _:
+            return str(value)
@@ -0,0 +1,192 @@
+"""
+The effects of IR statements.
+
+Each statement (except loops) has exactly one effect (see `Effect`), which
+determines whether a pass may move it (e.g. out of a loop) or replace it by
+a copy of an earlier result:
+
+- `PURE` statements compute their target from the variables they read,
+- `READS_ENV` statements additionally depend on the environment (the policy,
+  the user attributes or the values fixed per run, e.g. the secret), which
+  does not change while a generated function runs,
+- `SAMPLES` statements draw random values, i.e., running them twice gives
+  different results (and changes the values sampled afterwards),
+- `WRITES_OUTPUT` statements write an entry of a map (e.g. a key or the
+  ciphertext) or extend a product of pairings or a multi-scalar
+  multiplication in place.
+"""
+
+from enum import Enum
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import UPDATES, target
+
+
+class Effect(Enum):
+    PURE = "pure"
+    READS_ENV = "reads-env"
+    SAMPLES = "samples"
+    WRITES_OUTPUT = "writes-output"
+
+
+_SAMPLES = (ir.SampleZ,)
+
+_READS_ENV = (
+    ir.GetMu,
+    ir.GetLambda,
+    ir.GetEpsilon,
+    ir.GetXAttr,
+    ir.GetXAttrAlt,
+    ir.GetSecret,
+    ir.GetRgidG,
+    ir.GetRgidH,
+)
+
+# Statements updating a container (product of pairings or multi-scalar
+# multiplication) or a precomputation table in place
+_IN_PLACE = (
+    ir.ResetPairs,
+    ir.AddPair,
+    ir.ResetTermsG,
+    ir.AddTermG,
+    ir.ResetTermsH,
+    ir.AddTermH,
+    ir.PrecomputeG,
+    ir.PrecomputeH,
+)
+
+
+def effect(stmt: ir.IrStmt) -> Effect:
+    """Return the effect of `stmt` (which must not be a loop)."""
+    if isinstance(stmt, _SAMPLES):
+        return Effect.SAMPLES
+    if isinstance(stmt, _IN_PLACE):
+        return Effect.WRITES_OUTPUT
+    t = target(stmt)
+    if t is not None and t.index is not None:
+        return Effect.WRITES_OUTPUT
+    if isinstance(stmt, _READS_ENV):
+        return Effect.READS_ENV
+    if isinstance(stmt, (ir.Alloc, ir.StoreExpr)) and isinstance(stmt.expr, ir.Call):
+        return Effect.READS_ENV
+    return Effect.PURE
+
+
+# The types of the values computed by the statements
+_TYPES = {
+    ir.IrType.Z: (
+        ir.ResetZ,
+        ir.SampleZ,
+        ir.AddZ,
+        ir.MulZ,
+        ir.AddAssignZ,
+        ir.MulAssignZ,
+        ir.SetZ,
+        ir.NegZ,
+        ir.InvZ,
+        ir.GetMu,
+        ir.GetLambda,
+        ir.GetEpsilon,
+        ir.GetXAttr,
+        ir.GetXAttrAlt,
+        ir.GetSecret,
+    ),
+    ir.IrType.G: (
+        ir.ResetG,
+        ir.LiftG,
+        ir.AddG,
+        ir.ScaleG,
+        ir.AddAssignG,
+        ir.ScaleAssignG,
+        ir.ScaleFixG,
+        ir.FdhG,
+        ir.MultiScaleG,
+        ir.GetRgidG,
+    ),
+    ir.IrType.H: (
+        ir.ResetH,
+        ir.LiftH,
+        ir.AddH,
+        ir.ScaleH,
+        ir.AddAssignH,
+        ir.ScaleAssignH,
+        ir.ScaleFixH,
+        ir.FdhH,
+        ir.MultiScaleH,
+        ir.GetRgidH,
+    ),
+    ir.IrType.GT: (
+        ir.ResetGt,
+        ir.LiftGt,
+        ir.AddGt,
+        ir.ScaleGt,
+        ir.AddAssignGt,
+        ir.ScaleAssignGt,
+        ir.InvGt,
+        ir.Pair,
+        ir.MultiPair,
+    ),
+}
+
+# The types of the scratch variables (see `pracy.backend.opt.dse.SCRATCH`)
+_SCRATCH_TYPES = {
+    ir.TMP_Z.name: ir.IrType.Z,
+    ir.AUX_Z.name: ir.IrType.Z,
+    "tmp_z_2": ir.IrType.Z,
+    ir.ACC_Z.name: ir.IrType.Z,
+    ir.TMP_G.name: ir.IrType.G,
+    ir.ACC_G.name: ir.IrType.G,
+    ir.TMP_H.name: ir.IrType.H,
+    ir.ACC_H.name: ir.IrType.H,
+    ir.TMP_GT.name: ir.IrType.GT,
+    ir.ACC_GT.name: ir.IrType.GT,
+}
+
+
+def value_type(stmt: ir.IrStmt) -> ir.IrType | None:
+    """Return the type of the value `stmt` writes to its target (if known)."""
+    if isinstance(stmt, ir.Alloc):
+        return stmt.type
+    for type, classes in _TYPES.items():
+        if isinstance(stmt, classes):
+            return type
+    t = target(stmt)
+    if isinstance(stmt, (ir.Store, ir.StoreExpr)) and t is not None:
+        if t.index is None:
+            return _SCRATCH_TYPES.get(t.name)
+    return None
+
+
+# Statements whose results are cheaper to copy than to recompute
+_CHEAP = (
+    ir.Comment,
+    ir.ResetZ,
+    ir.ResetG,
+    ir.ResetH,
+    ir.ResetGt,
+    ir.SetIndex,
+    ir.AppendIndexLiteral,
+    ir.AppendIndex,
+    ir.SetIndexKey,
+)
+
+
+def reusable(stmt: ir.IrStmt) -> bool:
+    """
+    Whether the result of `stmt` may be reused instead of running `stmt`
+    again with the same inputs, and this is worth it. Copies of variables
+    are not, whereas loading the entry of a map is. In-place updates are not
+    considered, as their result depends on the previous value of the target.
+    """
+    if isinstance(stmt, (ir.Loop, *_CHEAP, *UPDATES)):
+        return False
+    if effect(stmt) not in (Effect.PURE, Effect.READS_ENV):
+        return False
+    match stmt:
+        case ir.Store():
+            return stmt.source.index is not None
+        case ir.Alloc():
+            return (
+                not isinstance(stmt.expr, ir.Read) or stmt.expr.source.index is not None
+            )
+    return True
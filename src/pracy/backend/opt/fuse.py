@@ -0,0 +1,310 @@
+"""
+Loop fusion.
+
+Encrypt and decrypt consist of many loops over the same set, e.g. one loop
+over the linear combination indices per pairing. Loops over the same set are
+fused into a single loop, such that the values depending on the current row
+only (e.g. its coefficient epsilon_j or its authority) are computed once per
+iteration:
+
+    Loop j : S              Loop j : S
+        A(j)          =>        A(j)
+    Loop j : S                  B(j)
+        B(j)
+
+Statements in between are moved behind the fused loop if they do not depend
+on the second loop, or in front of it if they do not depend on the first.
+Two loops are fused if no iteration of `B` reads or overwrites what a later
+iteration of `A` writes (and vice versa): apart from accumulations (e.g.
+`AddPair acc_pairs, ...`), which commute, the bodies may only share scratch
+variables they write before reading them and map entries at the same index,
+which has to contain the loop variable itself (e.g. `c_{j}` but not
+`c_{auth(j)}`). Loops sampling random values are never reordered with each
+other, so the samples are drawn in the same order.
+
+As the IR has no branches, loops over all linear combination indices (or
+LSSS rows) whose iterations are independent are split once into loops over
+the positive and the negative ones if the program also loops over either
+part, such that the parts can be fused with those loops. Splitting
+duplicates the bodies, so the split loops are only kept if the fused program
+does fewer operations per element once the fused bodies share their values
+(see `pracy.backend.opt.dataflow.count_ops`).
+
+The values both bodies compute (e.g. the coefficient `GetEpsilon aux_z, j`
+or the authority of row j) are then computed only once per iteration by
+common-subexpression elimination (see `pracy.backend.opt.cse`).
+"""
+
+from dataclasses import fields, replace
+
+from pracy.backend import ir
+from pracy.backend.opt.cse import eliminate_common_subexpressions
+from pracy.backend.opt.dataflow import (
+    PARTS,
+    accumulators,
+    all_names,
+    count_loop_pairings,
+    count_ops,
+    defs,
+    expr_vars,
+    fresh_name,
+    live_after_each,
+    live_in,
+    rename,
+)
+from pracy.backend.opt.dse import live_at_end
+from pracy.backend.opt.manager import PassContext, register_pass
+
+
+@register_pass("fuse")
+def fuse_loops(stmts: list[ir.IrStmt], context: PassContext) -> list[ir.IrStmt]:
+    live_out = live_at_end(stmts)
+    names = all_names(stmts)
+    fused = _fuse(stmts, live_out, names)
+    split = _split(stmts, live_out)
+    if split == stmts:
+        return fused
+    split = _fuse(split, live_out, names)
+    if _work(split, context) < _work(fused, context):
+        return split
+    return fused
+
+
+def _work(stmts, context):
+    """The pairings and operations per element of `stmts` after CSE."""
+    stmts = eliminate_common_subexpressions(stmts, context)
+    return count_loop_pairings(stmts), count_ops(stmts)
+
+
+def _split(stmts, live_out):
+    """Split the loops over sets of `PARTS` whose parts are looped over as well."""
+    looped = {s.set for s in stmts if isinstance(s, ir.Loop)}
+    live = live_after_each(stmts, live_out)
+    res = []
+    for k, stmt in enumerate(stmts):
+        parts = PARTS.get(stmt.set) if _is_flat(stmt) else None
+        if (
+            parts is not None
+            and looped & set(parts)
+            and _independent(stmt.body, stmt.body, live[k], stmt.var)
+        ):
+            res.extend(replace(stmt, set=p) for p in parts)
+        else:
+            res.append(stmt)
+    return res
+
+
+def _fuse(stmts, live_out, names):
+    """
+    Fuse each loop of `stmts` with the closest preceding loop over the same
+    set such that the statements in between can be moved out of the way.
+    """
+    live = live_after_each(stmts, live_out)
+    res = []
+    for k, stmt in enumerate(stmts):
+        if _is_flat(stmt):
+            for p in reversed(range(len(res))):
+                fused = _fused(res[p], stmt, names)
+                if fused is None:
+                    continue
+                moved = _moved(res[p], res[p + 1 :], stmt, live[k])
+                if moved is not None:
+                    before, after = moved
+                    res[p:] = [*before, fused, *after]
+                    break
+            else:
+                res.append(stmt)
+        else:
+            res.append(stmt)
+    return res
+
+
+def _moved(first, between, second, live_after):
+    """
+    Split the statements `between` the loops `first` and `second` into the
+    ones which can be moved in front of `first` and the ones which can be
+    moved behind `second` given the variables `live_after` the latter, or
+    return None if this is not possible.
+    """
+    # Move `second` in front of the longest possible suffix, then `first`
+    # behind the remaining statements
+    k = len(between)
+    while k > 0 and _independent(between[k - 1 :], [second], live_after):
+        k -= 1
+    before, after = between[:k], between[k:]
+    if _independent([first], before, live_in([second] + after, live_after)):
+        return before, after
+    return None
+
+
+def _fused(first, second, names):
+    """Return the loop fusing `first` and `second` or None if they can not be fused."""
+    if not (_is_flat(first) and _is_flat(second)):
+        return None
+    if (first.type, first.set) != (second.type, second.set):
+        return None
+    # Loop over the same variable and do not clash with the locals of `first`
+    renames = {}
+    if second.var != first.var:
+        if first.var in all_names(second.body):
+            return None
+        renames[second.var] = first.var
+    taken = all_names(first.body)
+    for s in second.body:
+        if isinstance(s, ir.Alloc) and s.target.name in taken:
+            renames[s.target.name] = fresh_name(s.target.name, names)
+    body = rename(second.body, renames)
+    if not _independent(first.body, body, set(), first.var):
+        return None
+    return replace(first, body=first.body + body)
+
+
+def _independent(a, b, live_after, var=None) -> bool:
+    """
+    Whether the statements `a` and `b` can be run in any order given the
+    variables `live_after` them. If `var` is given, `a` and `b` are the
+    bodies of loops over `var` and only runs for different values of `var`
+    have to be independent.
+    """
+    if _samples(a) and _samples(b):
+        return False
+    accesses_a, plain_a = _accesses(a)
+    accesses_b, plain_b = _accesses(b)
+    maps = {m for m, _, _ in accesses_a + accesses_b} - plain_a - plain_b
+    defs_a, defs_b = _defs(a) - maps, _defs(b) - maps
+    exposed_a = live_in(a, set()) - maps
+    exposed_b = live_in(b, set()) - maps
+    shared = (
+        (defs_a & exposed_b) | (exposed_a & defs_b) | (defs_a & defs_b & live_after)
+    )
+    if shared - (accumulators(a) & accumulators(b)):
+        return False
+    for name_a, sig_a, write_a in accesses_a:
+        for name_b, sig_b, write_b in accesses_b:
+            if name_a != name_b or name_a not in maps or not (write_a or write_b):
+                continue
+            if _disjoint(sig_a, sig_b):
+                continue
+            if var is not None and sig_a == sig_b and _injective(sig_a, var):
+                continue
+            return False
+    return True
+
+
+def _accesses(stmts):
+    """
+    Return the accesses of `stmts` to entries of maps as triples of the name
+    of the map, the signature of the index (see `_signature`) and whether
+    the entry is written, as well as the names of the variables accessed
+    without an index.
+    """
+    res, plain = [], set()
+    _collect_accesses(stmts, res, plain)
+    return res, plain
+
+
+def _collect_accesses(stmts, res, plain):
+    sig, locals_ = None, {}
+    for stmt in stmts:
+        match stmt:
+            case ir.Loop():
+                _collect_accesses(stmt.body, res, plain)
+                sig = None
+                continue
+            case ir.SetIndex():
+                sig = [stmt.literal]
+            case ir.AppendIndexLiteral():
+                sig = sig and [*sig, stmt.literal]
+            case ir.AppendIndex():
+                token = _token(stmt.conversion, stmt.source, locals_)
+                sig = sig and token and [*sig, token]
+            case ir.SetIndexKey():
+                sig = [("key", stmt.family)]
+                for part in stmt.parts:
+                    match part:
+                        case ir.Call(args=[ir.Read(source=source)]):
+                            token = _token(part.func, source, locals_)
+                        case _:
+                            token = ("expr", repr(part))
+                    sig = sig and token and [*sig, token]
+            case ir.Alloc(target=ir.IrVar(index=None)):
+                locals_[stmt.target.name] = repr(stmt.expr)
+        for f in fields(stmt):
+            value = getattr(stmt, f.name)
+            write = f.name == "target"
+            if isinstance(value, ir.IrVar):
+                read = [] if value.index is None else expr_vars(value.index)
+                accessed = [(value, write)] + [(v, False) for v in read]
+            elif isinstance(value, ir.IrExpr):
+                accessed = [(v, False) for v in expr_vars(value)]
+            elif isinstance(value, list):
+                accessed = [(v, False) for e in value for v in expr_vars(e)]
+            else:
+                continue
+            for v, w in accessed:
+                if v.index is None:
+                    plain.add(v.name)
+                elif v.index == ir.Read(ir.IDX):
+                    res.append((v.name, _signature(sig), w))
+                else:
+                    res.append((v.name, None, w))
+
+
+def _token(conversion, source, locals_):
+    """Return the token of the index component `conversion(source)`."""
+    if source.index is not None:
+        return None
+    return ("dyn", conversion.value, locals_.get(source.name, source.name))
+
+
+def _signature(parts):
+    """
+    Return the signature of an index built from `parts`, i.e., a tuple of
+    literal strings (merging adjacent ones) and tokens of the dynamic
+    components, or None if it is unknown.
+    """
+    if parts is None:
+        return None
+    res = []
+    for part in parts:
+        if isinstance(part, str) and res and isinstance(res[-1], str):
+            res[-1] += part
+        else:
+            res.append(part)
+    return tuple(res)
+
+
+def _disjoint(sig_a, sig_b) -> bool:
+    """Whether indices with the signatures `sig_a` and `sig_b` always differ."""
+    if not sig_a or not sig_b:
+        return False
+    a, b = sig_a[0], sig_b[0]
+    if isinstance(a, str) and isinstance(b, str):
+        return not (a.startswith(b) or b.startswith(a))
+    return a[0] == b[0] == "key" and a != b
+
+
+def _injective(sig, var) -> bool:
+    """Whether indices with the signature `sig` differ for different values of `var`."""
+    return any(isinstance(p, tuple) and p[0] == "dyn" and p[2] == var for p in sig)
+
+
+def _is_flat(stmt) -> bool:
+    """Whether `stmt` is a loop without nested loops."""
+    return isinstance(stmt, ir.Loop) and not any(
+        isinstance(s, ir.Loop) for s in stmt.body
+    )
+
+
+def _samples(stmts) -> bool:
+    return any(
+        isinstance(s, ir.SampleZ) or (isinstance(s, ir.Loop) and _samples(s.body))
+        for s in stmts
+    )
+
+
+def _defs(stmts) -> set[str]:
+    res = set()
+    for s in stmts:
+        res |= defs(s)
+    return res
@@ -0,0 +1,46 @@
+"""
+Apply the coefficients of pairings in the cheapest group.
+
+Decryption multiplies products of pairings by pairings raised to scalars:
+
+    AddPair acc, a, b, c
+
+By bilinearity, `e(a, b)^c = e(c * a, b) = e(a, c * b)`, so the scalar can
+be applied by a scalar multiplication in G or H, which keeps the pairing in
+the product (see `MultiPair`), or by an exponentiation in Gt, which evaluates
+the pairing on its own. The group is chosen by the costs on the target curve
+(see `pracy.backend.opt.costs.coeff_cost`): the compiler applies coefficients
+in G, which is cheapest on the asymmetric curves, while exponentiating in Gt
+is cheaper on symmetric curves.
+"""
+
+from dataclasses import replace
+
+from pracy.backend import ir
+from pracy.backend.opt.costs import coeff_cost
+from pracy.backend.opt.manager import PassContext, register_pass
+
+_GROUPS = (ir.IrType.G, ir.IrType.H, ir.IrType.GT)
+
+
+@register_pass("gtpush")
+def push_gt_exponentiations(
+    stmts: list[ir.IrStmt], context: PassContext
+) -> list[ir.IrStmt]:
+    group = min(_GROUPS, key=lambda g: coeff_cost(g, context.costs))
+    return _retarget(stmts, group)
+
+
+def _retarget(stmts: list[ir.IrStmt], group: ir.IrType) -> list[ir.IrStmt]:
+    res: list[ir.IrStmt] = []
+    for stmt in stmts:
+        if isinstance(stmt, ir.Loop):
+            stmt = replace(stmt, body=_retarget(stmt.body, group))
+        elif (
+            isinstance(stmt, ir.AddPair)
+            and stmt.coeff is not None
+            and stmt.group != group
+        ):
+            stmt = replace(stmt, group=group)
+        res.append(stmt)
+    return res
@@ -0,0 +1,63 @@
+"""
+In-place updates.
+
+Accumulations in the IR are three-address statements overwriting one of
+their operands, e.g. `AddG acc_g, acc_g, tmp_g`, which the exporters would
+lower to a call returning a new element (copied into `acc_g`). Such
+statements are rewritten into their in-place forms, which update the target
+without a temporary:
+
+    AddG acc_g, acc_g, tmp_g        =>      AddAssignG acc_g, tmp_g
+    MulZ tmp_z, aux_z, tmp_z        =>      MulAssignZ tmp_z, aux_z
+    ScaleGt tmp_gt, aux_z, tmp_gt   =>      ScaleAssignGt tmp_gt, aux_z
+
+Additions and multiplications in Z commute, so the target may be either
+operand. The other operand must not be the target itself.
+
+This is a lowering rather than an optimization of the IR: the other passes
+only know the three-address forms, hence it runs once after the pipeline
+(see `pracy.backend.opt.manager.LOWERING`).
+"""
+
+from dataclasses import replace
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import target
+from pracy.backend.opt.manager import PassContext, register_pass
+
+# The in-place forms of the commutative three-address statements
+_COMMUTATIVE = {
+    ir.AddZ: ir.AddAssignZ,
+    ir.MulZ: ir.MulAssignZ,
+    ir.AddG: ir.AddAssignG,
+    ir.AddH: ir.AddAssignH,
+    ir.AddGt: ir.AddAssignGt,
+}
+
+# The in-place forms of the scalar multiplications
+_SCALE = {
+    ir.ScaleG: ir.ScaleAssignG,
+    ir.ScaleH: ir.ScaleAssignH,
+    ir.ScaleGt: ir.ScaleAssignGt,
+}
+
+
+@register_pass("inplace")
+def update_in_place(stmts: list[ir.IrStmt], context: PassContext) -> list[ir.IrStmt]:
+    return [_update_in_place(s) for s in stmts]
+
+
+def _update_in_place(stmt):
+    if isinstance(stmt, ir.Loop):
+        return replace(stmt, body=[_update_in_place(s) for s in stmt.body])
+    t = target(stmt)
+    if t is None or t.index is not None:
+        return stmt
+    if type(stmt) in _COMMUTATIVE:
+        operands = [stmt.lhs, stmt.rhs]
+        if operands.count(t) == 1:
+            operands.remove(t)
+            return _COMMUTATIVE[type(stmt)](t, operands[0])
+    elif type(stmt) in _SCALE and stmt.source == t and stmt.coeff != t:
+        return _SCALE[type(stmt)](t, stmt.coeff)
+    return stmt
@@ -0,0 +1,129 @@
+"""
+Loop-invariant code motion.
+
+Statements in the body of a loop whose results are the same in every
+iteration (e.g. the constant `SetZ tmp_z, "-1"` or loading a common variable
+at a constant index) are run once in front of the loop, and their results
+are saved in fresh locals:
+
+    Loop j : S                          SetZ tmp_z, "-1"
+        SetZ tmp_z, "-1"          =>    Alloc j_inv_0, -Z-, tmp_z
+        MulZ tmp_z, tmp_z, aux_z        Loop j : S
+                                            Store tmp_z, j_inv_0
+                                            MulZ tmp_z, tmp_z, aux_z
+
+A statement is invariant if it has no side effects besides reading the
+environment (see `pracy.backend.opt.effects`) and only reads variables
+which are not written in the body or which have been written by invariant
+statements before it. The invariant statements it depends on (e.g. the ones
+building its index) are run in front of the loop as well. The copies left
+in the body are usually removed by copy propagation, and locals allocated
+with an invariant expression are allocated in front of the loop instead.
+
+The statements in front of the loop run even if the loop does not iterate,
+so nothing is moved if they would overwrite a variable which is live there.
+Only top-level loops are considered.
+"""
+
+from dataclasses import replace
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import (
+    all_names,
+    defs,
+    fresh_name,
+    live_after_each,
+    live_in,
+    rename,
+    uses,
+)
+from pracy.backend.opt.dse import live_at_end
+from pracy.backend.opt.effects import Effect, effect, reusable, value_type
+from pracy.backend.opt.manager import PassContext, register_pass
+
+
+@register_pass("licm")
+def hoist_invariants(stmts: list[ir.IrStmt], context: PassContext) -> list[ir.IrStmt]:
+    names = all_names(stmts)
+    live = live_after_each(stmts, live_at_end(stmts))
+    res = []
+    for k, stmt in enumerate(stmts):
+        if isinstance(stmt, ir.Loop):
+            header, stmt = _hoist(stmt, live_in([stmt], live[k]), names)
+            res.extend(header)
+        res.append(stmt)
+    return res
+
+
+def _hoist(loop, live_before, names):
+    """
+    Return the statements to run in front of `loop` and the remaining loop
+    given the variables `live_before` it.
+    """
+    body = loop.body
+    invariant = _invariant(loop)
+    written = [defs(s) for s in body]
+    hoisted = set()
+    for i, s in enumerate(body):
+        if not invariant[i] or not reusable(s) or value_type(s) is None:
+            continue
+        others = set().union(*written[:i], *written[i + 1 :])
+        if isinstance(s, ir.Alloc) and s.target.name in others:
+            continue
+        hoisted.add(i)
+    if not hoisted:
+        return [], loop
+
+    # The invariant statements the hoisted ones depend on
+    needed, moved = set(), set()
+    for i in reversed(range(len(body))):
+        if i in hoisted or (invariant[i] and written[i] & needed):
+            moved.add(i)
+            needed |= uses(body[i])
+
+    # Locals allocated in front of the loop get fresh names, which replace
+    # the ones in the body if the allocation is hoisted
+    header, renames, header_renames, copies = [], {}, {}, {}
+    for i in sorted(moved):
+        s = body[i]
+        if isinstance(s, ir.Alloc):
+            header_renames[s.target.name] = fresh_name(f"{loop.var}_inv_0", names)
+            if i in hoisted:
+                renames[s.target.name] = header_renames[s.target.name]
+        header.append(rename(s, header_renames))
+        if i in hoisted and not isinstance(s, ir.Alloc):
+            copies[i] = fresh_name(f"{loop.var}_inv_0", names)
+            header.append(
+                ir.Alloc(ir.IrVar(copies[i]), value_type(s), ir.Read(s.target))
+            )
+    clobbered = set().union(*(written[i] for i in moved)) - set(header_renames)
+    if clobbered & live_before:
+        return [], loop
+
+    res = []
+    for i, s in enumerate(body):
+        if i in copies:
+            res.append(ir.Store(rename(s.target, renames), ir.IrVar(copies[i])))
+        elif i not in hoisted:
+            res.append(rename(s, renames))
+    return header, replace(loop, body=res)
+
+
+def _invariant(loop) -> list[bool]:
+    """Return whether each statement of the body of `loop` is invariant."""
+    variant = {loop.var}
+    for s in loop.body:
+        variant |= defs(s)
+    res = []
+    for s in loop.body:
+        is_invariant = (
+            not isinstance(s, (ir.Loop, ir.Comment))
+            and effect(s) in (Effect.PURE, Effect.READS_ENV)
+            and not uses(s) & variant
+        )
+        if is_invariant:
+            variant -= defs(s)
+        else:
+            variant |= defs(s)
+        res.append(is_invariant)
+    return res
@@ -0,0 +1,256 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from pracy.backend import ir
+from pracy.backend.opt.costs import CURVES, DEFAULT_CURVE, CurveCosts
+from pracy.backend.opt.dataflow import (
+    count_loop_ops,
+    count_loop_pairings,
+    count_ops,
+    count_stmts,
+)
+from pracy.backend.opt.dump import format_ir
+from pracy.optconfig import OPT_LEVELS
+
+
+@dataclass(frozen=True)
+class PassContext:
+    """Settings of the target which passes may take into account."""
+
+    curve: str = DEFAULT_CURVE
+
+    @property
+    def costs(self) -> CurveCosts:
+        return CURVES[self.curve]
+
+
+Pass = Callable[[list[ir.IrStmt], PassContext], list[ir.IrStmt]]
+
+# All known passes by name, see `register_pass`
+PASSES: dict[str, Pass] = {}
+
+# The passes run at each optimization level, in order
+PIPELINES: dict[int, list[str]] = {
+    0: [],
+    1: ["constfold", "copyprop", "dse"],
+    2: [
+        "constfold",
+        "copyprop",
+        "dse",
+        "pairagg",
+        "gtpush",
+        "fuse",
+        "licm",
+        "cse",
+    ],
+}
+
+# The passes lowering the optimized program into the forms the exporters
+# generate the best code for, run once after the pipeline at each level
+LOWERING: dict[int, list[str]] = {
+    0: [],
+    1: ["inplace"],
+    2: ["inplace"],
+}
+
+# Optimization levels at which the pipeline is repeated until the program does
+# not change anymore (at most `_MAX_ROUNDS` times)
+_ITERATED_LEVELS = (2,)
+_MAX_ROUNDS = 8
+
+
+def register_pass(name: str):
+    """
+    Decorator registering a pass under `name`.
+
+    A pass is a function taking a program (a list of `IrStmt`) and the
+    `PassContext` and returning the optimized program. Passes must not
+    modify the given statements but create new ones where needed, and they
+    must preserve the semantics of the program (as observed through the
+    variables which are not local to the generated function, see
+    `pracy.backend.opt.dse`).
+    """
+
+    def decorator(func: Pass) -> Pass:
+        if name in PASSES:
+            raise ValueError(f"Pass '{name}' is already registered.")
+        PASSES[name] = func
+        return func
+
+    return decorator
+
+
+@dataclass
+class PassStats:
+    """Statistics on a single run of a pass on a program."""
+
+    program: str
+    name: str
+    stmts_before: int
+    stmts_after: int
+    # The work per element of the sets looped over, see
+    # `pracy.backend.opt.dataflow.count_ops`
+    ops_before: int
+    ops_after: int
+    # See `pracy.backend.opt.dataflow.count_loop_pairings`
+    pairings_before: int = 0
+    pairings_after: int = 0
+    # See `pracy.backend.opt.dataflow.count_loop_ops`
+    loop_ops_before: int = 0
+    loop_ops_after: int = 0
+
+    @property
+    def stmts_removed(self) -> int:
+        return self.stmts_before - self.stmts_after
+
+    @property
+    def ops_saved(self) -> int:
+        return self.ops_before - self.ops_after
+
+    @property
+    def pairings_removed(self) -> int:
+        return self.pairings_before - self.pairings_after
+
+    @property
+    def loop_ops_removed(self) -> int:
+        return self.loop_ops_before - self.loop_ops_after
+
+
+class PassManager:
+    """
+    Runs a pipeline of passes on programs, collecting a `PassStats` for each
+    run of a pass in `stats`.
+
+    The passes in `lowering` run once after the pipeline (see `LOWERING`).
+
+    If `dump_dir` is given, the program is written to
+    `<dump_dir>/<program>.<nn>-<pass>.ir` before the first and after each
+    pass (see `pracy.backend.opt.dump.format_ir`).
+    """
+
+    def __init__(
+        self,
+        passes: list[str],
+        iterate: bool = False,
+        dump_dir: Path | str | None = None,
+        context: PassContext | None = None,
+        lowering: list[str] | None = None,
+    ):
+        if lowering is None:
+            lowering = []
+        for name in passes + lowering:
+            if name not in PASSES:
+                raise ValueError(f"Unknown pass '{name}'.")
+        if context is None:
+            context = PassContext()
+        if context.curve not in CURVES:
+            raise ValueError(f"Unknown curve '{context.curve}'.")
+        self.passes = passes
+        self.lowering = lowering
+        self.iterate = iterate
+        self.context = context
+        self.dump_dir = Path(dump_dir) if dump_dir is not None else None
+        self.stats: list[PassStats] = []
+
+    @classmethod
+    def for_level(
+        cls,
+        level: int,
+        dump_dir: Path | str | None = None,
+        context: PassContext | None = None,
+    ):
+        if level not in PIPELINES:
+            raise ValueError(f"Invalid optimization level '{level}'.")
+        return cls(
+            PIPELINES[level],
+            level in _ITERATED_LEVELS,
+            dump_dir,
+            context,
+            LOWERING[level],
+        )
+
+    @property
+    def options(self) -> dict[str, str]:
+        """The settings which affect the optimized programs (e.g. for caching)."""
+        return {
+            "passes": ",".join(self.passes),
+            "lowering": ",".join(self.lowering),
+            "iterate": str(self.iterate),
+            "curve": self.context.curve,
+        }
+
+    def run(self, program: str, stmts: list[ir.IrStmt]) -> list[ir.IrStmt]:
+        """Optimize the `stmts` of `program` (e.g. "setup")."""
+        step = 0
+        self._dump(program, step, "input", stmts)
+        for _ in range(_MAX_ROUNDS if self.iterate else 1):
+            before = stmts
+            for name in self.passes:
+                stmts = self._run_pass(program, name, stmts)
+                step += 1
+                self._dump(program, step, name, stmts)
+            if stmts == before:
+                break
+        for name in self.lowering:
+            stmts = self._run_pass(program, name, stmts)
+            step += 1
+            self._dump(program, step, name, stmts)
+        return stmts
+
+    def _run_pass(self, program, name, stmts):
+        stmts_before = count_stmts(stmts)
+        ops_before = count_ops(stmts)
+        pairings_before = count_loop_pairings(stmts)
+        loop_ops_before = count_loop_ops(stmts)
+        stmts = PASSES[name](stmts, self.context)
+        self.stats.append(
+            PassStats(
+                program,
+                name,
+                stmts_before,
+                count_stmts(stmts),
+                ops_before,
+                count_ops(stmts),
+                pairings_before,
+                count_loop_pairings(stmts),
+                loop_ops_before,
+                count_loop_ops(stmts),
+            )
+        )
+        return stmts
+
+    def _dump(self, program, step, name, stmts):
+        if self.dump_dir is None:
+            return
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        path = self.dump_dir / f"{program}.{step:02}-{name}.ir"
+        path.write_text(format_ir(stmts), encoding="utf-8")
+
+
+def format_stats(stats: list[PassStats]) -> str:
+    """Format `stats` as a table with one row per pass run and a total."""
+    lines = [
+        f"{'program':8} {'pass':10} {'stmts':>13} {'ops':>13} {'pairings':>13} "
+        f"{'loop ops':>13}"
+    ]
+    for s in stats:
+        changes = (s.stmts_removed, s.ops_saved, s.pairings_removed, s.loop_ops_removed)
+        if not any(changes):
+            continue
+        lines.append(
+            f"{s.program:8} {s.name:10} "
+            f"{s.stmts_before:5} -> {s.stmts_after:<5}"
+            f"{s.ops_before:5} -> {s.ops_after:<5}"
+            f"{s.pairings_before:5} -> {s.pairings_after:<5}"
+            f"{s.loop_ops_before:5} -> {s.loop_ops_after:<5}"
+        )
+    removed = sum(s.stmts_removed for s in stats)
+    saved = sum(s.ops_saved for s in stats)
+    pairings = sum(s.pairings_removed for s in stats)
+    loop_ops = sum(s.loop_ops_removed for s in stats)
+    lines.append(
+        f"total: {removed} statements removed, {saved} ops saved, "
+        f"{pairings} pairings and {loop_ops} ops removed from loops"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,225 @@
+"""
+Pairing aggregation.
+
+Decryption computes sums like `prod_j e(c_j, K)^{eps_j}` with one pairing per
+element of the loop. If one argument of the pairing (here `K`) does not
+depend on the loop, bilinearity allows computing `e(prod_j c_j^{eps_j}, K)`
+instead: the loop only accumulates the other argument in its source group and
+a single pairing follows the loop.
+
+A loop body matches if it contains
+
+    Pair p, a, b            (one of `a`, `b` is loop invariant)
+    ...                     (computes the coefficient c)
+    ScaleGt p, c, p
+    AddGt acc, acc, p
+
+where `p` and `acc` are not used otherwise in the body, or if it adds a
+pairing with a loop invariant argument to a product of pairings
+
+    AddPair acc, a, b, c
+
+where `acc` is not used otherwise in the body. The statements computing the
+invariant argument are repeated after the loop, the copies in the body are
+cleaned up by dead-store elimination.
+"""
+
+from dataclasses import replace
+from typing import Callable
+
+from pracy.backend import ir
+from pracy.backend.opt.dataflow import defs, strong_defs, uses, var_names
+from pracy.backend.opt.manager import PassContext, register_pass
+
+# The variables and statements accumulating the variant argument of a pairing
+# in its group: (tmp, acc, scale, add, reset)
+_Make = Callable[..., ir.IrStmt]
+_ACCUMULATION: dict[str, tuple[ir.IrVar, ir.IrVar, _Make, _Make, _Make]] = {
+    "g": (ir.TMP_G, ir.ACC_G, ir.ScaleG, ir.AddG, ir.ResetG),
+    "h": (ir.TMP_H, ir.ACC_H, ir.ScaleH, ir.AddH, ir.ResetH),
+}
+
+
+@register_pass("pairagg")
+def aggregate_pairings(stmts: list[ir.IrStmt], context: PassContext) -> list[ir.IrStmt]:
+    res = []
+    for stmt in stmts:
+        if isinstance(stmt, ir.Loop):
+            stmt = replace(stmt, body=aggregate_pairings(stmt.body, context))
+            res.extend(_aggregate(stmt))
+        else:
+            res.append(stmt)
+    return res
+
+
+def _aggregate(loop: ir.Loop) -> list[ir.IrStmt]:
+    """Rewrite the first matching pairing in `loop` (if any)."""
+    body = loop.body
+    slices = _invariant_slices(loop)
+    for k, stmt in enumerate(body):
+        if k not in slices or not isinstance(stmt, (ir.Pair, ir.AddPair)):
+            continue
+        pairing: ir.Pair | ir.AddPair = stmt
+        if isinstance(stmt, ir.AddPair):
+            match = _match_product(body, k)
+        else:
+            match = _match_accumulation(body, k)
+        if match is None:
+            continue
+        m, acc = match
+        invariant_g, invariant_h = slices[k]["g"], slices[k]["h"]
+        if invariant_g is not None and invariant_h is None:
+            side, positions = "h", invariant_g
+        elif invariant_h is not None and invariant_g is None:
+            side, positions = "g", invariant_h
+        else:
+            continue
+        var_tmp, var_acc, scale, add, reset = _ACCUMULATION[side]
+        variant = pairing.source_g if side == "g" else pairing.source_h
+        hoisted = [body[i] for i in positions]
+        if not _can_accumulate(body, k, m, variant, var_tmp, var_acc, hoisted):
+            continue
+
+        if isinstance(pairing, ir.AddPair):
+            coeff, rest = pairing.coeff, body[k + 1 :]
+        else:
+            coeff, rest = body[m].coeff, body[m + 2 :]
+        accumulate: list[ir.IrStmt]
+        if coeff is None:
+            accumulate = [add(var_acc, var_acc, variant)]
+        else:
+            accumulate = [
+                scale(var_tmp, coeff, variant),
+                add(var_acc, var_acc, var_tmp),
+            ]
+        new_body = body[:k] + body[k + 1 : m] + accumulate + rest
+        if side == "g":
+            args = (var_acc, pairing.source_h)
+        else:
+            args = (pairing.source_g, var_acc)
+        pair: list[ir.IrStmt]
+        if isinstance(pairing, ir.AddPair):
+            pair = [ir.AddPair(acc, *args)]
+        else:
+            pair = [ir.Pair(pairing.target, *args), ir.AddGt(acc, acc, pairing.target)]
+        return [
+            reset(var_acc),
+            replace(loop, body=new_body),
+            ir.Comment(f"PAIRING AGGREGATED OVER {loop.var}"),
+            *hoisted,
+            *pair,
+        ]
+    return [loop]
+
+
+def _invariant_slices(loop: ir.Loop) -> dict[int, dict[str, list[int] | None]]:
+    """
+    For each pairing in the body of `loop`, determine for both arguments
+    ("g" and "h") whether they are invariant in the loop. If so, the positions
+    of the statements in the body which compute the argument are given
+    (the argument is `None` otherwise).
+    """
+    variant = {loop.var}
+    for s in loop.body:
+        variant |= defs(s)
+    # Positions of the statements computing each invariant variable which is
+    # (re)computed in the body
+    computed: dict[str, list[int]] = {}
+
+    def slice_of(names):
+        if any(n in variant for n in names):
+            return None
+        return sorted({i for n in names for i in computed.get(n, [])})
+
+    res = {}
+    for i, s in enumerate(loop.body):
+        if isinstance(s, (ir.Pair, ir.AddPair)):
+            res[i] = {
+                "g": slice_of(var_names(s.source_g)),
+                "h": slice_of(var_names(s.source_h)),
+            }
+        if isinstance(s, ir.Comment):
+            continue
+        positions = None
+        if not isinstance(s, (ir.Loop, ir.SampleZ)):
+            positions = slice_of(uses(s))
+        written = strong_defs(s)
+        if positions is None or written != defs(s):
+            for n in defs(s):
+                variant.add(n)
+                computed.pop(n, None)
+        else:
+            for n in written:
+                variant.discard(n)
+                computed[n] = positions + [i]
+    return res
+
+
+def _match_accumulation(body, k):
+    """
+    Match the scaling and accumulation of the pairing at position `k`.
+    Returns the position of the `ScaleGt` and the accumulator.
+    """
+    p = body[k].target
+    if p.index is not None:
+        return None
+    for m in range(k + 1, len(body) - 1):
+        scale, add = body[m], body[m + 1]
+        if p.name in uses(scale) or p.name in defs(scale):
+            break
+    else:
+        return None
+    if not (
+        isinstance(scale, ir.ScaleGt)
+        and scale.target == p
+        and scale.source == p
+        and scale.coeff.name != p.name
+        and isinstance(add, ir.AddGt)
+        and add.target == add.lhs
+        and add.rhs == p
+        and add.target.index is None
+        and add.target.name != p.name
+    ):
+        return None
+    acc = add.target
+    for i, s in enumerate(body):
+        if i in (k, m, m + 1):
+            continue
+        if {p.name, acc.name} & (uses(s) | defs(s)):
+            return None
+    return m, acc
+
+
+def _match_product(body, k):
+    """
+    Match the pairing added to a product of pairings at position `k`.
+    Returns `k` and the product.
+    """
+    acc = body[k].target
+    if acc.index is not None:
+        return None
+    for i, s in enumerate(body):
+        if i != k and acc.name in uses(s) | defs(s):
+            return None
+    return k, acc
+
+
+def _can_accumulate(body, k, m, variant, var_tmp, var_acc, hoisted) -> bool:
+    """
+    Check that the `variant` argument of the pairing at `k` still has the same
+    value at `m` and that the variables used to accumulate it are free.
+    """
+    names = var_names(variant)
+    for s in body[k + 1 : m]:
+        if names & defs(s):
+            return False
+    for i, s in enumerate(body):
+        if var_acc.name in uses(s) | defs(s):
+            return False
+        if i > k and var_tmp.name in uses(s):
+            return False
+    for s in hoisted:
+        # Allocations would be repeated in the enclosing scope
+        if isinstance(s, ir.Alloc) or {var_tmp.name, var_acc.name} & defs(s):
+            return False
+    return True
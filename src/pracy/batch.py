@@ -0,0 +1,169 @@
+"""
+Batch mode of the CLI: compile many schemes for several backends in one
+invocation, spreading the work over a pool of worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from pracy.optconfig import DEFAULT_CURVE
+
+
+@dataclass
+class BatchResult:
+    scheme: str
+    error: str | None = None
+    message: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _init_worker(backend_names: list[str], opt_level: int):
+    """
+    Warm up a worker: import all modules the tasks need (the optimizer only
+    if `opt_level` is above 0) and build all parsers once, so that the
+    individual tasks only pay for the actual compilation.
+    """
+    import pracy.analysis.scheme  # noqa: F401
+    import pracy.backend.compiler.all  # noqa: F401
+    from pracy.frontend.parsing import _GRAMMARS, get_parser
+
+    if opt_level > 0:
+        import pracy.backend.opt  # noqa: F401
+    for name in _GRAMMARS:
+        get_parser(name)
+    if "relic" in backend_names:
+        import pracy.backend.export.relic  # noqa: F401
+    if "charm" in backend_names:
+        import pracy.backend.export.charm  # noqa: F401
+
+
+def _compile_one(
+    scheme: str,
+    backend_names: list[str],
+    outdir: str,
+    cache_dir: str | None,
+    use_cache: bool,
+    opt_level: int,
+    curve: str,
+    precompute: bool,
+    prepared_key: bool,
+    structured_index: bool,
+    charm_module: bool,
+) -> BatchResult:
+    """
+    Compile `scheme` for all backends and write the generated code to
+    `outdir/<stem>/<backend>/` (see `run_batch`).
+    """
+    from pracy import generate_all
+    from pracy.cache import ArtifactCache, write_artifacts
+
+    try:
+        with open(scheme, encoding="utf-8") as f:
+            json_input = f.read()
+        cache = None
+        if use_cache:
+            cache = ArtifactCache(Path(cache_dir) if cache_dir is not None else None)
+        pass_manager = None
+        if opt_level > 0:
+            from pracy.backend.opt import PassContext, PassManager
+
+            pass_manager = PassManager.for_level(opt_level, context=PassContext(curve))
+        res = generate_all(
+            json_input,
+            backend_names,
+            cache,
+            pass_manager,
+            precompute,
+            prepared_key,
+            structured_index,
+            charm_module,
+        )
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # e.g. analysis errors, malformed JSON or syntax errors in the spec
+        return BatchResult(scheme, type(exc).__name__, str(exc))
+
+    for backend, artifacts in res.items():
+        out_dir = Path(outdir) / Path(scheme).stem / backend
+        out_dir.mkdir(parents=True, exist_ok=True)
+        write_artifacts(out_dir, artifacts)
+    return BatchResult(scheme)
+
+
+def run_batch(
+    schemes: list[str],
+    backend_names: list[str],
+    outdir: str,
+    jobs: int | None = None,
+    cache_dir: str | None = None,
+    use_cache: bool = True,
+    opt_level: int = 0,
+    curve: str = DEFAULT_CURVE,
+    precompute: bool = False,
+    prepared_key: bool = False,
+    structured_index: bool = False,
+    charm_module: bool = False,
+) -> list[BatchResult]:
+    """
+    Compile all `schemes` for all backends in `backend_names` using `jobs`
+    worker processes (default: number of CPUs) at the given `opt_level`
+    (optimizing for `curve`), see `pracy.compile_spec` for `precompute`,
+    `prepared_key` and `structured_index` and `pracy.export` for `charm_module`.
+    Prints a summary with one line per scheme and returns the results of the
+    schemes which failed.
+
+    The code of a scheme is written to `outdir/<stem>/<backend>/`, where
+    `<stem>` is the file name of the scheme without its extension, hence
+    schemes with the same stem (e.g. in different directories) are rejected
+    with a ValueError.
+    """
+    stems: dict[str, str] = {}
+    for s in schemes:
+        other = stems.setdefault(Path(s).stem, s)
+        if other != s:
+            raise ValueError(
+                f"'{other}' and '{s}' would both be written to "
+                f"'{Path(outdir) / Path(s).stem}'"
+            )
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(schemes)))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(backend_names, opt_level)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _compile_one,
+                s,
+                backend_names,
+                outdir,
+                cache_dir,
+                use_cache,
+                opt_level,
+                curve,
+                precompute,
+                prepared_key,
+                structured_index,
+                charm_module,
+            )
+            for s in schemes
+        ]
+        results = [f.result() for f in futures]
+
+    width = max(len(r.scheme) for r in results)
+    for r in results:
+        if r.ok:
+            print(f"{r.scheme:{width}}  ok")
+        else:
+            print(f"{r.scheme:{width}}  FAILED  {r.error}")
+    failed = [r for r in results if not r.ok]
+    print(
+        f"{len(results) - len(failed)} of {len(results)} schemes compiled "
+        f"for {', '.join(backend_names)}"
+    )
+    return failed
@@ -0,0 +1,143 @@
+"""
+A content-addressed cache for the code generated by the CLI.
+
+Entries are keyed by the hash of the scheme specification, the backend, the
+compiler options (e.g. the optimization level) and the compiler version
+(i.e., the sources of pracy itself), so that a cached entry is never used
+for a compiler which might generate different code.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+# Names of the generated artifacts, each is stored as "<name>.gen"
+ARTIFACTS = ("setup", "keygen", "encrypt", "decrypt")
+
+# Name of the artifact generated instead for an importable module (see
+# `pracy.backend.export.charm.Charm.export_module`), which is written as
+# "<name>.py" (but cached as "<name>.gen" as well)
+MODULE_ARTIFACTS = ("scheme",)
+
+_compiler_version = None
+
+
+def default_cache_dir() -> Path:
+    """Return `$XDG_CACHE_HOME/pracy` (defaulting to `~/.cache/pracy`)."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        return Path.home() / ".cache" / "pracy"
+    return Path(base) / "pracy"
+
+
+def compiler_version() -> str:
+    """
+    Return a hash of all sources (Python code and grammars) of pracy.
+
+    This is used instead of the package version because it also changes
+    during development, when the version number stays the same.
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        root = Path(__file__).parent
+        h = hashlib.sha256()
+        for path in sorted(root.rglob("*")):
+            if path.suffix not in (".py", ".lark"):
+                continue
+            h.update(path.relative_to(root).as_posix().encode())
+            h.update(b"\0")
+            h.update(path.read_bytes())
+            h.update(b"\0")
+        _compiler_version = h.hexdigest()
+    return _compiler_version
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write `content` to `path` unless the file already has exactly this
+    content. Leaving the file untouched keeps its modification time, so
+    build systems do not consider it changed.
+
+    Returns `True` if the file has been written.
+    """
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def write_artifacts(out_dir: Path, artifacts: dict[str, str]):
+    """Write the generated `artifacts` to `out_dir` (see `write_if_changed`)."""
+    suffix = ".py" if tuple(artifacts) == MODULE_ARTIFACTS else ".gen"
+    for name, content in artifacts.items():
+        write_if_changed(out_dir / f"{name}{suffix}", content)
+
+
+class ArtifactCache:
+    """
+    Stores the artifacts generated for a scheme in `root/<key>/<name>.gen`.
+    """
+
+    def __init__(self, root: Path | None = None):
+        if root is None:
+            root = default_cache_dir()
+        self.root = Path(root)
+
+    def key(
+        self, spec: str, backend: str, options: dict[str, str] | None = None
+    ) -> str:
+        """
+        Compute the key for the given (JSON) `spec`, `backend` and compiler
+        `options` which affect the generated code.
+        """
+        if options is None:
+            options = {}
+        opts = ",".join(f"{k}={v}" for k, v in sorted(options.items()))
+        h = hashlib.sha256()
+        for part in (compiler_version(), backend, opts, spec):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def load(self, key: str, names=ARTIFACTS) -> dict[str, str] | None:
+        """
+        Return the artifacts with the given `names` stored for `key` or
+        `None` if there is no (complete) entry.
+        """
+        entry = self.root / key
+        try:
+            return {
+                name: (entry / f"{name}.gen").read_text(encoding="utf-8")
+                for name in names
+            }
+        except FileNotFoundError:
+            return None
+
+    def store(self, key: str, artifacts: dict[str, str]):
+        """
+        Store `artifacts` for `key`.
+
+        The entry is assembled in a temporary directory and moved into place
+        at once, so concurrent readers never observe a partial entry.
+        Failures to write the cache are ignored, as the cache is only an
+        optimization.
+        """
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = Path(tempfile.mkdtemp(dir=self.root, prefix=".tmp-"))
+            for name, content in artifacts.items():
+                (tmp / f"{name}.gen").write_text(content, encoding="utf-8")
+            try:
+                tmp.rename(self.root / key)
+            except OSError:
+                # Another process stored the same entry in the meantime
+                for name in artifacts:
+                    (tmp / f"{name}.gen").unlink()
+                tmp.rmdir()
+        except OSError:
+            pass
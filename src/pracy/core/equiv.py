@@ -43,6 +43,36 @@ def equiv(x, y):
     return True
 
 
+def equiv_key(x):
+    """
+    Compute the *equivalence signature* of a variable (or polynomial).
+
+    The signature is a hashable value which is compatible with `equiv`, i.e.,
+    `equiv(x, y)` implies `equiv_key(x) == equiv_key(y)`. It consists of
+    - the name
+    - the number of indices
+    - for each index
+        - its name, if it is not quantified, or
+        - its type (see `QType`) with `ATTRIBUTE` and `ALT_ATTR` collapsed, if it
+          is quantified
+
+    Since `equiv` considers two objects equivalent as soon as it finds two
+    different attribute types at the same position, the signature ends with the
+    first quantified index of an attribute type.
+    """
+    key = [x.name, len(x.idcs)]
+    for idx in x.idcs:
+        if not idx.is_quantified(x.quants):
+            key.append(("fix", idx.name))
+            continue
+        idx_type = idx.get_type(x.quants)
+        if idx_type in [QType.ATTRIBUTE, QType.ALT_ATTR]:
+            key.append(("quant", QType.ATTRIBUTE))
+            break
+        key.append(("quant", idx_type))
+    return tuple(key)
+
+
 class EquivMap:
     """
     A dictionary-like mapping based on the equivalence relation given by `equiv`.
@@ -50,8 +80,9 @@ class EquivMap:
     This map does not rely on `__hash__` or `__eq__` of its keys, as we want keys
     which are *equivalent but not equal* to collide.
 
-    The implementation is straight-forward and thus has linear complexity for
-    read and write access.
+    Entries are bucketed by their `equiv_key`, so that `equiv` only needs to be
+    evaluated for the (few) keys with the same signature. Thus, read and write
+    access have constant expected complexity.
     """
 
     def __init__(self, default=None):
@@ -63,8 +94,14 @@ class EquivMap:
                      keys.
         """
         self._mappings = []
+        self._buckets = {}
         self._default = default
 
+    def _lookup(self, key):
+        """Find the key-value pair in self with a key equivalent to `key`."""
+        bucket = self._buckets.get(equiv_key(key), [])
+        return next(((k, v) for k, v in bucket if equiv(k, key)), None)
+
     def __setitem__(self, key, value):
         """
         Add a new key-value pair to self.
@@ -75,15 +112,16 @@ class EquivMap:
         if key in self:
             raise ValueError("Duplicate key '{key}' not allowed in EquivMap.")
         self._mappings.append((key, value))
+        self._buckets.setdefault(equiv_key(key), []).append((key, value))
 
     def __getitem__(self, key):
         """Retrieve a value by its key from self."""
-        try:
-            return next(v for k, v in self._mappings if equiv(k, key))
-        except StopIteration as excp:
+        mapping = self._lookup(key)
+        if mapping is None:
             if self._default:
                 return self._default(key)
-            raise KeyError("Invalid key '{key}'.") from excp
+            raise KeyError("Invalid key '{key}'.")
+        return mapping[1]
 
     def __len__(self):
         """Compute the number of entries in self."""
@@ -119,10 +157,11 @@ class EquivMap:
     def clear(self):
         """Remove all entries from self."""
         self._mappings.clear()
+        self._buckets.clear()
 
     def has_key(self, key):
         """Return True if and only if self has a mapping for a given key."""
-        return any(equiv(k, key) for k, _ in self._mappings)
+        return self._lookup(key) is not None
 
     def get(self, key, default=None):
         """Retrieve a value by its key from self."""
@@ -164,8 +203,9 @@ class EquivSet(Generic[T]):
     This set does not rely on `__hash__` or `__eq__` of its elements, as we want
     elements which are *equivalent but not equal* to collide.
 
-    The implementation is straight-forward and thus has linear complexity for
-    read and write access.
+    Like `EquivMap`, the elements are bucketed (by position) according to their
+    `equiv_key`, which gives constant expected complexity for read and write
+    access.
     """
 
     def __init__(self, elements=None):
@@ -173,6 +213,7 @@ class EquivSet(Generic[T]):
         Construct an empty EquivSet.
         """
         self._elements = []
+        self._buckets = {}
         if elements is not None:
             for el in elements:
                 self.add(el)
@@ -188,7 +229,18 @@ class EquivSet(Generic[T]):
 
     def __contains__(self, el):
         """Test if an element is stored in self."""
-        return any(equiv(el, e) for e in self._elements)
+        return self._find(el) is not None
+
+    def _find(self, el):
+        """Find the position of the element in self equivalent to `el`."""
+        bucket = self._buckets.get(equiv_key(el), [])
+        return next((i for i in bucket if equiv(el, self._elements[i])), None)
+
+    def _reindex(self):
+        """Rebuild the buckets after positions of elements have changed."""
+        self._buckets = {}
+        for i, e in enumerate(self._elements):
+            self._buckets.setdefault(equiv_key(e), []).append(i)
 
     def __iter__(self):
         """Obtain an iterator over the elements of self."""
@@ -201,6 +253,7 @@ class EquivSet(Generic[T]):
     def add(self, el):
         """Add a given element to self."""
         if el not in self:
+            self._buckets.setdefault(equiv_key(el), []).append(len(self._elements))
             self._elements.append(el)
 
     def update(self, el):
@@ -214,9 +267,8 @@ class EquivSet(Generic[T]):
         if el not in self:
             return self.add(el)
 
-        idx, conflict = next(
-            (i, v) for i, v in enumerate(self._elements) if equiv(el, v)
-        )
+        idx = self._find(el)
+        conflict = self._elements[idx]
 
         quants = []
         for q in conflict.quants:
@@ -227,17 +279,21 @@ class EquivSet(Generic[T]):
             quants.append(Quant(q.name, base_set, global_map))
         resolved = Var(conflict.name, conflict.idcs, quants)
         self._elements[idx] = resolved
+        if equiv_key(resolved) != equiv_key(conflict):
+            self._reindex()
 
     def remove(self, el):
         """Remove a given element from self."""
         if el not in self._elements:
             raise KeyError()
-        idx = next(i for i, e in enumerate(self._elements) if equiv(e, el))
+        idx = self._find(el)
         del self._elements[idx]
+        self._reindex()
 
     def clear(self):
         """Remove all entries from self."""
         self._elements = []
+        self._buckets = {}
 
     def __eq__(self, other):
         """
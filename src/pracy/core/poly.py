@@ -1,10 +1,9 @@
 from dataclasses import dataclass
 
-from sympy import Expr, simplify
-
 from pracy.core.group import Group
 from pracy.core.idx import Idx
 from pracy.core.quant import Quant
+from pracy.core.rational_poly import RationalPoly, as_rational_poly
 
 
 @dataclass
@@ -12,7 +11,7 @@ class Poly:
     name: str
     idcs: list[Idx]
     quants: list[Quant]
-    expr: Expr
+    expr: RationalPoly
     group: Group
 
     def __eq__(self, other):
@@ -21,7 +20,7 @@ class Poly:
                 self.name == other.name
                 and self.idcs == other.idcs
                 and self.quants == other.quants
-                and simplify(self.expr - other.expr) == 0
+                and as_rational_poly(self.expr) == as_rational_poly(other.expr)
                 and self.group == other.group
             )
         return False
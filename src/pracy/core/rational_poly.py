@@ -0,0 +1,299 @@
+import sys
+from fractions import Fraction
+from typing import Union
+
+# A factor of a monomial is either a symbol (given by its name) or a sum of
+# several terms (a `RationalPoly`) which may only occur in the denominator,
+# i.e., with negative exponent.
+Atom = Union[str, "RationalPoly"]
+Monomial = frozenset[tuple[Atom, int]]
+
+_ONE: Monomial = frozenset()
+
+
+class RationalPoly:
+    """
+    A sparse multivariate polynomial with rational coefficients over named
+    symbols, extended by the restricted kind of denominators supported by the
+    analysis: single symbols (e.g. `1/x`) and sums (e.g. `1/(x - y)`).
+
+    Instances are immutable and always kept in expanded normal form, i.e.,
+    products are distributed over sums and like terms are collected. Hence,
+    two instances are equal iff their normal forms agree.
+    """
+
+    __slots__ = ("_terms", "_hash")
+
+    def __init__(self, terms: dict[Monomial, Fraction] | None = None):
+        if terms is None:
+            terms = {}
+        self._terms = {m: c for m, c in terms.items() if c != 0}
+        self._hash = None
+
+    @classmethod
+    def symbol(cls, name: str) -> "RationalPoly":
+        return cls({frozenset([(name, 1)]): Fraction(1)})
+
+    @classmethod
+    def constant(cls, value: int | Fraction) -> "RationalPoly":
+        return cls({_ONE: Fraction(value)})
+
+    def is_zero(self) -> bool:
+        return not self._terms
+
+    def as_monomial(self) -> tuple[Fraction, Monomial] | None:
+        """Return `(coeff, monomial)` if `self` consists of a single term."""
+        if len(self._terms) != 1:
+            return None
+        ((m, c),) = self._terms.items()
+        return c, m
+
+    def terms(self) -> list[tuple[Fraction, list[tuple[Atom, int]]]]:
+        """
+        Return the terms of `self` as `(coeff, factors)` pairs.
+
+        Terms and the factors within each term are listed in the canonical
+        order which sympy uses for expanded expressions. The generated code
+        has always followed this order, so it does not depend on whether
+        sympy is involved or not.
+        """
+        const = self._terms.get(_ONE)
+        res: list[tuple[Fraction, list[tuple[Atom, int]]]] = []
+        if const is not None:
+            res.append((const, []))
+        others = [(c, sorted(m, key=_factor_key)) for m, c in self._terms.items() if m]
+        others.sort(key=lambda t: _term_key(*t))
+        res.extend(others)
+        return res
+
+    def __add__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        terms = dict(self._terms)
+        for m, c in other._terms.items():
+            terms[m] = terms.get(m, 0) + c
+        return RationalPoly(terms)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return RationalPoly({m: -c for m, c in self._terms.items()})
+
+    def __sub__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self + (-other)
+
+    def __rsub__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return other + (-self)
+
+    def __mul__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        terms = {}
+        for m1, c1 in self._terms.items():
+            for m2, c2 in other._terms.items():
+                for m, c in _mul_monomials(m1, m2)._terms.items():
+                    terms[m] = terms.get(m, 0) + c * c1 * c2
+        return RationalPoly(terms)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        if other.is_zero():
+            raise ZeroDivisionError("division by zero polynomial")
+        mono = other.as_monomial()
+        if mono is not None:
+            c, m = mono
+            inverse = frozenset((a, -e) for a, e in m)
+            return self * _expand_monomial(inverse) * RationalPoly.constant(1 / c)
+        return self * RationalPoly({frozenset([(other, -1)]): Fraction(1)})
+
+    def __rtruediv__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return other / self
+
+    def __eq__(self, other):
+        try:
+            other = as_rational_poly(other)
+        except (TypeError, ValueError):
+            return False
+        return self._terms == other._terms
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._terms.items()))
+        return self._hash
+
+    def __str__(self):
+        if not self._terms:
+            return "0"
+        res = ""
+        for c, factors in self.terms():
+            fs = [_factor_str(a, e) for a, e in factors]
+            if not fs or abs(c) != 1:
+                fs.insert(0, str(abs(c)))
+            if res:
+                res += " - " if c < 0 else " + "
+            elif c < 0:
+                res += "-"
+            res += "*".join(fs)
+        return res
+
+    def __repr__(self):
+        return f"RationalPoly('{self}')"
+
+
+def as_rational_poly(expr) -> RationalPoly:
+    """
+    Convert `expr` to a `RationalPoly`.
+
+    Besides `RationalPoly` itself, numbers and sympy expressions are accepted.
+    Sympy is never imported here: sympy expressions can only exist if the
+    caller has imported sympy already.
+    """
+    res = _coerce(expr)
+    if res is not None:
+        return res
+    sympy = sys.modules.get("sympy")
+    if sympy is not None and isinstance(expr, sympy.Basic):
+        return _from_sympy(expr)
+    raise TypeError(f"Cannot convert {type(expr).__name__} to RationalPoly")
+
+
+def _coerce(x) -> RationalPoly | None:
+    if isinstance(x, RationalPoly):
+        return x
+    if isinstance(x, (int, Fraction)) and not isinstance(x, bool):
+        return RationalPoly.constant(x)
+    return None
+
+
+def _from_sympy(expr) -> RationalPoly:
+    if expr.is_Rational:
+        return RationalPoly.constant(Fraction(int(expr.p), int(expr.q)))
+    if expr.is_Symbol:
+        return RationalPoly.symbol(expr.name)
+    if expr.is_Add:
+        res = RationalPoly()
+        for arg in expr.args:
+            res += _from_sympy(arg)
+        return res
+    if expr.is_Mul:
+        res = RationalPoly.constant(1)
+        for arg in expr.args:
+            res *= _from_sympy(arg)
+        return res
+    if expr.is_Pow and expr.exp.is_Integer:
+        base = _from_sympy(expr.base)
+        res = RationalPoly.constant(1)
+        for _ in range(abs(int(expr.exp))):
+            res *= base
+        if expr.exp < 0:
+            res = 1 / res
+        return res
+    raise ValueError("Unexpected term")
+
+
+def _mul_monomials(m1: Monomial, m2: Monomial) -> RationalPoly:
+    exps = dict(m1)
+    for a, e in m2:
+        exps[a] = exps.get(a, 0) + e
+    return _expand_monomial(frozenset((a, e) for a, e in exps.items() if e != 0))
+
+
+def _expand_monomial(m: Monomial) -> RationalPoly:
+    """
+    Turn `m` into a `RationalPoly`, multiplying out sums which ended up with
+    a positive exponent (e.g. after dividing by a denominator).
+    """
+    plain = frozenset((a, e) for a, e in m if isinstance(a, str) or e < 0)
+    res = RationalPoly({plain: Fraction(1)})
+    for a, e in m - plain:
+        for _ in range(e):
+            res *= a
+    return res
+
+
+def _factor_str(atom: Atom, exp: int) -> str:
+    base = atom if isinstance(atom, str) else f"({atom})"
+    if exp == 1:
+        return base
+    if exp < 0:
+        return f"{base}**({exp})"
+    return f"{base}**{exp}"
+
+
+# Ranks of the sympy classes occurring in expanded expressions, see
+# `sympy.core.basic.ordering_of_classes`.
+_RANK_ZERO = 0
+_RANK_ONE = 1
+_RANK_HALF = 2
+_RANK_NEGATIVE_ONE = 5
+_RANK_INTEGER = 7
+_RANK_RATIONAL = 8
+_RANK_SYMBOL = 13
+_RANK_POW = 15
+_RANK_MUL = 16
+_RANK_ADD = 17
+
+
+# The keys below mirror `sympy.core.basic.Basic.compare`: objects are ordered by
+# class first, then by the number of their arguments and finally by their
+# arguments (recursively).
+def _number_key(n: Fraction | int):
+    n = Fraction(n)
+    if n == 0:
+        rank = _RANK_ZERO
+    elif n == 1:
+        rank = _RANK_ONE
+    elif n == Fraction(1, 2):
+        rank = _RANK_HALF
+    elif n == -1:
+        rank = _RANK_NEGATIVE_ONE
+    elif n.denominator == 1:
+        rank = _RANK_INTEGER
+    else:
+        rank = _RANK_RATIONAL
+    return (rank, 2, (n.numerator, n.denominator))
+
+
+def _factor_key(factor: tuple[Atom, int]):
+    atom, exp = factor
+    if isinstance(atom, str):
+        base = (_RANK_SYMBOL, 1, (atom,))
+        if exp == 1:
+            return base
+    else:
+        base = _sum_key(atom)
+    return (_RANK_POW, 2, (base, _number_key(exp)))
+
+
+def _term_key(coeff: Fraction, factors: list[tuple[Atom, int]]):
+    if not factors:
+        return _number_key(coeff)
+    args = [_factor_key(f) for f in factors]
+    if coeff == 1 and len(args) == 1:
+        return args[0]
+    if coeff != 1:
+        args.insert(0, _number_key(coeff))
+    return (_RANK_MUL, len(args), tuple(args))
+
+
+def _sum_key(poly: RationalPoly):
+    args = tuple(_term_key(c, fs) for c, fs in poly.terms())
+    return (_RANK_ADD, len(args), args)
@@ -1,8 +1,8 @@
 import json
 
 from lark import Lark, Transformer
+from lark.exceptions import GrammarError
 from lark.visitors import merge_transformers
-from sympy import Add, Expr, Mul, Pow, Symbol
 
 from pracy.core.fdh import FdhEntry
 from pracy.core.group import Group
@@ -12,6 +12,7 @@ from pracy.core.poly import Poly
 from pracy.core.qmap import QMap
 from pracy.core.qset import QSet
 from pracy.core.quant import Quant
+from pracy.core.rational_poly import RationalPoly
 from pracy.core.var import Var
 from pracy.frontend.raw_scheme import RawPair, RawScheme, RawSingle
 
@@ -41,6 +42,44 @@ def parse_json(data: str) -> RawScheme:
     return raw_scheme
 
 
+# Name -> (grammar file, start symbol) of all entry grammars.
+_GRAMMARS = {
+    "var": ("var.lark", "var"),
+    "poly": ("poly.lark", "poly"),
+    "fdh_entry": ("fdh_entry.lark", "fdh"),
+    "matrix_entry": ("matrix_entry.lark", "entry"),
+    "vector_entry": ("vector_entry.lark", "entry"),
+}
+
+_parsers: dict[str, Lark] = {}
+
+
+def get_parser(name: str) -> Lark:
+    """
+    Obtain the parser for one of the entry grammars (see `_GRAMMARS`).
+
+    Every parser is built at most once per process and then shared by all
+    subsequent calls. The grammars are LALR(1), which lets Lark also keep the
+    compiled parse tables in its on-disk cache, so that even the first build
+    in a fresh process is cheap.
+
+    Earley is only used as a fallback if a grammar cannot be compiled to an
+    LALR(1) parser (e.g. after a change introduced a conflict). The parse
+    results are the same in this case, only parsing is slower and uncached.
+    """
+    parser = _parsers.get(name)
+    if parser is None:
+        file, start = _GRAMMARS[name]
+        try:
+            parser = Lark.open(
+                file, rel_to=__file__, start=start, parser="lalr", cache=True
+            )
+        except GrammarError:
+            parser = Lark.open(file, rel_to=__file__, start=start, parser="earley")
+        _parsers[name] = parser
+    return parser
+
+
 class BaseTransformer(Transformer):
     """
     The `BaseTransformer` groups common syntactical components (for example indices
@@ -92,7 +131,7 @@ class BaseTransformer(Transformer):
     def normal_ident(self, i):
         return "".join(i.value for i in i)
 
-    def symbol(self, v) -> Expr:
+    def symbol(self, v) -> RationalPoly:
         if len(v) == 2:
             name, idcs = v
         else:
@@ -109,25 +148,44 @@ class BaseTransformer(Transformer):
             s += "_{"
             s += ",".join([to_str(i) for i in idcs])
             s += "}"
-        return Symbol(s)
+        return RationalPoly.symbol(s)
+
+    def num(self, n) -> RationalPoly:
+        return RationalPoly.constant(int(n[0].value))
+
+    def add(self, args) -> RationalPoly:
+        return args[0] + args[1]
+
+    def sub(self, args) -> RationalPoly:
+        return args[0] - args[1]
 
-    def num(self, n) -> int:
-        return int(n[0].value)
+    def mul(self, args) -> RationalPoly:
+        return args[0] * args[1]
 
-    def add(self, args) -> Expr:
-        return Add(args[0], args[1])
+    def neg(self, args) -> RationalPoly:
+        return -args[0]
 
-    def sub(self, args) -> Expr:
-        return Add(args[0], Mul(-1, args[1]))
+    def div(self, args) -> RationalPoly:
+        return args[0] / args[1]
 
-    def mul(self, args) -> Expr:
-        return Mul(args[0], args[1])
 
-    def neg(self, args) -> Expr:
-        return Add(0, Mul(-1, args[0]))
+class _FdhBuilder(Transformer):
+    def fdh_idx(self, f):
+        return int(f[0])
+
+    def fdh(self, v):
+        return FdhEntry(v[0], v[1])
+
+    def var(self, v):
+        name, idcs, quants = v
+        if idcs is None:
+            idcs = []
+        if quants is None:
+            quants = []
+        return Var(name, idcs, quants)
+
 
-    def div(self, args) -> Expr:
-        return Mul(args[0], Pow(args[1], -1))
+_FDH_ENTRY_TRANSFORMER = merge_transformers(_FdhBuilder(), base=BaseTransformer())
 
 
 def parse_fdh_entry(str: str) -> FdhEntry:
@@ -143,26 +201,29 @@ def parse_fdh_entry(str: str) -> FdhEntry:
 
     The integer specifies the index of the FDH function to use and must be unsigned.
     """
-    fdh_parser = Lark.open("fdh_entry.lark", rel_to=__file__, start="fdh")
-    fdh = fdh_parser.parse(str)
+    fdh = get_parser("fdh_entry").parse(str)
+    return _FDH_ENTRY_TRANSFORMER.transform(fdh)
 
-    class FdhBuilder(Transformer):
-        def fdh_idx(self, f):
-            return int(f[0])
 
-        def fdh(self, v):
-            return FdhEntry(v[0], v[1])
+class _MatrixEntryBuilder(Transformer):
+    def entry(self, e):
+        lhs, idcs_l, rhs, idcs_r, expr, quants = e
+        idcs_l = [] if not idcs_l else idcs_l
+        idcs_r = [] if not idcs_r else idcs_r
+        lhs = Var(lhs, idcs_l)
+        rhs = Var(rhs, idcs_r)
+        return RawPair(lhs, rhs, expr, quants)
 
-        def var(self, v):
-            name, idcs, quants = v
-            if idcs is None:
-                idcs = []
-            if quants is None:
-                quants = []
-            return Var(name, idcs, quants)
+    def var(self, v):
+        name, idcs = v
+        if not idcs:
+            return name, []
+        return name, idcs
 
-    transformer = merge_transformers(FdhBuilder(), base=BaseTransformer())
-    return transformer.transform(fdh)
+
+_MATRIX_ENTRY_TRANSFORMER = merge_transformers(
+    _MatrixEntryBuilder(), base=BaseTransformer()
+)
 
 
 def parse_matrix_entry(str: str) -> RawPair:
@@ -182,26 +243,26 @@ def parse_matrix_entry(str: str) -> RawPair:
     The expression may be any arithmetic expression consisting of standard operators,
     parenthesis, integer literals and (possibly indexed) variables.
     """
-    entry_parser = Lark.open("matrix_entry.lark", rel_to=__file__, start="entry")
-    entry = entry_parser.parse(str)
-
-    class EntryBuilder(Transformer):
-        def entry(self, e):
-            lhs, idcs_l, rhs, idcs_r, expr, quants = e
-            idcs_l = [] if not idcs_l else idcs_l
-            idcs_r = [] if not idcs_r else idcs_r
-            lhs = Var(lhs, idcs_l)
-            rhs = Var(rhs, idcs_r)
-            return RawPair(lhs, rhs, expr, quants)
-
-        def var(self, v):
-            name, idcs = v
-            if not idcs:
-                return name, []
+    entry = get_parser("matrix_entry").parse(str)
+    return _MATRIX_ENTRY_TRANSFORMER.transform(entry)
+
+
+class _VectorEntryBuilder(Transformer):
+    def entry(self, e):
+        name, idcs, expr, quants = e
+        return RawSingle(Var(name, idcs), expr, quants)
+
+    def var(self, v):
+        name, idcs = v
+        if not idcs:
+            return name, []
+        else:
             return name, idcs
 
-    transformer = merge_transformers(EntryBuilder(), base=BaseTransformer())
-    return transformer.transform(entry)
+
+_VECTOR_ENTRY_TRANSFORMER = merge_transformers(
+    _VectorEntryBuilder(), base=BaseTransformer()
+)
 
 
 def parse_vector_entry(str: str) -> RawSingle:
@@ -222,23 +283,29 @@ def parse_vector_entry(str: str) -> RawSingle:
     The expression may contain arithmetic operators, parenthesis, variables and
     integer literals.
     """
-    entry_parser = Lark.open("vector_entry.lark", rel_to=__file__, start="entry")
-    entry = entry_parser.parse(str)
+    entry = get_parser("vector_entry").parse(str)
+    return _VECTOR_ENTRY_TRANSFORMER.transform(entry)
 
-    class EntryBuilder(Transformer):
-        def entry(self, e):
-            name, idcs, expr, quants = e
-            return RawSingle(Var(name, idcs), expr, quants)
 
-        def var(self, v):
-            name, idcs = v
-            if not idcs:
-                return name, []
-            else:
-                return name, idcs
+class _PolyBuilder(Transformer):
+    def poly(self, p):
+        (name, idcs) = p[0]
+        group = p[1]
+        expr = p[2]
+        quants = p[3] if len(p) == 4 else []
+        return Poly(name, idcs, quants, expr, group)
 
-    transformer = merge_transformers(EntryBuilder(), base=BaseTransformer())
-    return transformer.transform(entry)
+    def var(self, v):
+        name, idcs = v
+        if not idcs:
+            return name, []
+        return name, idcs
+
+    def group(self, g):
+        return Group(g[0].value)
+
+
+_POLY_TRANSFORMER = merge_transformers(_PolyBuilder(), base=BaseTransformer())
 
 
 def parse_poly(str: str) -> Poly:
@@ -263,28 +330,21 @@ def parse_poly(str: str) -> Poly:
     in parenthesis and followed by quantifications. See `parse_var` for detailed syntax
     description.
     """
-    poly_parser = Lark.open("poly.lark", rel_to=__file__, start="poly")
-    poly = poly_parser.parse(str)
-
-    class PolyBuilder(Transformer):
-        def poly(self, p):
-            (name, idcs) = p[0]
-            group = p[1]
-            expr = p[2]
-            quants = p[3] if len(p) == 4 else []
-            return Poly(name, idcs, quants, expr, group)
-
-        def var(self, v):
-            name, idcs = v
-            if not idcs:
-                return name, []
-            return name, idcs
+    poly = get_parser("poly").parse(str)
+    return _POLY_TRANSFORMER.transform(poly)
+
+
+class _VarBuilder(Transformer):
+    def var(self, v):
+        name, idcs, quants = v
+        if not idcs:
+            idcs = []
+        if not quants:
+            quants = []
+        return Var(name, idcs, quants)
 
-        def group(self, g):
-            return Group(g[0].value)
 
-    transformer = merge_transformers(PolyBuilder(), base=BaseTransformer())
-    return transformer.transform(poly)
+_VAR_TRANSFORMER = merge_transformers(_VarBuilder(), base=BaseTransformer())
 
 
 def parse_var(str: str) -> Var:
@@ -308,17 +368,5 @@ def parse_var(str: str) -> Var:
     Each base set may be mapped and specified as `f(base_set)` instead, where `f`
     is a `QMap`.
     """
-    var_parser = Lark.open("var.lark", rel_to=__file__, start="var")
-    var = var_parser.parse(str)
-
-    class VarBuilder(Transformer):
-        def var(self, v):
-            name, idcs, quants = v
-            if not idcs:
-                idcs = []
-            if not quants:
-                quants = []
-            return Var(name, idcs, quants)
-
-    transformer = merge_transformers(VarBuilder(), base=BaseTransformer())
-    return transformer.transform(var)
+    var = get_parser("var").parse(str)
+    return _VAR_TRANSFORMER.transform(var)
@@ -1,17 +1,16 @@
 from dataclasses import dataclass
 
-from sympy import Expr
-
 from pracy.core.fdh import FdhEntry
 from pracy.core.poly import Poly
 from pracy.core.quant import Quant
+from pracy.core.rational_poly import RationalPoly
 from pracy.core.var import Var
 
 
 @dataclass
 class RawSingle:
     entry: Var
-    expr: Expr
+    expr: RationalPoly
     quants: list[Quant]
 
 
@@ -19,7 +18,7 @@ class RawSingle:
 class RawPair:
     lhs: Var
     rhs: Var
-    expr: Expr
+    expr: RationalPoly
     quants: list[Quant]
 
 
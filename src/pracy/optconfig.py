@@ -0,0 +1,14 @@
+"""
+The optimization levels and target curves of the optimizer (see
+`pracy.backend.opt`).
+
+This module imports nothing, such that the command line interface can offer
+them as choices without loading the optimizer.
+"""
+
+# See `pracy.backend.opt.PIPELINES`
+OPT_LEVELS = (0, 1, 2)
+
+# See `pracy.backend.opt.costs.CURVES`
+CURVES = ("bn254", "bn256", "bls12-381", "ss512")
+DEFAULT_CURVE = "bn254"
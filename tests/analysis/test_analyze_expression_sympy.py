@@ -0,0 +1,112 @@
+import json
+import os
+from pathlib import Path
+
+import sympy
+from lark.visitors import merge_transformers
+
+from pracy.analysis.expr import analyze_expr
+from pracy.core.rational_poly import as_rational_poly
+from pracy.frontend.parsing import (
+    BaseTransformer,
+    get_parser,
+    parse_matrix_entry,
+    parse_poly,
+    parse_vector_entry,
+)
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+# Spec section -> (grammar, parse function) of its entries
+_SECTIONS = {
+    "key_polys": ("poly", parse_poly),
+    "cipher_polys": ("poly", parse_poly),
+    "e_vec": ("vector_entry", parse_vector_entry),
+    "e_mat": ("matrix_entry", parse_matrix_entry),
+}
+
+
+class _SympyTransformer(BaseTransformer):
+    """Builds sympy expressions the way the parser used to."""
+
+    def symbol(self, v):
+        return sympy.Symbol(str(super().symbol(v)))
+
+    def num(self, n):
+        return sympy.Integer(int(n[0].value))
+
+    def add(self, args):
+        return sympy.Add(args[0], args[1])
+
+    def sub(self, args):
+        return sympy.Add(args[0], sympy.Mul(-1, args[1]))
+
+    def mul(self, args):
+        return sympy.Mul(args[0], args[1])
+
+    def neg(self, args):
+        return sympy.Add(0, sympy.Mul(-1, args[0]))
+
+    def div(self, args):
+        return sympy.Mul(args[0], sympy.Pow(args[1], -1))
+
+
+_transformer = merge_transformers(base=_SympyTransformer())
+
+
+def _load_exprs():
+    """
+    Collect the expressions of all scheme specs, both as built by the parser
+    and as sympy expression.
+    """
+    exprs = []
+    for path in sorted(_schemes_path.glob("*.json")):
+        with open(path, "r") as file:
+            spec = json.load(file)["spec"]
+        for section, (grammar, parse) in _SECTIONS.items():
+            for text in spec[section]:
+                tree = _transformer.transform(get_parser(grammar).parse(text))
+                expr = next(c for c in tree.children if isinstance(c, sympy.Basic))
+                exprs.append((parse(text).expr, expr))
+    return exprs
+
+
+_exprs = _load_exprs()
+
+
+def _to_sympy(poly):
+    """Convert `poly` to sympy, keeping the order of its terms and factors."""
+    args = [_term_to_sympy(c, fs) for c, fs in poly.terms()]
+    if len(args) == 1:
+        return args[0]
+    return sympy.Add(*args, evaluate=False)
+
+
+def _term_to_sympy(coeff, factors):
+    args = []
+    for atom, exp in factors:
+        if isinstance(atom, str):
+            base = sympy.Symbol(atom)
+        else:
+            base = _to_sympy(atom)
+        args.append(base if exp == 1 else sympy.Pow(base, exp, evaluate=False))
+    if coeff != 1 or not args:
+        args.insert(0, sympy.Rational(coeff.numerator, coeff.denominator))
+    if len(args) == 1:
+        return args[0]
+    return sympy.Mul(*args, evaluate=False)
+
+
+def test_native_matches_sympy_expand():
+    for native, expr in _exprs:
+        assert native == as_rational_poly(sympy.expand(expr))
+
+
+def test_native_order_matches_sympy_order():
+    for native, expr in _exprs:
+        assert _to_sympy(native) == sympy.expand(expr)
+
+
+def test_analyze_native_matches_sympy():
+    for native, expr in _exprs:
+        assert repr(analyze_expr(native)) == repr(analyze_expr(expr))
@@ -86,6 +86,7 @@ def test_code_gen_pairs_only():
 
     expected = [
         ir.Comment("BEGIN DECRYPT"),
+        ir.ResetPairs(ir.ACC_PAIRS),
         ir.Loop(
             "j",
             ir.IrType.LSSS_ROW,
@@ -119,14 +120,14 @@ def test_code_gen_pairs_only():
                 ir.AppendIndex(ir.IrVar("j_local_1"), ir.IrFunc.ATTRIBUTE_TO_STRING),
                 ir.AppendIndexLiteral("}"),
                 ir.Store(ir.TMP_H, ir.USK_POLYS_H.indexed_at(ir.IDX)),
-                ir.Pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H),
                 ir.SetZ(ir.TMP_Z, "1"),
                 ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
                 ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
-                ir.ScaleGt(ir.TMP_GT, ir.TMP_Z, ir.TMP_GT),
-                ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
+                ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H, ir.TMP_Z),
             ],
         ),
+        ir.MultiPair(ir.TMP_GT, ir.ACC_PAIRS),
+        ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
         ir.Store(ir.BLINDING_POLY, ir.ACC_GT),
         ir.Comment("END DECRYPT"),
     ]
@@ -153,6 +154,7 @@ def test_code_gen_pairs_special_symbol():
 
     expected = [
         ir.Comment("BEGIN DECRYPT"),
+        ir.ResetPairs(ir.ACC_PAIRS),
         ir.Loop(
             "j",
             ir.IrType.LSSS_ROW,
@@ -167,14 +169,68 @@ def test_code_gen_pairs_special_symbol():
                 ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
                 ir.AppendIndexLiteral("}"),
                 ir.Store(ir.TMP_H, ir.CT_PRIMARIES_H.indexed_at(ir.IDX)),
-                ir.Pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H),
                 ir.SetZ(ir.TMP_Z, "1"),
                 ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
                 ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
-                ir.ScaleGt(ir.TMP_GT, ir.TMP_Z, ir.TMP_GT),
-                ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
+                ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H, ir.TMP_Z),
+            ],
+        ),
+        ir.MultiPair(ir.TMP_GT, ir.ACC_PAIRS),
+        ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
+        ir.Store(ir.BLINDING_POLY, ir.ACC_GT),
+        ir.Comment("END DECRYPT"),
+    ]
+    assert received == expected
+
+
+def test_code_gen_pairs_prepared_key():
+    singles = []
+    quants = [Quant("j", QSet.LINEAR_COMBINATION_INDICES)]
+    pairs = [
+        Pair(
+            Var("k", [Idx("j")]),
+            Var("s", [Idx("j")]),
+            [Term(Coeff("<epsilon>_{j}"))],
+            quants,
+        )
+    ]
+    var_type_map = VarTypeMap()
+    var_type_map[Var("k", [Idx("j")], quants)] = VarType.KEY_POLY
+    var_type_map[Var("s", [Idx("j")], quants)] = VarType.CIPHER_NON_LONE_RANDOM
+
+    fdh_map = FdhMap()
+    received = compile_decrypt(singles, pairs, var_type_map, fdh_map, prepared_key=True)
+
+    expected = [
+        ir.Comment("BEGIN DECRYPT"),
+        ir.ResetPairs(ir.ACC_PAIRS),
+        ir.Loop(
+            "j",
+            ir.IrType.LSSS_ROW,
+            QSet.LINEAR_COMBINATION_INDICES,
+            [
+                ir.SetIndex(""),
+                ir.AppendIndexLiteral("s"),
+                ir.AppendIndexLiteral("_{"),
+                ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+                ir.AppendIndexLiteral("}"),
+                ir.Store(ir.TMP_H, ir.CT_RANDOMS_H.indexed_at(ir.IDX)),
+                ir.SetZ(ir.TMP_Z, "1"),
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
+                ir.SetIndex(""),
+                ir.AppendIndexLiteral("k"),
+                ir.AppendIndexLiteral("_{"),
+                ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+                ir.AppendIndexLiteral("}"),
+                ir.ScaleFixG(
+                    ir.TMP_G, ir.TMP_Z, ir.USK_TABLES_POLYS_G.indexed_at(ir.IDX)
+                ),
+                ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H),
             ],
         ),
+        ir.MultiPair(ir.TMP_GT, ir.ACC_PAIRS),
+        ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
         ir.Store(ir.BLINDING_POLY, ir.ACC_GT),
         ir.Comment("END DECRYPT"),
     ]
@@ -410,6 +410,7 @@ def test_codegen_primary_poly_alternative():
                 ir.ResetG(ir.TMP_G),
                 ir.ResetG(ir.ACC_G),
                 ir.LiftG(ir.ACC_G, ir.ACC_Z),
+                ir.ResetTermsG(ir.TERMS_G),
                 ir.SetZ(ir.TMP_Z, "1"),
                 ir.SetIndex(""),
                 ir.AppendIndexLiteral("s"),
@@ -433,9 +434,9 @@ def test_codegen_primary_poly_alternative():
                 ),
                 ir.AppendIndex(ir.IrVar("j_local_0"), ir.IrFunc.AUTHORITY_TO_STRING),
                 ir.AppendIndexLiteral("}"),
-                ir.Store(ir.TMP_G, ir.MPK_COMMON_VARS_G.indexed_at(ir.IDX)),
-                ir.ScaleG(ir.TMP_G, ir.TMP_Z, ir.TMP_G),
-                ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+                ir.AddTermG(
+                    ir.TERMS_G, ir.TMP_Z, ir.MPK_COMMON_VARS_G.indexed_at(ir.IDX)
+                ),
                 ir.SetZ(ir.TMP_Z, "1"),
                 ir.SetIndex(""),
                 ir.AppendIndexLiteral("s"),
@@ -466,8 +467,10 @@ def test_codegen_primary_poly_alternative():
                 ),
                 ir.AppendIndex(ir.IrVar("j_local_2"), ir.IrFunc.ATTRIBUTE_TO_STRING),
                 ir.AppendIndexLiteral("}"),
-                ir.Store(ir.TMP_G, ir.MPK_COMMON_VARS_G.indexed_at(ir.IDX)),
-                ir.ScaleG(ir.TMP_G, ir.TMP_Z, ir.TMP_G),
+                ir.AddTermG(
+                    ir.TERMS_G, ir.TMP_Z, ir.MPK_COMMON_VARS_G.indexed_at(ir.IDX)
+                ),
+                ir.MultiScaleG(ir.TMP_G, ir.TERMS_G),
                 ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
                 ir.SetIndex(""),
                 ir.AppendIndexLiteral("c"),
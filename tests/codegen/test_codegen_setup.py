@@ -1,5 +1,6 @@
 from pracy.backend import ir
 from pracy.backend.compiler.setup import compile_setup
+from pracy.backend.ir.irbuilder import IndexFamilies
 from pracy.core.fdh import FdhMap
 from pracy.core.group import Group, GroupMap
 from pracy.core.idx import Idx
@@ -225,3 +226,93 @@ def test_codegen_setup_combined_with_fdh():
         ir.Comment("END SETUP"),
     ]
     assert received == expected
+
+
+def test_codegen_setup_common_vars_precompute():
+    master_key_vars = []
+    common_vars = [Var("b", [Idx("1")], [])]
+
+    group_map = GroupMap()
+    group_map[common_vars[0]] = Group.H
+
+    received = compile_setup(
+        master_key_vars, common_vars, group_map, FdhMap(), precompute=True
+    )
+
+    expected = [
+        ir.Comment("BEGIN SETUP"),
+        ir.SetIndex(""),
+        ir.AppendIndexLiteral("b"),
+        ir.AppendIndexLiteral("_{"),
+        ir.AppendIndexLiteral("1"),
+        ir.AppendIndexLiteral("}"),
+        ir.SampleZ(ir.MSK_COMMON_VARS.indexed_at(ir.IDX)),
+        ir.LiftH(
+            ir.MPK_COMMON_VARS_H.indexed_at(ir.IDX),
+            ir.MSK_COMMON_VARS.indexed_at(ir.IDX),
+        ),
+        ir.PrecomputeH(
+            ir.MPK_TABLES_H.indexed_at(ir.IDX),
+            ir.MPK_COMMON_VARS_H.indexed_at(ir.IDX),
+        ),
+        ir.Comment("END SETUP"),
+    ]
+    assert received == expected
+
+
+def test_codegen_setup_structured_index():
+    master_key_vars = [Var("alpha", [Idx("l")], [Quant("l", QSet.AUTHORITIES)])]
+    common_vars = [Var("b", [Idx("1"), Idx("l")], [Quant("l", QSet.AUTHORITIES)])]
+
+    group_map = GroupMap()
+    group_map[common_vars[0]] = Group.G
+    index_families = IndexFamilies()
+
+    received = compile_setup(
+        master_key_vars,
+        common_vars,
+        group_map,
+        FdhMap(),
+        index_families=index_families,
+    )
+
+    expected = [
+        ir.Comment("BEGIN SETUP"),
+        ir.Loop(
+            "l",
+            ir.IrType.AUTHORITY,
+            QSet.AUTHORITIES,
+            [
+                ir.SetIndexKey(
+                    0,
+                    "alpha_{*}",
+                    [ir.Call(ir.IrFunc.AUTHORITY_TO_ID, [ir.Read(ir.IrVar("l"))])],
+                ),
+                ir.SampleZ(ir.MSK_ALPHAS.indexed_at(ir.IDX)),
+                ir.LiftGt(
+                    ir.MPK_ALPHAS.indexed_at(ir.IDX),
+                    ir.MSK_ALPHAS.indexed_at(ir.IDX),
+                ),
+            ],
+        ),
+        ir.Loop(
+            "l",
+            ir.IrType.AUTHORITY,
+            QSet.AUTHORITIES,
+            [
+                ir.SetIndexKey(
+                    1,
+                    "b_{1,*}",
+                    [ir.Call(ir.IrFunc.AUTHORITY_TO_ID, [ir.Read(ir.IrVar("l"))])],
+                ),
+                ir.SampleZ(ir.MSK_COMMON_VARS.indexed_at(ir.IDX)),
+                ir.LiftG(
+                    ir.MPK_COMMON_VARS_G.indexed_at(ir.IDX),
+                    ir.MSK_COMMON_VARS.indexed_at(ir.IDX),
+                ),
+            ],
+        ),
+        ir.Comment("END SETUP"),
+    ]
+    assert received == expected
+    assert index_families.ids == {"alpha_{*}": 0, "b_{1,*}": 1}
@@ -0,0 +1,20 @@
+import os
+import re
+from pathlib import Path
+
+from pracy.backend.export import relic
+
+_ops_h = (
+    Path(os.path.realpath(__file__)).parent.parent.parent
+    / "backends"
+    / "relic"
+    / "include"
+    / "ops.h"
+)
+
+
+def test_z_pool_bound_matches_ops():
+    # The exporter only reads literals from the pool the operations build
+    match = re.search(r"^#define Z_POOL_BOUND (\d+)$", _ops_h.read_text(), re.M)
+    assert match is not None
+    assert int(match.group(1)) == relic._Z_POOL_BOUND
@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from pracy import compile_spec
+from pracy.backend import ir
+from pracy.backend.interp import (
+    Env,
+    EnvError,
+    Interpreter,
+    InterpreterError,
+    MockEngine,
+    check_correctness,
+)
+from pracy.backend.opt import PassManager
+from pracy.core.qset import QSet
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+
+def _option_sets(name):
+    """The option sets tools/test_relic_backend.py runs the scheme `name` with."""
+    options = [{}]
+    if name.startswith("a") or name.startswith("b"):
+        options.append({"multi_auth": True})
+    if name.startswith("b"):
+        options.append({"multi_auth": True, "negations": True})
+    return options
+
+
+def _assert_all_correct(**kwargs):
+    for path in sorted(_schemes_path.glob("*.json")):
+        with open(path, "r") as file:
+            programs = compile_spec(file.read(), **kwargs)
+        for options in _option_sets(path.stem):
+            engine = MockEngine(seed=0)
+            env = Env.random(engine, **options)
+            assert check_correctness(programs, engine, env), (path.stem, options)
+
+
+def _programs(name):
+    with open(_schemes_path / f"{name}.json", "r") as file:
+        return compile_spec(file.read())
+
+
+def test_interp_all_correct():
+    _assert_all_correct()
+
+
+def test_interp_all_correct_precompute_prepared_key():
+    _assert_all_correct(
+        pass_manager=PassManager.for_level(2), precompute=True, prepared_key=True
+    )
+
+
+def test_interp_all_correct_structured_index():
+    _assert_all_correct(structured_index=True)
+
+
+def test_interp_tampered_ciphertext():
+    setup, keygen, encrypt, decrypt = _programs("a_0_ok")
+    engine = MockEngine(seed=0)
+    interpreter = Interpreter(engine, Env.random(engine))
+    for program in (setup, keygen, encrypt):
+        interpreter.run_program(program)
+    randoms = interpreter.vars[ir.CT_RANDOMS_H.name]
+    randoms["s_{1,0}"] = engine.add(ir.IrType.H, randoms["s_{1,0}"], engine.z(1))
+    interpreter.run_program(decrypt)
+    assert interpreter.read(ir.BLINDING_POLY) != interpreter.read(ir.CT_BLINDING_POLY)
+
+
+def test_interp_unsatisfied_policy():
+    engine = MockEngine(seed=0)
+    env = Env.random(engine)
+    env.user_attrs.pop()
+    with pytest.raises(EnvError):
+        check_correctness(_programs("a_0_ok"), engine, env)
+
+
+def test_interp_read_before_write():
+    engine = MockEngine(seed=0)
+    interpreter = Interpreter(engine, Env.random(engine))
+    *_, decrypt = _programs("a_0_ok")
+    with pytest.raises(InterpreterError):
+        interpreter.run_program(decrypt)
+
+
+def test_interp_loop_and_index():
+    engine = MockEngine(seed=0)
+    interpreter = Interpreter(engine, Env.random(engine, policy_len=3))
+    j = ir.IrVar("j")
+    interpreter.run_program(
+        [
+            ir.Loop(
+                "j",
+                ir.IrType.LSSS_ROW,
+                QSet.LSSS_ROWS,
+                [
+                    ir.SetIndex("c_{"),
+                    ir.AppendIndex(j, ir.IrFunc.LSSS_ROW_TO_STRING),
+                    ir.AppendIndexLiteral("}"),
+                    ir.GetLambda(ir.IrVar("res", ir.Read(ir.IDX)), j),
+                ],
+            )
+        ]
+    )
+    lambdas = interpreter.vars["res"]
+    assert list(lambdas) == ["c_{0}", "c_{1}", "c_{2}"]
+    assert sum(lambdas.values()) % engine.p == interpreter.env.secret
@@ -0,0 +1,89 @@
+import os
+import random
+from pathlib import Path
+
+from pracy.analysis.scheme import analyze_scheme
+from pracy.backend import ir
+from pracy.backend.compiler.all import compile
+from pracy.backend.interp.batch import BatchEngine
+from pracy.backend.interp.env import Entry
+from pracy.backend.interp.fuzz import Features, features, fuzz, random_instance
+from pracy.backend.interp.policy import Gate, Leaf, leaves, lsss, select
+from pracy.core.qset import QSet
+from pracy.frontend.parsing import parse_json
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+
+def _leaf(i, negated=False):
+    return Leaf(Entry("AA", f"l{i}", f"{i:02}"), negated)
+
+
+def _scheme(name):
+    with open(_schemes_path / f"{name}.json", "r") as file:
+        return analyze_scheme(parse_json(file.read()))
+
+
+def test_lsss_reconstructs():
+    policy = Gate(
+        "or",
+        (
+            Gate("and", (Gate("and", (_leaf(0), _leaf(1))), _leaf(2))),
+            Gate("and", (_leaf(3), _leaf(4), _leaf(5))),
+        ),
+    )
+    matrix = lsss(policy)
+    assert len(matrix) == len(leaves(policy))
+    for satisfied in ({0, 1, 2}, {3, 4, 5}):
+        rows = select(policy, satisfied)
+        sums = [sum(matrix[row][i] for row in rows) for i in range(len(matrix[0]))]
+        assert sums == [1] + [0] * (len(sums) - 1)
+    assert select(policy, {0, 1, 3, 4}) is None
+
+
+def test_random_instance_satisfied():
+    rng = random.Random(0)
+    for rows in range(1, 20):
+        instance = random_instance(rng, rows, Features(True, True))
+        assert len(leaves(instance.policy)) == rows
+        assert instance.is_valid()
+
+
+def test_batch_engine():
+    engine = BatchEngine(16, seed=0)
+    a = engine.sample_z()
+    assert a.shape == (16,)
+    assert (engine.mul_z(a, engine.inv_z(a)) == engine.z(1)).all()
+    assert (engine.add_z(a, engine.neg_z(a)) == engine.z(0)).all()
+    h = engine.fdh(ir.IrType.G, 0, "x")
+    assert (h == engine.fdh(ir.IrType.G, 0, "x")).all()
+    assert len(set(h.tolist())) > 1
+
+
+def test_features():
+    assert features(compile(_scheme("b_1_xx"))) == Features(True, True)
+    assert features(compile(_scheme("c_0_ok"))) == Features(False, False)
+
+
+def test_fuzz_all_correct():
+    for name in ("a_0_ok", "b_1_xx", "c_0_ok"):
+        report = fuzz(_scheme(name), instances=10, size=64, seed=0)
+        assert report.failures == [], name
+
+
+def test_fuzz_minimizes_failure():
+    scheme = _scheme("b_1_xx")
+    *programs, decrypt = compile(scheme)
+    # Decryption ignores all negated rows
+    decrypt = [
+        s
+        for s in decrypt
+        if not (isinstance(s, ir.Loop) and s.set == QSet.NEG_LINEAR_COMBINATION_INDICES)
+    ]
+    report = fuzz(scheme, [*programs, decrypt], instances=20, size=16, seed=1)
+    assert report.failures
+    for failure in report.failures:
+        assert failure.failed == failure.size
+        assert isinstance(failure.instance.policy, Leaf)
+        assert failure.instance.policy.negated
+        assert len(failure.instance.user_attrs) == 1
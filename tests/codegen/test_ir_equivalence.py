@@ -0,0 +1,198 @@
+import os
+from pathlib import Path
+
+from pracy import compile_spec
+from pracy.backend import ir
+from pracy.backend.interp import Env, Interpreter, MockEngine
+from pracy.backend.opt import (
+    LOWERING,
+    PIPELINES,
+    PassContext,
+    PassManager,
+    optimize,
+)
+from pracy.optconfig import OPT_LEVELS
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+# The precomputation tables of the master public key, which only exist with
+# `compile_spec(precompute=True)`
+_MPK_TABLES = (ir.MPK_TABLES_G.name, ir.MPK_TABLES_H.name)
+
+
+def _schemes():
+    for path in sorted(_schemes_path.glob("*.json")):
+        with open(path, "r") as file:
+            yield path.stem, file.read()
+
+
+def _option_sets(name):
+    """The environments (see `Env.random`) the scheme `name` is checked in."""
+    options = [{}]
+    if name.startswith("a") or name.startswith("b"):
+        options.append({"multi_auth": True})
+    if name.startswith("b"):
+        options.append({"multi_auth": True, "negations": True})
+    return options
+
+
+class _SpellingEnv(Env):
+    """Remembers the values of the ids in structured index keys."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = {}
+
+    def intern(self, value) -> int:
+        id = super().intern(value)
+        self.values[id] = value
+        return id
+
+
+class _SpellingEngine(MockEngine):
+    """
+    Hashes structured index keys like the index strings they stand for, such
+    that programs using either compute the same values.
+    """
+
+    def __init__(self, patterns):
+        super().__init__(seed=42)
+        # The patterns of the index families by family, see `ir.SetIndexKey`
+        self.patterns = patterns
+        self.env = None
+
+    def spell(self, key):
+        """Return the index string of `key` (if it is a structured key)."""
+        if not isinstance(key, tuple):
+            return key
+        family, *ids = key
+        literals = self.patterns[family].split("*")
+        res = literals[0]
+        for id, literal in zip(ids, literals[1:]):
+            res += f"{self.env.values[id]}{literal}"
+        return res
+
+    def fdh(self, group, idx, arg):
+        return super().fdh(group, idx, self.spell(arg))
+
+
+def _patterns(stmts, res):
+    for s in stmts:
+        match s:
+            case ir.Loop():
+                _patterns(s.body, res)
+            case ir.SetIndexKey():
+                res[s.family] = s.pattern
+    return res
+
+
+def _outputs(programs, options):
+    """
+    Run setup, keygen, encrypt and decrypt in the same environment (with the
+    same random values) and return the keys and ciphertexts after each of
+    them (with structured index keys spelled as index strings) and the
+    blinding value decrypt recovers.
+    """
+    patterns = {}
+    for program in programs:
+        _patterns(program, patterns)
+    engine = _SpellingEngine(patterns)
+    engine.env = _SpellingEnv.random(engine, **options)
+    interpreter = Interpreter(engine, engine.env)
+    setup, keygen, encrypt, decrypt = programs
+    res = []
+    for program in (setup, keygen, encrypt):
+        interpreter.run_program(program)
+        res.append(_key_material(interpreter, engine))
+    interpreter.prepare_key()
+    interpreter.run_program(decrypt)
+    res.append(_key_material(interpreter, engine))
+    res.append(interpreter.read(ir.BLINDING_POLY))
+    return res
+
+
+def _key_material(interpreter, engine):
+    res = {}
+    for name, value in interpreter.vars.items():
+        if "." not in name or name in _MPK_TABLES:
+            continue
+        if isinstance(value, dict):
+            value = {engine.spell(key): v for key, v in value.items()}
+        res[name] = value
+    return res
+
+
+def _assert_equivalent(expected_kwargs, received_kwargs):
+    for name, json_input in _schemes():
+        expected_programs = compile_spec(json_input, **expected_kwargs)
+        received_programs = compile_spec(json_input, **received_kwargs)
+        for options in _option_sets(name):
+            expected = _outputs(expected_programs, options)
+            received = _outputs(received_programs, options)
+            assert received == expected, (name, options)
+
+
+def test_opt_level_1_equivalent():
+    _assert_equivalent({}, {"pass_manager": PassManager.for_level(1)})
+
+
+def test_opt_level_2_equivalent():
+    _assert_equivalent({}, {"pass_manager": PassManager.for_level(2)})
+
+
+def test_opt_level_2_symmetric_curve_equivalent():
+    # Applies the coefficients of pairings in Gt (see `gtpush`)
+    pass_manager = PassManager.for_level(2, context=PassContext("ss512"))
+    _assert_equivalent({}, {"pass_manager": pass_manager})
+
+
+def test_precompute_equivalent():
+    _assert_equivalent({}, {"precompute": True})
+
+
+def test_prepared_key_equivalent():
+    _assert_equivalent({}, {"prepared_key": True})
+
+
+def test_structured_index_equivalent():
+    _assert_equivalent({}, {"structured_index": True})
+
+
+def test_opt_levels_match_optconfig():
+    assert tuple(PIPELINES) == OPT_LEVELS
+    assert tuple(LOWERING) == OPT_LEVELS
+
+
+def test_opt_level_0_unchanged():
+    with open(_schemes_path / "a_0_ok.json", "r") as file:
+        json_input = file.read()
+    programs = compile_spec(json_input)
+    assert compile_spec(json_input, PassManager.for_level(0)) == programs
+    assert optimize(programs, PassManager.for_level(0)) == programs
+
+
+def test_opt_removes_scalar_chains():
+    stmts = [
+        ir.ResetZ(ir.ACC_Z),
+        ir.SetZ(ir.TMP_Z, "1"),
+        ir.SetZ(ir.AUX_Z, 2),
+        ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
+        ir.SetIndex(""),
+        ir.AppendIndexLiteral("a"),
+        ir.AppendIndexLiteral("_{"),
+        ir.AppendIndexLiteral("}"),
+        ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.MSK_ALPHAS.indexed_at(ir.IDX)),
+        ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.TMP_Z),
+        ir.LiftGt(ir.ACC_GT, ir.ACC_Z),
+    ]
+    pass_manager = PassManager.for_level(2)
+    received = pass_manager.run("test", stmts)
+    expected = [
+        ir.SetZ(ir.TMP_Z, "2"),
+        ir.SetIndex("a_{}"),
+        ir.MulAssignZ(ir.TMP_Z, ir.MSK_ALPHAS.indexed_at(ir.IDX)),
+        ir.LiftGt(ir.ACC_GT, ir.TMP_Z),
+    ]
+    assert received == expected
+    assert sum(s.stmts_removed for s in pass_manager.stats) == 7
+    assert sum(s.ops_saved for s in pass_manager.stats) == 2
@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from pracy import compile_spec, optconfig
+from pracy.backend import ir
+from pracy.backend.export.charm import Charm
+from pracy.backend.opt.costs import CURVES, row_costs
+from pracy.core.qset import QSet
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+
+def _spec(name):
+    with open(_schemes_path / f"{name}.json", "r") as file:
+        return file.read()
+
+
+def _row_loop(set, body):
+    return ir.Loop("j", ir.IrType.LSSS_ROW, set, body)
+
+
+def test_row_costs():
+    costs = CURVES["bn254"]
+    decrypt = [
+        _row_loop(
+            QSet.LINEAR_COMBINATION_INDICES,
+            [
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.ScaleGt(ir.TMP_GT, ir.AUX_Z, ir.TMP_GT),
+            ],
+        ),
+        _row_loop(
+            QSet.POS_LINEAR_COMBINATION_INDICES,
+            [ir.Pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H)],
+        ),
+        _row_loop(
+            QSet.NEG_LINEAR_COMBINATION_INDICES,
+            [
+                ir.ScaleH(ir.TMP_H, ir.AUX_Z, ir.TMP_H),
+                ir.Pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H),
+            ],
+        ),
+        # Not repeated per row
+        ir.Pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H),
+    ]
+    assert row_costs(decrypt, costs) == pytest.approx(
+        {
+            "pos": costs.scale_gt + costs.pair,
+            "neg": costs.scale_gt + costs.scale_h + costs.pair,
+        }
+    )
+
+
+def test_curves_match_optconfig():
+    assert tuple(CURVES) == optconfig.CURVES
+    assert optconfig.DEFAULT_CURVE in CURVES
+
+
+def test_row_costs_without_rows():
+    assert row_costs([], CURVES["ss512"]) == {"pos": 0.0, "neg": 0.0}
+
+
+def test_charm_exports_row_costs():
+    *_, encrypt, decrypt = compile_spec(_spec("a_1_xx"))
+    assert Charm().export(decrypt).startswith("ROW_COSTS = {'pos': ")
+    assert "ROW_COSTS" not in Charm().export(encrypt)
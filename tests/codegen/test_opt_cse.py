@@ -0,0 +1,90 @@
+from pracy.backend import ir
+from pracy.backend.opt import PassContext
+from pracy.backend.opt.cse import eliminate_common_subexpressions
+from pracy.core.qset import QSet
+
+
+def _loop(body):
+    return ir.Loop("j", ir.IrType.LSSS_ROW, QSet.LINEAR_COMBINATION_INDICES, body)
+
+
+def _local(name):
+    return ir.Alloc(
+        ir.IrVar(name),
+        ir.IrType.AUTHORITY,
+        ir.Call(ir.IrFunc.LSSS_ROW_TO_AUTHORITY, [ir.Read(ir.IrVar("j"))]),
+    )
+
+
+def test_cse_repeated_lookup():
+    stmts = [
+        _loop(
+            [
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.AUX_Z),
+                ir.SetZ(ir.AUX_Z, "2"),
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
+            ]
+        )
+    ]
+    received = eliminate_common_subexpressions(stmts, PassContext())
+    expected = [
+        _loop(
+            [
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.Alloc(ir.IrVar("aux_z_cse_0"), ir.IrType.Z, ir.Read(ir.AUX_Z)),
+                ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.AUX_Z),
+                ir.SetZ(ir.AUX_Z, "2"),
+                ir.Store(ir.AUX_Z, ir.IrVar("aux_z_cse_0")),
+                ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
+            ]
+        )
+    ]
+    assert received == expected
+
+
+def test_cse_merge_locals():
+    def get_entry(local):
+        return [
+            ir.SetIndex("k_{"),
+            ir.AppendIndex(ir.IrVar(local), ir.IrFunc.AUTHORITY_TO_STRING),
+            ir.AppendIndexLiteral("}"),
+            ir.Store(ir.TMP_G, ir.USK_POLYS_G.indexed_at(ir.IDX)),
+            ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+        ]
+
+    stmts = [
+        _loop(
+            [_local("j_local_0"), *get_entry("j_local_0")]
+            + [_local("x_attr_aux"), *get_entry("x_attr_aux")]
+        )
+    ]
+    received = eliminate_common_subexpressions(stmts, PassContext())
+    # The second entry is the same as the first one
+    expected = [
+        _loop(
+            [
+                _local("j_local_0"),
+                *get_entry("j_local_0")[:4],
+                ir.Alloc(ir.IrVar("tmp_g_cse_0"), ir.IrType.G, ir.Read(ir.TMP_G)),
+                ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+                *get_entry("j_local_0")[:3],
+                ir.Store(ir.TMP_G, ir.IrVar("tmp_g_cse_0")),
+                ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+            ]
+        )
+    ]
+    assert received == expected
+
+
+def test_cse_changed_inputs():
+    stmts = [
+        ir.SetIndex("s_{1}"),
+        ir.Store(ir.TMP_Z, ir.IrVar("randoms").indexed_at(ir.IDX)),
+        ir.SampleZ(ir.IrVar("randoms").indexed_at(ir.IDX)),
+        ir.Store(ir.AUX_Z, ir.IrVar("randoms").indexed_at(ir.IDX)),
+        ir.SampleZ(ir.TMP_Z),
+        ir.SampleZ(ir.AUX_Z),
+    ]
+    assert eliminate_common_subexpressions(stmts, PassContext()) == stmts
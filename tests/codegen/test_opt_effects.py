@@ -0,0 +1,22 @@
+from pracy.backend import ir
+from pracy.backend.opt.effects import Effect, effect, reusable
+
+
+def test_effects():
+    assert effect(ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.TMP_Z)) == Effect.PURE
+    assert effect(ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j"))) == Effect.READS_ENV
+    assert effect(ir.SampleZ(ir.TMP_Z)) == Effect.SAMPLES
+    assert effect(ir.Store(ir.CT_PRIMARIES_G.indexed_at(ir.IDX), ir.ACC_G)) == (
+        Effect.WRITES_OUTPUT
+    )
+    assert effect(ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H)) == (
+        Effect.WRITES_OUTPUT
+    )
+
+
+def test_reusable():
+    assert reusable(ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")))
+    assert reusable(ir.Store(ir.TMP_G, ir.CT_PRIMARIES_G.indexed_at(ir.IDX)))
+    assert not reusable(ir.Store(ir.TMP_G, ir.ACC_G))
+    assert not reusable(ir.SampleZ(ir.TMP_Z))
+    assert not reusable(ir.SetIndex("c_{1}"))
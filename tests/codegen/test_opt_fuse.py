@@ -0,0 +1,148 @@
+import os
+from pathlib import Path
+
+from pracy import compile_spec
+from pracy.backend import ir
+from pracy.backend.opt import LOWERING, PIPELINES, PassContext, PassManager
+from pracy.backend.opt.dataflow import count_loop_pairings, count_ops
+from pracy.backend.opt.fuse import fuse_loops
+from pracy.core.qset import QSet
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+
+def _index(prefix, var):
+    return [
+        ir.SetIndex(prefix),
+        ir.AppendIndex(ir.IrVar(var), ir.IrFunc.LSSS_ROW_TO_STRING),
+        ir.AppendIndexLiteral("}"),
+    ]
+
+
+def _secondaries(var):
+    return [
+        *_index("c'_{", var),
+        ir.GetEpsilon(ir.AUX_Z, ir.IrVar(var)),
+        ir.ScaleGt(ir.TMP_GT, ir.AUX_Z, ir.CT_SECONDARIES.indexed_at(ir.IDX)),
+        ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
+    ]
+
+
+def _primaries(var):
+    return [
+        *_index("c_{", var),
+        ir.GetEpsilon(ir.AUX_Z, ir.IrVar(var)),
+        ir.ScaleG(ir.TMP_G, ir.AUX_Z, ir.CT_PRIMARIES_G.indexed_at(ir.IDX)),
+        ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+    ]
+
+
+def _loop(var, body, qset=QSet.LINEAR_COMBINATION_INDICES):
+    return ir.Loop(var, ir.IrType.LSSS_ROW, qset, body)
+
+
+def test_fuse_moves_statements():
+    stmts = [
+        _loop("j", _secondaries("j")),
+        ir.ResetG(ir.ACC_G),
+        _loop("i", _primaries("i")),
+        ir.Store(ir.IrVar("res"), ir.ACC_G),
+    ]
+    received = fuse_loops(stmts, PassContext())
+    expected = [
+        ir.ResetG(ir.ACC_G),
+        _loop("j", _secondaries("j") + _primaries("j")),
+        ir.Store(ir.IrVar("res"), ir.ACC_G),
+    ]
+    assert received == expected
+
+
+def test_fuse_renames_locals():
+    def body(local):
+        return [
+            ir.SetIndex("r_{"),
+            ir.Alloc(
+                ir.IrVar(local),
+                ir.IrType.AUTHORITY,
+                ir.Call(ir.IrFunc.LSSS_ROW_TO_AUTHORITY, [ir.Read(ir.IrVar("j"))]),
+            ),
+            ir.AppendIndex(ir.IrVar(local), ir.IrFunc.AUTHORITY_TO_STRING),
+            ir.AppendIndexLiteral("}"),
+            ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.USK_RANDOMS_H.indexed_at(ir.IDX)),
+        ]
+
+    stmts = [_loop("j", body("j_local_0")), _loop("j", body("j_local_0"))]
+    received = fuse_loops(stmts, PassContext())
+    assert received == [_loop("j", body("j_local_0") + body("j_local_1"))]
+
+
+def test_fuse_sampling_loops():
+    def body(var):
+        return [*_index("s_{", var), ir.SampleZ(ir.IrVar("randoms").indexed_at(ir.IDX))]
+
+    stmts = [_loop("j", body("j")), _loop("j", body("j"))]
+    assert fuse_loops(stmts, PassContext()) == stmts
+
+
+def test_fuse_dependent_entries():
+    # The second loop reads entries written in later iterations of the first
+    first = [
+        *_index("s_{", "j"),
+        ir.SampleZ(ir.IrVar("randoms").indexed_at(ir.IDX)),
+    ]
+    second = [
+        ir.SetIndex("s_{1}"),
+        ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.IrVar("randoms").indexed_at(ir.IDX)),
+    ]
+    stmts = [_loop("j", first), _loop("j", second)]
+    assert fuse_loops(stmts, PassContext()) == stmts
+
+
+def _inverted(body):
+    # Both bodies invert epsilon_j, which the fused body does once
+    k = next(i for i, s in enumerate(body) if isinstance(s, ir.GetEpsilon))
+    return body[: k + 1] + [ir.InvZ(ir.AUX_Z, ir.AUX_Z)] + body[k + 1 :]
+
+
+def test_fuse_split_partition():
+    stmts = [
+        ir.ResetG(ir.ACC_G),
+        _loop("j", _inverted(_primaries("j"))),
+        _loop(
+            "j",
+            _inverted(_secondaries("j")),
+            QSet.POS_LINEAR_COMBINATION_INDICES,
+        ),
+        ir.Store(ir.IrVar("res"), ir.ACC_G),
+    ]
+    received = fuse_loops(stmts, PassContext())
+    sets = [s.set for s in received if isinstance(s, ir.Loop)]
+    assert sets == [
+        QSet.POS_LINEAR_COMBINATION_INDICES,
+        QSet.NEG_LINEAR_COMBINATION_INDICES,
+    ]
+
+
+def test_fuse_split_without_savings():
+    # Splitting would duplicate the first body without sharing any operation
+    stmts = [
+        ir.ResetG(ir.ACC_G),
+        _loop("j", _primaries("j")),
+        _loop("j", _secondaries("j"), QSet.POS_LINEAR_COMBINATION_INDICES),
+        ir.Store(ir.IrVar("res"), ir.ACC_G),
+    ]
+    assert fuse_loops(stmts, PassContext()) == stmts
+
+
+def test_fuse_adds_no_work():
+    # b_0_ok splits loops over all rows to fuse them with the negated ones
+    with open(_schemes_path / "b_0_ok.json", "r") as file:
+        json_input = file.read()
+    work = []
+    for passes in (PIPELINES[2], [p for p in PIPELINES[2] if p != "fuse"]):
+        pass_manager = PassManager(passes, True, lowering=LOWERING[2])
+        programs = compile_spec(json_input, pass_manager=pass_manager)
+        work.append([(count_loop_pairings(p), count_ops(p)) for p in programs])
+    fused, unfused = work
+    assert all(f <= u for f, u in zip(fused, unfused))
+    assert fused != unfused
@@ -0,0 +1,44 @@
+from pracy.backend import ir
+from pracy.backend.opt import CURVES, PassContext
+from pracy.backend.opt.costs import coeff_cost
+from pracy.backend.opt.gtpush import push_gt_exponentiations
+from pracy.core.qset import QSet
+
+
+def _scaled_pairings():
+    return [
+        ir.ResetPairs(ir.ACC_PAIRS),
+        ir.Loop(
+            "j",
+            ir.IrType.LSSS_ROW,
+            QSet.LINEAR_COMBINATION_INDICES,
+            [
+                ir.Store(ir.TMP_G, ir.CT_PRIMARIES_G.indexed_at(ir.IDX)),
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H, ir.AUX_Z),
+            ],
+        ),
+        ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H),
+        ir.MultiPair(ir.ACC_GT, ir.ACC_PAIRS),
+    ]
+
+
+def test_gtpush_asymmetric_curve():
+    # The compiler already applies coefficients in G
+    stmts = _scaled_pairings()
+    assert push_gt_exponentiations(stmts, PassContext("bn254")) == stmts
+
+
+def test_gtpush_symmetric_curve():
+    received = push_gt_exponentiations(_scaled_pairings(), PassContext("ss512"))
+    expected = _scaled_pairings()
+    expected[1].body[2] = ir.AddPair(
+        ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H, ir.AUX_Z, ir.IrType.GT
+    )
+    assert received == expected
+
+
+def test_coeff_cost_shares_no_final_exponentiation_in_gt():
+    for costs in CURVES.values():
+        assert coeff_cost(ir.IrType.GT, costs) == costs.scale_gt + costs.final_exp
+        assert coeff_cost(ir.IrType.H, costs) == costs.scale_h
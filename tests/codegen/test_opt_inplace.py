@@ -0,0 +1,67 @@
+from pracy.backend import ir
+from pracy.backend.opt import PassContext, PassManager
+from pracy.backend.opt.inplace import update_in_place
+from pracy.core.qset import QSet
+
+
+def test_inplace_accumulate():
+    stmts = [
+        ir.Loop(
+            "j",
+            ir.IrType.LSSS_ROW,
+            QSet.LSSS_ROWS,
+            [
+                ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+                ir.AddGt(ir.ACC_GT, ir.TMP_GT, ir.ACC_GT),
+                ir.MulZ(ir.TMP_Z, ir.AUX_Z, ir.TMP_Z),
+                ir.ScaleH(ir.TMP_H, ir.AUX_Z, ir.TMP_H),
+            ],
+        )
+    ]
+    received = update_in_place(stmts, PassContext())
+    expected = [
+        ir.Loop(
+            "j",
+            ir.IrType.LSSS_ROW,
+            QSet.LSSS_ROWS,
+            [
+                ir.AddAssignG(ir.ACC_G, ir.TMP_G),
+                ir.AddAssignGt(ir.ACC_GT, ir.TMP_GT),
+                ir.MulAssignZ(ir.TMP_Z, ir.AUX_Z),
+                ir.ScaleAssignH(ir.TMP_H, ir.AUX_Z),
+            ],
+        )
+    ]
+    assert received == expected
+
+
+def test_inplace_keeps_other_forms():
+    entry = ir.CT_PRIMARIES_G.indexed_at(ir.IDX)
+    stmts = [
+        ir.AddG(ir.ACC_G, ir.TMP_G, ir.TMP_G),
+        ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.ACC_Z),
+        ir.AddG(entry, entry, ir.TMP_G),
+        ir.ScaleG(ir.TMP_G, ir.AUX_Z, ir.ACC_G),
+    ]
+    assert update_in_place(stmts, PassContext()) == stmts
+
+
+def test_inplace_after_pipeline():
+    stmts = [
+        ir.ResetG(ir.ACC_G),
+        ir.SetIndex("k_{1}"),
+        ir.AddG(ir.ACC_G, ir.ACC_G, ir.USK_POLYS_G.indexed_at(ir.IDX)),
+        ir.SetIndex("k_{2}"),
+        ir.AddG(ir.ACC_G, ir.ACC_G, ir.USK_POLYS_G.indexed_at(ir.IDX)),
+        ir.Store(ir.IrVar("res"), ir.ACC_G),
+    ]
+    assert PassManager.for_level(0).run("test", stmts) == stmts
+    received = PassManager.for_level(1).run("test", stmts)
+    assert [type(s) for s in received] == [
+        ir.ResetG,
+        ir.SetIndex,
+        ir.AddAssignG,
+        ir.SetIndex,
+        ir.AddAssignG,
+        ir.Store,
+    ]
@@ -0,0 +1,68 @@
+from pracy.backend import ir
+from pracy.backend.opt import PassContext
+from pracy.backend.opt.licm import hoist_invariants
+from pracy.core.qset import QSet
+
+
+def _loop(body):
+    return ir.Loop("j", ir.IrType.LSSS_ROW, QSet.LINEAR_COMBINATION_INDICES, body)
+
+
+def _scaled_epsilon():
+    return [
+        ir.SetZ(ir.TMP_Z, "-1"),
+        ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+        ir.MulZ(ir.TMP_Z, ir.TMP_Z, ir.AUX_Z),
+        ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.TMP_Z),
+    ]
+
+
+def test_licm_constant():
+    stmts = [_loop(_scaled_epsilon()), ir.Store(ir.IrVar("res"), ir.ACC_Z)]
+    received = hoist_invariants(stmts, PassContext())
+    expected = [
+        ir.SetZ(ir.TMP_Z, "-1"),
+        ir.Alloc(ir.IrVar("j_inv_0"), ir.IrType.Z, ir.Read(ir.TMP_Z)),
+        _loop([ir.Store(ir.TMP_Z, ir.IrVar("j_inv_0")), *_scaled_epsilon()[1:]]),
+        ir.Store(ir.IrVar("res"), ir.ACC_Z),
+    ]
+    assert received == expected
+
+
+def test_licm_entry_at_constant_index():
+    load = [
+        ir.SetIndex("b_{1}"),
+        ir.Store(ir.TMP_G, ir.MPK_COMMON_VARS_G.indexed_at(ir.IDX)),
+    ]
+    scale = [
+        ir.SetIndex("s_{"),
+        ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+        ir.AppendIndexLiteral("}"),
+        ir.ScaleG(ir.TMP_G, ir.IrVar("randoms").indexed_at(ir.IDX), ir.TMP_G),
+        ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+    ]
+    stmts = [_loop(load + scale), ir.Store(ir.IrVar("res"), ir.ACC_G)]
+    received = hoist_invariants(stmts, PassContext())
+    expected = [
+        *load,
+        ir.Alloc(ir.IrVar("j_inv_0"), ir.IrType.G, ir.Read(ir.TMP_G)),
+        _loop([load[0], ir.Store(ir.TMP_G, ir.IrVar("j_inv_0")), *scale]),
+        ir.Store(ir.IrVar("res"), ir.ACC_G),
+    ]
+    assert received == expected
+
+
+def test_licm_live_in_front():
+    # `tmp_z` is read by the first iteration before it is overwritten
+    body = [ir.AddZ(ir.ACC_Z, ir.ACC_Z, ir.TMP_Z), ir.SetZ(ir.TMP_Z, "2")]
+    stmts = [ir.SetZ(ir.TMP_Z, "1"), _loop(body), ir.Store(ir.IrVar("res"), ir.ACC_Z)]
+    assert hoist_invariants(stmts, PassContext()) == stmts
+
+
+def test_licm_samples():
+    body = [
+        ir.SetIndex("s_{1}"),
+        ir.SampleZ(ir.IrVar("randoms").indexed_at(ir.IDX)),
+    ]
+    stmts = [_loop(body)]
+    assert hoist_invariants(stmts, PassContext()) == stmts
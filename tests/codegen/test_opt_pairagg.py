@@ -0,0 +1,104 @@
+from pracy.backend import ir
+from pracy.backend.opt import PassContext
+from pracy.backend.opt.pairagg import aggregate_pairings
+from pracy.core.qset import QSet
+
+
+def _pair_loop(get_h):
+    return ir.Loop(
+        "j",
+        ir.IrType.LSSS_ROW,
+        QSet.LINEAR_COMBINATION_INDICES,
+        [
+            ir.SetIndex("c_{"),
+            ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+            ir.AppendIndexLiteral("}"),
+            ir.Store(ir.TMP_G, ir.CT_PRIMARIES_G.indexed_at(ir.IDX)),
+            *get_h,
+            ir.Pair(ir.TMP_GT, ir.TMP_G, ir.TMP_H),
+            ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+            ir.ScaleGt(ir.TMP_GT, ir.AUX_Z, ir.TMP_GT),
+            ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
+        ],
+    )
+
+
+def test_pairagg_invariant_argument():
+    get_h = [
+        ir.SetIndex("k_{1}"),
+        ir.Store(ir.TMP_H, ir.USK_POLYS_H.indexed_at(ir.IDX)),
+    ]
+    received = aggregate_pairings([_pair_loop(get_h)], PassContext())
+    expected = [
+        ir.ResetG(ir.ACC_G),
+        ir.Loop(
+            "j",
+            ir.IrType.LSSS_ROW,
+            QSet.LINEAR_COMBINATION_INDICES,
+            [
+                ir.SetIndex("c_{"),
+                ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+                ir.AppendIndexLiteral("}"),
+                ir.Store(ir.TMP_G, ir.CT_PRIMARIES_G.indexed_at(ir.IDX)),
+                *get_h,
+                ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+                ir.ScaleG(ir.TMP_G, ir.AUX_Z, ir.TMP_G),
+                ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+            ],
+        ),
+        ir.Comment("PAIRING AGGREGATED OVER j"),
+        *get_h,
+        ir.Pair(ir.TMP_GT, ir.ACC_G, ir.TMP_H),
+        ir.AddGt(ir.ACC_GT, ir.ACC_GT, ir.TMP_GT),
+    ]
+    assert received == expected
+
+
+def test_pairagg_variant_arguments():
+    get_h = [
+        ir.SetIndex("k_{"),
+        ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+        ir.AppendIndexLiteral("}"),
+        ir.Store(ir.TMP_H, ir.USK_POLYS_H.indexed_at(ir.IDX)),
+    ]
+    stmts = [_pair_loop(get_h)]
+    assert aggregate_pairings(stmts, PassContext()) == stmts
+
+
+def test_pairagg_product_of_pairings():
+    get_h = [
+        ir.SetIndex("k_{1}"),
+        ir.Store(ir.TMP_H, ir.USK_POLYS_H.indexed_at(ir.IDX)),
+    ]
+    get_g = [
+        ir.SetIndex("c_{"),
+        ir.AppendIndex(ir.IrVar("j"), ir.IrFunc.LSSS_ROW_TO_STRING),
+        ir.AppendIndexLiteral("}"),
+        ir.Store(ir.TMP_G, ir.CT_PRIMARIES_G.indexed_at(ir.IDX)),
+        *get_h,
+        ir.GetEpsilon(ir.AUX_Z, ir.IrVar("j")),
+    ]
+    loop = ir.Loop(
+        "j",
+        ir.IrType.LSSS_ROW,
+        QSet.LINEAR_COMBINATION_INDICES,
+        [*get_g, ir.AddPair(ir.ACC_PAIRS, ir.TMP_G, ir.TMP_H, ir.AUX_Z)],
+    )
+    received = aggregate_pairings([loop], PassContext())
+    expected = [
+        ir.ResetG(ir.ACC_G),
+        ir.Loop(
+            "j",
+            ir.IrType.LSSS_ROW,
+            QSet.LINEAR_COMBINATION_INDICES,
+            [
+                *get_g,
+                ir.ScaleG(ir.TMP_G, ir.AUX_Z, ir.TMP_G),
+                ir.AddG(ir.ACC_G, ir.ACC_G, ir.TMP_G),
+            ],
+        ),
+        ir.Comment("PAIRING AGGREGATED OVER j"),
+        *get_h,
+        ir.AddPair(ir.ACC_PAIRS, ir.ACC_G, ir.TMP_H),
+    ]
+    assert received == expected
@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+
+from pracy.core.equiv import EquivMap, EquivSet, equiv, equiv_key
+from pracy.core.idx import Idx
+from pracy.core.qmap import QMap
+from pracy.core.qset import QSet
+from pracy.core.quant import Quant
+from pracy.core.var import Var
+from pracy.frontend.parsing import parse_json
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent.parent / "schemes"
+
+
+def _load_objects():
+    """
+    Collect all variables and polynomials (with their quantifications) which
+    occur in the scheme specs, grouped by scheme.
+    """
+    objects = {}
+    for path in sorted(_schemes_path.glob("*.json")):
+        with open(path, "r") as file:
+            raw = parse_json(file.read())
+        objs = []
+        objs.extend(raw.master_key_vars)
+        objs.extend(raw.common_vars)
+        objs.extend(raw.key_polys)
+        objs.extend(raw.cipher_polys)
+        objs.extend(e.var for e in raw.fdh_map)
+        for s in raw.decrypt_vec:
+            objs.append(s.entry.quantify(s.quants))
+        for p in raw.decrypt_mat:
+            objs.append(p.lhs.quantify(p.quants))
+            objs.append(p.rhs.quantify(p.quants))
+        objects[path.stem] = objs
+    return objects
+
+
+_objects = _load_objects()
+
+
+def _linear_get(mappings, key):
+    """The former linear-scan lookup of `EquivMap`."""
+    return next((v for k, v in mappings if equiv(k, key)), None)
+
+
+def test_equiv_key_compatible_with_equiv():
+    for objs in _objects.values():
+        for x in objs:
+            for y in objs:
+                if equiv(x, y):
+                    assert equiv_key(x) == equiv_key(y)
+
+
+def test_equiv_key_attribute_types_collapsed():
+    var_a = Var("a", [Idx("i"), Idx("1")], [Quant("i", QSet.USER_ATTRIBUTES)])
+    var_b = Var(
+        "a",
+        [Idx("j"), Idx("2")],
+        [Quant("j", QSet.LSSS_ROWS, QMap.LSSS_ROW_TO_ALT_ATTR)],
+    )
+    assert equiv(var_a, var_b)
+    assert equiv_key(var_a) == equiv_key(var_b)
+
+
+def test_equiv_map_matches_linear_scan():
+    for objs in _objects.values():
+        equiv_map = EquivMap()
+        mappings = []
+        for i, obj in enumerate(objs):
+            if _linear_get(mappings, obj) is None:
+                equiv_map[obj] = i
+                mappings.append((obj, i))
+        assert len(equiv_map) == len(mappings)
+        assert equiv_map.items() == mappings
+        for obj in objs:
+            assert obj in equiv_map
+            assert equiv_map[obj] == _linear_get(mappings, obj)
+
+
+def test_equiv_set_matches_linear_scan():
+    for objs in _objects.values():
+        equiv_set = EquivSet()
+        elements = []
+        for obj in objs:
+            equiv_set.add(obj)
+            if not any(equiv(obj, e) for e in elements):
+                elements.append(obj)
+        assert list(equiv_set) == elements
+        for obj in objs:
+            assert obj in equiv_set
+
+
+def test_equiv_set_update_resolves_base_set():
+    var_pos = Var("s", [Idx("j")], [Quant("j", QSet.POS_LSSS_ROWS)])
+    var_neg = Var("s", [Idx("k")], [Quant("k", QSet.NEG_LSSS_ROWS)])
+    equiv_set = EquivSet([var_pos])
+    equiv_set.update(var_neg)
+    assert len(equiv_set) == 1
+    assert equiv_set[0] == Var("s", [Idx("j")], [Quant("j", QSet.LSSS_ROWS)])
+    assert var_neg in equiv_set
+
+
+def test_equiv_set_remove_keeps_index():
+    var_a = Var("a", [Idx("1")])
+    var_b = Var("b", [Idx("1")])
+    var_c = Var("c", [Idx("1")])
+    equiv_set = EquivSet([var_a, var_b, var_c])
+    equiv_set.remove(var_a)
+    assert var_a not in equiv_set
+    assert var_b in equiv_set
+    assert var_c in equiv_set
+    equiv_set.update(var_c)
+    assert list(equiv_set) == [var_b, var_c]
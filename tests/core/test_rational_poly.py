@@ -0,0 +1,46 @@
+from fractions import Fraction
+
+from sympy import Add, Mul, Pow, Symbol
+
+from pracy.core.rational_poly import RationalPoly, as_rational_poly
+
+x = RationalPoly.symbol("x")
+y = RationalPoly.symbol("y")
+z = RationalPoly.symbol("z")
+
+
+def test_rational_poly_collects_terms():
+    assert (x + y) * (x - y) == x * x - y * y
+    assert x + y - x == y
+    assert (x - x).is_zero()
+
+
+def test_rational_poly_div_by_monomial():
+    assert (2 * x * y) / (4 * x) == y * Fraction(1, 2)
+    assert (x / y) * y == x
+    assert RationalPoly.constant(1) / 3 == Fraction(1, 3)
+
+
+def test_rational_poly_div_by_sum():
+    quot = z / (x - y)
+    assert quot != z / (y - x)
+    assert quot * 2 == (2 * z) / (x - y)
+    assert 1 / (1 / (x - y)) == x - y
+
+
+def test_rational_poly_equals_sympy():
+    expr = Mul(Symbol("z"), Pow(Add(Symbol("x"), Mul(-1, Symbol("y"))), -1))
+    assert z / (x - y) == expr
+    assert as_rational_poly(expr) == z / (x - y)
+    assert x != Symbol("y")
+
+
+def test_rational_poly_terms_ordered():
+    poly = 3 * y + x * y + 2 + x / (x - y)
+    received = [(c, [a for a, _ in fs]) for c, fs in poly.terms()]
+    expected = [(2, []), (3, ["y"]), (1, ["x", "y"]), (1, ["x", x - y])]
+    assert received == expected
+
+
+def test_rational_poly_str():
+    assert str(x * x / 2 - 3 * y + 1 / (x - y)) == "(x - y)**(-1) + 1/2*x**2 - 3*y"
@@ -86,7 +86,7 @@ for (Attr l_global : env.get_user_attributes()) {
     Auth l = env.attr_to_auth(l_global);
     tmp_z = ops.reset_z();
     acc_z = ops.reset_z();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "alpha";
     idx += "_{";
@@ -94,7 +94,7 @@ for (Attr l_global : env.get_user_attributes()) {
     idx += "}";
     tmp_z = ops.mul_z(tmp_z, msk.alphas[idx]);
     acc_z = ops.add_z(acc_z, tmp_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "r";
     idx += "_{";
@@ -109,7 +109,7 @@ for (Attr l_global : env.get_user_attributes()) {
     tmp_z = ops.mul_z(tmp_z, msk.common_vars[idx]);
     acc_z = ops.add_z(acc_z, tmp_z);
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "b";
     idx += "_{";
@@ -132,7 +132,7 @@ for (Attr att : env.get_user_attributes()) {
     tmp_z = ops.reset_z();
     acc_z = ops.reset_z();
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "r";
     idx += "_{";
@@ -217,12 +217,12 @@ for (int j : env.get_lsss_rows()) {
     acc_z = ops.reset_z();
     tmp_h = ops.reset_h();
     acc_h = ops.reset_h();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_mu(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     acc_z = ops.add_z(acc_z, tmp_z);
     acc_h = ops.lift_h(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "s";
     idx += "_{";
@@ -255,7 +255,8 @@ for (int j : env.get_lsss_rows()) {
     tmp_g = ops.reset_g();
     acc_g = ops.reset_g();
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
+    terms_g = ops.reset_terms_g();
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "s";
     idx += "_{";
@@ -270,10 +271,8 @@ for (int j : env.get_lsss_rows()) {
     Auth j_local_0 = env.ls_row_to_auth(j);
     idx += env.auth_to_string(j_local_0);
     idx += "}";
-    tmp_g = mpk.common_vars_g[idx];
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
-    acc_g = ops.add_g(acc_g, tmp_g);
-    tmp_z = ops.read_z("1");
+    ops.add_term_g(terms_g, tmp_z, mpk.common_vars_g[idx]);
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "s";
     idx += "_{";
@@ -292,7 +291,8 @@ for (int j : env.get_lsss_rows()) {
     idx += env.attr_to_string(j_local_2);
     idx += "}";
     tmp_g = ops.fdh_g(1, idx);
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
+    ops.add_term_g(terms_g, tmp_z, tmp_g);
+    tmp_g = ops.multi_scale_g(terms_g);
     acc_g = ops.add_g(acc_g, tmp_g);
     idx = "";
     idx += "c";
@@ -308,12 +308,12 @@ for (int j : env.get_lsss_rows()) {
     acc_z = ops.reset_z();
     tmp_gt = ops.reset_gt();
     acc_gt = ops.reset_gt();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_lambda(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     acc_z = ops.add_z(acc_z, tmp_z);
     acc_gt = ops.lift_gt(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "alpha";
     idx += "_{";
@@ -342,7 +342,7 @@ tmp_z = ops.reset_z();
 acc_z = ops.reset_z();
 tmp_gt = ops.reset_gt();
 acc_gt = ops.reset_gt();
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 aux_z = env.get_secret();
 tmp_z = ops.mul_z(tmp_z, aux_z);
 acc_z = ops.add_z(acc_z, tmp_z);
@@ -366,7 +366,7 @@ def test_decrypt_full_integration():
     expected = """\
 /* BEGIN DECRYPT */
 for (int j : env.get_linear_combination_idcs()) {
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     idx = "";
@@ -377,6 +377,7 @@ for (int j : env.get_linear_combination_idcs()) {
     tmp_gt = ops.scale_gt(tmp_z, ct.secondary_polys[idx]);
     acc_gt = ops.add_gt(acc_gt, tmp_gt);
 }
+acc_pairs = ops.reset_pairs();
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
     idx += "k";
@@ -396,14 +397,12 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.dedup_idx_to_string(j_local_1);
     idx += "}";
     tmp_h = ct.non_lone_vars_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -423,14 +422,12 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.ls_row_to_string(j);
     idx += "}";
     tmp_h = ct.non_lone_vars_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     tmp_g = env.get_rgid_g();
@@ -442,12 +439,10 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.ls_row_to_string(j);
     idx += "}";
     tmp_h = ct.primary_polys_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -465,13 +460,13 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.auth_to_string(j_local_0);
     idx += "}";
     tmp_h = usk.non_lone_vars_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
+tmp_gt = ops.multi_pair(acc_pairs);
+acc_gt = ops.add_gt(acc_gt, tmp_gt);
 blinding_poly = acc_gt;
 /* END DECRYPT */"""
     assert received == expected
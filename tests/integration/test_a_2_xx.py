@@ -97,7 +97,7 @@ for (Attr l_global : env.get_user_attributes()) {
     Auth l = env.attr_to_auth(l_global);
     tmp_z = ops.reset_z();
     acc_z = ops.reset_z();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "alpha";
     idx += "_{";
@@ -105,7 +105,7 @@ for (Attr l_global : env.get_user_attributes()) {
     idx += "}";
     tmp_z = ops.mul_z(tmp_z, msk.alphas[idx]);
     acc_z = ops.add_z(acc_z, tmp_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "r";
     idx += "_{";
@@ -120,7 +120,7 @@ for (Attr l_global : env.get_user_attributes()) {
     tmp_z = ops.mul_z(tmp_z, msk.common_vars[idx]);
     acc_z = ops.add_z(acc_z, tmp_z);
     acc_h = ops.lift_h(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "b";
     idx += "_{";
@@ -142,7 +142,7 @@ for (Attr l_global : env.get_user_attributes()) {
 for (Attr att : env.get_user_attributes()) {
     tmp_z = ops.reset_z();
     acc_z = ops.reset_z();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "r";
     idx += "_{";
@@ -227,12 +227,12 @@ for (int j : env.get_lsss_rows()) {
     acc_z = ops.reset_z();
     tmp_g = ops.reset_g();
     acc_g = ops.reset_g();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_mu(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     acc_z = ops.add_z(acc_z, tmp_z);
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "s";
     idx += "_{";
@@ -265,7 +265,8 @@ for (int j : env.get_lsss_rows()) {
     tmp_g = ops.reset_g();
     acc_g = ops.reset_g();
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
+    terms_g = ops.reset_terms_g();
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "s";
     idx += "_{";
@@ -280,10 +281,8 @@ for (int j : env.get_lsss_rows()) {
     Auth j_local_0 = env.ls_row_to_auth(j);
     idx += env.auth_to_string(j_local_0);
     idx += "}";
-    tmp_g = mpk.common_vars_g[idx];
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
-    acc_g = ops.add_g(acc_g, tmp_g);
-    tmp_z = ops.read_z("1");
+    ops.add_term_g(terms_g, tmp_z, mpk.common_vars_g[idx]);
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "s";
     idx += "_{";
@@ -301,8 +300,8 @@ for (int j : env.get_lsss_rows()) {
     Attr j_local_2 = env.ls_row_to_attr(j);
     idx += env.attr_to_string(j_local_2);
     idx += "}";
-    tmp_g = mpk.common_vars_g[idx];
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
+    ops.add_term_g(terms_g, tmp_z, mpk.common_vars_g[idx]);
+    tmp_g = ops.multi_scale_g(terms_g);
     acc_g = ops.add_g(acc_g, tmp_g);
     idx = "";
     idx += "c";
@@ -318,12 +317,12 @@ for (int j : env.get_lsss_rows()) {
     acc_z = ops.reset_z();
     tmp_gt = ops.reset_gt();
     acc_gt = ops.reset_gt();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_lambda(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     acc_z = ops.add_z(acc_z, tmp_z);
     acc_gt = ops.lift_gt(acc_z);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "alpha";
     idx += "_{";
@@ -352,7 +351,7 @@ tmp_z = ops.reset_z();
 acc_z = ops.reset_z();
 tmp_gt = ops.reset_gt();
 acc_gt = ops.reset_gt();
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 aux_z = env.get_secret();
 tmp_z = ops.mul_z(tmp_z, aux_z);
 acc_z = ops.add_z(acc_z, tmp_z);
@@ -376,7 +375,7 @@ def test_decrypt_full_integration():
     expected = """\
 /* BEGIN DECRYPT */
 for (int j : env.get_linear_combination_idcs()) {
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     idx = "";
@@ -387,6 +386,7 @@ for (int j : env.get_linear_combination_idcs()) {
     tmp_gt = ops.scale_gt(tmp_z, ct.secondary_polys[idx]);
     acc_gt = ops.add_gt(acc_gt, tmp_gt);
 }
+acc_pairs = ops.reset_pairs();
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
     idx += "s";
@@ -406,14 +406,12 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.attr_to_string(j_local_1);
     idx += "}";
     tmp_h = usk.polys_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -433,14 +431,12 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.auth_to_string(j_local_0);
     idx += "}";
     tmp_h = usk.polys_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -452,12 +448,10 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += "}";
     tmp_g = ct.primary_polys_g[idx];
     tmp_h = env.get_rgid_h();
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -475,13 +469,13 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.auth_to_string(j_local_0);
     idx += "}";
     tmp_h = usk.non_lone_vars_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
+tmp_gt = ops.multi_pair(acc_pairs);
+acc_gt = ops.add_gt(acc_gt, tmp_gt);
 blinding_poly = acc_gt;
 /* END DECRYPT */"""
     assert received == expected
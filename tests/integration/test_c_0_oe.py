@@ -74,14 +74,14 @@ non_lone_randoms[idx] = ops.sample_z();
 usk.non_lone_vars_h[idx] = ops.lift_h(non_lone_randoms[idx]);
 tmp_z = ops.reset_z();
 acc_z = ops.reset_z();
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 idx = "";
 idx += "alpha";
 idx += "_{";
 idx += "}";
 tmp_z = ops.mul_z(tmp_z, msk.alphas[idx]);
 acc_z = ops.add_z(acc_z, tmp_z);
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 idx = "";
 idx += "t";
 idx += "_{";
@@ -102,7 +102,7 @@ usk.polys_h[idx] = acc_h;
 for (Attr x : env.get_user_attributes()) {
     tmp_z = ops.reset_z();
     acc_z = ops.reset_z();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "t";
     idx += "_{";
@@ -174,18 +174,17 @@ for (int j : env.get_lsss_rows()) {
     tmp_g = ops.reset_g();
     acc_g = ops.reset_g();
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
+    terms_g = ops.reset_terms_g();
+    tmp_z = ops.const_z(1);
     aux_z = env.get_lambda(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     idx = "";
     idx += "a";
     idx += "_{";
     idx += "}";
-    tmp_g = mpk.common_vars_g[idx];
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
-    acc_g = ops.add_g(acc_g, tmp_g);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    ops.add_term_g(terms_g, tmp_z, mpk.common_vars_g[idx]);
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     idx = "";
     idx += "s";
@@ -199,8 +198,8 @@ for (int j : env.get_lsss_rows()) {
     Attr j_local_0 = env.ls_row_to_attr(j);
     idx += env.attr_to_string(j_local_0);
     idx += "}";
-    tmp_g = mpk.common_vars_g[idx];
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
+    ops.add_term_g(terms_g, tmp_z, mpk.common_vars_g[idx]);
+    tmp_g = ops.multi_scale_g(terms_g);
     acc_g = ops.add_g(acc_g, tmp_g);
     idx = "";
     idx += "c";
@@ -214,7 +213,7 @@ acc_z = ops.reset_z();
 tmp_gt = ops.reset_gt();
 acc_gt = ops.reset_gt();
 acc_gt = ops.lift_gt(acc_z);
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 idx = "";
 idx += "alpha";
 idx += "_{";
@@ -242,6 +241,7 @@ def test_decrypt_full_integration():
     received = Relic().export(decrypt)
     expected = """\
 /* BEGIN DECRYPT */
+acc_pairs = ops.reset_pairs();
 idx = "";
 idx += "<secret>";
 idx += "_{";
@@ -252,10 +252,8 @@ idx += "k";
 idx += "_{";
 idx += "}";
 tmp_h = usk.polys_h[idx];
-tmp_gt = ops.pair(tmp_g, tmp_h);
-tmp_z = ops.read_z("1");
-tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-acc_gt = ops.add_gt(acc_gt, tmp_gt);
+tmp_z = ops.const_z(1);
+ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
     idx += "c";
@@ -268,14 +266,12 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += "_{";
     idx += "}";
     tmp_h = usk.non_lone_vars_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -291,15 +287,15 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.attr_to_string(j_local_0);
     idx += "}";
     tmp_h = usk.polys_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
+tmp_gt = ops.multi_pair(acc_pairs);
+acc_gt = ops.add_gt(acc_gt, tmp_gt);
 blinding_poly = acc_gt;
 /* END DECRYPT */"""
     assert received == expected
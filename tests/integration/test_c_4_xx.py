@@ -68,7 +68,7 @@ non_lone_randoms[idx] = ops.sample_z();
 usk.non_lone_vars_h[idx] = ops.lift_h(non_lone_randoms[idx]);
 tmp_z = ops.reset_z();
 acc_z = ops.reset_z();
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 idx = "";
 idx += "alpha";
 idx += "_{";
@@ -76,7 +76,7 @@ idx += "}";
 tmp_z = ops.mul_z(tmp_z, msk.alphas[idx]);
 acc_z = ops.add_z(acc_z, tmp_z);
 acc_g = ops.lift_g(acc_z);
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 idx = "";
 idx += "t";
 idx += "_{";
@@ -97,7 +97,7 @@ usk.polys_g[idx] = acc_g;
 for (Attr x : env.get_user_attributes()) {
     tmp_z = ops.reset_z();
     acc_z = ops.reset_z();
-    tmp_z = ops.read_z("1");
+    tmp_z = ops.const_z(1);
     idx = "";
     idx += "t";
     idx += "_{";
@@ -169,8 +169,9 @@ for (int j : env.get_lsss_rows()) {
     tmp_g = ops.reset_g();
     acc_g = ops.reset_g();
     acc_g = ops.lift_g(acc_z);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    terms_g = ops.reset_terms_g();
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     idx = "";
     idx += "s";
@@ -184,10 +185,8 @@ for (int j : env.get_lsss_rows()) {
     Attr j_local_0 = env.ls_row_to_attr(j);
     idx += env.attr_to_string(j_local_0);
     idx += "}";
-    tmp_g = mpk.common_vars_g[idx];
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
-    acc_g = ops.add_g(acc_g, tmp_g);
-    tmp_z = ops.read_z("1");
+    ops.add_term_g(terms_g, tmp_z, mpk.common_vars_g[idx]);
+    tmp_z = ops.const_z(1);
     aux_z = env.get_lambda(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     idx = "";
@@ -195,7 +194,8 @@ for (int j : env.get_lsss_rows()) {
     idx += "_{";
     idx += "}";
     tmp_g = ops.fdh_g(9, idx);
-    tmp_g = ops.scale_g(tmp_z, tmp_g);
+    ops.add_term_g(terms_g, tmp_z, tmp_g);
+    tmp_g = ops.multi_scale_g(terms_g);
     acc_g = ops.add_g(acc_g, tmp_g);
     idx = "";
     idx += "c";
@@ -209,7 +209,7 @@ acc_z = ops.reset_z();
 tmp_gt = ops.reset_gt();
 acc_gt = ops.reset_gt();
 acc_gt = ops.lift_gt(acc_z);
-tmp_z = ops.read_z("1");
+tmp_z = ops.const_z(1);
 idx = "";
 idx += "alpha";
 idx += "_{";
@@ -237,6 +237,7 @@ def test_decrypt_full_integration():
     received = Relic().export(decrypt)
     expected = """\
 /* BEGIN DECRYPT */
+acc_pairs = ops.reset_pairs();
 idx = "";
 idx += "k";
 idx += "_{";
@@ -247,10 +248,8 @@ idx += "<secret>";
 idx += "_{";
 idx += "}";
 tmp_h = ct.non_lone_vars_h[idx];
-tmp_gt = ops.pair(tmp_g, tmp_h);
-tmp_z = ops.read_z("1");
-tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-acc_gt = ops.add_gt(acc_gt, tmp_gt);
+tmp_z = ops.const_z(1);
+ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
     idx += "c";
@@ -263,14 +262,12 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += "_{";
     idx += "}";
     tmp_h = usk.non_lone_vars_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
 for (int j : env.get_linear_combination_idcs()) {
     idx = "";
@@ -286,15 +283,15 @@ for (int j : env.get_linear_combination_idcs()) {
     idx += env.attr_to_string(j_local_0);
     idx += "}";
     tmp_h = usk.polys_h[idx];
-    tmp_gt = ops.pair(tmp_g, tmp_h);
-    tmp_z = ops.read_z("1");
-    aux_z = ops.read_z("-1");
+    tmp_z = ops.const_z(1);
+    aux_z = ops.const_z(-1);
     tmp_z = ops.mul_z(tmp_z, aux_z);
     aux_z = env.get_epsilon(j);
     tmp_z = ops.mul_z(tmp_z, aux_z);
-    tmp_gt = ops.scale_gt(tmp_z, tmp_gt);
-    acc_gt = ops.add_gt(acc_gt, tmp_gt);
+    ops.add_pair_g(acc_pairs, tmp_g, tmp_h, tmp_z);
 }
+tmp_gt = ops.multi_pair(acc_pairs);
+acc_gt = ops.add_gt(acc_gt, tmp_gt);
 blinding_poly = acc_gt;
 /* END DECRYPT */"""
     assert received == expected
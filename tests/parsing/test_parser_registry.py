@@ -0,0 +1,11 @@
+from pracy.frontend.parsing import _GRAMMARS, get_parser
+
+
+def test_parser_registry_builds_once():
+    for name in _GRAMMARS:
+        assert get_parser(name) is get_parser(name)
+
+
+def test_parser_registry_uses_lalr():
+    for name in _GRAMMARS:
+        assert get_parser(name).options.parser == "lalr"
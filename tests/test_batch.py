@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pracy.batch import run_batch
+from pracy.cache import ARTIFACTS
+
+_schemes_path = Path(os.path.realpath(__file__)).parent.parent / "schemes"
+
+
+def test_batch_writes_all_backends():
+    scheme = str(_schemes_path / "a_0_ok.json")
+    with tempfile.TemporaryDirectory() as tmp:
+        failed = run_batch([scheme], ["relic", "charm"], tmp, jobs=1, use_cache=False)
+        assert failed == []
+        for backend in ["relic", "charm"]:
+            for name in ARTIFACTS:
+                assert (Path(tmp) / "a_0_ok" / backend / f"{name}.gen").exists()
+
+
+def test_batch_writes_charm_module():
+    scheme = str(_schemes_path / "a_1_xx.json")
+    with tempfile.TemporaryDirectory() as tmp:
+        failed = run_batch(
+            [scheme],
+            ["relic", "charm"],
+            tmp,
+            jobs=1,
+            use_cache=False,
+            charm_module=True,
+        )
+        assert failed == []
+        assert (Path(tmp) / "a_1_xx" / "relic" / "setup.gen").exists()
+        module = Path(tmp) / "a_1_xx" / "charm" / "scheme.py"
+        namespace = {}
+        exec(compile(module.read_text(), str(module), "exec"), namespace)
+        assert all(name in namespace for name in ARTIFACTS)
+        assert set(namespace["ROW_COSTS"]) == {"pos", "neg"}
+
+
+def test_batch_reports_analysis_error():
+    with open(_schemes_path / "a_0_ok.json", "r") as file:
+        data = json.load(file)
+    data["spec"]["master_key_vars"] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        scheme = Path(tmp) / "broken.json"
+        with open(scheme, "w") as file:
+            json.dump(data, file)
+        failed = run_batch(
+            [str(scheme)], ["relic"], str(Path(tmp) / "out"), jobs=1, use_cache=False
+        )
+        assert [r.error for r in failed] == ["MasterKeyVarsEmptyError"]
+        assert not (Path(tmp) / "out" / "broken").exists()
+
+
+def test_batch_rejects_duplicate_stems():
+    with tempfile.TemporaryDirectory() as tmp:
+        other = Path(tmp) / "other"
+        other.mkdir()
+        shutil.copy(_schemes_path / "a_0_ok.json", other / "a_0_ok.json")
+        schemes = [str(_schemes_path / "a_0_ok.json"), str(other / "a_0_ok.json")]
+        with pytest.raises(ValueError):
+            run_batch(schemes, ["relic"], str(Path(tmp) / "out"), jobs=1)
+        assert not (Path(tmp) / "out").exists()
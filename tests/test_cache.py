@@ -0,0 +1,40 @@
+import os
+import tempfile
+from pathlib import Path
+
+from pracy.cache import ARTIFACTS, ArtifactCache, write_if_changed
+
+_artifacts = {name: f"// {name}\n" for name in ARTIFACTS}
+
+
+def test_cache_roundtrip():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArtifactCache(Path(tmp))
+        key = cache.key('{"spec": {}}', "relic")
+        assert cache.load(key) is None
+        cache.store(key, _artifacts)
+        assert cache.load(key) == _artifacts
+        # storing the same entry twice is fine
+        cache.store(key, _artifacts)
+        assert cache.load(key) == _artifacts
+
+
+def test_cache_key_depends_on_spec_and_backend():
+    cache = ArtifactCache(Path("unused"))
+    key = cache.key('{"spec": {}}', "relic")
+    assert key == cache.key('{"spec": {}}', "relic")
+    assert key != cache.key('{"spec": {}}', "charm")
+    assert key != cache.key('{"spec": {"x": 1}}', "relic")
+    assert key == cache.key('{"spec": {}}', "relic", {})
+    assert key != cache.key('{"spec": {}}', "relic", {"opt_level": "1"})
+
+
+def test_write_if_changed_keeps_unchanged_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "setup.gen"
+        assert write_if_changed(path, "a")
+        os.utime(path, (0, 0))
+        assert not write_if_changed(path, "a")
+        assert path.stat().st_mtime == 0
+        assert write_if_changed(path, "b")
+        assert path.read_text() == "b"
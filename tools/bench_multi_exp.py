@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+project_path = Path(os.path.realpath(__file__)).parent.parent
+sys.path.insert(0, str(project_path / "backends" / "charm"))
+
+from charm.toolbox.pairinggroup import G1, ZR  # noqa: E402
+from CharmBackend import parsing  # noqa: E402
+from CharmBackend.calculations import Calculations  # noqa: E402
+
+
+def main():
+    """
+    Compares the windowed multi-exponentiation of the Charm backend (see
+    `Calculations.multi_exp`) with a product of native exponentiations in G1
+    across numbers of bases, with plain and with precomputed bases.
+
+    Prints one row per number of bases with the timings of both evaluations
+    and the smallest number of bases from which the windowed one is faster,
+    i.e., the value to use for `Calculations.multi_exp_threshold`.
+    """
+    parser = argparse.ArgumentParser(
+        prog=__name__,
+        description="Benchmark multi-exponentiations of the Charm backend",
+    )
+    parser.add_argument("-c", "--curve", default="SS512", help="the Charm curve")
+    parser.add_argument(
+        "-n", "--max-bases", type=int, default=16, help="largest number of bases"
+    )
+    parser.add_argument(
+        "-i", "--iters", type=int, default=20, help="iterations per benchmark"
+    )
+    args = parser.parse_args()
+
+    meta = parsing.parse_json(str(project_path / "backends/charm/schemes/meta.json"))
+    calc = Calculations(args.curve, meta)
+
+    for precomputed in (False, True):
+        print(f"precomputed bases: {precomputed}")
+        print(f"{'bases':>6} {'native [ms]':>12} {'windowed [ms]':>14}")
+        crossover = None
+        for n in range(1, args.max_bases + 1):
+            bases = [calc.group.random(G1) for _ in range(n)]
+            if precomputed:
+                bases = [calc.precompute(b) for b in bases]
+            exponents = [calc.group.random(ZR) for _ in range(n)]
+            times = []
+            for threshold in (n + 1, 0):
+                calc.multi_exp_threshold = threshold
+                t = timeit.timeit(
+                    lambda: calc.multi_exp(bases, exponents, calc.reset_g()),
+                    number=args.iters,
+                )
+                times.append(t / args.iters * 1000)
+            native, windowed = times
+            if crossover is None and windowed < native:
+                crossover = n
+            print(f"{n:>6} {native:12.3f} {windowed:14.3f}")
+        print(f"windowed is faster from {crossover} bases on\n")
+
+
+if __name__ == "__main__":
+    main()
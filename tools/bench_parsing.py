@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from lark import Lark
+
+from pracy.frontend import parsing
+
+logger = logging.getLogger(__name__)
+
+# Spec section -> name of the grammar (see `pracy.frontend.parsing.get_parser`)
+SECTIONS = {
+    "master_key_vars": "var",
+    "common_vars": "var",
+    "key_polys": "poly",
+    "cipher_polys": "poly",
+    "e_vec": "vector_entry",
+    "e_mat": "matrix_entry",
+    "fdh_map": "fdh_entry",
+}
+
+
+def collect_inputs(schemes_path):
+    """
+    Collect all strings of all scheme specs in `schemes_path` together with
+    the name of the grammar used to parse them.
+    """
+    inputs = []
+    for scheme in sorted(schemes_path.glob("*.json")):
+        with open(scheme, encoding="utf-8") as f:
+            spec = json.load(f)["spec"]
+        for section, name in SECTIONS.items():
+            inputs.extend((name, text) for text in spec[section])
+    return inputs
+
+
+def parse_uncached(name, text):
+    """
+    Parse `text` the way `pracy.frontend.parsing` did before parsers were
+    shared, i.e., build a fresh Earley parser for every single string.
+    """
+    file, start = parsing._GRAMMARS[name]
+    parser = Lark.open(file, rel_to=parsing.__file__, start=start)
+    return parser.parse(text)
+
+
+def parse_cached(name, text):
+    """Parse `text` with the shared parser from the registry."""
+    return parsing.get_parser(name).parse(text)
+
+
+def measure(parse, inputs, rounds):
+    """
+    Parse all `inputs` `rounds` times with `parse` and return the achieved
+    number of parses per second.
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name, text in inputs:
+            parse(name, text)
+    elapsed = time.perf_counter() - start
+    return rounds * len(inputs) / elapsed
+
+
+def main():
+    """
+    Measures how many entries of the scheme specs can be parsed per second with
+    a fresh parser per entry ("before") and with the shared parsers ("after").
+    """
+    logging.basicConfig(
+        stream=sys.stdout, level=logging.INFO, format="[%(levelname)s] %(message)s"
+    )
+
+    project_path = Path(os.path.realpath(__file__)).parent.parent
+    schemes_path = project_path / "schemes"
+
+    parser = argparse.ArgumentParser(
+        prog=__name__,
+        description="Benchmark the throughput of the spec parsers",
+    )
+    parser.add_argument(
+        "-r",
+        "--rounds",
+        type=int,
+        default=20,
+        help="how often all inputs are parsed with the shared parsers",
+    )
+    args = parser.parse_args()
+
+    inputs = collect_inputs(schemes_path)
+    logger.info(f"Collected {len(inputs)} entries from '{schemes_path}'")
+
+    before = measure(parse_uncached, inputs, 1)
+    logger.info(f"before (fresh Earley parser per entry): {before:10.1f} parses/s")
+
+    # Build all shared parsers first, so only parsing itself is measured
+    for name in parsing._GRAMMARS:
+        parsing.get_parser(name)
+    after = measure(parse_cached, inputs, args.rounds)
+    logger.info(f"after (shared parsers):                 {after:10.1f} parses/s")
+    logger.info(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import re
+import subprocess as sp
+import sys
+from pathlib import Path
+
+from test_relic_backend import run_cmake, run_make, run_pracy
+
+logger = logging.getLogger(__name__)
+
+# Matches the mean time of a benchmark in the output of the Relic backend
+_MEAN = r"{name}:\s*mean = ([0-9.]+) ms"
+
+
+def decrypt_time(relic_build_dir):
+    """
+    Run the compiled executable `main` (located in `relic_build_dir`) and
+    return the mean time of DECRYPT in ms, or `None` if it fails.
+    """
+    res = sp.run(["./main"], cwd=relic_build_dir, capture_output=True, text=True)
+    if res.returncode != 0:
+        logger.error("Relic backend failed")
+        logger.error(f"stdout: '{res.stdout}'")
+        logger.error(f"stderr: '{res.stderr}'")
+        return None
+    match = re.search(_MEAN.format(name="DECRYPT"), res.stdout)
+    return float(match.group(1)) if match else None
+
+
+def main():
+    """
+    Compares the DECRYPT timings of the Relic backend with and without
+    prepared user keys (see `--prepared-key`) across policy lengths.
+
+    For each policy length, the scheme is compiled and run twice: once with
+    the plain user key and once with a key prepared ahead of the measured
+    decryptions. Prints one row per policy length with both timings and the
+    speedup.
+    """
+    logging.basicConfig(
+        stream=sys.stdout, level=logging.INFO, format="[%(levelname)s] %(message)s"
+    )
+
+    project_path = Path(os.path.realpath(__file__)).parent.parent
+    relic_src_dir = project_path / "backends" / "relic" / "src"
+    relic_build_dir = project_path / "backends" / "relic" / "_build"
+
+    parser = argparse.ArgumentParser(
+        prog=__name__,
+        description="Benchmark decryption with prepared user keys",
+    )
+    parser.add_argument(
+        "-s",
+        "--scheme",
+        default=str(project_path / "schemes" / "a_0_ok.json"),
+        help="the scheme to benchmark",
+    )
+    parser.add_argument(
+        "-l",
+        "--policy-lens",
+        default="2,5,10,20",
+        help="comma separated list of policy lengths",
+    )
+    parser.add_argument(
+        "-i", "--iters", type=int, default=10, help="iterations per benchmark"
+    )
+    parser.add_argument(
+        "-O",
+        dest="opt_level",
+        type=int,
+        default=0,
+        help="the optimization level passed to pracy",
+    )
+    args = parser.parse_args()
+
+    relic_build_dir.mkdir(exist_ok=True)
+    rows = []
+    for policy_len in args.policy_lens.split(","):
+        times = []
+        for prepared_key in (False, True):
+            options = {
+                "policy_len": policy_len,
+                "bench_iters": args.iters,
+                "multi_auth": "off",
+                "ot_negs": "off",
+                "prepared_key": "on" if prepared_key else "off",
+            }
+            ok = (
+                run_pracy(
+                    args.scheme,
+                    relic_src_dir,
+                    args.opt_level,
+                    prepared_key=prepared_key,
+                )
+                and run_cmake(relic_build_dir, options)
+                and run_make(relic_build_dir)
+            )
+            times.append(decrypt_time(relic_build_dir) if ok else None)
+        rows.append((policy_len, *times))
+
+    print(f"{'policy_len':>10} {'plain [ms]':>12} {'prepared [ms]':>14} {'speedup':>8}")
+    failed = False
+    for policy_len, plain, prepared in rows:
+        if plain is None or prepared is None:
+            failed = True
+            print(f"{policy_len:>10} {'FAILED':>12}")
+            continue
+        print(
+            f"{policy_len:>10} {plain:12.3f} {prepared:14.3f} {plain / prepared:8.2f}"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import logging
+import os
+import subprocess as sp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Scenario -> (arguments passed to `python -m pracy`, modules which must not be
+# imported by it). "{scheme}", "{outdir}" and "{cachedir}" are substituted
+# before running. Forbidden imports are checked in the last round, so the
+# "cached" scenario is checked once the cache is warm.
+SCENARIOS = {
+    "help": (
+        ["--help"],
+        ["lark", "sympy", "pracy.frontend", "pracy.analysis", "pracy.backend"],
+    ),
+    "bad_args": (
+        ["-b", "unknown", "{scheme}"],
+        ["lark", "sympy", "pracy.frontend", "pracy.analysis", "pracy.backend"],
+    ),
+    "relic": (
+        ["-b", "relic", "--no-cache", "-o", "{outdir}", "{scheme}"],
+        ["sympy", "pracy.backend.export.charm"],
+    ),
+    "charm": (
+        ["-b", "charm", "--no-cache", "-o", "{outdir}", "{scheme}"],
+        ["sympy", "pracy.backend.export.relic"],
+    ),
+    "cached": (
+        ["-b", "relic", "--cache-dir", "{cachedir}", "-o", "{outdir}", "{scheme}"],
+        ["lark", "sympy", "pracy.frontend", "pracy.analysis", "pracy.backend"],
+    ),
+}
+
+
+def parse_importtime(output):
+    """
+    Parse the output of `python -X importtime` into a list of
+    `(module, cumulative time in us, nesting depth)` in import order.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(cumulative), depth))
+    return imports
+
+
+def run_scenario(src_path, args):
+    """
+    Run `python -X importtime -m pracy` with `args` once and return the wall
+    time (in ms) and the parsed import times.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [str(src_path), env.get("PYTHONPATH")] if p
+    )
+    cmd = [sys.executable, "-X", "importtime", "-m", "pracy", *args]
+    start = time.perf_counter()
+    res = sp.run(cmd, env=env, stdout=sp.DEVNULL, stderr=sp.PIPE, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    return wall, parse_importtime(res.stderr)
+
+
+def pracy_import_time(imports):
+    """
+    Sum up the time spent on all imports from loading pracy onwards, i.e.,
+    everything pracy imports at startup and lazily while running.
+    """
+    start = next(i for i, (name, _, _) in enumerate(imports) if name == "pracy")
+    return sum(t for _, t, depth in imports[start:] if depth == 0)
+
+
+def forbidden_imports(imports, forbidden):
+    return sorted(
+        name
+        for name, _, _ in imports
+        for f in forbidden
+        if name == f or name.startswith(f + ".")
+    )
+
+
+def main():
+    """
+    Measures the cold start of `python -m pracy` for a few typical invocations
+    and compares the time spent importing pracy (and everything it pulls in)
+    against the budget recorded in `startup_budget.json` (in microseconds per
+    scenario, see `--record`).
+
+    Fails if a budget is exceeded by more than the given tolerance or if an
+    invocation imports a module it does not need.
+    """
+    logging.basicConfig(
+        stream=sys.stdout, level=logging.INFO, format="[%(levelname)s] %(message)s"
+    )
+
+    project_path = Path(os.path.realpath(__file__)).parent.parent
+    src_path = project_path / "src"
+    budget_path = Path(os.path.realpath(__file__)).parent / "startup_budget.json"
+
+    parser = argparse.ArgumentParser(
+        prog=__name__,
+        description="Benchmark the startup time of the pracy CLI",
+    )
+    parser.add_argument(
+        "-r",
+        "--rounds",
+        type=int,
+        default=5,
+        help="how often each scenario is run (the fastest run counts)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="factor by which the recorded budget may be exceeded",
+    )
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=2.0,
+        help="absolute time (in ms) by which the budget may be exceeded "
+        "on top of the tolerance, which absorbs noise for tiny budgets",
+    )
+    parser.add_argument(
+        "-s",
+        "--scheme",
+        default=str(project_path / "schemes" / "a_0_ok.json"),
+        help="the scheme compiled in the backend scenarios",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="record the measured times as the new budget",
+    )
+    args = parser.parse_args()
+
+    budget = {}
+    if budget_path.exists():
+        with open(budget_path, encoding="utf-8") as f:
+            budget = json.load(f)
+
+    failed = False
+    measured = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outdir = Path(tmpdir) / "out"
+        cachedir = Path(tmpdir) / "cache"
+        for name, (cmd, forbidden) in SCENARIOS.items():
+            cmd = [
+                a.format(scheme=args.scheme, outdir=outdir, cachedir=cachedir)
+                for a in cmd
+            ]
+            walls = []
+            imports = []
+            for _ in range(args.rounds):
+                wall, times = run_scenario(src_path, cmd)
+                walls.append(wall)
+                imports.append(pracy_import_time(times))
+            unwanted = forbidden_imports(times, forbidden)
+            measured[name] = min(imports)
+            logger.info(
+                f"{name:10} imports: {min(imports) / 1000:7.1f} ms"
+                f"  wall: {min(walls):7.1f} ms"
+            )
+
+            if unwanted:
+                failed = True
+                logger.error(f"{name}: unexpected imports: {', '.join(unwanted)}")
+
+            limit = budget.get(name)
+            if (
+                limit is not None
+                and measured[name] > limit * args.tolerance + args.slack * 1000
+            ):
+                failed = True
+                logger.error(
+                    f"{name}: import time {measured[name] / 1000:.1f} ms exceeds "
+                    f"budget {limit / 1000:.1f} ms "
+                    f"(x{args.tolerance} + {args.slack} ms)"
+                )
+
+    if args.record:
+        with open(budget_path, "w", encoding="utf-8") as f:
+            json.dump(measured, f, indent=4)
+            f.write("\n")
+        logger.info(f"Recorded new budget in '{budget_path}'")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
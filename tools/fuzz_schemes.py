@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+from pracy.analysis.scheme import analyze_scheme
+from pracy.backend.compiler.all import compile
+from pracy.backend.interp.fuzz import features, fuzz
+from pracy.backend.opt import PassManager, optimize
+from pracy.frontend.parsing import parse_json
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Searches for all ABE scheme specs in the schemes folder and checks their
+    correctness for random policies (with negations and multiple authorities
+    if a scheme supports them) and user attributes, a whole batch of random
+    values per policy at once (see `pracy.backend.interp.fuzz`).
+    Prints the throughput per scheme and a minimized reproducer per failure.
+    """
+    logging.basicConfig(
+        stream=sys.stdout, level=logging.INFO, format="[%(levelname)s] %(message)s"
+    )
+
+    errors = 0
+
+    project_path = Path(os.path.realpath(__file__)).parent.parent
+    schemes_path = project_path / "schemes"
+
+    parser = argparse.ArgumentParser(
+        prog=__name__,
+        description="Fuzz all schemes with random policies and user attributes",
+    )
+
+    parser.add_argument("-n", "--name", help="the scheme which should be tested")
+    parser.add_argument(
+        "-O", dest="opt_level", type=int, default=0, help="the optimization level"
+    )
+    parser.add_argument(
+        "-i",
+        "--instances",
+        type=int,
+        default=100,
+        help="the number of random policies per scheme",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        type=int,
+        default=1000,
+        help="the number of random values checked at once per policy",
+    )
+    parser.add_argument(
+        "--max-rows", type=int, default=16, help="the maximal length of policies"
+    )
+    parser.add_argument("--seed", type=int, help="the seed of the random policies")
+    parser.add_argument(
+        "--precompute",
+        action="store_true",
+        help="build fixed-base precomputation tables",
+    )
+    parser.add_argument(
+        "--prepared-key",
+        action="store_true",
+        help="decrypt with prepared user keys",
+    )
+    parser.add_argument(
+        "--structured-index",
+        action="store_true",
+        help="use structured index keys instead of index strings",
+    )
+
+    args = parser.parse_args()
+
+    def matches_name_pattern(s):
+        return args.name is None or s.startswith(args.name)
+
+    schemes = schemes_path.glob("*.json")
+    for path in sorted(schemes):
+        if not matches_name_pattern(path.stem):
+            continue
+
+        with open(path, "r") as file:
+            scheme = analyze_scheme(parse_json(file.read()))
+        programs = compile(
+            scheme, args.precompute, args.prepared_key, args.structured_index
+        )
+        programs = optimize(programs, PassManager.for_level(args.opt_level))
+
+        report = fuzz(
+            scheme,
+            programs,
+            args.instances,
+            args.batch,
+            args.max_rows,
+            args.seed,
+        )
+        logger.info(
+            f"{path.stem} {features(programs)}: "
+            f"{report.instances * report.size} instances, "
+            f"{report.throughput:.0f} instances/s"
+        )
+        for failure in report.failures:
+            logger.error(f"Scheme '{path.stem}' is not correct: {failure}")
+            errors += 1
+
+    if errors > 0:
+        logger.error(f"{errors} policies were not decrypted correctly")
+        sys.exit(3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from pracy import compile_spec
+from pracy.backend.interp import Env, MockEngine, check_correctness
+from pracy.backend.opt import PassManager
+
+logger = logging.getLogger(__name__)
+
+
+def engine_for(name, seed):
+    """Return the group engine `name` ("mock" or a curve of Charm)."""
+    if name == "mock":
+        return MockEngine(seed=seed)
+    # Charm is only needed for real curves
+    from pracy.backend.interp.charm import CharmEngine
+
+    return CharmEngine(name)
+
+
+def main():
+    """
+    Searches for all ABE scheme specs in the schemes folder and checks their
+    correctness with the IR interpreter, for the same option sets as
+    tools/test_relic_backend.py, but without generating and compiling code.
+    Prints the time each scheme took.
+    """
+    logging.basicConfig(
+        stream=sys.stdout, level=logging.INFO, format="[%(levelname)s] %(message)s"
+    )
+
+    errors = 0
+
+    project_path = Path(os.path.realpath(__file__)).parent.parent
+    schemes_path = project_path / "schemes"
+
+    parser = argparse.ArgumentParser(
+        prog=__name__,
+        description="Check the correctness of all schemes with the IR interpreter",
+    )
+
+    parser.add_argument("-n", "--name", help="the scheme which should be tested")
+    parser.add_argument(
+        "-O", dest="opt_level", type=int, default=0, help="the optimization level"
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        default="mock",
+        help="the group engine, 'mock' or a curve of Charm (e.g. 'SS512')",
+    )
+    parser.add_argument("--seed", type=int, help="the seed of the mock engine")
+    parser.add_argument(
+        "--precompute",
+        action="store_true",
+        help="build fixed-base precomputation tables",
+    )
+    parser.add_argument(
+        "--prepared-key",
+        action="store_true",
+        help="decrypt with prepared user keys",
+    )
+    parser.add_argument(
+        "--structured-index",
+        action="store_true",
+        help="use structured index keys instead of index strings",
+    )
+
+    args = parser.parse_args()
+
+    def matches_name_pattern(s):
+        return args.name is None or s.startswith(args.name)
+
+    option_sets = [
+        {"policy_len": 5, "multi_auth": False, "negations": False},
+        {"policy_len": 5, "multi_auth": True, "negations": False},
+        {"policy_len": 5, "multi_auth": True, "negations": True},
+    ]
+
+    schemes = schemes_path.glob("*.json")
+    for scheme in sorted(schemes):
+        if not matches_name_pattern(scheme.stem):
+            continue
+
+        options = [option_sets[0]]
+        if scheme.stem.startswith("a") or scheme.stem.startswith("b"):
+            options.append(option_sets[1])
+        if scheme.stem.startswith("b"):
+            options.append(option_sets[2])
+
+        with open(scheme, "r") as file:
+            programs = compile_spec(
+                file.read(),
+                PassManager.for_level(args.opt_level),
+                args.precompute,
+                args.prepared_key,
+                args.structured_index,
+            )
+
+        for opts in options:
+            engine = engine_for(args.engine, args.seed)
+            start = time.perf_counter()
+            try:
+                correct = check_correctness(
+                    programs, engine, Env.random(engine, **opts)
+                )
+            except Exception as e:
+                logger.error(f"Scheme '{scheme.stem}' failed for {opts}: {e}")
+                errors += 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            if not correct:
+                logger.error(f"Scheme '{scheme.stem}' is not correct for {opts}")
+                errors += 1
+                continue
+            logger.info(f"{scheme.stem} {opts}: correct ({elapsed:.1f} ms)")
+
+    if errors > 0:
+        logger.error(f"At least {errors} schemes were not correct")
+        sys.exit(3)
+
+
+if __name__ == "__main__":
+    main()
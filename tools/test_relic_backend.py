@@ -10,15 +10,33 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 
-def run_pracy(scheme, relic_src_dir):
+def run_pracy(
+    scheme,
+    relic_src_dir,
+    opt_level=0,
+    curve="bn254",
+    precompute=False,
+    prepared_key=False,
+    structured_index=False,
+):
     """
     Run the pracy compiler for `scheme` and place the generated
-    source code in `relic_src_dir`.
+    source code in `relic_src_dir`, optimizing at `opt_level` for `curve`
+    (and with fixed-base precomputation tables if `precompute` is set,
+    decrypting with prepared user keys if `prepared_key` is set, using
+    structured index keys if `structured_index` is set).
 
     Returns `False`, if any subcommand fails, `True`, otherwise.
     """
     logger.info(f"Compiling JSON scheme '{scheme}' to source code")
     cmd = ["python", "-m", "pracy", f"{scheme}", "-o", f"{relic_src_dir}"]
+    cmd += [f"-O{opt_level}", "--curve", curve]
+    if precompute:
+        cmd.append("--precompute")
+    if prepared_key:
+        cmd.append("--prepared-key")
+    if structured_index:
+        cmd.append("--structured-index")
     logger.info(" ".join(cmd))
     res = sp.run(cmd, capture_output=True)
 
@@ -44,12 +62,16 @@ def run_cmake(relic_build_dir, options):
     BENCH_ITERS = options["bench_iters"]
     MULTI_AUTH = options["multi_auth"]
     OT_NEGS = options["ot_negs"]
+    PREPARED_KEY = options.get("prepared_key", "off")
+    STRUCTURED_INDEX = options.get("structured_index", "off")
     cmd = [
         "cmake",
         f"-DPOLICY_LEN={POLICY_LEN}",
         f"-DBENCH_ITERS={BENCH_ITERS}",
         f"-DMULTI_AUTH={MULTI_AUTH}",
         f"-DOT_NEGS={OT_NEGS}",
+        f"-DPREPARED_KEY={PREPARED_KEY}",
+        f"-DSTRUCTURED_INDEX={STRUCTURED_INDEX}",
         "-DCMAKE_BUILD_TYPE=Release",
         "..",
     ]
@@ -130,6 +152,30 @@ def main():
     )
 
     parser.add_argument("-n", "--name", help="the scheme which should be tested")
+    parser.add_argument(
+        "-O",
+        dest="opt_level",
+        type=int,
+        default=0,
+        help="the optimization level passed to pracy (compare the DECRYPT "
+        "timings of different levels)",
+    )
+    parser.add_argument("--curve", default="bn254", help="the curve passed to pracy")
+    parser.add_argument(
+        "--precompute",
+        action="store_true",
+        help="build fixed-base precomputation tables (compare the ENCRYPT timings)",
+    )
+    parser.add_argument(
+        "--prepared-key",
+        action="store_true",
+        help="decrypt with prepared user keys (compare the DECRYPT timings)",
+    )
+    parser.add_argument(
+        "--structured-index",
+        action="store_true",
+        help="use structured index keys instead of index strings",
+    )
 
     args = parser.parse_args()
 
@@ -172,11 +218,26 @@ def main():
             options.append(option_sets[2])
 
         for opts in options:
-            if not run_pracy(scheme, relic_src_dir):
+            if not run_pracy(
+                scheme,
+                relic_src_dir,
+                args.opt_level,
+                args.curve,
+                args.precompute,
+                args.prepared_key,
+                args.structured_index,
+            ):
                 errors += 1
                 continue
 
-            if not run_cmake(relic_build_dir, opts):
+            if not run_cmake(
+                relic_build_dir,
+                {
+                    **opts,
+                    "prepared_key": "on" if args.prepared_key else "off",
+                    "structured_index": "on" if args.structured_index else "off",
+                },
+            ):
                 errors += 1
                 continue
 